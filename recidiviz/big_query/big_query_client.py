@@ -23,9 +23,22 @@ import json
 import logging
 import os
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from concurrent import futures
-from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from contextlib import closing
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import __main__
 import pandas as pd
@@ -57,7 +70,7 @@ from recidiviz.ingest.direct.dataset_config import (
     raw_tables_dataset_for_region,
 )
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
-from recidiviz.utils import environment, metadata
+from recidiviz.utils import environment, metadata, structured_logging
 from recidiviz.utils.size import total_size
 from recidiviz.utils.string import StrictStringFormatter
 
@@ -261,7 +274,10 @@ class BigQueryClient:
 
     @abc.abstractmethod
     def create_or_update_view(
-        self, view: BigQueryView, might_exist: bool = True
+        self,
+        view: BigQueryView,
+        might_exist: bool = True,
+        labels: Optional[Dict[str, str]] = None,
     ) -> bigquery.Table:
         """Create a View if it does not exist, or update its query if it does.
 
@@ -271,6 +287,7 @@ class BigQueryClient:
             view: The View to create or update.
             might_exist: If it is possible this view already exists, so we
             should optimistically attempt to update it.
+            labels: If set, labels to set on the view.
 
         Returns:
             The Table that was just created.
@@ -293,8 +310,9 @@ class BigQueryClient:
         destination_table_schema: List[bigquery.SchemaField],
         write_disposition: str,
         skip_leading_rows: int = 0,
+        source_format: str = bigquery.SourceFormat.CSV,
     ) -> bigquery.job.LoadJob:
-        """Loads a table from CSV data in GCS to BigQuery.
+        """Loads a table from CSV (or other |source_format|) data in GCS to BigQuery.
 
         Given a desired table name, source data URI(s) and destination schema, loads the
         table into BigQuery.
@@ -317,7 +335,9 @@ class BigQueryClient:
                 completely (WRITE_TRUNCATE) or adds to the table with new rows
                 (WRITE_APPEND). By default, WRITE_APPEND is used.
             skip_leading_rows: Optional number of leading rows to skip on each input
-                file. Defaults to zero
+                file. Defaults to zero. Only applies to CSV files.
+            source_format: The bigquery.SourceFormat of the source files. Defaults to
+                CSV.
         Returns:
             The LoadJob object containing job details.
         """
@@ -457,12 +477,31 @@ class BigQueryClient:
             A QueryJob which will contain the results once the query is complete.
         """
 
+    @abc.abstractmethod
+    def paged_read(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        prefetch_pages: int = 0,
+    ) -> Iterator[List[bigquery.table.Row]]:
+        """Returns an iterator over the given result set from the given query job in pages to limit how many rows are
+        read into memory at any given time.
+
+        Args:
+            query_job: the query job from which to read results.
+            page_size: the maximum number of rows to read in at a time.
+            prefetch_pages: if greater than 0, up to this many of the following pages are fetched concurrently while
+                the caller processes the current page, so at most prefetch_pages + 1 pages are held in memory. If 0,
+                each page is only fetched once the caller asks for it.
+        """
+
     @abc.abstractmethod
     def paged_read_and_process(
         self,
         query_job: bigquery.QueryJob,
         page_size: int,
         process_page_fn: Callable[[List[bigquery.table.Row]], None],
+        prefetch_pages: int = 0,
     ) -> None:
         """Reads the given result set from the given query job in pages to limit how many rows are read into memory at
         any given time, processing the results of each row with the given callable.
@@ -471,6 +510,8 @@ class BigQueryClient:
             query_job: the query job from which to process results.
             page_size: the maximum number of rows to read in at a time.
             process_page_fn: a callable function which takes in the paged rows and performs some operation.
+            prefetch_pages: the number of pages to fetch concurrently while a page is being processed. See
+                paged_read().
         """
 
     @abc.abstractmethod
@@ -661,7 +702,10 @@ class BigQueryClient:
 
     @abc.abstractmethod
     def materialize_view_to_table(
-        self, view: BigQueryView, use_query_cache: bool
+        self,
+        view: BigQueryView,
+        use_query_cache: bool,
+        labels: Optional[Dict[str, str]] = None,
     ) -> bigquery.Table:
         """Materializes the result of a view's view_query into a table. The view's
         materialized_address must be set. The resulting table is put in the same
@@ -671,6 +715,7 @@ class BigQueryClient:
             view: The BigQueryView to materialize into a table.
             use_query_cache: Whether to look for the result in the query cache. See:
                 https://cloud.google.com/bigquery/docs/reference/rest/v2/Job#JobConfigurationQuery.FIELDS.use_query_cache
+            labels: If set, labels to set on the table once it has been materialized.
         """
 
     @abc.abstractmethod
@@ -1220,7 +1265,10 @@ class BigQueryClientImpl(BigQueryClient):
         return self.client.create_table(table, exists_ok=overwrite)
 
     def create_or_update_view(
-        self, view: BigQueryView, might_exist: bool = True
+        self,
+        view: BigQueryView,
+        might_exist: bool = True,
+        labels: Optional[Dict[str, str]] = None,
     ) -> bigquery.Table:
         if not view.should_deploy():
             raise ValueError(
@@ -1230,14 +1278,16 @@ class BigQueryClientImpl(BigQueryClient):
         bq_view = bigquery.Table(view)
         bq_view.view_query = view.view_query
         bq_view.description = view.bq_description
+        fields_to_update = ["view_query", "description"]
+        if labels is not None:
+            bq_view.labels = labels
+            fields_to_update.append("labels")
 
         try:
             if might_exist:
                 try:
                     logging.info("Optimistically updating view [%s]", str(bq_view))
-                    return self.client.update_table(
-                        bq_view, ["view_query", "description"]
-                    )
+                    return self.client.update_table(bq_view, fields_to_update)
                 except exceptions.NotFound:
                     logging.info(
                         "Creating view [%s] as it was not found while attempting to update",
@@ -1260,6 +1310,7 @@ class BigQueryClientImpl(BigQueryClient):
         destination_table_schema: List[bigquery.SchemaField],
         write_disposition: str,
         skip_leading_rows: int = 0,
+        source_format: str = bigquery.SourceFormat.CSV,
     ) -> bigquery.job.LoadJob:
         """Triggers a load job, i.e. a job that will copy all of the data from the given
         Cloud Storage source into the given BigQuery destination. Returns once the job
@@ -1278,10 +1329,11 @@ class BigQueryClientImpl(BigQueryClient):
 
         job_config = bigquery.LoadJobConfig()
         job_config.schema = destination_table_schema
-        job_config.source_format = bigquery.SourceFormat.CSV
-        job_config.allow_quoted_newlines = True
+        job_config.source_format = source_format
         job_config.write_disposition = write_disposition
-        job_config.skip_leading_rows = skip_leading_rows
+        if source_format == bigquery.SourceFormat.CSV:
+            job_config.allow_quoted_newlines = True
+            job_config.skip_leading_rows = skip_leading_rows
 
         load_job = self.client.load_table_from_uri(
             source_uris, destination_table_ref, job_config=job_config
@@ -1495,47 +1547,119 @@ class BigQueryClientImpl(BigQueryClient):
             job_config=job_config,
         )
 
-    def paged_read_and_process(
+    def paged_read(
         self,
         query_job: bigquery.QueryJob,
         page_size: int,
-        process_page_fn: Callable[[List[bigquery.table.Row]], None],
-    ) -> None:
-        logging.debug(
-            "Querying for first page of results to perform %s...",
-            process_page_fn.__name__,
-        )
+        prefetch_pages: int = 0,
+    ) -> Generator[List[bigquery.table.Row], None, None]:
+        if prefetch_pages > 0:
+            yield from self._prefetching_paged_read(
+                query_job, page_size, prefetch_pages
+            )
+            return
 
         start_index = 0
 
         while True:
-            page_rows: bigquery.table.RowIterator = query_job.result(
-                max_results=page_size, start_index=start_index
-            )
-            logging.info(
-                "Retrieved result set from query page of size [%d] starting at index [%d]",
-                page_size,
-                start_index,
+            processed_rows = self._read_page(query_job, page_size, start_index)
+            if not processed_rows:
+                break
+
+            yield processed_rows
+
+            start_index += len(processed_rows)
+            logging.info("Processed [%d] rows...", start_index)
+
+    def _prefetching_paged_read(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        prefetch_pages: int,
+    ) -> Iterator[List[bigquery.table.Row]]:
+        """Reads pages at fixed offsets of page_size, keeping up to prefetch_pages
+        fetches in flight ahead of the page the caller is processing. Pages are
+        returned in order. Since result() fills each page with page_size rows unless
+        it reaches the end of the result set, the first empty or partial page is the
+        last one.
+        """
+        executor = futures.ThreadPoolExecutor(max_workers=prefetch_pages)
+        read_page_fn = structured_logging.with_context(self._read_page)
+        pending_pages: Deque[futures.Future[List[bigquery.table.Row]]] = deque()
+        next_start_index = 0
+
+        def _submit_next_page() -> None:
+            nonlocal next_start_index
+            pending_pages.append(
+                executor.submit(read_page_fn, query_job, page_size, next_start_index)
             )
+            next_start_index += page_size
 
+        try:
+            # The first page is read on its own so that the query job has completed
+            # before any pages are fetched concurrently
+            _submit_next_page()
             num_rows_read = 0
-            processed_rows: List[bigquery.table.Row] = []
-            for row in page_rows:
-                num_rows_read += 1
-                processed_rows.append(row)
+            while pending_pages:
+                processed_rows = pending_pages.popleft().result()
+                if not processed_rows:
+                    break
 
-            logging.info(
-                "Processed [%d] rows from query page starting at index [%d]",
-                num_rows_read,
-                start_index,
-            )
-            if num_rows_read == 0:
-                break
+                is_last_page = len(processed_rows) < page_size
+                if not is_last_page:
+                    while len(pending_pages) < prefetch_pages:
+                        _submit_next_page()
 
-            process_page_fn(processed_rows)
+                yield processed_rows
 
-            start_index += num_rows_read
-            logging.info("Processed [%d] rows...", start_index)
+                num_rows_read += len(processed_rows)
+                logging.info("Processed [%d] rows...", num_rows_read)
+                if is_last_page:
+                    break
+        finally:
+            # Don't wait on pages past the end of the result set, or on those that
+            # will no longer be read if the caller stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _read_page(
+        query_job: bigquery.QueryJob, page_size: int, start_index: int
+    ) -> List[bigquery.table.Row]:
+        page_rows: bigquery.table.RowIterator = query_job.result(
+            max_results=page_size, start_index=start_index
+        )
+        logging.info(
+            "Retrieved result set from query page of size [%d] starting at index [%d]",
+            page_size,
+            start_index,
+        )
+
+        processed_rows: List[bigquery.table.Row] = list(page_rows)
+
+        logging.info(
+            "Processed [%d] rows from query page starting at index [%d]",
+            len(processed_rows),
+            start_index,
+        )
+        return processed_rows
+
+    def paged_read_and_process(
+        self,
+        query_job: bigquery.QueryJob,
+        page_size: int,
+        process_page_fn: Callable[[List[bigquery.table.Row]], None],
+        prefetch_pages: int = 0,
+    ) -> None:
+        logging.debug(
+            "Querying for first page of results to perform %s...",
+            process_page_fn.__name__,
+        )
+
+        with closing(
+            self.paged_read(query_job, page_size, prefetch_pages=prefetch_pages)
+        ) as pages:
+            for processed_rows in pages:
+                process_page_fn(processed_rows)
 
     def copy_view(
         self,
@@ -1830,7 +1954,10 @@ class BigQueryClientImpl(BigQueryClient):
         return self.client.query(delete_query)
 
     def materialize_view_to_table(
-        self, view: BigQueryView, use_query_cache: bool
+        self,
+        view: BigQueryView,
+        use_query_cache: bool,
+        labels: Optional[Dict[str, str]] = None,
     ) -> bigquery.Table:
         if view.materialized_address is None:
             raise ValueError(
@@ -1860,11 +1987,19 @@ class BigQueryClientImpl(BigQueryClient):
 
         description = view.materialized_table_bq_description
         table = self.get_table(self.dataset_ref_for_id(dst_dataset_id), dst_table_id)
-        if description == table.description:
+        fields_to_update = []
+        if description != table.description:
+            table.description = description
+            fields_to_update.append("description")
+        if labels is not None and any(
+            (table.labels or {}).get(key) != value for key, value in labels.items()
+        ):
+            table.labels = labels
+            fields_to_update.append("labels")
+        if not fields_to_update:
             return table
 
-        table.description = description
-        return self.client.update_table(table, ["description"])
+        return self.client.update_table(table, fields_to_update)
 
     def create_table_with_schema(
         self,
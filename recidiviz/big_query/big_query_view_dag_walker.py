@@ -23,12 +23,13 @@ import time
 from collections import deque
 from concurrent import futures
 from concurrent.futures import Future
+from itertools import count
+from queue import SimpleQueue
 from types import TracebackType
 from typing import (
     Callable,
     Deque,
     Dict,
-    Generator,
     Generic,
     Iterable,
     Iterator,
@@ -57,6 +58,9 @@ class ViewProcessingMetadata:
     node_processing_runtime_seconds: float
     total_time_in_queue_seconds: float
     graph_depth: int
+    # The sum of processing runtimes for the slowest chain of dependent nodes that ends
+    # with this node (including this node).
+    longest_path_runtime_seconds: float
 
 
 @attr.s(auto_attribs=True, kw_only=True)
@@ -93,6 +97,19 @@ class ProcessDagResult(Generic[ViewResultT]):
     view_processing_stats: Dict[BigQueryView, ViewProcessingMetadata]
     total_runtime: float
 
+    @property
+    def critical_path_runtime(self) -> float:
+        """The sum of processing runtimes for the slowest chain of dependent nodes in
+        the DAG. This is the lower bound on |total_runtime| given unlimited parallelism.
+        """
+        return max(
+            (
+                metadata.longest_path_runtime_seconds
+                for metadata in self.view_processing_stats.values()
+            ),
+            default=0.0,
+        )
+
     def log_processing_stats(self, n_slowest: int) -> None:
         """Logs various stats about a DAG processing run.
 
@@ -127,11 +144,13 @@ class ProcessDagResult(Generic[ViewResultT]):
         logging.info(
             "### BQ DAG PROCESSING STATS ###\n"
             "Total processing time: %s sec\n"
+            "Critical path processing time: %s sec\n"
             "Nodes processed: %s\n"
             "Average queue wait time: %s seconds\n"
             "Max queue wait time: %s seconds\n"
             "Top [%s] most expensive nodes in DAG: \n%s",
             round(self.total_runtime, 2),
+            round(self.critical_path_runtime, 2),
             nodes_processed,
             avg_wait_time,
             max_wait_time,
@@ -163,8 +182,13 @@ class BigQueryViewDagNode:
         self.is_root = is_root
         self.is_leaf = is_leaf
 
+        # Sub-DAGs are built lazily from the bitsets of the nodes they contain, since
+        # most callers only read the sub-DAGs of a few nodes.
+        self._build_sub_dag_fn: Optional[Callable[[int], BigQueryViewDagWalker]] = None
+        self._ancestors_bitset: Optional[int] = None
         self._ancestors_sub_dag: Optional[BigQueryViewDagWalker] = None
         self._ancestors_tree_num_edges: Optional[int] = None
+        self._descendants_bitset: Optional[int] = None
         self._descendants_sub_dag: Optional[BigQueryViewDagWalker] = None
         self._descendants_tree_num_edges: Optional[int] = None
 
@@ -182,32 +206,54 @@ class BigQueryViewDagNode:
     def add_source_address(self, source_address: BigQueryAddress) -> None:
         self.source_addresses.add(source_address)
 
-    def set_ancestors_sub_dag(self, ancestor_sub_dag: "BigQueryViewDagWalker") -> None:
-        self._ancestors_sub_dag = ancestor_sub_dag
+    def set_ancestors_sub_dag_bitset(
+        self,
+        ancestors_bitset: int,
+        build_sub_dag_fn: Callable[[int], "BigQueryViewDagWalker"],
+    ) -> None:
+        """Sets the bitset of this node and its ancestors, from which
+        |build_sub_dag_fn| builds the ancestors_sub_dag the first time it is read.
+        """
+        self._ancestors_bitset = ancestors_bitset
+        self._ancestors_sub_dag = None
+        self._build_sub_dag_fn = build_sub_dag_fn
 
     @property
     def ancestors_sub_dag(self) -> "BigQueryViewDagWalker":
         """A DAG that includes this node and all nodes that are an ancestor of this
         node.
         """
-        if not self._ancestors_sub_dag:
-            raise ValueError("Must set ancestors_sub_dag via set_ancestors_sub_dag().")
+        if self._ancestors_sub_dag is None:
+            if self._ancestors_bitset is None or self._build_sub_dag_fn is None:
+                raise ValueError(
+                    "Must set ancestors_sub_dag via set_ancestors_sub_dag_bitset()."
+                )
+            self._ancestors_sub_dag = self._build_sub_dag_fn(self._ancestors_bitset)
         return self._ancestors_sub_dag
 
-    def set_descendants_sub_dag(
-        self, descendants_sub_dag: "BigQueryViewDagWalker"
+    def set_descendants_sub_dag_bitset(
+        self,
+        descendants_bitset: int,
+        build_sub_dag_fn: Callable[[int], "BigQueryViewDagWalker"],
     ) -> None:
-        self._descendants_sub_dag = descendants_sub_dag
+        """Sets the bitset of this node and its descendants, from which
+        |build_sub_dag_fn| builds the descendants_sub_dag the first time it is read.
+        """
+        self._descendants_bitset = descendants_bitset
+        self._descendants_sub_dag = None
+        self._build_sub_dag_fn = build_sub_dag_fn
 
     @property
     def descendants_sub_dag(self) -> "BigQueryViewDagWalker":
         """A DAG that includes this node and all nodes that are a descendant of this
         node.
         """
-        if not self._descendants_sub_dag:
-            raise ValueError(
-                "Must set descendants_sub_dag via set_descendants_sub_dag()."
-            )
+        if self._descendants_sub_dag is None:
+            if self._descendants_bitset is None or self._build_sub_dag_fn is None:
+                raise ValueError(
+                    "Must set descendants_sub_dag via set_descendants_sub_dag_bitset()."
+                )
+            self._descendants_sub_dag = self._build_sub_dag_fn(self._descendants_bitset)
         return self._descendants_sub_dag
 
     def set_ancestors_tree_num_edges(self, num_edges: int) -> None:
@@ -285,24 +331,42 @@ _ProcessNodeQueueT = Union["_AsyncProcessNodeQueue", "_SyncProcessNodeQueue"]
 class _AsyncProcessNodeQueue:
     """
     Internal queue implementation that enqueues for
-    asynchronous execution with executor.submit
+    asynchronous execution with executor.submit. When more nodes are ready to
+    process than there are workers available, nodes with the highest priority
+    are submitted first.
     """
 
     def __init__(
         self,
         view_process_fn: Callable[[BigQueryView, ParentResultsT], ViewResultT],
+        priority_fn: Callable[[BigQueryViewDagNode], int],
     ) -> None:
-        self.executor = futures.ThreadPoolExecutor(
-            # Conservatively allow only half as many workers as allowed connections.
-            # Lower this number if we see "urllib3.connectionpool:Connection pool is
-            # full, discarding connection" errors.
-            max_workers=int(BQ_CLIENT_MAX_POOL_SIZE / 2)
-        )
+        # Conservatively allow only half as many workers as allowed connections.
+        # Lower this number if we see "urllib3.connectionpool:Connection pool is
+        # full, discarding connection" errors.
+        self.max_workers = int(BQ_CLIENT_MAX_POOL_SIZE / 2)
+        self.executor = futures.ThreadPoolExecutor(max_workers=self.max_workers)
         self.future_to_context: Dict[
             Future[Tuple[float, ViewResultT]],
             Tuple[BigQueryViewDagNode, ParentResultsT, float],
         ] = {}
+        # Heap of nodes that are ready to process but have not yet been submitted to
+        # the executor, ordered by descending priority, then by the order they were
+        # enqueued.
+        self.ready_heap: List[
+            Tuple[
+                int,
+                int,
+                Tuple[BigQueryViewDagNode, Dict[BigQueryView, ViewResultT], float],
+            ]
+        ] = []
+        self.enqueue_counter = count()
+        # Futures are added to this queue as they complete
+        self.completed_futures: SimpleQueue[
+            Future[Tuple[float, ViewResultT]]
+        ] = SimpleQueue()
         self.view_process_fn = view_process_fn
+        self.priority_fn = priority_fn
 
     def __enter__(self) -> _ProcessNodeQueueT:
         self.executor.__enter__()
@@ -317,34 +381,45 @@ class _AsyncProcessNodeQueue:
         self.executor.__exit__(exc_type, exc_val, exc_tb)
 
     def __len__(self) -> int:
-        return len(self.future_to_context)
+        return len(self.future_to_context) + len(self.ready_heap)
 
     def enqueue(
         self,
         item: Tuple[BigQueryViewDagNode, Dict[BigQueryView, ViewResultT], float],
     ) -> None:
-        adjacent_node, previous_level_results, entered_queue_time = item
-        self.future_to_context[
-            self.executor.submit(
+        node, _previous_level_results, _entered_queue_time = item
+        heapq.heappush(
+            self.ready_heap,
+            (-self.priority_fn(node), next(self.enqueue_counter), item),
+        )
+
+    def _submit_ready_nodes(self) -> None:
+        while self.ready_heap and len(self.future_to_context) < self.max_workers:
+            _, _, (node, previous_level_results, entered_queue_time) = heapq.heappop(
+                self.ready_heap
+            )
+            future = self.executor.submit(
                 trace.time_execution(
                     structured_logging.with_context(self.view_process_fn)
                 ),
-                adjacent_node.view,
+                node.view,
                 previous_level_results,
             )
-        ] = (
-            adjacent_node,
-            previous_level_results,
-            entered_queue_time,
-        )
+            self.future_to_context[future] = (
+                node,
+                previous_level_results,
+                entered_queue_time,
+            )
+            future.add_done_callback(self.completed_futures.put)
 
     def dequeue(
         self,
     ) -> Tuple[Callable, BigQueryViewDagNode, Dict[BigQueryView, ViewResultT], float,]:
-        completed, _not_completed = futures.wait(
-            self.future_to_context.keys(), return_when=futures.FIRST_COMPLETED
-        )
-        future = completed.pop()
+        # Nodes are only submitted here, after all nodes made ready by the previously
+        # dequeued node have been enqueued, so that the highest priority ready nodes
+        # always get the next available workers.
+        self._submit_ready_nodes()
+        future = self.completed_futures.get()
         node, parent_results, entered_queue_time = self.future_to_context.pop(future)
         return future.result, node, parent_results, entered_queue_time
 
@@ -404,17 +479,38 @@ class BigQueryViewDagWalker:
     def __init__(
         self,
         views: Iterable[BigQueryView],
+        *,
+        check_for_cycles: bool = True,
     ):
+        """Builds a DAG of the given views. The check for cycles may only be skipped
+        if |views| are a subset of the views of a DAG that has already been checked,
+        since any subset of an acyclic graph is acyclic.
+        """
         self.views = list(views)
-        dag_nodes = [BigQueryViewDagNode(view) for view in views]
+        dag_nodes = [BigQueryViewDagNode(view) for view in self.views]
         self.nodes_by_address: Dict[BigQueryAddress, BigQueryViewDagNode] = {
             node.view.address: node for node in dag_nodes
         }
         self._prepare_dag()
+        self._init_node_lookups()
+
+        if check_for_cycles:
+            self._check_for_cycles()
+
+    def _init_node_lookups(self) -> None:
+        """Collects the root and leaf nodes and assigns each node an integer index that
+        identifies that node's bit in the ancestor / descendant bitsets.
+        """
         self.roots = [node for node in self.nodes_by_address.values() if node.is_root]
         self.leaves = [node for node in self.nodes_by_address.values() if node.is_leaf]
 
-        self._check_for_cycles()
+        self._addresses_by_index: List[BigQueryAddress] = list(self.nodes_by_address)
+        self._index_by_address: Dict[BigQueryAddress, int] = {
+            address: i for i, address in enumerate(self._addresses_by_index)
+        }
+        # Lazily computed by _closure_bitsets()
+        self._ancestor_bitsets: Optional[Dict[BigQueryAddress, int]] = None
+        self._descendant_bitsets: Optional[Dict[BigQueryAddress, int]] = None
 
     def _prepare_dag(self) -> None:
         """
@@ -426,6 +522,7 @@ class BigQueryViewDagWalker:
         """
 
         materialized_addresses: Dict[BigQueryAddress, BigQueryAddress] = {}
+        self._view_addresses_by_materialized_address = materialized_addresses
         for address, node in self.nodes_by_address.items():
             if node.view.materialized_address:
                 if node.view.materialized_address in materialized_addresses:
@@ -448,10 +545,14 @@ class BigQueryViewDagWalker:
 
                 materialized_addresses[node.view.materialized_address] = address
 
+        self._connect_nodes()
+
+    def _connect_nodes(self) -> None:
+        """Associates every node with its parent / child nodes and source tables."""
         for address, node in self.nodes_by_address.items():
             node.is_root = True
             for parent_address in node.parent_tables:
-                parent_address = materialized_addresses.get(
+                parent_address = self._view_addresses_by_materialized_address.get(
                     parent_address, parent_address
                 )
                 if parent_address in self.nodes_by_address:
@@ -561,53 +662,65 @@ class BigQueryViewDagWalker:
     def node_for_view(self, view: BigQueryView) -> BigQueryViewDagNode:
         return self.nodes_by_address[view.address]
 
-    def _adjacent_dag_verticies(
-        self,
-        node: BigQueryViewDagNode,
-        view_results: Dict[BigQueryView, ViewResultT],
-        visited_set: Set[BigQueryAddress],
-        reverse: bool,
-    ) -> Generator[
-        Tuple[BigQueryViewDagNode, Dict[BigQueryView, ViewResultT]], None, None
-    ]:
+    def _next_level_addresses(
+        self, node: BigQueryViewDagNode, reverse: bool
+    ) -> Set[BigQueryAddress]:
+        """Returns the addresses of nodes that can only be processed after the given
+        node has been processed.
         """
-        Generates an iterable of tuples, adjacent nodes and parent results,
-        which are adjacent to the given node
+        return node.parent_node_addresses if reverse else node.child_node_addresses
+
+    def _previous_level_addresses(
+        self, node: BigQueryViewDagNode, reverse: bool
+    ) -> List[BigQueryAddress]:
+        """Returns the addresses of nodes in this DAG that must be processed before the
+        given node can be processed.
         """
+        addresses = node.child_node_addresses if reverse else node.parent_node_addresses
+        return [a for a in addresses if a in self.nodes_by_address]
 
-        adjacent_addresses = (
-            node.parent_node_addresses if reverse else node.child_node_addresses
-        )
-        for adjacent_address in adjacent_addresses:
-            adjacent_node = self.nodes_by_address[adjacent_address]
-            previous_level_all_processed = True
-            previous_level_results = {}
-            previous_level_addresses = (
-                adjacent_node.child_node_addresses
-                if reverse
-                else adjacent_node.parent_node_addresses
-            )
-            for previous_level_address in previous_level_addresses:
-                if (
-                    previous_level_address in self.nodes_by_address
-                    and previous_level_address not in visited_set
-                ):
-                    previous_level_all_processed = False
-                    break
-                if previous_level_address in self.nodes_by_address:
-                    previous_level_view = self.nodes_by_address[
-                        previous_level_address
-                    ].view
-                    previous_level_results[previous_level_view] = view_results[
-                        previous_level_view
-                    ]
-            if previous_level_all_processed:
-                if not previous_level_results:
-                    raise ValueError(
-                        f"Expected adjacent node [{adjacent_node.view.address}] "
-                        f"to have previously processed ancesters."
+    def _topological_order(self, reverse: bool) -> List[BigQueryAddress]:
+        """Returns the addresses of all nodes in this DAG, ordered such that every node
+        comes after all nodes that must be processed before it when processing the DAG
+        in the given direction.
+        """
+        num_unprocessed_previous_level = {
+            address: len(self._previous_level_addresses(node, reverse))
+            for address, node in self.nodes_by_address.items()
+        }
+        topological_order = [
+            address
+            for address, num_previous in num_unprocessed_previous_level.items()
+            if num_previous == 0
+        ]
+        for address in topological_order:
+            for next_address in self._next_level_addresses(
+                self.nodes_by_address[address], reverse
+            ):
+                num_unprocessed_previous_level[next_address] -= 1
+                if num_unprocessed_previous_level[next_address] == 0:
+                    topological_order.append(next_address)
+        return topological_order
+
+    def _longest_downstream_path_lengths(
+        self, reverse: bool
+    ) -> Dict[BigQueryAddress, int]:
+        """Returns a map of node address to the number of nodes in the longest chain of
+        nodes starting with that node, where each node can only be processed after the
+        node before it, when processing the DAG in the given direction.
+        """
+        path_lengths: Dict[BigQueryAddress, int] = {}
+        for address in reversed(self._topological_order(reverse)):
+            path_lengths[address] = 1 + max(
+                (
+                    path_lengths[next_address]
+                    for next_address in self._next_level_addresses(
+                        self.nodes_by_address[address], reverse
                     )
-                yield adjacent_node, previous_level_results
+                ),
+                default=0,
+            )
+        return path_lengths
 
     @staticmethod
     def _check_processing_time(
@@ -663,10 +776,18 @@ class BigQueryViewDagWalker:
             if not parent_results
             else max({view_processing_stats[p].graph_depth for p in parent_results}) + 1
         )
+        longest_path_runtime_seconds = processing_time + max(
+            (
+                view_processing_stats[p].longest_path_runtime_seconds
+                for p in parent_results
+            ),
+            default=0.0,
+        )
         return ViewProcessingMetadata(
             node_processing_runtime_seconds=processing_time,
             total_time_in_queue_seconds=queue_time,
             graph_depth=graph_depth,
+            longest_path_runtime_seconds=longest_path_runtime_seconds,
         )
 
     def process_dag(
@@ -675,6 +796,7 @@ class BigQueryViewDagWalker:
         synchronous: bool,
         perf_config: Optional[ProcessDagPerfConfig] = DEFAULT_PROCESS_DAG_PERF_CONFIG,
         reverse: bool = False,
+        priority_fn: Optional[Callable[[BigQueryViewDagNode], int]] = None,
     ) -> ProcessDagResult[ViewResultT]:
         """
         This method provides a level-by-level "breadth-first" traversal of a DAG and
@@ -690,18 +812,39 @@ class BigQueryViewDagWalker:
 
         If a |perf_config| is provided, processing will fail if any node takes longer
         to process than is allowed by the config.
+
+        When processing asynchronously and more nodes are ready to process than there
+        are workers available, nodes with a higher |priority_fn| value are started
+        first. By default, nodes at the start of the longest chains of dependent nodes
+        are prioritized so that the critical path through the DAG starts as early as
+        possible.
         """
 
         top_level_set = set(self.leaves) if reverse else set(self.roots)
         processed: Set[BigQueryAddress] = set()
         view_results: Dict[BigQueryView, ViewResultT] = {}
         view_processing_stats: Dict[BigQueryView, ViewProcessingMetadata] = {}
+        # The number of nodes that must be processed before each node can be processed
+        # that have not been processed yet. A node is enqueued once this reaches zero.
+        num_unprocessed_previous_level: Dict[BigQueryAddress, int] = {
+            address: len(self._previous_level_addresses(node, reverse))
+            for address, node in self.nodes_by_address.items()
+        }
         dag_processing_start = time.perf_counter()
-        queue: _ProcessNodeQueueT = (
-            _SyncProcessNodeQueue(view_process_fn=view_process_fn)
-            if synchronous
-            else _AsyncProcessNodeQueue(view_process_fn=view_process_fn)
-        )
+        queue: _ProcessNodeQueueT
+        if synchronous:
+            queue = _SyncProcessNodeQueue(view_process_fn=view_process_fn)
+        else:
+            if priority_fn is None:
+                path_lengths = self._longest_downstream_path_lengths(reverse)
+
+                def longest_downstream_path_length(node: BigQueryViewDagNode) -> int:
+                    return path_lengths[node.view.address]
+
+                priority_fn = longest_downstream_path_length
+            queue = _AsyncProcessNodeQueue(
+                view_process_fn=view_process_fn, priority_fn=priority_fn
+            )
         with queue:
             for node in top_level_set:
                 queue.enqueue((node, {}, dag_processing_start))
@@ -743,15 +886,21 @@ class BigQueryViewDagWalker:
                     node.view.address.to_str(),
                     execution_sec,
                 )
-                for (
-                    adjacent_node,
-                    previous_level_results,
-                ) in self._adjacent_dag_verticies(
-                    node=node,
-                    view_results=view_results,
-                    visited_set=processed,
-                    reverse=reverse,
-                ):
+                for adjacent_address in self._next_level_addresses(node, reverse):
+                    num_unprocessed_previous_level[adjacent_address] -= 1
+                    if num_unprocessed_previous_level[adjacent_address]:
+                        continue
+                    adjacent_node = self.nodes_by_address[adjacent_address]
+                    previous_level_results = {}
+                    for previous_level_address in self._previous_level_addresses(
+                        adjacent_node, reverse
+                    ):
+                        previous_level_view = self.nodes_by_address[
+                            previous_level_address
+                        ].view
+                        previous_level_results[previous_level_view] = view_results[
+                            previous_level_view
+                        ]
                     entered_queue_time = time.perf_counter()
                     queue.enqueue(
                         (adjacent_node, previous_level_results, entered_queue_time)
@@ -762,6 +911,75 @@ class BigQueryViewDagWalker:
             total_runtime=(time.perf_counter() - dag_processing_start),
         )
 
+    def _closure_bitsets(self, reverse: bool) -> Dict[BigQueryAddress, int]:
+        """Returns a map of node address to a bitset with the bit set for that node and
+        for each of its ancestors (or descendants, if |reverse| is True), where the
+        i-th bit represents the node at self._addresses_by_index[i].
+
+        The bitsets for the whole DAG are computed in a single topological pass and
+        cached, since the structure of the DAG does not change after it is built.
+        """
+        cached = self._descendant_bitsets if reverse else self._ancestor_bitsets
+        if cached is not None:
+            return cached
+
+        bitsets: Dict[BigQueryAddress, int] = {}
+        for address in self._topological_order(reverse):
+            bitset = 1 << self._index_by_address[address]
+            for previous_address in self._previous_level_addresses(
+                self.nodes_by_address[address], reverse
+            ):
+                bitset |= bitsets[previous_address]
+            bitsets[address] = bitset
+
+        if reverse:
+            self._descendant_bitsets = bitsets
+        else:
+            self._ancestor_bitsets = bitsets
+        return bitsets
+
+    def _addresses_for_bitset(self, bitset: int) -> List[BigQueryAddress]:
+        addresses = []
+        while bitset:
+            lowest_bit = bitset & -bitset
+            addresses.append(self._addresses_by_index[lowest_bit.bit_length() - 1])
+            bitset ^= lowest_bit
+        return addresses
+
+    def _sub_dag_for_bitset(self, bitset: int) -> "BigQueryViewDagWalker":
+        """Returns a DAG containing only the nodes in this DAG whose bits are set in
+        |bitset|. The cycle check that happens when building a DAG from scratch is
+        skipped, since it already passed for this DAG and holds for any subset of its
+        nodes.
+        """
+        return BigQueryViewDagWalker(
+            [
+                self.nodes_by_address[address].view
+                for address in self._addresses_for_bitset(bitset)
+            ],
+            check_for_cycles=False,
+        )
+
+    def ancestor_addresses(self, address: BigQueryAddress) -> Set[BigQueryAddress]:
+        """Returns the addresses of all views in this DAG that are ancestors of the view
+        with the given address. Does not include the view itself.
+        """
+        ancestor_bitset = self._closure_bitsets(reverse=False)[address]
+        return set(self._addresses_for_bitset(ancestor_bitset)) - {address}
+
+    def descendant_addresses(self, address: BigQueryAddress) -> Set[BigQueryAddress]:
+        """Returns the addresses of all views in this DAG that are descendants of the
+        view with the given address. Does not include the view itself.
+        """
+        descendant_bitset = self._closure_bitsets(reverse=True)[address]
+        return set(self._addresses_for_bitset(descendant_bitset)) - {address}
+
+    def num_ancestors(self, address: BigQueryAddress) -> int:
+        return self._closure_bitsets(reverse=False)[address].bit_count() - 1
+
+    def num_descendants(self, address: BigQueryAddress) -> int:
+        return self._closure_bitsets(reverse=True)[address].bit_count() - 1
+
     def _check_sub_dag_input_views(self, *, input_views: List[BigQueryView]) -> None:
         missing_views = set(input_views).difference(self.views)
         if missing_views:
@@ -777,35 +995,27 @@ class BigQueryViewDagWalker:
                 f"Found input views not represented in the output DAG: {missing_views}"
             )
 
+    def _sub_dag_for_closure(
+        self, views: List[BigQueryView], *, reverse: bool
+    ) -> "BigQueryViewDagWalker":
+        """Returns a DAG containing the input views along with all of their ancestors
+        (or descendants, if |reverse| is True).
+        """
+        self._check_sub_dag_input_views(input_views=views)
+
+        closure_bitsets = self._closure_bitsets(reverse)
+        sub_dag_bitset = 0
+        for view in views:
+            sub_dag_bitset |= closure_bitsets[view.address]
+        return self._sub_dag_for_bitset(sub_dag_bitset)
+
     def get_descendants_sub_dag(
         self, views: List[BigQueryView]
     ) -> "BigQueryViewDagWalker":
         """Returns a DAG containing only views that are descendants of the list of input
         views. Includes the input views themselves.
         """
-        self._check_sub_dag_input_views(input_views=views)
-
-        sub_dag_views: Set[BigQueryView] = set()
-
-        def collect_descendants(
-            v: BigQueryView, parent_results: Dict[BigQueryView, bool]
-        ) -> bool:
-            is_target_view_or_descendant = (
-                any(
-                    is_parent_target_view_or_descendant
-                    for is_parent_target_view_or_descendant in parent_results.values()
-                )
-                or v in views
-            )
-            if is_target_view_or_descendant:
-                sub_dag_views.add(v)
-
-            return is_target_view_or_descendant
-
-        self.process_dag(collect_descendants, synchronous=True)
-        self._check_sub_dag_views(input_views=views, sub_dag_views=sub_dag_views)
-        sub_dag = BigQueryViewDagWalker(list(sub_dag_views))
-        return sub_dag
+        return self._sub_dag_for_closure(views, reverse=True)
 
     def get_ancestors_sub_dag(
         self,
@@ -814,30 +1024,7 @@ class BigQueryViewDagWalker:
         """Returns a DAG containing only views that are ancestors of the list of input
         views. Includes the input views themselves.
         """
-        self._check_sub_dag_input_views(input_views=views)
-
-        sub_dag_views: Set[BigQueryView] = set()
-
-        def collect_ancestors(
-            v: BigQueryView, parent_results: Dict[BigQueryView, Set[BigQueryView]]
-        ) -> Set[BigQueryView]:
-            # Ancestors of this view are comprised of all ancestors of each parent...
-            all_ancestors: Set[BigQueryView] = set().union(*parent_results.values())
-
-            # ...plus the parents themselves
-            all_ancestors |= parent_results.keys()
-
-            if v in views:
-                sub_dag_views.add(v)
-                for ancestor in all_ancestors:
-                    sub_dag_views.add(ancestor)
-
-            return all_ancestors
-
-        self.process_dag(collect_ancestors, synchronous=True)
-        self._check_sub_dag_views(input_views=views, sub_dag_views=sub_dag_views)
-        sub_dag = BigQueryViewDagWalker(list(sub_dag_views))
-        return sub_dag
+        return self._sub_dag_for_closure(views, reverse=False)
 
     @staticmethod
     def union_dags(*dags: "BigQueryViewDagWalker") -> "BigQueryViewDagWalker":
@@ -866,85 +1053,65 @@ class BigQueryViewDagWalker:
         If |get_descendants| is True, includes all views that are descendant from the
         |views|.
         """
-        sub_dag_walker = BigQueryViewDagWalker(views)
+        if not include_ancestors and not include_descendants:
+            return BigQueryViewDagWalker(views)
 
-        # If necessary, get descendants of views_in_sub_dag
-        if include_descendants:
-            sub_dag_walker = BigQueryViewDagWalker.union_dags(
-                sub_dag_walker,
-                self.get_descendants_sub_dag(views),
-            )
+        self._check_sub_dag_input_views(input_views=views)
+        ancestor_bitsets = self._closure_bitsets(reverse=False)
+        descendant_bitsets = self._closure_bitsets(reverse=True)
+        sub_dag_bitset = 0
+        for view in views:
+            # If necessary, get descendants of views_in_sub_dag
+            if include_descendants:
+                sub_dag_bitset |= descendant_bitsets[view.address]
 
-        # If necessary, get ancestor views of views_in_sub_dag
-        if include_ancestors:
-            sub_dag_walker = BigQueryViewDagWalker.union_dags(
-                sub_dag_walker, self.get_ancestors_sub_dag(views)
-            )
+            # If necessary, get ancestor views of views_in_sub_dag
+            if include_ancestors:
+                sub_dag_bitset |= ancestor_bitsets[view.address]
 
-        return sub_dag_walker
+        return self._sub_dag_for_bitset(sub_dag_bitset)
 
     def populate_ancestor_sub_dags(self) -> None:
-        """Builds and caches ancestor sub-DAGs on all nodes in this DAG."""
-
-        def populate_node_ancestors_sub_dag(
-            v: BigQueryView, parent_results: Dict[BigQueryView, None]
-        ) -> None:
-            """For a given view, calculates the ancestors sub-DAG by unioning together
-            the parent ancestor sub-DAGs."""
-            this_view_dag = BigQueryViewDagWalker([v])
-            parent_nodes = [
-                self.node_for_view(parent_view) for parent_view in parent_results
-            ]
-            ancestors_sub_dag = self.union_dags(
-                this_view_dag,
-                *[n.ancestors_sub_dag for n in parent_nodes],
+        """Sets the ancestor bitset on all nodes in this DAG, from which each node's
+        ancestor sub-DAG is built and cached the first time it is read.
+        """
+        ancestor_bitsets = self._closure_bitsets(reverse=False)
+        for address in self._topological_order(reverse=False):
+            node = self.nodes_by_address[address]
+            node.set_ancestors_sub_dag_bitset(
+                ancestor_bitsets[address], self._sub_dag_for_bitset
             )
 
-            node = self.node_for_view(view=v)
-            node.set_ancestors_sub_dag(ancestors_sub_dag)
-
             # Include source tables in parent count in addition to parent views
             ancestors_tree_num_edges = (
                 len(node.source_addresses)
                 + len(node.parent_node_addresses)
-                + sum(p.ancestors_tree_num_edges for p in parent_nodes)
+                + sum(
+                    self.nodes_by_address[p].ancestors_tree_num_edges
+                    for p in node.parent_node_addresses
+                )
             )
             node.set_ancestors_tree_num_edges(ancestors_tree_num_edges)
 
-        self.process_dag(populate_node_ancestors_sub_dag, synchronous=True)
-
     def populate_descendant_sub_dags(self) -> None:
-        """Builds and caches descendant sub-DAGs on all nodes in this DAG."""
-
-        def populate_node_descendants_sub_dag(
-            v: BigQueryView, child_results: Dict[BigQueryView, None]
-        ) -> None:
-            """For a given view, calculates the descendants sub-DAG by unioning together
-            the child descendant sub-DAGs."""
-            this_view_dag = BigQueryViewDagWalker([v])
-            child_nodes = [
-                self.node_for_view(child_view) for child_view in child_results
-            ]
-            descendants_sub_dag = self.union_dags(
-                this_view_dag,
-                *[n.descendants_sub_dag for n in child_nodes],
+        """Sets the descendant bitset on all nodes in this DAG, from which each node's
+        descendant sub-DAG is built and cached the first time it is read.
+        """
+        descendant_bitsets = self._closure_bitsets(reverse=True)
+        # Process the DAG in the leaves -> roots direction so we process children
+        # first.
+        for address in self._topological_order(reverse=True):
+            node = self.nodes_by_address[address]
+            node.set_descendants_sub_dag_bitset(
+                descendant_bitsets[address], self._sub_dag_for_bitset
             )
 
-            node = self.node_for_view(view=v)
-            node.set_descendants_sub_dag(descendants_sub_dag)
-
-            descendants_tree_num_edges = len(child_results) + sum(
-                c.descendants_tree_num_edges for c in child_nodes
+            descendants_tree_num_edges = len(node.child_node_addresses) + sum(
+                self.nodes_by_address[c].descendants_tree_num_edges
+                for c in node.child_node_addresses
             )
             node.set_descendants_tree_num_edges(descendants_tree_num_edges)
 
-        # Process the DAG in the leaves -> roots direction so we process children
-        # first.
-
-        self.process_dag(
-            populate_node_descendants_sub_dag, synchronous=True, reverse=True
-        )
-
     def ancestors_dfs_tree_str(
         self,
         view: BigQueryView,
@@ -1086,8 +1253,7 @@ class BigQueryViewDagWalker:
         if terminating_datasets is None:
             terminating_datasets = set()
         related_addresses = set()
-        node = self.nodes_by_address[address]
-        ancestors = set(node.ancestors_sub_dag.nodes_by_address)
+        ancestors = self.ancestor_addresses(address) | {address}
         related_addresses |= ancestors
         for ancestor in ancestors:
             if not ancestor.dataset_id in terminating_datasets:
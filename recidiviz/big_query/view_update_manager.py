@@ -16,6 +16,7 @@
 # =============================================================================
 """Provides utilities for updating views within a live BigQuery instance."""
 import datetime
+import hashlib
 import logging
 from concurrent import futures
 from concurrent.futures import Future
@@ -71,6 +72,12 @@ MAX_WORKERS = 10
 # The number of slowest-to-process views to print at the end of processing the full DAG.
 NUM_SLOW_VIEWS_TO_LOG = 25
 
+# Label set on views deployed with skip_unchanged_views=True, holding a hash of the
+# view's definition and the definitions of all of its ancestor views. Label values may
+# be at most 63 characters long, so we only store a prefix of the hash.
+VIEW_FINGERPRINT_LABEL = "recidiviz_view_fingerprint"
+VIEW_FINGERPRINT_LENGTH = 32
+
 
 @gcp_only
 def execute_update_all_managed_views(
@@ -79,10 +86,13 @@ def execute_update_all_managed_views(
     dataset_ids_to_load: Optional[List[str]] = None,
     clean_managed_datasets: bool = True,
     allow_slow_views: bool = False,
+    skip_unchanged_views: bool = False,
 ) -> None:
     """
     Updates all views in the view registry. If dataset_ids_to_load is provided, only views in those datasets and
     their ancestors will be updated. If sandbox_prefix is provided, all views will be deployed to a sandbox dataset.
+    If skip_unchanged_views is True, views whose definitions (and whose ancestors'
+    definitions) have not changed since they were last deployed are not updated.
     """
     start = datetime.datetime.now()
 
@@ -120,6 +130,7 @@ def execute_update_all_managed_views(
         else None,
         force_materialize=True,
         allow_slow_views=allow_slow_views,
+        skip_unchanged_views=skip_unchanged_views,
     )
     end = datetime.datetime.now()
     runtime_sec = int((end - start).total_seconds())
@@ -143,12 +154,20 @@ def create_managed_dataset_and_deploy_views_for_view_builders(
     default_table_expiration_for_new_datasets: Optional[int] = None,
     views_might_exist: bool = True,
     allow_slow_views: bool = False,
+    skip_unchanged_views: bool = False,
 ) -> None:
     """Creates or updates all the views in the provided list with the view query in the
     provided view builder list. If any materialized view has been updated (or if an
     ancestor view has been updated) or the force_materialize flag is set, the view
     will be re-materialized to ensure the schemas remain consistent.
 
+    If `skip_unchanged_views` is set, each deployed view is labeled with a fingerprint
+    of its definition and the definitions of its ancestor views. Views whose
+    fingerprint matches the label on the currently deployed view are not updated, which
+    saves several BigQuery API calls per view. Changes to the schemas of source tables
+    are not reflected in the fingerprint, so this should not be set when source table
+    schemas may have changed since the last deploy.
+
     If a `historically_managed_datasets_to_clean` set is provided,
     then cleans up unmanaged views and datasets by deleting them from BigQuery.
 
@@ -181,6 +200,7 @@ def create_managed_dataset_and_deploy_views_for_view_builders(
             default_table_expiration_for_new_datasets=default_table_expiration_for_new_datasets,
             views_might_exist=views_might_exist,
             allow_slow_views=allow_slow_views,
+            skip_unchanged_views=skip_unchanged_views,
         )
     except Exception as e:
         get_monitoring_instrument(CounterInstrumentKey.VIEW_UPDATE_FAILURE).add(
@@ -302,6 +322,83 @@ def _create_all_datasets_if_necessary(
             future.result()
 
 
+def _view_fingerprint(view: BigQueryView, parent_fingerprints: List[str]) -> str:
+    """Returns a hash of all the view attributes that are set when the view is deployed,
+    combined with the fingerprints of the view's parent views.
+    """
+    hasher = hashlib.sha256()
+    for component in [
+        view.view_query,
+        view.bq_description,
+        str(view.clustering_fields),
+        view.materialized_address.to_str() if view.materialized_address else "",
+        *sorted(parent_fingerprints),
+    ]:
+        hasher.update(component.encode())
+        # Separate components so that different combinations cannot collide
+        hasher.update(b"\0")
+    return hasher.hexdigest()[:VIEW_FINGERPRINT_LENGTH]
+
+
+def _get_view_fingerprints(
+    dag_walker: BigQueryViewDagWalker,
+) -> Dict[BigQueryAddress, str]:
+    """Returns the fingerprint for every view in the DAG. A view's fingerprint will
+    change if that view or any of its ancestor views change.
+    """
+    fingerprints: Dict[BigQueryAddress, str] = {}
+
+    def get_fingerprint(address: BigQueryAddress) -> str:
+        if address not in fingerprints:
+            node = dag_walker.nodes_by_address[address]
+            fingerprints[address] = _view_fingerprint(
+                node.view,
+                [get_fingerprint(p) for p in node.parent_node_addresses],
+            )
+        return fingerprints[address]
+
+    for address in dag_walker.nodes_by_address:
+        get_fingerprint(address)
+    return fingerprints
+
+
+def _get_deployed_table_fingerprints(
+    bq_client: BigQueryClient, dataset_ids: List[str]
+) -> Dict[BigQueryAddress, Optional[str]]:
+    """Lists all tables and views in the given datasets, returning a map of address to
+    the fingerprint label on that table or view, if one is set. Makes one API call per
+    dataset.
+    """
+
+    def list_dataset_fingerprints(
+        dataset_id: str,
+    ) -> Dict[BigQueryAddress, Optional[str]]:
+        return {
+            BigQueryAddress(dataset_id=table.dataset_id, table_id=table.table_id): (
+                table.labels or {}
+            ).get(VIEW_FINGERPRINT_LABEL)
+            for table in bq_client.list_tables(dataset_id)
+        }
+
+    deployed_table_fingerprints: Dict[BigQueryAddress, Optional[str]] = {}
+    with futures.ThreadPoolExecutor(
+        # Conservatively allow only half as many workers as allowed connections.
+        # Lower this number if we see "urllib3.connectionpool:Connection pool is
+        # full, discarding connection" errors.
+        max_workers=int(BQ_CLIENT_MAX_POOL_SIZE / 2)
+    ) as executor:
+        list_futures = {
+            executor.submit(
+                structured_logging.with_context(list_dataset_fingerprints),
+                dataset_id,
+            )
+            for dataset_id in dataset_ids
+        }
+        for future in futures.as_completed(list_futures):
+            deployed_table_fingerprints.update(future.result())
+    return deployed_table_fingerprints
+
+
 class CreateOrUpdateViewStatus(Enum):
     SKIPPED = "SKIPPED"
     SUCCESS_WITHOUT_CHANGES = "SUCCESS_WITHOUT_CHANGES"
@@ -316,6 +413,7 @@ def _create_managed_dataset_and_deploy_views(
     default_table_expiration_for_new_datasets: Optional[int] = None,
     views_might_exist: bool = True,
     allow_slow_views: bool = False,
+    skip_unchanged_views: bool = False,
 ) -> None:
     """Create and update the given views and their parent datasets. Cleans up unmanaged views and datasets
 
@@ -341,6 +439,8 @@ def _create_managed_dataset_and_deploy_views(
             them, and fallback to creating the views if they do not exist.
         allow_slow_views: If set then we will not fail view update if a view
             takes longer to update than is typically allowed.
+        skip_unchanged_views: If set then we will not update views whose
+            fingerprint matches the fingerprint label on the deployed view.
     """
     bq_client = BigQueryClientImpl(region_override=bq_region_override)
     dag_walker = BigQueryViewDagWalker(views_to_update)
@@ -365,6 +465,14 @@ def _create_managed_dataset_and_deploy_views(
             dry_run=False,
         )
 
+    view_fingerprints: Optional[Dict[BigQueryAddress, str]] = None
+    deployed_table_fingerprints: Optional[Dict[BigQueryAddress, Optional[str]]] = None
+    if skip_unchanged_views:
+        view_fingerprints = _get_view_fingerprints(dag_walker)
+        deployed_table_fingerprints = _get_deployed_table_fingerprints(
+            bq_client, managed_dataset_ids
+        )
+
     def process_fn(
         v: BigQueryView, parent_results: Dict[BigQueryView, CreateOrUpdateViewStatus]
     ) -> CreateOrUpdateViewStatus:
@@ -376,6 +484,12 @@ def _create_managed_dataset_and_deploy_views(
                 parent_results,
                 force_materialize,
                 might_exist=views_might_exist,
+                view_fingerprint=(
+                    view_fingerprints[v.address]
+                    if view_fingerprints is not None
+                    else None
+                ),
+                deployed_table_fingerprints=deployed_table_fingerprints,
             )
         except Exception as e:
             raise ValueError(f"Error creating or updating view [{v.address}]") from e
@@ -397,9 +511,19 @@ def _create_or_update_view_and_materialize_if_necessary(
     parent_results: Dict[BigQueryView, CreateOrUpdateViewStatus],
     force_materialize: bool,
     might_exist: bool,
+    view_fingerprint: Optional[str] = None,
+    deployed_table_fingerprints: Optional[Dict[BigQueryAddress, Optional[str]]] = None,
 ) -> CreateOrUpdateViewStatus:
     """Creates or updates the provided view in BigQuery and materializes that view into
-    a table when appropriate. Returns:
+    a table when appropriate.
+
+    If |view_fingerprint| and |deployed_table_fingerprints| are provided, the view is
+    labeled with its fingerprint when updated, and is not updated at all if the
+    deployed view already has that fingerprint. The materialized table is labeled
+    with the fingerprint once it has been materialized, and is materialized whenever
+    its label does not match the view's fingerprint.
+
+    Returns:
         - CreateOrUpdateViewStatus.SKIPPED if this view cannot be deployed
         - CreateOrUpdateViewStatus.SUCCESS_WITH_CHANGES if this view or any views in its
            parent chain have been updated from the version that was saved in BigQuery
@@ -426,6 +550,36 @@ def _create_or_update_view_and_materialize_if_necessary(
             f"Skipped parents: {skipped_parents}"
         )
 
+    # The materialized table is labeled with the view's fingerprint only once it has
+    # been materialized, so a table whose label does not match is missing, or was not
+    # materialized from the current version of the view (e.g. because materialization
+    # failed after the view was updated).
+    materialized_table_is_stale = (
+        view_fingerprint is not None
+        and deployed_table_fingerprints is not None
+        and view.materialized_address is not None
+        and deployed_table_fingerprints.get(view.materialized_address)
+        != view_fingerprint
+    )
+
+    if (
+        view_fingerprint is not None
+        and deployed_table_fingerprints is not None
+        and deployed_table_fingerprints.get(view.address) == view_fingerprint
+    ):
+        # Neither this view nor any of its ancestor views have changed since it was
+        # last deployed.
+        should_materialize = view.materialized_address is not None and (
+            force_materialize or materialized_table_is_stale
+        )
+        if should_materialize:
+            _materialize_view(bq_client, view, view_fingerprint)
+        return (
+            CreateOrUpdateViewStatus.SUCCESS_WITH_CHANGES
+            if force_materialize or should_materialize
+            else CreateOrUpdateViewStatus.SUCCESS_WITHOUT_CHANGES
+        )
+
     parent_changed = (
         CreateOrUpdateViewStatus.SUCCESS_WITH_CHANGES in parent_results.values()
     )
@@ -450,7 +604,14 @@ def _create_or_update_view_and_materialize_if_necessary(
     # changes from underlying tables to be reflected in its schema.
     if old_schema is not None:
         bq_client.delete_table(dataset_ref.dataset_id, view.view_id)
-    updated_view = bq_client.create_or_update_view(view, might_exist=might_exist)
+    if view_fingerprint is None:
+        updated_view = bq_client.create_or_update_view(view, might_exist=might_exist)
+    else:
+        updated_view = bq_client.create_or_update_view(
+            view,
+            might_exist=might_exist,
+            labels={VIEW_FINGERPRINT_LABEL: view_fingerprint},
+        )
 
     if updated_view.schema != old_schema:
         # We also check for schema changes, just in case a parent view or table has added a column
@@ -463,24 +624,42 @@ def _create_or_update_view_and_materialize_if_necessary(
         if (
             view_changed
             or parent_changed
+            or materialized_table_is_stale
             or not bq_client.table_exists(
                 materialized_view_dataset_ref, view.materialized_address.table_id
             )
             or force_materialize
         ):
-            bq_client.materialize_view_to_table(
-                view=view,
-                use_query_cache=True,
-            )
+            _materialize_view(bq_client, view, view_fingerprint)
         else:
             logging.info(
                 "Skipping materialization of view [%s.%s] which has not changed.",
                 view.dataset_id,
                 view.view_id,
             )
-    has_changes = view_changed or parent_changed or force_materialize
+    has_changes = (
+        view_changed
+        or parent_changed
+        or force_materialize
+        or materialized_table_is_stale
+    )
     return (
         CreateOrUpdateViewStatus.SUCCESS_WITH_CHANGES
         if has_changes
         else CreateOrUpdateViewStatus.SUCCESS_WITHOUT_CHANGES
     )
+
+
+def _materialize_view(
+    bq_client: BigQueryClient, view: BigQueryView, view_fingerprint: Optional[str]
+) -> None:
+    """Materializes the view, labeling the materialized table with |view_fingerprint|
+    if it is set."""
+    if view_fingerprint is None:
+        bq_client.materialize_view_to_table(view=view, use_query_cache=True)
+    else:
+        bq_client.materialize_view_to_table(
+            view=view,
+            use_query_cache=True,
+            labels={VIEW_FINGERPRINT_LABEL: view_fingerprint},
+        )
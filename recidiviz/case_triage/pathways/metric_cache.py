@@ -15,10 +15,17 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """ Interface for fetching metrics from Pathways Cloud Memorystore, falling back to Cloud SQL """
-from typing import List, Mapping, Union
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent import futures
+from datetime import timedelta
+from typing import Any, List, Mapping, Optional, Tuple, Union, cast
 
 import attr
 from redis import Redis
+from redis.client import Pipeline
 
 from recidiviz.case_triage.pathways.dimensions.dimension import Dimension
 from recidiviz.case_triage.pathways.dimensions.dimension_mapping import (
@@ -34,10 +41,80 @@ from recidiviz.case_triage.util import get_pathways_metric_redis
 from recidiviz.cloud_memorystore import utils as cloud_memorystore_utils
 from recidiviz.common.constants.states import StateCode
 
+# Metrics expire from Redis after this amount of time. This also cleans up the keys
+# left behind by previous cache versions.
+METRIC_CACHE_TTL = timedelta(days=1)
+
+# Metrics are kept in memory in each worker for this amount of time, which bounds how
+# long a worker may keep serving a metric after the Redis value was changed without
+# resetting the cache.
+LOCAL_METRIC_CACHE_TTL = timedelta(minutes=1)
+LOCAL_METRIC_CACHE_MAX_SIZE = 1000
+
+# The current cache version of each metric is kept in memory in each worker for this
+# amount of time, which bounds how long a worker may keep reading the previous version
+# after the cache is reset.
+LOCAL_CACHE_VERSION_TTL = timedelta(seconds=10)
+
+# The number of metric queries to run in parallel when initializing the cache.
+CACHE_INITIALIZATION_MAX_WORKERS = 8
+
+
+class _LocalMetricCache:
+    """Thread-safe in-memory LRU cache whose entries expire after a fixed TTL. Values
+    are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_size: int, ttl: timedelta) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiration_time, value = entry
+            if expiration_time < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl.total_seconds(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all PathwaysMetricCache instances in this process, since a new instance is
+# built for every request.
+local_metric_cache = _LocalMetricCache(
+    max_size=LOCAL_METRIC_CACHE_MAX_SIZE, ttl=LOCAL_METRIC_CACHE_TTL
+)
+local_cache_version_cache = _LocalMetricCache(
+    max_size=LOCAL_METRIC_CACHE_MAX_SIZE, ttl=LOCAL_CACHE_VERSION_TTL
+)
+
 
 @attr.s(auto_attribs=True)
 class PathwaysMetricCache:
-    """Contains functionality for fetching metrics from cache"""
+    """Contains functionality for fetching metrics from cache.
+
+    Metrics are cached in Redis and in memory in each worker. Cache keys include the
+    version of the cache for the metric, which reset_cache() switches to a new version
+    once the cache for that version has been initialized. Workers also keep the
+    current version in memory, so that metrics cached in memory are served without
+    reading from Redis.
+    """
 
     state_code: StateCode
     metric_fetcher: PathwaysMetricFetcher
@@ -46,18 +123,48 @@ class PathwaysMetricCache:
     def fetch(
         self, mapper: MetricQueryBuilder, params: FetchMetricParams
     ) -> List[Mapping[str, Union[str, int]]]:
-        return cloud_memorystore_utils.get_or_set_json(
+        cache_key = self.cache_key_for(
+            mapper, params, version=self._local_cache_version(mapper)
+        )
+
+        cached_value = local_metric_cache.get(cache_key)
+        if cached_value is not None:
+            return cached_value
+
+        value = cloud_memorystore_utils.get_or_set_json_with_lock(
             self.redis,
-            self.cache_key_for(mapper, params),
+            cache_key,
             lambda: self.metric_fetcher.fetch(mapper, params),
+            expiry=METRIC_CACHE_TTL,
         )
+        local_metric_cache.set(cache_key, value)
+        return value
 
     def cache_key_for(
-        self, mapper: MetricQueryBuilder, params: FetchMetricParams
+        self, mapper: MetricQueryBuilder, params: FetchMetricParams, version: int = 0
     ) -> str:
-        return (
-            f"{self.state_code.value} {mapper.cache_fragment} {params.cache_fragment}"
-        )
+        # Keys for version 0 (i.e. a cache that has never been reset) match the format
+        # of keys written before cache versions were introduced.
+        version_fragment = f" v{version}" if version else ""
+        return f"{self.state_code.value} {mapper.cache_fragment}{version_fragment} {params.cache_fragment}"
+
+    def cache_version_key_for(self, mapper: MetricQueryBuilder) -> str:
+        return f"version {self.state_code.value} {mapper.cache_fragment}"
+
+    def cache_version_counter_key_for(self, mapper: MetricQueryBuilder) -> str:
+        return f"version counter {self.state_code.value} {mapper.cache_fragment}"
+
+    def cache_version(self, mapper: MetricQueryBuilder) -> int:
+        version = self.redis.get(self.cache_version_key_for(mapper))
+        return int(version) if version else 0
+
+    def _local_cache_version(self, mapper: MetricQueryBuilder) -> int:
+        version_key = self.cache_version_key_for(mapper)
+        version = local_cache_version_cache.get(version_key)
+        if version is None:
+            version = self.cache_version(mapper)
+            local_cache_version_cache.set(version_key, version)
+        return version
 
     def purge_cache_for_mapper(self, mapper: MetricQueryBuilder) -> None:
         cache_key_pattern = f"{self.state_code.value} {mapper.cache_fragment}*"
@@ -69,18 +176,42 @@ class PathwaysMetricCache:
         pipe.execute()
 
     def reset_cache(self, mapper: MetricQueryBuilder) -> None:
-        self.purge_cache_for_mapper(mapper)
-        self.initialize_cache(mapper)
+        """Initializes the cache for a new cache version of this metric, then
+        switches readers over to that version. Keys for previous versions expire on
+        their own.
+
+        Concurrent resets each initialize a distinct version, and readers are only
+        ever switched over to a later version than the current one.
+        """
+        if self.cache_version(mapper) == 0:
+            # Keys written before cache versions were introduced do not expire. Any
+            # keys written for version 0 from now on will have a TTL.
+            self.purge_cache_for_mapper(mapper)
+
+        version = self.redis.incr(self.cache_version_counter_key_for(mapper))
+        self.initialize_cache(mapper, version=version)
+
+        version_key = self.cache_version_key_for(mapper)
+
+        def switch_to_version(pipe: Pipeline) -> None:
+            # Commands run immediately, rather than being queued, until multi() is
+            # called on a watching pipeline.
+            current_version = cast(Optional[bytes], pipe.get(version_key))
+            if current_version is None or int(current_version) < version:
+                pipe.multi()
+                pipe.set(version_key, version)
 
-    def initialize_cache(self, mapper: MetricQueryBuilder) -> None:
+        self.redis.transaction(switch_to_version, version_key)
+        local_cache_version_cache.clear()
+
+    def _params_to_initialize(
+        self, mapper: MetricQueryBuilder
+    ) -> List[FetchMetricParams]:
         operable_dimensions = mapper.dimension_mapping_collection.operable_map
+        all_params = []
         for dimension in operable_dimensions[DimensionOperation.GROUP]:
             params = mapper.build_params({"group": dimension})
-
-            self.fetch(
-                mapper=mapper,
-                params=attr.evolve(params),
-            )
+            all_params.append(attr.evolve(params))
 
             if Dimension.TIME_PERIOD in operable_dimensions[DimensionOperation.FILTER]:
                 for time_period in TimePeriod:
@@ -92,8 +223,38 @@ class PathwaysMetricCache:
                             )
                         },
                     )
+                    all_params.append(params)
+        return all_params
 
-                    self.fetch(mapper=mapper, params=params)
+    def initialize_cache(
+        self, mapper: MetricQueryBuilder, version: Optional[int] = None
+    ) -> None:
+        """Fetches every group / time period combination for this metric in parallel
+        and writes them all to Redis for the given cache version (by default, the
+        current version).
+        """
+        if version is None:
+            version = self.cache_version(mapper)
+
+        all_params = self._params_to_initialize(mapper)
+        with futures.ThreadPoolExecutor(
+            max_workers=CACHE_INITIALIZATION_MAX_WORKERS
+        ) as executor:
+            values = list(
+                executor.map(
+                    lambda params: self.metric_fetcher.fetch(mapper, params),
+                    all_params,
+                )
+            )
+
+        pipe = self.redis.pipeline()
+        for params, value in zip(all_params, values):
+            pipe.set(
+                self.cache_key_for(mapper, params, version=version),
+                json.dumps(value),
+                ex=METRIC_CACHE_TTL,
+            )
+        pipe.execute()
 
     @classmethod
     def build(cls, state_code: StateCode) -> "PathwaysMetricCache":
@@ -17,8 +17,9 @@
 """ Utils for working with Redis """
 import json
 import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Callable, Iterator, List, Set
+from typing import Any, Callable, Iterator, List, Optional, Set
 
 import redis
 
@@ -63,3 +64,66 @@ def get_or_set_json(cache: redis.Redis, cache_key: str, fetch_value: Callable) -
     cache.set(cache_key, json.dumps(cached_value))
 
     return cached_value
+
+
+def get_or_set_json_with_lock(
+    cache: redis.Redis,
+    cache_key: str,
+    fetch_value: Callable,
+    expiry: Optional[timedelta] = None,
+    lock_timeout: timedelta = timedelta(seconds=60),
+    poll_interval: timedelta = timedelta(milliseconds=50),
+) -> Any:
+    """Like get_or_set_json, but when the key is missing, only one caller across all
+    clients of the Redis instance fetches the value at a time. Other callers wait for
+    that value to be set rather than also fetching it. If the value is not set within
+    |lock_timeout| (e.g. the caller holding the lock died), waiting callers fetch the
+    value themselves.
+
+    If |expiry| is set, the cached value expires after that amount of time.
+    """
+    cached_value = cache.get(cache_key)
+
+    if cached_value:
+        return json.loads(cached_value)
+
+    lock_key = f"lock:{cache_key}"
+    lock_token = str(uuid.uuid4())
+    has_lock = cache.set(lock_key, lock_token, nx=True, px=lock_timeout)
+
+    if not has_lock:
+        timeout = datetime.now() + lock_timeout
+        while datetime.now() <= timeout:
+            time.sleep(poll_interval.total_seconds())
+            cached_value = cache.get(cache_key)
+            if cached_value:
+                return json.loads(cached_value)
+
+    try:
+        fetched_value = fetch_value()
+        cache.set(cache_key, json.dumps(fetched_value), ex=expiry)
+    finally:
+        if has_lock:
+            _release_lock(cache, lock_key, lock_token)
+
+    return fetched_value
+
+
+def _release_lock(cache: redis.Redis, lock_key: str, lock_token: str) -> None:
+    """Deletes the lock at |lock_key| if it is still held with |lock_token|, i.e. it
+    has not expired and been acquired by another caller in the meantime. The lock is
+    WATCHed while its token is compared so that the delete is not executed if the lock
+    changes hands between the comparison and the delete.
+    """
+    with cache.pipeline() as pipeline:
+        try:
+            pipeline.watch(lock_key)
+            if pipeline.get(lock_key) != lock_token.encode("utf-8"):
+                return
+            pipeline.multi()
+            pipeline.delete(lock_key)
+            pipeline.execute()
+        except redis.WatchError:
+            # The lock expired and was acquired by another caller after its token was
+            # compared, so it is no longer ours to release.
+            pass
@@ -103,9 +103,16 @@ class GCSFileSystem:
         """
 
     @abc.abstractmethod
-    def download_as_bytes(self, path: GcsfsFilePath) -> bytes:
+    def download_as_bytes(
+        self,
+        path: GcsfsFilePath,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> bytes:
         """
-        Downloads object contents from the given path to bytes.
+        Downloads object contents from the given path to bytes. If |start| and / or
+        |end| are provided, only downloads the bytes in that range (inclusive of both
+        ends), matching the semantics of Blob.download_as_bytes().
         """
 
     @abc.abstractmethod
@@ -283,9 +283,14 @@ class GCSFileSystemImpl(GCSFileSystem):
         return blob.download_as_bytes().decode(encoding)
 
     @retry.Retry(predicate=google_api_retry_predicate)
-    def download_as_bytes(self, path: GcsfsFilePath) -> bytes:
+    def download_as_bytes(
+        self,
+        path: GcsfsFilePath,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> bytes:
         blob = self._get_blob(path)
-        return blob.download_as_bytes()
+        return blob.download_as_bytes(start=start, end=end)
 
     @retry.Retry(predicate=google_api_retry_predicate)
     def upload_from_string(
@@ -16,6 +16,7 @@
 # =============================================================================
 """Streaming read functionality for Google Cloud Storage CSV files."""
 import abc
+import codecs
 import csv
 from contextlib import contextmanager
 from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
@@ -42,6 +43,16 @@ COMMON_RAW_FILE_ENCODINGS = [
     ISO_8859_1_ENCODING,
 ]
 
+# The size and number of evenly spaced byte ranges (including the very start and end of
+# the file) that we try to decode when checking which encodings can decode a file.
+ENCODING_SAMPLE_SIZE_BYTES = 64 * 1024
+ENCODING_NUM_SAMPLES = 8
+
+# A sample that does not start at the beginning of the file may start in the middle of a
+# multi-byte character, so we also try decoding it with up to this many leading bytes
+# skipped.
+MAX_CHARACTER_CONTINUATION_BYTES = 3
+
 
 class GcsfsCsvReaderDelegate:
     """A delegate for handling various events that happen during a GcsfsCsvReader streaming_read() call."""
@@ -114,6 +125,80 @@ class GcsfsCsvReader:
         with self.gcs_file_system.open(path, encoding=encoding) as f:
             yield f
 
+    def _get_encoding_samples(
+        self, path: GcsfsFilePath
+    ) -> List[Tuple[bytes, int, bool]]:
+        """Returns a list of (sample bytes, start offset, whether the sample ends at
+        the end of the file) tuples for evenly spaced byte ranges of the file.
+        """
+        file_size = self.gcs_file_system.get_file_size(path)
+        if file_size is None:
+            return []
+        if file_size <= ENCODING_SAMPLE_SIZE_BYTES * ENCODING_NUM_SAMPLES:
+            return [(self.gcs_file_system.download_as_bytes(path), 0, True)]
+
+        step = (file_size - ENCODING_SAMPLE_SIZE_BYTES) // (ENCODING_NUM_SAMPLES - 1)
+        samples = []
+        for i in range(ENCODING_NUM_SAMPLES):
+            start = i * step
+            end = (
+                file_size - 1
+                if i == ENCODING_NUM_SAMPLES - 1
+                else start + ENCODING_SAMPLE_SIZE_BYTES - 1
+            )
+            samples.append(
+                (
+                    self.gcs_file_system.download_as_bytes(path, start=start, end=end),
+                    start,
+                    end == file_size - 1,
+                )
+            )
+        return samples
+
+    @staticmethod
+    def _can_decode_sample(
+        encoding: str, sample: bytes, start: int, is_end_of_file: bool
+    ) -> bool:
+        try:
+            decoder_cls = codecs.getincrementaldecoder(encoding)
+        except LookupError:
+            # Leave it to the full read to surface unknown encodings
+            return True
+
+        num_skippable_bytes = 0 if start == 0 else MAX_CHARACTER_CONTINUATION_BYTES
+        for offset in range(num_skippable_bytes + 1):
+            try:
+                decoder_cls(errors="strict").decode(
+                    sample[offset:], final=is_end_of_file
+                )
+                return True
+            except UnicodeDecodeError:
+                continue
+        return False
+
+    def filter_encodings_by_sample(
+        self, path: GcsfsFilePath, encodings_to_try: List[str]
+    ) -> List[str]:
+        """Returns the encodings in |encodings_to_try|, in order, that can decode a
+        handful of evenly spaced byte ranges sampled from the file at |path|.
+
+        An encoding that fails to decode any sample would also fail on a full read, so
+        this lets us skip reads of the whole file that would fail part way through. An
+        encoding that decodes every sample may still fail on a full read. If no
+        encoding can decode every sample, returns |encodings_to_try| unchanged so that
+        the full read surfaces the decode error.
+        """
+        samples = self._get_encoding_samples(path)
+        filtered_encodings = [
+            encoding
+            for encoding in encodings_to_try
+            if all(
+                self._can_decode_sample(encoding, sample, start, is_end_of_file)
+                for sample, start, is_end_of_file in samples
+            )
+        ]
+        return filtered_encodings or encodings_to_try
+
     def _get_preprocessed_file_stream(
         self, fp: TextIO, encoding: str, kwargs: Dict[str, Any]
     ) -> Tuple[Union[ReadOnlyCsvNormalizingStream, TextIO], str, Dict[str, Any]]:
@@ -165,7 +250,7 @@ class GcsfsCsvReader:
         encodings_to_try: Optional[List[str]] = None,
         dtype: Optional[Any] = str,
         **kwargs: Any,
-    ) -> None:
+    ) -> str:
         """
         Performs a streaming read of the CSV at the provided path. Will attempt to decode file with multiple encoding
         types. For large files, this allows us to read and process the whole file without ever storing the whole file in
@@ -179,12 +264,16 @@ class GcsfsCsvReader:
             dtype: The data type for values
             wrapper: If provided and true, use wrapper function when calling the helper function in direct_ingest_utils
             kwargs: Key-value args passed through to the pandas read_csv() call.
+
+        Returns:
+            The encoding the file was successfully read with.
         """
 
         if not encodings_to_try:
             encodings_to_try = COMMON_RAW_FILE_ENCODINGS
 
-        for encoding in encodings_to_try:
+        for file_encoding in encodings_to_try:
+            encoding = file_encoding
             delegate.on_start_read_with_encoding(encoding)
             try:
                 with self._file_pointer_for_path(path, encoding=encoding) as fp:
@@ -225,7 +314,7 @@ class GcsfsCsvReader:
                             break
 
                     delegate.on_file_read_success(encoding)
-                    return
+                    return file_encoding
             except UnicodeError as e:
                 should_throw = delegate.on_unicode_decode_error(encoding, e)
                 if should_throw:
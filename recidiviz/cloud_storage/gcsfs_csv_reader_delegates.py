@@ -18,8 +18,11 @@
 
 import abc
 import csv
+import functools
 import logging
-from typing import List, Optional
+import threading
+from concurrent import futures
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -72,22 +75,51 @@ class ReadOneGcsfsCsvReaderDelegate(SimpleGcsfsCsvReaderDelegate):
 class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
     """An implementation of the GcsfsCsvReaderDelegate that uploads each CSV chunk to a separate Google Cloud Storage
     path.
+
+    If |max_upload_workers| is set, each chunk is transformed, serialized and uploaded on a pool of worker threads while
+    the reader continues to parse subsequent chunks. At most |max_upload_workers| * 2 chunks are held in memory waiting
+    to be uploaded - the reader blocks until a slot frees up.
     """
 
-    def __init__(self, path: GcsfsFilePath, fs: GCSFileSystem, include_header: bool):
+    def __init__(
+        self,
+        path: GcsfsFilePath,
+        fs: GCSFileSystem,
+        include_header: bool,
+        max_upload_workers: Optional[int] = None,
+    ):
         self.path = path
         self.fs = fs
         self.include_header = include_header
+        self.max_upload_workers = max_upload_workers
 
         self.output_paths: List[GcsfsFilePath] = []
         self.output_columns: Optional[List[str]] = None
 
+        self._upload_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._upload_slots: Optional[threading.BoundedSemaphore] = None
+        self._chunk_upload_futures: Dict[
+            int, "futures.Future[Optional[Tuple[GcsfsFilePath, List[str]]]]"
+        ] = {}
+        # The first chunk upload to fail, if any, set as soon as that upload finishes.
+        self._failed_chunk_upload: Optional[
+            "futures.Future[Optional[Tuple[GcsfsFilePath, List[str]]]]"
+        ] = None
+
     def on_start_read_with_encoding(self, encoding: str) -> None:
         logging.info(
             "Attempting to do chunked upload of [%s] with encoding [%s]",
             self.path.abs_path(),
             encoding,
         )
+        if self.max_upload_workers:
+            # The executor outlives this callback, and is shut down by
+            # _wait_for_chunk_uploads() once the file has been read or has failed.
+            # pylint: disable=consider-using-with
+            self._upload_executor = futures.ThreadPoolExecutor(
+                max_workers=self.max_upload_workers
+            )
+            self._upload_slots = threading.BoundedSemaphore(self.max_upload_workers * 2)
 
     def on_file_stream_normalization(
         self, old_encoding: str, new_encoding: str
@@ -103,6 +135,43 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             "Loaded DataFrame chunk [%d] has [%d] rows", chunk_num, df.shape[0]
         )
 
+        if self._upload_executor is None or self._upload_slots is None:
+            self._record_chunk_output(self._transform_and_upload_chunk(chunk_num, df))
+            return True
+
+        # Fail fast if an upload of an earlier chunk has already failed
+        if self._failed_chunk_upload is not None:
+            self._failed_chunk_upload.result()
+
+        # Blocks until there is room for another chunk in the upload queue. The slot
+        # is released by _on_chunk_upload_done() once the chunk is uploaded.
+        self._upload_slots.acquire()  # pylint: disable=consider-using-with
+        future = self._upload_executor.submit(
+            self._transform_and_upload_chunk, chunk_num, df
+        )
+        future.add_done_callback(
+            functools.partial(
+                self._on_chunk_upload_done, upload_slots=self._upload_slots
+            )
+        )
+        self._chunk_upload_futures[chunk_num] = future
+        return True
+
+    def _on_chunk_upload_done(
+        self,
+        future: "futures.Future[Optional[Tuple[GcsfsFilePath, List[str]]]]",
+        upload_slots: threading.BoundedSemaphore,
+    ) -> None:
+        if future.exception() is not None and self._failed_chunk_upload is None:
+            self._failed_chunk_upload = future
+        upload_slots.release()
+
+    def _transform_and_upload_chunk(
+        self, chunk_num: int, df: pd.DataFrame
+    ) -> Optional[Tuple[GcsfsFilePath, List[str]]]:
+        """Transforms and uploads a single chunk, returning the path it was written to
+        and its columns, or None if the chunk had no data.
+        """
         transformed_df = self.transform_dataframe(df)
 
         num_rows = transformed_df.shape[0]
@@ -113,7 +182,7 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             logging.info(
                 "Skipping output for chunk [%s] - no data in chunk.", chunk_num
             )
-            return True
+            return None
 
         output_path = self.get_output_path(chunk_num=chunk_num)
 
@@ -122,20 +191,29 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             chunk_num,
             output_path.abs_path(),
         )
+        self.write_dataframe(output_path, transformed_df)
+        logging.info("Done writing to output path")
+
+        return output_path, list(transformed_df.columns.values)
 
+    def write_dataframe(self, output_path: GcsfsFilePath, df: pd.DataFrame) -> None:
+        """Writes the contents of a transformed chunk to the given output path."""
         # We cannot use QUOTE_ALL as it results in empty values being written as "" in our temp file csv.
         # When uploading the temp file to BQ this results in empty strings being uploaded instead of NULLs.
         quoting = csv.QUOTE_MINIMAL
         self.fs.upload_from_string(
             output_path,
-            transformed_df.to_csv(
-                header=self.include_header, index=False, quoting=quoting
-            ),
+            df.to_csv(header=self.include_header, index=False, quoting=quoting),
             "text/csv",
         )
-        logging.info("Done writing to output path")
 
-        columns_as_list = list(transformed_df.columns.values)
+    def _record_chunk_output(
+        self, chunk_output: Optional[Tuple[GcsfsFilePath, List[str]]]
+    ) -> None:
+        if chunk_output is None:
+            return
+        output_path, columns_as_list = chunk_output
+
         if self.output_columns is None:
             self.output_columns = columns_as_list
 
@@ -147,7 +225,44 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
             )
 
         self.output_paths.append(output_path)
-        return True
+
+    def _wait_for_chunk_uploads(self) -> None:
+        """Waits for all in-flight chunk uploads to finish and records their outputs
+        in chunk order. Every successfully uploaded path is recorded, even if another
+        chunk failed, so that they can be cleaned up. Raises the first upload failure,
+        if any.
+        """
+        if self._upload_executor is None:
+            return
+
+        self._upload_executor.shutdown(wait=True)
+        self._upload_executor = None
+        self._upload_slots = None
+
+        chunk_upload_futures = self._chunk_upload_futures
+        self._chunk_upload_futures = {}
+        self._failed_chunk_upload = None
+
+        first_error: Optional[BaseException] = None
+        for chunk_num in sorted(chunk_upload_futures):
+            future = chunk_upload_futures[chunk_num]
+            if future.exception() is not None:
+                first_error = first_error or future.exception()
+                continue
+            chunk_output = future.result()
+            if chunk_output is None:
+                continue
+            if first_error is None:
+                try:
+                    self._record_chunk_output(chunk_output)
+                    continue
+                except ValueError as e:
+                    first_error = e
+            # Track the path even though we will fail so that it gets cleaned up
+            self.output_paths.append(chunk_output[0])
+
+        if first_error:
+            raise first_error
 
     def on_unicode_decode_error(self, encoding: str, e: UnicodeError) -> bool:
         logging.info(
@@ -165,6 +280,7 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
         return True
 
     def on_file_read_success(self, encoding: str) -> None:
+        self._wait_for_chunk_uploads()
         logging.info(
             "Successfully read file [%s] with encoding [%s]",
             self.path.abs_path(),
@@ -172,6 +288,10 @@ class SplittingGcsfsCsvReaderDelegate(GcsfsCsvReaderDelegate):
         )
 
     def _delete_temp_output_paths(self) -> None:
+        try:
+            self._wait_for_chunk_uploads()
+        except Exception as e:
+            logging.error("Chunk upload failed while cleaning up temp paths: %s", e)
         for temp_output_path in self.output_paths:
             logging.info("Deleting temp file [%s].", temp_output_path.abs_path())
             self.fs.delete(temp_output_path)
@@ -19,7 +19,8 @@ format with arbitrary delimiters and newline terminators to a standardized forma
 """
 import csv
 import logging
-from typing import Optional, TextIO
+from collections import deque
+from typing import Deque, List, Optional, TextIO
 
 DOUBLE_QUOTE = '"'
 ESCAPED_DOUBLE_QUOTE = '""'
@@ -48,15 +49,24 @@ class ReadOnlyCsvNormalizingStream:
         self.delimiter = delimiter
         self.line_terminator = line_terminator
 
-        # Holds the next part of the text stream that we may have read but have not yet
-        # done any preprocessing to. Between calls to read(), this will never hold more
-        # than part of a single CSV line.
-        self._unnormalized_buffer = ""
+        # Holds the blocks of the text stream that we may have read but have not yet
+        # done any preprocessing to. Between calls to read(), these will never hold
+        # more than part of a single CSV line. Blocks are only joined once we have
+        # found the end of a line so that long lines are not copied once per block.
+        self._unnormalized_blocks: List[str] = []
+
+        # The last len(line_terminator) - 1 characters of the unnormalized blocks, used
+        # to find line terminators that are split across two blocks.
+        self._unnormalized_tail = ""
 
         # Holds the next portion of the stream that has been normalized and is ready
         # to read. It is only added to in one-line increments, but may be read from in
-        # any size increment.
-        self._normalized_buffer = ""
+        # any size increment. Rather than slicing off the start of a single string on
+        # every read (which copies everything that is left), we keep a queue of
+        # normalized strings and an offset into the first one.
+        self._normalized_chunks: Deque[str] = deque()
+        self._normalized_offset = 0
+        self._normalized_length = 0
 
         # When True, indicates that we have reached the end of the file stream and
         # should not attempt to read more. This may be set before all of the normalized
@@ -67,6 +77,24 @@ class ReadOnlyCsvNormalizingStream:
         # buffer.
         self._num_lines_processed = 0
 
+    def _block_completes_line(self, block: str) -> bool:
+        """Returns True if the line terminator appears in |block| or spans the end of
+        the previously read blocks and the start of |block|.
+        """
+        if self.line_terminator in block:
+            return True
+        if not self._unnormalized_tail:
+            return False
+        return (
+            self.line_terminator
+            in self._unnormalized_tail + block[: len(self.line_terminator) - 1]
+        )
+
+    def _update_unnormalized_tail(self, block: str) -> None:
+        tail_length = len(self.line_terminator) - 1
+        if tail_length:
+            self._unnormalized_tail = (self._unnormalized_tail + block)[-tail_length:]
+
     def _add_to_buffer(self, block_size: Optional[int]) -> None:
         """Reads the next portion of the file and normalizes any full lines, adding them
         to the end of the normalized buffer.
@@ -74,29 +102,41 @@ class ReadOnlyCsvNormalizingStream:
         if self._eof:
             return
 
-        while not self._eof and self.line_terminator not in self._unnormalized_buffer:
+        while not self._eof:
             block = self.fp.read(block_size or -1)
             if not block or block_size is None:
                 self._eof = True
-            self._unnormalized_buffer += block
+            self._unnormalized_blocks.append(block)
+            if self._block_completes_line(block):
+                break
+            self._update_unnormalized_tail(block)
+            if block_size:
+                # The requested size can be arbitrarily small, so grow the reads until
+                # we find the end of the line rather than reading a long line a few
+                # characters at a time.
+                block_size *= 2
 
-        lines = self._unnormalized_buffer.split(self.line_terminator)
+        lines = "".join(self._unnormalized_blocks).split(self.line_terminator)
         if self._eof:
             full_lines = lines
+            self._unnormalized_blocks = []
         else:
             if len(lines) < 2:
                 raise ValueError("Expected more than one line, found only one.")
-            self._unnormalized_buffer = lines[-1]
+            self._unnormalized_blocks = [lines[-1]]
+            self._unnormalized_tail = ""
+            self._update_unnormalized_tail(lines[-1])
             full_lines = lines[: len(lines) - 1]
 
         if not full_lines and not self._eof:
             raise ValueError("Expect to have lines if not EOF, found None.")
 
+        normalized_parts = []
         for full_line in full_lines:
             if self._num_lines_processed > 0:
-                self._normalized_buffer += NEWLINE
+                normalized_parts.append(NEWLINE)
             if full_line:
-                self._normalized_buffer += (
+                normalized_parts.append(
                     DOUBLE_QUOTE
                     + full_line.replace(DOUBLE_QUOTE, ESCAPED_DOUBLE_QUOTE)
                     .replace(self.delimiter, COMMA_SURROUNDED_BY_DOUBLE_QUOTES)
@@ -105,6 +145,49 @@ class ReadOnlyCsvNormalizingStream:
                 )
             self._num_lines_processed += 1
 
+        normalized = "".join(normalized_parts)
+        if normalized:
+            self._normalized_chunks.append(normalized)
+            self._normalized_length += len(normalized)
+
+    def _find_in_normalized_buffer(self, sub: str, start: int) -> int:
+        """Returns the index of the first occurrence of the single character |sub| in
+        the normalized buffer at or after |start|, or -1 if it is not found.
+        """
+        chunk_start = -self._normalized_offset
+        for chunk in self._normalized_chunks:
+            chunk_end = chunk_start + len(chunk)
+            if chunk_end > start:
+                index = chunk.find(sub, max(start - chunk_start, 0))
+                if index != -1:
+                    return chunk_start + index
+            chunk_start = chunk_end
+        return -1
+
+    def _consume_normalized_buffer(self, length: int) -> str:
+        """Removes and returns up to |length| characters from the start of the
+        normalized buffer.
+        """
+        remaining = min(length, self._normalized_length)
+        self._normalized_length -= remaining
+
+        parts = []
+        while remaining:
+            chunk = self._normalized_chunks[0]
+            available = len(chunk) - self._normalized_offset
+            if available <= remaining:
+                parts.append(chunk[self._normalized_offset :])
+                self._normalized_chunks.popleft()
+                self._normalized_offset = 0
+                remaining -= available
+            else:
+                parts.append(
+                    chunk[self._normalized_offset : self._normalized_offset + remaining]
+                )
+                self._normalized_offset += remaining
+                remaining = 0
+        return "".join(parts)
+
     def read(self, __size: Optional[int] = None) -> str:
         if __size is not None and __size < 1:
             raise ValueError(f"Bad size [{__size}]")
@@ -114,13 +197,11 @@ class ReadOnlyCsvNormalizingStream:
             if not self._eof:
                 raise ValueError("Must have reached EOF if reading full file.")
         else:
-            while not self._eof and len(self._normalized_buffer) < __size:
-                self._add_to_buffer(__size - len(self._normalized_buffer))
+            while not self._eof and self._normalized_length < __size:
+                self._add_to_buffer(__size - self._normalized_length)
 
-        read_length = __size or len(self._normalized_buffer)
-        ret = self._normalized_buffer[:read_length]
-        self._normalized_buffer = self._normalized_buffer[read_length:]
-        return ret
+        read_length = __size or self._normalized_length
+        return self._consume_normalized_buffer(read_length)
 
     def readline(self, __size: Optional[int] = None) -> str:
         """Read a single line from the stream, or up to __size bytes, whichever is
@@ -130,10 +211,14 @@ class ReadOnlyCsvNormalizingStream:
             raise ValueError(f"Invalid size [{__size}]")
 
         bytes_read = 0
+        # Everything before this index in the normalized buffer is known not to
+        # contain a newline.
+        search_start = 0
         while True:
-            index = self._normalized_buffer.find("\n")
+            index = self._find_in_normalized_buffer(NEWLINE, search_start)
             if index != -1 or self._eof or (__size and bytes_read >= __size):
                 break
+            search_start = self._normalized_length
 
             bytes_to_read = (
                 min(__size - bytes_read, READ_LINE_INCREMENT_SIZE)
@@ -152,16 +237,14 @@ class ReadOnlyCsvNormalizingStream:
             # Read the whole line, including the newline
             read_length = index + 1
         elif not __size:
-            read_length = len(self._normalized_buffer)
+            read_length = self._normalized_length
         else:
             read_length = __size
 
         # Read length can never be more than __size
         read_length = min(__size, read_length) if __size else read_length
 
-        ret = self._normalized_buffer[:read_length]
-
-        self._normalized_buffer = self._normalized_buffer[read_length:]
+        ret = self._consume_normalized_buffer(read_length)
 
         if not ret and not self._eof:
             raise ValueError("Should not have empty return if not EOF")
@@ -25,6 +25,7 @@ import locale
 import re
 import string
 from distutils.util import strtobool  # pylint: disable=no-name-in-module
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 import dateparser
@@ -223,6 +224,48 @@ def _is_str_field_zeros(str_field: str) -> bool:
     return False
 
 
+# Formats for common date strings that would otherwise fall through to dateparser,
+# which is orders of magnitude slower than strptime. Each of these formats produces the
+# same result as dateparser for any string it matches. No string can match more than
+# one of these formats, so the order they are tried in does not affect results.
+_FAST_PATH_DATETIME_FORMATS = [
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m-%d-%Y",
+    "%Y/%m/%d",
+]
+
+# Values for a given column generally share a single format, so we try whichever fast
+# path format most recently succeeded first.
+_last_fast_path_datetime_format = _FAST_PATH_DATETIME_FORMATS[0]
+
+
+def _parse_datetime_fast_path(date_string: str) -> Optional[datetime.datetime]:
+    """Parses the date string with one of the _FAST_PATH_DATETIME_FORMATS, returning
+    None if it matches none of them.
+    """
+    global _last_fast_path_datetime_format
+
+    try:
+        return datetime.datetime.strptime(date_string, _last_fast_path_datetime_format)
+    except ValueError:
+        pass
+
+    for date_format in _FAST_PATH_DATETIME_FORMATS:
+        if date_format == _last_fast_path_datetime_format:
+            continue
+        try:
+            parsed = datetime.datetime.strptime(date_string, date_format)
+        except ValueError:
+            continue
+        _last_fast_path_datetime_format = date_format
+        return parsed
+    return None
+
+
 def parse_datetime(
     date_string: str, from_dt: Optional[datetime.datetime] = None
 ) -> Optional[datetime.datetime]:
@@ -230,6 +273,29 @@ def parse_datetime(
     Parses a string into a datetime.datetime object, using |from_dt| as a base
     for any relative dates.
     """
+    if from_dt is None:
+        # Relative dates are parsed relative to the current time, so results can't be
+        # cached.
+        return _parse_datetime(date_string, from_dt=None)
+    return _parse_datetime_with_from_dt(date_string, from_dt)
+
+
+# The same date strings appear over and over in ingested data (and every date field is
+# deserialized with the same |from_dt|), so we cache parsed values. datetime objects are
+# immutable, so cached values are safe to share.
+@lru_cache(maxsize=2**16)
+def _parse_datetime_with_from_dt(
+    date_string: str, from_dt: datetime.datetime
+) -> Optional[datetime.datetime]:
+    return _parse_datetime(date_string, from_dt=from_dt)
+
+
+def _parse_datetime(
+    date_string: str, from_dt: Optional[datetime.datetime]
+) -> Optional[datetime.datetime]:
+    """Parses a string into a datetime.datetime object, trying the most common exact
+    formats before falling back to dateparser for free-form values.
+    """
     if (
         date_string == ""
         or date_string.isspace()
@@ -238,23 +304,24 @@ def parse_datetime(
     ):
         return None
 
-    if is_iso_datetime(date_string):
+    try:
         return datetime.datetime.fromisoformat(date_string)
+    except ValueError:
+        pass
+
+    try:
+        return datetime.datetime.strptime(date_string, "%Y%m%d")
+    except ValueError:
+        pass
 
-    if is_yyyymmdd_date(date_string):
-        as_date = parse_yyyymmdd_date(date_string)
-        if not as_date:
-            raise ValueError(
-                f"Parsed date for string [{date_string}] is unexpectedly None."
-            )
-        return datetime.datetime(
-            year=as_date.year, month=as_date.month, day=as_date.day
-        )
     if (parsed_datetime := parse_mmddyyyy_datetime(date_string)) is not None:
         # Due to a change in dateparser, values like `03122008` are no longer
         # correctly parsed. We add this in to preserve backwards-compatibility.
         return parsed_datetime
 
+    if (parsed_datetime := _parse_datetime_fast_path(date_string)) is not None:
+        return parsed_datetime
+
     settings: "dateparser._Settings" = {"PREFER_DAY_OF_MONTH": "first"}
     if from_dt:
         settings["RELATIVE_BASE"] = from_dt
@@ -21,15 +21,20 @@ in order to support ingest and calculations."""
 import abc
 import os
 import re
+from collections import defaultdict
 from enum import Enum, EnumMeta
-from typing import Callable, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import attr
+import numpy as np
 from nltk import data
 from nltk.corpus import stopwords
 from nltk.stem.snowball import SnowballStemmer
 from nltk.tokenize import ToktokTokenizer
+from rapidfuzz import fuzz as rapidfuzz_fuzz
+from rapidfuzz import process as rapidfuzz_process
 from thefuzz import fuzz
+from thefuzz import utils as fuzz_utils
 
 from recidiviz.common.data_sets import nltk_data
 
@@ -58,11 +63,39 @@ TEXT_NORMALIZERS: List[Normalizer] = [
     REMOVE_MULTIPLE_WHITESPACES,
 ]
 
+# The rapidfuzz scorers that back thefuzz matching functions, and whether thefuzz runs
+# full_process() on both strings before scoring them
+_BATCHABLE_MATCHING_FUNCTIONS: Dict[
+    Callable[[str, str], int], Tuple[Callable, bool]
+] = {
+    fuzz.ratio: (rapidfuzz_fuzz.ratio, False),
+    fuzz.partial_ratio: (rapidfuzz_fuzz.partial_ratio, False),
+    fuzz.token_sort_ratio: (rapidfuzz_fuzz.token_sort_ratio, True),
+    fuzz.partial_token_sort_ratio: (rapidfuzz_fuzz.partial_token_sort_ratio, True),
+    fuzz.token_set_ratio: (rapidfuzz_fuzz.token_set_ratio, True),
+    fuzz.partial_token_set_ratio: (rapidfuzz_fuzz.partial_token_set_ratio, True),
+}
+
 _nltk_path = os.path.dirname(nltk_data.__file__)
 if not _nltk_path in data.path:
     data.path.append(_nltk_path)
 
 
+def chunk_text(normalized_text: str, chunk_size: Optional[int]) -> List[str]:
+    """Splits normalized text into overlapping chunks of |chunk_size| tokens, starting
+    at each token. Returns the whole text as a single chunk if there is no chunk_size."""
+    if not chunk_size:
+        return [normalized_text]
+    tokens = normalized_text.split(" ")
+    chunks = []
+    for i in range(len(tokens)):
+        if i + chunk_size > len(tokens) - 1:
+            chunks.append(" ".join(tokens[i:]))
+            break
+        chunks.append(" ".join(tokens[i : i + chunk_size]))
+    return chunks
+
+
 @attr.s(kw_only=True)
 class FuzzyMatcher(abc.ABC):
     """Abstract class for performing fuzzy matching of free text against a search term."""
@@ -120,15 +153,7 @@ class TextEntity(Enum, metaclass=EnumMeta):
         of the fuzzy matchers. As soon as the first fuzzy matcher matches the text, we
         say that the flag matches and break before continuing to the rest of the matchers.
         """
-        normalized_text_chunks = [normalized_text]
-        if self.chunk_size:
-            tokens = normalized_text.split(" ")
-            normalized_text_chunks = []
-            for i in range(len(tokens)):
-                if i + self.chunk_size > len(tokens) - 1:
-                    normalized_text_chunks.append(" ".join(tokens[i:]))
-                    break
-                normalized_text_chunks.append(" ".join(tokens[i : i + self.chunk_size]))
+        normalized_text_chunks = chunk_text(normalized_text, self.chunk_size)
         for fuzzy_matcher in self.fuzzy_matchers:
             for chunk in normalized_text_chunks:
                 if fuzzy_matcher.matches(chunk):
@@ -231,3 +256,255 @@ class TextAnalyzer:
             print("Matched entities: ")
             for matched_entity in matched_entities:
                 print(matched_entity.name)
+
+
+def _split_top_level_alternatives(regex: str) -> List[str]:
+    """Splits a regex on each "|" that is not escaped or inside a group or character
+    class."""
+    alternatives = []
+    depth = 0
+    in_class = False
+    start = 0
+    i = 0
+    while i < len(regex):
+        char = regex[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after the opening "[" (or "[^") is a literal
+            if regex[i + 1 : i + 2] == "^":
+                i += 1
+            if regex[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            alternatives.append(regex[start:i])
+            start = i + 1
+        i += 1
+    alternatives.append(regex[start:])
+    return alternatives
+
+
+def _strip_unbounded_wildcards(regex: str) -> str:
+    """Removes a leading and trailing greedy ".*" from a regex (without top-level
+    alternatives). Whether re.search finds a match is unchanged, because ".*" can
+    always match the empty string, but the regex no longer has to scan to the end of
+    the text (and back) from every position it is tried at."""
+    if regex.startswith(".*") and regex[2:3] not in {"?", "+", "*", "{"}:
+        regex = regex[2:]
+    if regex.endswith(".*"):
+        # Count the backslashes before the "." to see whether it is escaped
+        num_backslashes = len(regex[:-2]) - len(regex[:-2].rstrip("\\"))
+        if num_backslashes % 2 == 0:
+            regex = regex[:-2]
+    return regex
+
+
+@attr.s(kw_only=True)
+class _ScorerBatch:
+    """All of the search terms in a _CompiledEntityGroup that are scored with the same
+    rapidfuzz scorer."""
+
+    scorer: Callable = attr.ib()
+    full_process: bool = attr.ib()
+    entity_indices: List[int] = attr.ib(factory=list)
+    search_terms: List[str] = attr.ib(factory=list)
+    score_cutoffs: List[int] = attr.ib(factory=list)
+
+
+class _CompiledEntityGroup:
+    """The matchers of all text entities that share the same normalizers and chunk size,
+    and so are matched against the same chunks of normalized text."""
+
+    def __init__(
+        self,
+        normalizers: Optional[List[Normalizer]],
+        chunk_size: Optional[int],
+        text_entities: List[TextEntity],
+    ) -> None:
+        self.normalizers = normalizers
+        self.chunk_size = chunk_size
+        self.text_entities = text_entities
+
+        # The search regexes of each entity that can be merged into a single pattern
+        self.entity_regexes: Dict[int, List[str]] = defaultdict(list)
+        self.scorer_batches: Dict[Callable, _ScorerBatch] = {}
+        # Matchers that have to be run on their own, one chunk at a time
+        self.other_matchers: List[Tuple[int, FuzzyMatcher]] = []
+
+        for i, text_entity in enumerate(text_entities):
+            for matcher in text_entity.fuzzy_matchers:
+                if isinstance(matcher, RegexFuzzyMatcher) and self._can_merge_regex(
+                    matcher
+                ):
+                    self.entity_regexes[i].extend(
+                        _strip_unbounded_wildcards(alternative)
+                        for alternative in _split_top_level_alternatives(
+                            matcher.search_regex
+                        )
+                    )
+                elif (
+                    isinstance(matcher, ScoringFuzzyMatcher)
+                    and matcher.matching_function in _BATCHABLE_MATCHING_FUNCTIONS
+                ):
+                    scorer, full_process = _BATCHABLE_MATCHING_FUNCTIONS[
+                        matcher.matching_function
+                    ]
+                    batch = self.scorer_batches.setdefault(
+                        matcher.matching_function,
+                        _ScorerBatch(scorer=scorer, full_process=full_process),
+                    )
+                    batch.entity_indices.append(i)
+                    batch.search_terms.append(
+                        fuzz_utils.full_process(matcher.search_term, force_ascii=True)
+                        if full_process
+                        else matcher.search_term
+                    )
+                    batch.score_cutoffs.append(matcher.score_cutoff)
+                else:
+                    self.other_matchers.append((i, matcher))
+
+        self._combined_regexes: Dict[Tuple[int, ...], re.Pattern] = {}
+
+    @staticmethod
+    def _can_merge_regex(matcher: RegexFuzzyMatcher) -> bool:
+        """Regexes can be merged into a single alternation only if they are searched with
+        re.search and do not have their own groups (which could be referenced by
+        number) or global flags (which are only valid at the start of a pattern)."""
+        if matcher.matching_function is not re.search:
+            return False
+        try:
+            return re.compile(f"(?:{matcher.search_regex})").groups == 0
+        except re.error:
+            return False
+
+    def _combined_regex(self, entity_indices: Tuple[int, ...]) -> re.Pattern:
+        """Returns a pattern that matches any of the regexes of the given entities, with
+        a named group for each entity."""
+        if entity_indices not in self._combined_regexes:
+            self._combined_regexes[entity_indices] = re.compile(
+                "|".join(
+                    f"(?P<e{i}>{'|'.join(f'(?:{r})' for r in self.entity_regexes[i])})"
+                    for i in entity_indices
+                )
+            )
+        return self._combined_regexes[entity_indices]
+
+    def matched_entities(self, normalized_text: str) -> Set[TextEntity]:
+        """Returns the entities in this group that have a fuzzy matcher matching any
+        chunk of |normalized_text|. These are the entities that calling matches() on
+        each of their matchers for each chunk would find, but the merged regexes are
+        searched together and each batch of search terms is scored in one call."""
+        chunks = chunk_text(normalized_text, self.chunk_size)
+        matched: Set[int] = set()
+
+        # A search of the combined pattern finds a match for one of the entities, if
+        # any of them match. Keep searching for the entities that haven't matched yet.
+        for chunk in chunks:
+            remaining = tuple(i for i in self.entity_regexes if i not in matched)
+            while remaining:
+                match = self._combined_regex(remaining).search(chunk)
+                if match is None or match.lastgroup is None:
+                    break
+                matched.add(int(match.lastgroup[1:]))
+                remaining = tuple(i for i in remaining if i not in matched)
+
+        processed_chunks: Optional[List[str]] = None
+        for batch in self.scorer_batches.values():
+            rows = [
+                row for row, i in enumerate(batch.entity_indices) if i not in matched
+            ]
+            if not rows:
+                continue
+            if batch.full_process:
+                if processed_chunks is None:
+                    processed_chunks = [
+                        fuzz_utils.full_process(chunk, force_ascii=True)
+                        for chunk in chunks
+                    ]
+                choices = processed_chunks
+            else:
+                choices = chunks
+            scores = rapidfuzz_process.cdist(
+                [batch.search_terms[row] for row in rows],
+                choices,
+                scorer=batch.scorer,
+            )
+            # thefuzz rounds scores to the nearest integer (half to even) before they
+            # are compared with the cutoff
+            row_matches = (
+                np.rint(scores)
+                >= np.array([batch.score_cutoffs[row] for row in rows])[:, None]
+            ).any(axis=1)
+            for row, row_match in zip(rows, row_matches):
+                if row_match:
+                    matched.add(batch.entity_indices[row])
+
+        for i, matcher in self.other_matchers:
+            if i not in matched and any(matcher.matches(chunk) for chunk in chunks):
+                matched.add(i)
+
+        return {self.text_entities[i] for i in matched}
+
+
+class CompiledTextAnalyzer(TextAnalyzer):
+    """TextAnalyzer that returns the same entities from extract_entities(), but compiles
+    the configured matchers up front so that each text is processed in as few passes
+    as possible:
+     - text is normalized and chunked once per distinct list of normalizers and chunk
+       size, rather than once per entity,
+     - the regexes of all entities are merged into a single alternation that is
+       searched once per match, rather than once per regex,
+     - all of the search terms scored with the same matching function are scored
+       against all chunks in a single batched rapidfuzz call.
+    Matchers that can't be compiled (e.g. custom matching functions) are run as-is.
+    """
+
+    def __init__(self, configuration: TextMatchingConfiguration) -> None:
+        super().__init__(configuration)
+        entities_by_key: Dict[
+            Tuple[Optional[Tuple[Normalizer, ...]], Optional[int]], List[TextEntity]
+        ] = defaultdict(list)
+        for text_entity in configuration.text_entities:
+            normalizers_key = (
+                tuple(text_entity.normalizers) if text_entity.normalizers else None
+            )
+            entities_by_key[(normalizers_key, text_entity.chunk_size)].append(
+                text_entity
+            )
+        self.entity_groups = [
+            _CompiledEntityGroup(
+                list(normalizers_key) if normalizers_key else None,
+                chunk_size,
+                text_entities,
+            )
+            for (normalizers_key, chunk_size), text_entities in entities_by_key.items()
+        ]
+
+    def extract_entities(
+        self, text: str, enable_logging: bool = False
+    ) -> Set[TextEntity]:
+        normalized_texts: Dict[Optional[Tuple[Normalizer, ...]], str] = {}
+        matched_entities: Set[TextEntity] = set()
+        for group in self.entity_groups:
+            normalizers_key = tuple(group.normalizers) if group.normalizers else None
+            if normalizers_key not in normalized_texts:
+                normalized_texts[normalizers_key] = self.normalize_text(
+                    text, normalizers=group.normalizers
+                )
+                if enable_logging:
+                    print(
+                        f"Normalized text for normalizers {group.normalizers}: "
+                        f"{normalized_texts[normalizers_key]}"
+                    )
+            matched_entities |= group.matched_entities(
+                normalized_texts[normalizers_key]
+            )
+        return matched_entities
@@ -21,10 +21,13 @@ import argparse
 from recidiviz.common.constants.states import StateCode
 from recidiviz.entrypoints.entrypoint_interface import EntrypointInterface
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.utils.params import str_to_bool
 from recidiviz.validation.validation_manager import execute_validation_request
 
 
 class ValidationEntrypoint(EntrypointInterface):
+    """Entrypoint for running validations for a given state"""
+
     @staticmethod
     def get_parser() -> argparse.ArgumentParser:
         """Parse arguments for the validation script."""
@@ -49,6 +52,13 @@ class ValidationEntrypoint(EntrypointInterface):
             help="Sandbox prefix to validate",
             type=str,
         )
+        parser.add_argument(
+            "--batch_validation_queries",
+            help="If true, computes all checks against the same validation view in a "
+            "single query. Defaults to false.",
+            type=str_to_bool,
+            default=False,
+        )
         return parser
 
     @staticmethod
@@ -57,4 +67,5 @@ class ValidationEntrypoint(EntrypointInterface):
             state_code=args.state_code,
             ingest_instance=args.ingest_instance,
             sandbox_prefix=args.sandbox_prefix,
+            batch_validation_queries=args.batch_validation_queries,
         )
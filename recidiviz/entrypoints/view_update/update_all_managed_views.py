@@ -54,6 +54,15 @@ class UpdateAllManagedViewsEntrypoint(EntrypointInterface):
             default=True,
         )
 
+        parser.add_argument(
+            "--skip_unchanged_views",
+            help="If true, will not update views whose definition and ancestor view "
+            "definitions have not changed since they were last deployed. Defaults to "
+            "false.",
+            type=str_to_bool,
+            default=False,
+        )
+
         return parser
 
     @staticmethod
@@ -65,4 +74,5 @@ class UpdateAllManagedViewsEntrypoint(EntrypointInterface):
             clean_managed_datasets=args.clean_managed_datasets,
             # Should allow slow views if not cleaning managed datasets and is updating is slow.
             allow_slow_views=not args.clean_managed_datasets,
+            skip_unchanged_views=args.skip_unchanged_views,
         )
@@ -186,14 +186,23 @@ class FakeGCSFileSystem(GCSFileSystem):
         with open(self.real_absolute_path_for_path(path), "r", encoding=encoding) as f:
             return f.read()
 
-    def download_as_bytes(self, path: GcsfsFilePath) -> bytes:
+    def download_as_bytes(
+        self,
+        path: GcsfsFilePath,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> bytes:
         """Downloads file contents into memory, returning the contents as bytes
         or raising if the path no-longer exists in the GCS file system"""
         if not self.exists(path):
             raise GCSBlobDoesNotExistError(f"Could not find blob at {path}")
 
         with open(self.real_absolute_path_for_path(path), "rb") as f:
-            return f.read()
+            if start:
+                f.seek(start)
+            if end is None:
+                return f.read()
+            return f.read(max(end - (start or 0) + 1, 0))
 
     def upload_from_string(
         self, path: GcsfsFilePath, contents: str, content_type: str
@@ -19,7 +19,7 @@ import abc
 import logging
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from google.api_core.operation import Operation
 from google.cloud import firestore_admin_v1, firestore_v1
@@ -97,6 +97,13 @@ class FirestoreClient(abc.ABC):
     ) -> None:
         """Deletes documents from a Firestore collection for a specific state that is timestamped before the cutoff."""
 
+    @abc.abstractmethod
+    def get_field_by_document_id(
+        self, collection_path: str, state_code: str, field: str
+    ) -> Dict[str, Any]:
+        """Returns the value of a single field (or None if it is not set) for every document in a
+        Firestore collection for a specific state, keyed by document ID."""
+
 
 class FirestoreClientImpl(FirestoreClient):
     """Base implementation of the FirestoreClient interface."""
@@ -218,6 +225,17 @@ class FirestoreClientImpl(FirestoreClient):
             collection_path,
         )
 
+    def get_field_by_document_id(
+        self, collection_path: str, state_code: str, field: str
+    ) -> Dict[str, Any]:
+        # Project the query onto the single field so that we don't download whole documents
+        query = (
+            self.get_collection(collection_path)
+            .where(filter=FieldFilter("stateCode", "==", state_code))
+            .select([field])
+        )
+        return {doc.id: (doc.to_dict() or {}).get(field) for doc in query.stream()}
+
     def delete_documents_with_state_code(
         self,
         collection_path: str,
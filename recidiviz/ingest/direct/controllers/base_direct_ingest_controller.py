@@ -58,7 +58,10 @@ from recidiviz.ingest.direct.direct_ingest_cloud_task_queue_manager import (
     build_scheduler_task_id,
 )
 from recidiviz.ingest.direct.direct_ingest_regions import DirectIngestRegion
-from recidiviz.ingest.direct.gating import is_ingest_in_dataflow_enabled
+from recidiviz.ingest.direct.gating import (
+    is_ingest_in_dataflow_enabled,
+    is_parallel_parquet_raw_data_import_enabled,
+)
 from recidiviz.ingest.direct.gcs.direct_ingest_gcs_file_system import (
     DirectIngestGCSFileSystem,
 )
@@ -95,7 +98,9 @@ from recidiviz.ingest.direct.metadata.postgres_direct_ingest_instance_status_man
     PostgresDirectIngestInstanceStatusManager,
 )
 from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    PARALLEL_RAW_DATA_UPLOAD_MAX_WORKERS,
     DirectIngestRawFileImportManager,
+    RawDataStagingFormat,
 )
 from recidiviz.ingest.direct.types.cloud_task_args import (
     ExtractAndMergeArgs,
@@ -338,6 +343,9 @@ class BaseDirectIngestController(DirectIngestInstanceStatusChangeListener):
             raw_data_instance=self._raw_data_source_instance,
         )
 
+        parallel_parquet_import_enabled = is_parallel_parquet_raw_data_import_enabled(
+            state_code=self.state_code(), instance=self._raw_data_source_instance
+        )
         self._raw_file_import_manager = DirectIngestRawFileImportManager(
             region=self.region,
             fs=self.fs,
@@ -345,6 +353,16 @@ class BaseDirectIngestController(DirectIngestInstanceStatusChangeListener):
             big_query_client=self.big_query_client,
             csv_reader=self.csv_reader,
             instance=self._raw_data_source_instance,
+            staging_format=(
+                RawDataStagingFormat.PARQUET
+                if parallel_parquet_import_enabled
+                else RawDataStagingFormat.CSV
+            ),
+            max_upload_workers=(
+                PARALLEL_RAW_DATA_UPLOAD_MAX_WORKERS
+                if parallel_parquet_import_enabled
+                else None
+            ),
         )
 
         if not self.is_ingest_in_dataflow_enabled:
@@ -58,3 +58,20 @@ def ingest_pipeline_can_run_in_dag(
     if state_code == StateCode.US_TN and environment.in_gcp_production():
         return False
     return True
+
+
+def is_parallel_parquet_raw_data_import_enabled(
+    state_code: StateCode,
+    instance: DirectIngestInstance,  # pylint: disable=unused-argument
+) -> bool:
+    """Returns whether chunks of raw data files are uploaded to temporary GCS files
+    as Parquet on a pool of worker threads, rather than one at a time as CSV, before
+    they are loaded into BigQuery.
+    """
+    if environment.in_gcp_production():
+        return False
+
+    staging_enabled_states = [
+        StateCode.US_OZ,
+    ]
+    return state_code in staging_enabled_states
@@ -32,6 +32,7 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -47,7 +48,7 @@ from recidiviz.common.attr_mixins import (
     attr_field_type_for_field_name,
 )
 from recidiviz.common.attr_utils import get_non_flat_attribute_class_name
-from recidiviz.common.constants.enum_parser import EnumParser, EnumT
+from recidiviz.common.constants.enum_parser import EnumParser, EnumParsingError, EnumT
 from recidiviz.common.str_field_utils import NormalizedJSON
 from recidiviz.ingest.direct.ingest_mappings.ingest_view_contents_context import (
     IngestViewContentsContext,
@@ -65,6 +66,67 @@ from recidiviz.utils.yaml_dict import YAMLDict
 
 ManifestNodeT = TypeVar("ManifestNodeT")
 
+# A function that parses the value of a compiled manifest node out of a single input
+# row. Calling it is equivalent to calling build_from_row() on the node.
+RowParser = Callable[
+    [Dict[str, str], IngestViewContentsContext], Optional[ManifestNodeT]
+]
+
+# Values of these types are immutable and can be shared between every reference to a
+# variable within a row, or between every row for nodes with a constant value.
+_SHAREABLE_VALUE_TYPES = (str, bool, int, float, Enum)
+
+
+def _is_shareable_value(value: Any) -> bool:
+    """Returns whether a value produced by a manifest node can be shared between
+    every place it is used. Entities (and lists of entities) must be built fresh for
+    each reference so that no object appears in more than one place in the output
+    tree.
+    """
+    return value is None or isinstance(value, _SHAREABLE_VALUE_TYPES)
+
+
+class _ConstantValueContext(IngestViewContentsContext):
+    """Context used to evaluate nodes with a constant value when a manifest is
+    compiled. Those nodes never read environment properties.
+    """
+
+    def get_env_property(self, property_name: str) -> Union[bool, str]:
+        raise ValueError(
+            f"Cannot read environment property [{property_name}] when evaluating a "
+            f"constant value."
+        )
+
+
+# Returned by _constant_value() for nodes whose value differs between rows.
+_NOT_CONSTANT = object()
+
+
+def _constant_value(node: "ManifestNode") -> Any:
+    """Returns the value of the given node if it is the same shareable value for
+    every row, otherwise _NOT_CONSTANT. Nodes that raise are not folded, so that the
+    error is still raised for every row that is parsed.
+    """
+    if not node.has_constant_value():
+        return _NOT_CONSTANT
+    try:
+        value = node.build_from_row({}, _ConstantValueContext())
+    except Exception:
+        return _NOT_CONSTANT
+    return value if _is_shareable_value(value) else _NOT_CONSTANT
+
+
+class ManifestRow(Dict[str, str]):
+    """An ingest view result row that additionally memoizes the values of manifest
+    variables, so that a variable referenced multiple times in a manifest is only
+    evaluated once per row.
+    """
+
+    def __init__(self, row: Dict[str, str]) -> None:
+        super().__init__(row)
+        # Maps (variable name, current $foreach loop value) to the variable value.
+        self.variable_values: Dict[Tuple[str, Optional[str]], Any] = {}
+
 
 @attr.s(kw_only=True)
 class ManifestNode(Generic[ManifestNodeT]):
@@ -96,6 +158,31 @@ class ManifestNode(Generic[ManifestNodeT]):
         in the entity tree, parsed out of the input row.
         """
 
+    def compile_row_parser(self) -> RowParser[ManifestNodeT]:
+        """Compiles this node (and its descendants) into a function that parses the
+        node's value out of a single input row, producing the same result as
+        |build_from_row|. If this node has the same value for every row, that value is
+        computed once here rather than for every row.
+        """
+        value = _constant_value(self)
+        if value is not _NOT_CONSTANT:
+            return lambda row, context: value
+        return self.build_row_parser()
+
+    @abc.abstractmethod
+    def build_row_parser(self) -> RowParser[ManifestNodeT]:
+        """Should be implemented by subclasses to return a function equivalent to
+        |build_from_row|, with all per-node lookups and dispatch resolved up front.
+        Child nodes should be compiled with |compile_row_parser|.
+        """
+
+    def has_constant_value(self) -> bool:
+        """Returns whether this node produces the same value for every row,
+        regardless of the row contents or context. Should be overridden by literal
+        nodes and by nodes whose value is derived only from their children's values.
+        """
+        return False
+
     def columns_referenced(self) -> Set[str]:
         """Returns a set of columns that this node references. Must be overridden by
         subclasses that do not have child nodes.
@@ -148,6 +235,11 @@ class ManifestNode(Generic[ManifestNodeT]):
 
 @attr.s(kw_only=True)
 class VariableManifestNode(ManifestNode[ManifestNodeT]):
+    """Manifest node for a reference to a variable defined in the manifest's
+    `variables` section. Evaluates to the value of the variable's manifest, which is
+    memoized per row (and per $foreach loop iteration) when it is immutable.
+    """
+
     variable_name: str = attr.ib()
     value_manifest: ManifestNode[ManifestNodeT] = attr.ib()
 
@@ -161,7 +253,49 @@ class VariableManifestNode(ManifestNode[ManifestNodeT]):
     def build_from_row(
         self, row: Dict[str, str], context: IngestViewContentsContext
     ) -> Optional[ManifestNodeT]:
-        return self.value_manifest.build_from_row(row, context)
+        if not isinstance(row, ManifestRow):
+            return self.value_manifest.build_from_row(row, context)
+
+        # Variables may reference the $foreach loop value, so values are memoized per
+        # loop iteration.
+        key = (
+            self.variable_name,
+            row.get(ExpandableListItemManifest.FOREACH_LOOP_VALUE_NAME),
+        )
+        if key in row.variable_values:
+            return row.variable_values[key]
+
+        value = self.value_manifest.build_from_row(row, context)
+        if _is_shareable_value(value):
+            row.variable_values[key] = value
+        return value
+
+    def build_row_parser(self) -> RowParser[ManifestNodeT]:
+        variable_name = self.variable_name
+        parse_value = self.value_manifest.compile_row_parser()
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[ManifestNodeT]:
+            if not isinstance(row, ManifestRow):
+                return parse_value(row, context)
+
+            key = (
+                variable_name,
+                row.get(ExpandableListItemManifest.FOREACH_LOOP_VALUE_NAME),
+            )
+            if key in row.variable_values:
+                return row.variable_values[key]
+
+            value = parse_value(row, context)
+            if _is_shareable_value(value):
+                row.variable_values[key] = value
+            return value
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return self.value_manifest.has_constant_value()
 
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.value_manifest]
@@ -237,6 +371,41 @@ class EntityTreeManifest(ManifestNode[EntityT]):
 
         return entity
 
+    def build_row_parser(self) -> RowParser[EntityT]:
+        entity_cls = self.entity_cls
+        deserialize = self.entity_factory_cls.deserialize
+        common_args = self.common_args
+        filter_if_null_field = self.filter_if_null_field
+
+        field_parsers: List[Tuple[str, RowParser]] = []
+        for field_name, field_manifest in self.field_manifests.items():
+            if field_name != filter_if_null_field and (
+                _constant_value(field_manifest) is None
+            ):
+                # Fields that are always null are never passed to the factory.
+                continue
+            field_parsers.append((field_name, field_manifest.compile_row_parser()))
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[EntityT]:
+            args: Dict[str, DeserializableEntityFieldValue] = common_args.copy()
+            for field_name, parse_field in field_parsers:
+                field_value = parse_field(row, context)
+                if field_value is not None:
+                    args[field_name] = field_value
+                elif field_name == filter_if_null_field:
+                    return None
+
+            entity = deserialize(**args)
+
+            if not isinstance(entity, entity_cls):
+                raise ValueError(f"Unexpected type for entity: [{type(entity)}]")
+
+            return entity
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return list(self.field_manifests.values())
 
@@ -509,6 +678,20 @@ class SplitCommaSeparatedListManifest(ManifestNode[List[str]]):
         #  delimiter to be configurable.
         return column_value.split(self.DEFAULT_LIST_VALUE_DELIMITER)
 
+    def build_row_parser(self) -> RowParser[List[str]]:
+        column_name = self.column_name
+        delimiter = self.DEFAULT_LIST_VALUE_DELIMITER
+
+        def parse(
+            row: Dict[str, str], _context: IngestViewContentsContext
+        ) -> List[str]:
+            column_value = row[column_name]
+            if not column_value:
+                return []
+            return column_value.split(delimiter)
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -543,6 +726,20 @@ class SplitJSONListManifest(ManifestNode[List[str]]):
 
         return [json.dumps(item) for item in json.loads(column_value)]
 
+    def build_row_parser(self) -> RowParser[List[str]]:
+        column_name = self.column_name
+
+        def parse(
+            row: Dict[str, str], _context: IngestViewContentsContext
+        ) -> List[str]:
+            column_value = row[column_name]
+            if not column_value:
+                return []
+
+            return [json.dumps(item) for item in json.loads(column_value)]
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -602,6 +799,34 @@ class ExpandableListItemManifest(ManifestNode[List[Entity]]):
                 result.append(entity)
         return result
 
+    def build_row_parser(self) -> RowParser[List[Entity]]:
+        loop_value_name = self.FOREACH_LOOP_VALUE_NAME
+        parse_values = self.values_manifest.compile_row_parser()
+        parse_child_entity = self.child_entity_manifest.compile_row_parser()
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> List[Entity]:
+            values = parse_values(row, context)
+            if values is None:
+                raise ValueError("Unexpected null list value.")
+
+            result = []
+            if loop_value_name in row:
+                raise ValueError(
+                    f"Unexpected {loop_value_name} key value in row: {row}. "
+                    f"Nested loops not supported."
+                )
+            for value in values:
+                row[loop_value_name] = value
+                entity = parse_child_entity(row, context)
+                del row[loop_value_name]
+                if entity:
+                    result.append(entity)
+            return result
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.values_manifest, self.child_entity_manifest]
 
@@ -670,6 +895,33 @@ class ListRelationshipFieldManifest(ManifestNode[List[Entity]]):
                     child_entities.append(child_entity)
         return child_entities
 
+    def build_row_parser(self) -> RowParser[List[Entity]]:
+        # Maps each child manifest's parser to whether it produces a list of entities
+        child_parsers: List[
+            Tuple[Callable[[Dict[str, str], IngestViewContentsContext], Any], bool]
+        ] = [
+            (
+                child_manifest.compile_row_parser(),
+                isinstance(child_manifest, ExpandableListItemManifest),
+            )
+            for child_manifest in self.child_manifests
+        ]
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> List[Entity]:
+            child_entities: List[Entity] = []
+            for parse_child, is_expandable in child_parsers:
+                if is_expandable:
+                    child_entities.extend(parse_child(row, context))
+                else:
+                    child_entity = parse_child(row, context)
+                    if child_entity:
+                        child_entities.append(child_entity)
+            return child_entities
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return self.child_manifests
 
@@ -694,6 +946,10 @@ class DirectMappingFieldManifest(ManifestNode[str]):
     ) -> str:
         return row[self.mapped_column]
 
+    def build_row_parser(self) -> RowParser[str]:
+        mapped_column = self.mapped_column
+        return lambda row, context: row[mapped_column]
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -723,6 +979,13 @@ class BooleanLiteralFieldManifest(ManifestNode[bool]):
     ) -> Optional[bool]:
         return self.literal_value
 
+    def build_row_parser(self) -> RowParser[bool]:
+        literal_value = self.literal_value
+        return lambda row, context: literal_value
+
+    def has_constant_value(self) -> bool:
+        return True
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -755,6 +1018,13 @@ class EnvPropertyManifest(ManifestNode[ManifestNodeT]):
             context.get_env_property(self.env_property_name), self.env_property_type
         )
 
+    def build_row_parser(self) -> RowParser[ManifestNodeT]:
+        env_property_name = self.env_property_name
+        env_property_type = self.env_property_type
+        return lambda row, context: assert_type(
+            context.get_env_property(env_property_name), env_property_type
+        )
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -788,6 +1058,13 @@ class StringLiteralFieldManifest(ManifestNode[str]):
     ) -> Optional[str]:
         return self.literal_value
 
+    def build_row_parser(self) -> RowParser[str]:
+        literal_value = self.literal_value
+        return lambda row, context: literal_value
+
+    def has_constant_value(self) -> bool:
+        return True
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -829,6 +1106,13 @@ class EnumLiteralFieldManifest(ManifestNode[EnumT]):
     ) -> EnumT:
         return self.enum_value
 
+    def build_row_parser(self) -> RowParser[EnumT]:
+        enum_value = self.enum_value
+        return lambda row, context: enum_value
+
+    def has_constant_value(self) -> bool:
+        return True
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -902,6 +1186,41 @@ class EnumMappingManifest(ManifestNode[EnumT]):
             raw_text=self.raw_text_field_manifest.build_from_row(row, context)
         )
 
+    def build_row_parser(self) -> RowParser[EnumT]:
+        enum_parser = self.enum_parser
+        parse_raw_text = self.raw_text_field_manifest.compile_row_parser()
+        if enum_parser.mapper_fn or not enum_parser.raw_text_mappings:
+            return lambda row, context: enum_parser.parse(
+                raw_text=parse_raw_text(row, context)
+            )
+
+        # Resolve the direct mappings and ignores into a single lookup, where ignored
+        # raw text values map to None.
+        enum_cls = enum_parser.enum_cls
+        enum_values_by_raw_text: Dict[str, Optional[EnumT]] = {
+            **enum_parser.raw_text_mappings,
+            **{raw_text: None for raw_text in enum_parser.ignored_raw_text_values},
+        }
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[EnumT]:
+            raw_text = parse_raw_text(row, context)
+            if not raw_text:
+                return None
+            if raw_text in enum_values_by_raw_text:
+                return enum_values_by_raw_text[raw_text]
+            raise EnumParsingError(enum_cls, raw_text)
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        # Custom parser functions are not assumed to always return the same value.
+        return (
+            self.enum_parser.mapper_fn is None
+            and self.raw_text_field_manifest.has_constant_value()
+        )
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.raw_text_field_manifest]
 
@@ -1089,6 +1408,21 @@ class CustomFunctionManifest(ManifestNode[ManifestNodeT]):
         }
         return self.function(**kwargs)
 
+    def build_row_parser(self) -> RowParser[ManifestNodeT]:
+        function = self.function
+        kwarg_parsers = [
+            (key, manifest.compile_row_parser())
+            for key, manifest in self.kwarg_manifests.items()
+        ]
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[ManifestNodeT]:
+            kwargs = {key: parse_arg(row, context) for key, parse_arg in kwarg_parsers}
+            return function(**kwargs)
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return list(self.kwarg_manifests.values())
 
@@ -1181,6 +1515,27 @@ class SerializedJSONDictFieldManifest(ManifestNode[NormalizedJSON]):
                 return None
         return NormalizedJSON(**result_dict)
 
+    def build_row_parser(self) -> RowParser[NormalizedJSON]:
+        drop_all_empty = self.drop_all_empty
+        key_parsers = [
+            (key, manifest.compile_row_parser())
+            for key, manifest in self.key_to_manifest_map.items()
+        ]
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[NormalizedJSON]:
+            result_dict = {
+                key: parse_value(row, context) for key, parse_value in key_parsers
+            }
+            if drop_all_empty:
+                has_non_empty_value = any(value for value in result_dict.values())
+                if not has_non_empty_value:
+                    return None
+            return NormalizedJSON(**result_dict)
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return list(self.key_to_manifest_map.values())
 
@@ -1216,6 +1571,19 @@ class JSONExtractKeyManifest(ManifestNode[str]):
         json_dict = json.loads(json_str)
         return json_dict[self.json_key]
 
+    def build_row_parser(self) -> RowParser[str]:
+        json_key = self.json_key
+        parse_json = self.json_manifest.compile_row_parser()
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> str:
+            json_str = parse_json(row, context)
+            if json_str is None:
+                raise ValueError(f"Expected nonnull JSON string for row: {row}")
+            json_dict = json.loads(json_str)
+            return json_dict[json_key]
+
+        return parse
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.json_manifest]
 
@@ -1298,6 +1666,33 @@ class ConcatenatedStringsManifest(ManifestNode[str]):
 
         return self.separator.join(values)
 
+    def build_row_parser(self) -> RowParser[str]:
+        separator = self.separator
+        null_value = str(None).upper() if self.include_nulls else None
+        value_parsers = [
+            value_manifest.compile_row_parser()
+            for value_manifest in self.value_manifests
+        ]
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> str:
+            values = []
+            for parse_value in value_parsers:
+                value = parse_value(row, context)
+                if value:
+                    values.append(value)
+                elif null_value:
+                    values.append(null_value)
+
+            return separator.join(values)
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(
+            value_manifest.has_constant_value()
+            for value_manifest in self.value_manifests
+        )
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return self.value_manifests
 
@@ -1379,6 +1774,32 @@ class PhysicalAddressManifest(ManifestNode[str]):
 
         return ", ".join([s for s in address_parts if s])
 
+    def build_row_parser(self) -> RowParser[str]:
+        parse_address_1 = self.address_1_manifest.compile_row_parser()
+        parse_address_2 = self.address_2_manifest.compile_row_parser()
+        parse_city = self.city_manifest.compile_row_parser()
+        parse_state = self.state_manifest.compile_row_parser()
+        parse_zip = self.zip_manifest.compile_row_parser()
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> str:
+            state_and_zip_parts = [
+                parse_state(row, context),
+                parse_zip(row, context),
+            ]
+            address_parts: List[Optional[str]] = [
+                parse_address_1(row, context),
+                parse_address_2(row, context),
+                parse_city(row, context),
+                " ".join([s for s in state_and_zip_parts if s]),
+            ]
+
+            return ", ".join([s for s in address_parts if s])
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [
             self.address_1_manifest,
@@ -1479,6 +1900,9 @@ class PersonNameManifest(ManifestNode[NormalizedJSON]):
     ) -> Optional[NormalizedJSON]:
         return self.name_json_manifest.build_from_row(row, context)
 
+    def build_row_parser(self) -> RowParser[NormalizedJSON]:
+        return self.name_json_manifest.compile_row_parser()
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.name_json_manifest]
 
@@ -1594,6 +2018,27 @@ class ContainsConditionManifest(ManifestNode[bool]):
 
         return value in options
 
+    def build_row_parser(self) -> RowParser[bool]:
+        parse_value = self.value_manifest.compile_row_parser()
+        constant_options = {_constant_value(m) for m in self.options_manifests}
+        if _NOT_CONSTANT not in constant_options:
+            # The options are usually all literals, so the set only needs to be built
+            # once.
+            return lambda row, context: parse_value(row, context) in constant_options
+
+        option_parsers = [m.compile_row_parser() for m in self.options_manifests]
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> bool:
+            value = parse_value(row, context)
+            options = {parse_option(row, context) for parse_option in option_parsers}
+
+            return value in options
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.value_manifest, *self.options_manifests]
 
@@ -1645,6 +2090,13 @@ class IsNullConditionManifest(ManifestNode[bool]):
         value = self.value_manifest.build_from_row(row, context)
         return not bool(value)
 
+    def build_row_parser(self) -> RowParser[bool]:
+        parse_value = self.value_manifest.compile_row_parser()
+        return lambda row, context: not bool(parse_value(row, context))
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.value_manifest]
 
@@ -1699,6 +2151,24 @@ class EqualsConditionManifest(ManifestNode[bool]):
             for value_manifest in self.value_manifests[1:]
         )
 
+    def build_row_parser(self) -> RowParser[bool]:
+        parse_first_value, *other_value_parsers = [
+            value_manifest.compile_row_parser()
+            for value_manifest in self.value_manifests
+        ]
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> bool:
+            first_value = parse_first_value(row, context)
+            for parse_value in other_value_parsers:
+                if first_value != parse_value(row, context):
+                    return False
+            return True
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return self.value_manifests
 
@@ -1738,6 +2208,23 @@ class AndConditionManifest(ManifestNode[bool]):
             for value_manifest in self.condition_manifests
         )
 
+    def build_row_parser(self) -> RowParser[bool]:
+        condition_parsers = [
+            condition_manifest.compile_row_parser()
+            for condition_manifest in self.condition_manifests
+        ]
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> bool:
+            for parse_condition in condition_parsers:
+                if not parse_condition(row, context):
+                    return False
+            return True
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return self.condition_manifests
 
@@ -1777,12 +2264,31 @@ class OrConditionManifest(ManifestNode[bool]):
             for value_manifest in self.condition_manifests
         )
 
+    def build_row_parser(self) -> RowParser[bool]:
+        condition_parsers = [
+            condition_manifest.compile_row_parser()
+            for condition_manifest in self.condition_manifests
+        ]
+
+        def parse(row: Dict[str, str], context: IngestViewContentsContext) -> bool:
+            for parse_condition in condition_parsers:
+                if parse_condition(row, context):
+                    return True
+            return False
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return self.condition_manifests
 
 
 @attr.s(kw_only=True)
 class InvertConditionManifest(ManifestNode[bool]):
+    """Manifest node that returns the inverse of a boolean condition."""
+
     # Manifest node key for inverting any ManifestNode[bool]
     NOT_CONDITION_KEY = "$not"
 
@@ -1806,6 +2312,13 @@ class InvertConditionManifest(ManifestNode[bool]):
     ) -> bool:
         return not self.condition_manifest.build_from_row(row, context)
 
+    def build_row_parser(self) -> RowParser[bool]:
+        parse_condition = self.condition_manifest.compile_row_parser()
+        return lambda row, context: not parse_condition(row, context)
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return [self.condition_manifest]
 
@@ -1831,6 +2344,13 @@ class BooleanLiteralManifest(ManifestNode[bool]):
     ) -> bool:
         return self.value
 
+    def build_row_parser(self) -> RowParser[bool]:
+        value = self.value
+        return lambda row, context: value
+
+    def has_constant_value(self) -> bool:
+        return True
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         return []
 
@@ -1918,6 +2438,37 @@ class BooleanConditionManifest(ManifestNode[ManifestNodeT]):
 
         return self.else_manifest.build_from_row(row, context)
 
+    def build_row_parser(self) -> RowParser[ManifestNodeT]:
+        parse_then = self.then_manifest.compile_row_parser()
+        parse_else: RowParser[ManifestNodeT] = (
+            self.else_manifest.compile_row_parser()
+            if self.else_manifest
+            else lambda row, context: None
+        )
+
+        constant_condition = _constant_value(self.condition_manifest)
+        if constant_condition is not _NOT_CONSTANT and constant_condition is not None:
+            # Only one branch can ever be taken.
+            return parse_then if constant_condition else parse_else
+
+        parse_condition = self.condition_manifest.compile_row_parser()
+
+        def parse(
+            row: Dict[str, str], context: IngestViewContentsContext
+        ) -> Optional[ManifestNodeT]:
+            condition = parse_condition(row, context)
+            if condition is None:
+                raise ValueError("Condition manifest should not return None.")
+
+            if condition:
+                return parse_then(row, context)
+            return parse_else(row, context)
+
+        return parse
+
+    def has_constant_value(self) -> bool:
+        return all(child.has_constant_value() for child in self.child_manifest_nodes())
+
     def child_manifest_nodes(self) -> List["ManifestNode"]:
         manifests: List[ManifestNode] = [self.condition_manifest, self.then_manifest]
         if self.else_manifest:
@@ -18,7 +18,7 @@
 manifest file for this ingest view.
 """
 import os
-from typing import Callable, Dict, Iterator, List, Optional, Set, Type, Union
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Type, Union
 
 import attr
 from more_itertools import one
@@ -33,6 +33,8 @@ from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
     EntityTreeManifest,
     EntityTreeManifestFactory,
     ManifestNode,
+    ManifestRow,
+    RowParser,
     VariableManifestNode,
     build_manifest_from_raw_typed,
 )
@@ -60,8 +62,31 @@ class IngestViewManifest:
     should_launch_manifest: ManifestNode[bool]
     output: EntityTreeManifest
 
+    # The set of columns every input row must have, computed once up front rather than
+    # for every row parsed.
+    expected_columns: FrozenSet[str] = attr.ib(init=False)
+
+    # The manifest ASTs compiled into functions that parse a single row, built once
+    # per view so that every row is parsed without walking the AST.
+    should_launch_row_parser: RowParser[bool] = attr.ib(
+        init=False, eq=False, repr=False
+    )
+    output_row_parser: RowParser[Entity] = attr.ib(init=False, eq=False, repr=False)
+
+    @expected_columns.default
+    def _expected_columns_default(self) -> FrozenSet[str]:
+        return frozenset(self.input_columns)
+
+    @should_launch_row_parser.default
+    def _should_launch_row_parser_default(self) -> RowParser[bool]:
+        return self.should_launch_manifest.compile_row_parser()
+
+    @output_row_parser.default
+    def _output_row_parser_default(self) -> RowParser[Entity]:
+        return self.output.compile_row_parser()
+
     def should_launch(self, context: IngestViewContentsContext) -> bool:
-        should_launch_value = self.should_launch_manifest.build_from_row({}, context)
+        should_launch_value = self.should_launch_row_parser({}, context)
         return should_launch_value if should_launch_value is not None else True
 
     def hydrated_entity_classes(self) -> Set[Type[Entity]]:
@@ -81,7 +106,7 @@ class IngestViewManifest:
         ] = None,
     ) -> List[Entity]:
         """Parses query results from this manifest's ingest view into a list of
-        entities.
+        entities, using the compiled |output_row_parser| for each row.
         """
         result = []
         if not self.should_launch(context):
@@ -90,11 +115,14 @@ class IngestViewManifest:
                 f"because should_launch is false."
             )
 
+        expected_columns = self.expected_columns
+        parse_output = self.output_row_parser
         for i, row in enumerate(contents_iterator):
-            self._validate_row_columns(i, row, set(self.input_columns))
+            if row.keys() != expected_columns:
+                self._validate_row_columns(i, row, set(expected_columns))
 
             try:
-                output_tree = self.output.build_from_row(row, context)
+                output_tree = parse_output(ManifestRow(row), context)
             except Exception as e:
                 if result_callable:
                     result_callable(i, row, e)
@@ -19,10 +19,14 @@ import csv
 import datetime
 import logging
 import os
+from enum import Enum
 from types import ModuleType
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytz
 from google.api_core import retry
 from google.cloud import bigquery
@@ -34,6 +38,7 @@ from recidiviz.big_query.big_query_client import (
     BigQueryClient,
 )
 from recidiviz.big_query.big_query_utils import normalize_column_name_for_bq
+from recidiviz.cloud_storage.gcs_file_system_impl import generate_random_temp_path
 from recidiviz.cloud_storage.gcsfs_csv_reader import (
     UTF_8_ENCODING,
     GcsfsCsvReader,
@@ -45,6 +50,7 @@ from recidiviz.cloud_storage.gcsfs_csv_reader_delegates import (
 )
 from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath, GcsfsFilePath
 from recidiviz.common.constants.states import StateCode
+from recidiviz.common.io.local_file_contents_handle import LocalFileContentsHandle
 from recidiviz.common.retry_predicate import google_api_retry_predicate
 from recidiviz.ingest.direct import regions
 from recidiviz.ingest.direct.dataset_config import (
@@ -82,6 +88,31 @@ from recidiviz.ingest.direct.views.raw_data_diff_query_builder import (
 from recidiviz.persistence.entity.operations.entities import DirectIngestRawFileMetadata
 from recidiviz.utils import metadata
 
+# The number of threads that transform and upload chunks of a raw data file when chunks
+# are uploaded in parallel.
+PARALLEL_RAW_DATA_UPLOAD_MAX_WORKERS = 4
+
+
+class RawDataStagingFormat(Enum):
+    """The format that chunks of a raw data file are written to in temporary GCS files
+    before they are loaded into BigQuery.
+    """
+
+    # Chunks are re-encoded as CSV (this is the default)
+    CSV = "csv"
+
+    # Chunks are written as Parquet with a typed schema, which is smaller than the
+    # equivalent CSV and does not need to be re-parsed as text by BigQuery.
+    PARQUET = "parquet"
+
+    @property
+    def bq_source_format(self) -> str:
+        if self is RawDataStagingFormat.CSV:
+            return bigquery.SourceFormat.CSV
+        if self is RawDataStagingFormat.PARQUET:
+            return bigquery.SourceFormat.PARQUET
+        raise ValueError(f"Unexpected staging format [{self}]")
+
 
 class DirectIngestRawFileReader:
     """Reads a raw CSV using the defined file config."""
@@ -97,6 +128,9 @@ class DirectIngestRawFileReader:
         self.region_raw_file_config = region_raw_file_config
         self.allow_incomplete_configs = allow_incomplete_configs
 
+        # The encoding the most recent file for each file tag was read with
+        self._encodings_by_file_tag: Dict[str, str] = {}
+
     def read_raw_file_from_gcs(
         self,
         path: GcsfsFilePath,
@@ -106,13 +140,22 @@ class DirectIngestRawFileReader:
         parts = filename_parts_from_path(path)
         file_config = self.region_raw_file_config.raw_file_configs[parts.file_tag]
 
-        columns = self._get_validated_columns(path, file_config)
+        encodings_to_try = file_config.encodings_to_try()
+        if self._encodings_by_file_tag.get(parts.file_tag) != encodings_to_try[0]:
+            # Unless the last file with this tag could be read with the first encoding
+            # we try, sample the file to rule out encodings that would fail part way
+            # through a full read.
+            encodings_to_try = self.csv_reader.filter_encodings_by_sample(
+                path, encodings_to_try
+            )
 
-        self.csv_reader.streaming_read(
+        columns = self._get_validated_columns(path, file_config, encodings_to_try)
+
+        self._encodings_by_file_tag[parts.file_tag] = self.csv_reader.streaming_read(
             path,
             delegate=delegate,
             chunk_size=chunk_size_override or file_config.import_chunk_size_rows,
-            encodings_to_try=file_config.encodings_to_try(),
+            encodings_to_try=encodings_to_try,
             index_col=False,
             header=0 if not file_config.infer_columns_from_config else None,
             names=columns,
@@ -121,7 +164,10 @@ class DirectIngestRawFileReader:
         )
 
     def _get_validated_columns(
-        self, path: GcsfsFilePath, file_config: DirectIngestRawFileConfig
+        self,
+        path: GcsfsFilePath,
+        file_config: DirectIngestRawFileConfig,
+        encodings_to_try: List[str],
     ) -> List[str]:
         """Returns a list of normalized column names for the raw data file at the given path."""
 
@@ -130,7 +176,7 @@ class DirectIngestRawFileReader:
             path,
             delegate=delegate,
             chunk_size=1,
-            encodings_to_try=file_config.encodings_to_try(),
+            encodings_to_try=encodings_to_try,
             nrows=1,
             **self._common_read_csv_kwargs(file_config),
         )
@@ -252,7 +298,13 @@ class DirectIngestRawFileImportManager:
         region_raw_file_config: Optional[DirectIngestRegionRawFileConfig] = None,
         sandbox_dataset_prefix: Optional[str] = None,
         allow_incomplete_configs: bool = False,
+        staging_format: RawDataStagingFormat = RawDataStagingFormat.CSV,
+        max_upload_workers: Optional[int] = None,
     ):
+        """If |max_upload_workers| is set, chunks of each raw file are transformed and
+        uploaded to temporary GCS files by that many threads while the file continues
+        to be read. Otherwise, chunks are uploaded one at a time as they are read.
+        """
         self.region = region
         self.state_code = StateCode(self.region.region_code.upper())
         self.fs = fs
@@ -282,6 +334,8 @@ class DirectIngestRawFileImportManager:
             instance=instance,
             sandbox_dataset_prefix=sandbox_dataset_prefix,
         )
+        self.staging_format = staging_format
+        self.max_upload_workers = max_upload_workers
 
     def import_raw_file_to_big_query(
         self,
@@ -374,6 +428,8 @@ class DirectIngestRawFileImportManager:
             file_metadata,
             self.temp_output_directory_path,
             augment_with_metadata_columns,
+            staging_format=self.staging_format,
+            max_upload_workers=self.max_upload_workers,
         )
 
         self.raw_file_reader.read_raw_file_from_gcs(path, delegate)
@@ -433,6 +489,7 @@ class DirectIngestRawFileImportManager:
                     columns=columns,
                 ),
                 write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+                source_format=self.staging_format.bq_source_format,
             )
         except Exception as e:
             logging.error("Failed to start load job - cleaning up temp paths")
@@ -627,6 +684,11 @@ class DirectIngestRawFileImportManager:
         return schema
 
 
+# Applies str.strip() to every element of a numpy object array, so that whitespace is
+# stripped exactly as str.strip() would without a Python-level function call per cell.
+_strip_whitespace = np.frompyfunc(str.strip, 1, 1)
+
+
 class DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
     SplittingGcsfsCsvReaderDelegate
 ):
@@ -641,21 +703,31 @@ class DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
         file_metadata: DirectIngestRawFileMetadata,
         temp_output_directory_path: GcsfsDirectoryPath,
         augment_with_metadata_columns: bool,
+        staging_format: RawDataStagingFormat = RawDataStagingFormat.CSV,
+        max_upload_workers: Optional[int] = None,
     ):
-        super().__init__(path, fs, include_header=False)
+        super().__init__(
+            path, fs, include_header=False, max_upload_workers=max_upload_workers
+        )
         self.file_metadata = file_metadata
         self.temp_output_directory_path = temp_output_directory_path
         self.augment_with_metadata_columns = augment_with_metadata_columns
+        self.staging_format = staging_format
 
     def transform_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        # Stripping white space from all fields
-        df = df.applymap(lambda x: x.strip())
+        # Stripping white space from all fields. All values are read as strings, so
+        # we operate on the whole chunk as a single object array rather than cell by
+        # cell through the DataFrame.
+        values = _strip_whitespace(df.to_numpy(dtype=object))
 
         num_rows_before_filter = df.shape[0]
 
-        # Filter out rows where ALL values are null / empty string. Solution largely
-        # copied from https://stackoverflow.com/a/41401892.
-        df = df[~pd.isnull(df.applymap(lambda x: None if x == "" else x)).all(axis=1)]
+        # Filter out rows where ALL values are null / empty string.
+        is_empty = (values == "") | pd.isnull(values)
+        has_values = ~is_empty.all(axis=1)
+        df = pd.DataFrame(
+            values[has_values], index=df.index[has_values], columns=df.columns
+        )
 
         num_rows_after_filter = df.shape[0]
         if num_rows_before_filter > num_rows_after_filter:
@@ -674,7 +746,21 @@ class DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
         name, _extension = os.path.splitext(self.path.file_name)
 
         return GcsfsFilePath.from_directory_and_file_name(
-            self.temp_output_directory_path, f"temp_{name}_{chunk_num}.csv"
+            self.temp_output_directory_path,
+            f"temp_{name}_{chunk_num}.{self.staging_format.value}",
+        )
+
+    def write_dataframe(self, output_path: GcsfsFilePath, df: pd.DataFrame) -> None:
+        if self.staging_format is RawDataStagingFormat.CSV:
+            super().write_dataframe(output_path, df)
+            return
+
+        local_path = generate_random_temp_path()
+        pq.write_table(raw_data_df_to_arrow_table(df), local_path)
+        self.fs.upload_from_contents_handle_stream(
+            path=output_path,
+            contents_handle=LocalFileContentsHandle(local_path, cleanup_file=True),
+            content_type="application/octet-stream",
         )
 
     @staticmethod
@@ -752,6 +838,37 @@ def augment_raw_data_df_with_metadata_columns(
     return raw_data_df
 
 
+def raw_data_df_to_arrow_table(raw_data_df: pd.DataFrame) -> pa.Table:
+    """Converts a transformed chunk of raw data to an Arrow table whose types match the
+    raw data table schema. Empty strings are converted to nulls, matching how BigQuery
+    loads empty CSV values.
+    """
+    fields = []
+    arrays = []
+    for name in raw_data_df.columns:
+        if name == FILE_ID_COL_NAME:
+            data_type = pa.int64()
+        elif name == UPDATE_DATETIME_COL_NAME:
+            # Timestamps without a timezone are loaded into DATETIME columns
+            data_type = pa.timestamp("us")
+        elif name == IS_DELETED_COL_NAME:
+            data_type = pa.bool_()
+        else:
+            values = raw_data_df[name].to_numpy(dtype=object)
+            fields.append(pa.field(name, pa.string()))
+            arrays.append(
+                pa.array(
+                    values, type=pa.string(), mask=(values == "") | pd.isnull(values)
+                )
+            )
+            continue
+
+        fields.append(pa.field(name, data_type, nullable=False))
+        arrays.append(pa.array(raw_data_df[name].to_numpy(), type=data_type))
+
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
 _RAW_TABLE_CONFIGS_BY_STATE = {}
 
 
@@ -18,9 +18,10 @@
 
 import calendar
 from datetime import date
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 
-from thefuzz import fuzz
+from rapidfuzz import fuzz as rapidfuzz_fuzz
+from rapidfuzz import process as rapidfuzz_process
 
 from recidiviz.common.text_analysis import (
     REMOVE_MULTIPLE_WHITESPACES,
@@ -57,6 +58,48 @@ def get_annual_year_from_fiscal_year(fiscal_year: str) -> Optional[str]:
     return fiscal_year[0 : fiscal_year.index("-")]
 
 
+class FuzzyOptionMatcher:
+    """Fuzzy matches input text against a fixed list of options. The normalized form of
+    each option is computed once, and the best option for each input text is memoized,
+    so a single matcher can be reused for every cell of an uploaded sheet.
+    """
+
+    def __init__(self, analyzer: TextAnalyzer, options: Sequence[str]) -> None:
+        self.analyzer = analyzer
+        self.options = list(options)
+        self._normalized_options = [self._normalize(option) for option in self.options]
+        self._text_to_best_option_and_score: Dict[str, Tuple[str, int]] = {}
+
+    def _normalize(self, text: str) -> str:
+        return self.analyzer.normalize_text(
+            text, stem_tokens=True, normalizers=NORMALIZERS
+        )
+
+    def get_best_option_and_score(self, text: str) -> Tuple[str, int]:
+        """Returns the option with the highest match score against the input text,
+        along with that score. If multiple options have the highest score, returns the
+        first of them.
+        """
+        if text not in self._text_to_best_option_and_score:
+            results = rapidfuzz_process.extract(
+                self._normalize(text),
+                self._normalized_options,
+                scorer=rapidfuzz_fuzz.ratio,
+                limit=None,
+            )
+            # thefuzz's fuzz.ratio() rounds the rapidfuzz score to the nearest integer,
+            # so round the same way to break ties between options consistently.
+            best_score = max(round(score) for _, score, _ in results)
+            best_index = min(
+                index for _, score, index in results if round(score) == best_score
+            )
+            self._text_to_best_option_and_score[text] = (
+                self.options[best_index],
+                best_score,
+            )
+        return self._text_to_best_option_and_score[text]
+
+
 def fuzzy_match_against_options(
     analyzer: TextAnalyzer,
     text: str,
@@ -65,22 +108,28 @@ def fuzzy_match_against_options(
     metric_key_to_errors: Dict[Optional[str], List[JusticeCountsBulkUploadException]],
     metric_key: Optional[str] = None,
     time_range: Optional[Tuple[date, date]] = None,
+    fuzzy_option_matchers: Optional[Dict[Tuple[str, ...], FuzzyOptionMatcher]] = None,
 ) -> str:
     """Given a piece of input text and a list of options, uses
     fuzzy matching to calculate a match score between the input
     text and each option. Returns the option with the highest
     score, as long as the score is above a cutoff.
+
+    If fuzzy_option_matchers is given, the matcher for the options is reused from
+    (or added to) it, so that the options are normalized and each input text is
+    matched only once per upload.
     """
-    option_to_score = {
-        option: fuzz.ratio(  # type: ignore[attr-defined]
-            analyzer.normalize_text(text, stem_tokens=True, normalizers=NORMALIZERS),
-            analyzer.normalize_text(option, stem_tokens=True, normalizers=NORMALIZERS),
+    if fuzzy_option_matchers is None:
+        fuzzy_option_matchers = {}
+    options_key = tuple(options)
+    if options_key not in fuzzy_option_matchers:
+        fuzzy_option_matchers[options_key] = FuzzyOptionMatcher(
+            analyzer=analyzer, options=options
         )
-        for option in options
-    }
-
-    best_option = max(option_to_score, key=option_to_score.get)  # type: ignore[arg-type]
-    if option_to_score[best_option] < FUZZY_MATCHING_SCORE_CUTOFF:
+    best_option, best_score = fuzzy_option_matchers[
+        options_key
+    ].get_best_option_and_score(text)
+    if best_score < FUZZY_MATCHING_SCORE_CUTOFF:
         category_not_recognized_warning = JusticeCountsBulkUploadException(
             title=f"{category_name} Not Recognized",
             description=f"\"{text}\" is not a valid value for {category_name}. The valid values for this column are {', '.join(filter(None, options))}.",
@@ -99,6 +148,7 @@ def get_column_value(
     analyzer: TextAnalyzer,
     metric_key_to_errors: Dict[Optional[str], List[JusticeCountsBulkUploadException]],
     metric_key: Optional[str] = None,
+    fuzzy_option_matchers: Optional[Dict[Tuple[str, ...], FuzzyOptionMatcher]] = None,
 ) -> Any:
     """Given a row, a column name, and a column type, attempts to
     extract a value of the given type from the row."""
@@ -122,6 +172,7 @@ def get_column_value(
                 month=column_value,
                 metric_key_to_errors=metric_key_to_errors,
                 metric_key=metric_key,
+                fuzzy_option_matchers=fuzzy_option_matchers,
             )
             value = column_type(column_value)
         elif column_name == "year" and "-" in str(column_value):
@@ -150,6 +201,7 @@ def get_month_value_from_string(
     text_analyzer: TextAnalyzer,
     metric_key_to_errors: Dict[Optional[str], List[JusticeCountsBulkUploadException]],
     metric_key: Optional[str] = None,
+    fuzzy_option_matchers: Optional[Dict[Tuple[str, ...], FuzzyOptionMatcher]] = None,
 ) -> int:
     """Takes as input a string and attempts to find the corresponding month
     index using the calendar module's month_names enum. For instance,
@@ -163,5 +215,6 @@ def get_month_value_from_string(
             options=MONTH_NAMES,
             metric_key_to_errors=metric_key_to_errors,
             metric_key=metric_key,
+            fuzzy_option_matchers=fuzzy_option_matchers,
         )
     return MONTH_NAMES.index(column_value)
@@ -17,16 +17,17 @@
 """Functionality for bulk upload of a spreadsheet into the Justice Counts database."""
 
 import datetime
-import math
 from collections import defaultdict
 from itertools import groupby
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-import pandas as pd
 from sqlalchemy.orm import Session
 
 from recidiviz.common.text_analysis import TextAnalyzer
-from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import get_column_value
+from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import (
+    FuzzyOptionMatcher,
+    get_column_value,
+)
 from recidiviz.justice_counts.bulk_upload.time_range_uploader import TimeRangeUploader
 from recidiviz.justice_counts.datapoint import DatapointInterface, DatapointUniqueKey
 from recidiviz.justice_counts.exceptions import (
@@ -54,6 +55,7 @@ class SpreadsheetUploader:
     def __init__(
         self,
         text_analyzer: TextAnalyzer,
+        fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher],
         system: schema.System,
         agency: schema.Agency,
         metric_key_to_agency_datapoints: Dict[str, List[schema.Datapoint]],
@@ -70,6 +72,7 @@ class SpreadsheetUploader:
         user_account: Optional[schema.UserAccount] = None,
     ) -> None:
         self.text_analyzer = text_analyzer
+        self.fuzzy_option_matchers = fuzzy_option_matchers
         self.system = system
         self.agency = agency
         self.user_account = user_account
@@ -85,7 +88,7 @@ class SpreadsheetUploader:
     def upload_sheet(
         self,
         session: Session,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         invalid_sheet_names: List[str],
         metric_key_to_datapoint_jsons: Dict[str, List[DatapointJson]],
         metric_key_to_errors: Dict[
@@ -101,7 +104,10 @@ class SpreadsheetUploader:
         contain metrics for one system. In the case of supervision,
         the sheet could contain metrics for supervision, parole, or probation.
         This is indicated by the `system` column. In this case, we break up
-        the rows by system, and then ingest one system at a time."""
+        the rows by system, and then ingest one system at a time.
+        Rows may be passed in as they are read from the file. They are grouped by
+        time range before they are uploaded, and the rows for each time range are
+        released once that time range has been uploaded."""
 
         if len(self.child_agency_name_to_agency) > 0:
             agency_name_to_rows = self._get_agency_name_to_rows(
@@ -172,15 +178,19 @@ class SpreadsheetUploader:
             )
         )
 
-        for curr_agency_name, current_rows in agency_name_to_rows.items():
-            # For child agencies, update current_rows to not include columns with NaN values
+        # Pop the rows for each agency, so that they are released once uploaded.
+        for curr_agency_name in list(agency_name_to_rows.keys()):
+            current_rows = agency_name_to_rows.pop(curr_agency_name)
+            # For child agencies, update current_rows to not include columns with empty values
             # since different child agencies can have different metric configs. For example,
             # Child Agency 1 can report data monthly while Child Agency 2 can report data
             # annually. So the same sheet may have a 'month' column filled out for some
             # child agencies, and not for others.
-            current_rows = (
-                pd.DataFrame(current_rows).dropna(axis=1).to_dict(orient="records")
-            )
+            columns = _get_columns_without_empty_values(current_rows)
+            current_rows = [
+                {column: value for column, value in row.items() if column in columns}
+                for row in current_rows
+            ]
             if self.system == schema.System.SUPERVISION:
                 system_to_rows = self._get_system_to_rows(
                     rows=current_rows,
@@ -228,10 +238,10 @@ class SpreadsheetUploader:
         ] = None,
     ) -> None:
         """Uploads supervision rows one system at a time."""
-        for current_system, current_rows in system_to_rows.items():
+        for current_system in list(system_to_rows.keys()):
             self._upload_rows(
                 session=session,
-                rows=current_rows,
+                rows=system_to_rows.pop(current_system),
                 system=current_system,
                 invalid_sheet_names=invalid_sheet_names,
                 metric_key_to_datapoint_jsons=metric_key_to_datapoint_jsons,
@@ -245,7 +255,7 @@ class SpreadsheetUploader:
     def _upload_rows(
         self,
         session: Session,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         system: schema.System,
         invalid_sheet_names: List[str],
         metric_key_to_datapoint_jsons: Dict[str, List[DatapointJson]],
@@ -308,7 +318,7 @@ class SpreadsheetUploader:
     def _upload_rows_for_metricfile(
         self,
         session: Session,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         metricfile: MetricFile,
         metric_key_to_errors: Dict[
             Optional[str], List[JusticeCountsBulkUploadException]
@@ -368,8 +378,9 @@ class SpreadsheetUploader:
         # Step 1: Warn if there are unexpected columns in the file
         # actual_columns is a set of all of the column names that have been uploaded by the user
         # we are filtering out 'Unnamed: 0' because this is the column name of the index column
-        # the index column is produced when the excel file is converted to a pandas df
-        column_names = pd.DataFrame(rows).dropna(axis=1).columns
+        # the index column is produced when a pandas df is saved to an excel file
+        rows = list(rows)
+        column_names = _get_columns_without_empty_values(rows)
         actual_columns = {col.lower() for col in column_names if col != "Unnamed: 0"}
         metric_key_to_errors = self._check_expected_columns(
             metricfile=metricfile,
@@ -387,6 +398,8 @@ class SpreadsheetUploader:
             metric_key_to_errors=metric_key_to_errors,
             metric_key=metricfile.definition.key,
         )
+        # The rows are now only held by rows_by_time_range.
+        del rows
         # Step 3: For each time range represented in the file, convert the
         # reported data into a MetricInterface object. If a report already
         # exists for this time range, update it with the MetricInterface.
@@ -398,7 +411,9 @@ class SpreadsheetUploader:
             else self.child_agency_name_to_agency[child_agency_name]
         )
 
-        for time_range, rows_for_this_time_range in rows_by_time_range.items():
+        # Pop the rows for each time range, so that they are released once uploaded.
+        for time_range in list(rows_by_time_range.keys()):
+            rows_for_this_time_range = rows_by_time_range.pop(time_range)
             try:
                 time_range_uploader = TimeRangeUploader(
                     time_range=time_range,
@@ -407,6 +422,7 @@ class SpreadsheetUploader:
                     user_account=self.user_account,
                     existing_datapoints_dict=self.existing_datapoints_dict,
                     text_analyzer=self.text_analyzer,
+                    fuzzy_option_matchers=self.fuzzy_option_matchers,
                     metricfile=metricfile,
                     agency_name_to_metric_key_to_timerange_to_total_value=self.agency_name_to_metric_key_to_timerange_to_total_value,
                 )
@@ -578,7 +594,7 @@ class SpreadsheetUploader:
 
     def _get_rows_by_time_range(
         self,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         reporting_frequency: ReportingFrequency,
         custom_starting_month: Optional[int],
         metric_key_to_errors: Dict[
@@ -594,8 +610,9 @@ class SpreadsheetUploader:
         rows_by_time_range = defaultdict(list)
         time_range_to_year_month = {}
         for row in rows:
-            # remove whitespace from column headers
-            row = {k.strip(): v for k, v in row.items() if k is not None}
+            # remove whitespace from column headers, only copying the row if needed
+            if any(k is None or k != k.strip() for k in row):
+                row = {k.strip(): v for k, v in row.items() if k is not None}
             year = get_column_value(
                 row=row,
                 column_name="year",
@@ -622,6 +639,7 @@ class SpreadsheetUploader:
                     analyzer=self.text_analyzer,
                     metric_key_to_errors=metric_key_to_errors,
                     metric_key=metric_key,
+                    fuzzy_option_matchers=self.fuzzy_option_matchers,
                 )
                 assumed_frequency = ReportingFrequency.MONTHLY
             elif (
@@ -637,6 +655,7 @@ class SpreadsheetUploader:
                     column_type=int,
                     metric_key_to_errors=metric_key_to_errors,
                     metric_key=metric_key,
+                    fuzzy_option_matchers=self.fuzzy_option_matchers,
                 )
                 assumed_frequency = ReportingFrequency.MONTHLY
             elif reporting_frequency == ReportingFrequency.ANNUAL:
@@ -654,7 +673,7 @@ class SpreadsheetUploader:
 
     def _get_agency_name_to_rows(
         self,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         metric_key_to_errors: Dict[
             Optional[str], List[JusticeCountsBulkUploadException]
         ],
@@ -670,7 +689,7 @@ class SpreadsheetUploader:
                 sheet_name=self.sheet_name,
                 system=system if system is not None else self.system,
             )
-            if agency_name is None:
+            if "agency" not in row:
                 actual_columns = {
                     col.lower() for col in row.keys() if col != "Unnamed: 0"
                 }
@@ -684,9 +703,9 @@ class SpreadsheetUploader:
                     description=description,
                     message_type=BulkUploadMessageType.ERROR,
                 )
-            if isinstance(agency_name, float) and math.isnan(agency_name):
+            if agency_name is None:
                 # When there is an agency column but there is a missing
-                # agency value for the row, then the agency_name in the row is nan
+                # agency value for the row, then the agency_name in the row is None
                 if metric_file is not None and "Missing Agency Data" not in {
                     e.title for e in metric_key_to_errors[metric_file.definition.key]
                 }:
@@ -757,7 +776,7 @@ class SpreadsheetUploader:
 
     def _get_system_to_rows(
         self,
-        rows: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         metric_key_to_errors: Dict[
             Optional[str], List[JusticeCountsBulkUploadException]
         ],
@@ -817,3 +836,12 @@ class SpreadsheetUploader:
             )
         e.sheet_name = sheet_name
         return e
+
+
+def _get_columns_without_empty_values(rows: Iterable[Dict[str, Any]]) -> Set[str]:
+    """Returns the columns that have a value in every one of the given rows."""
+    columns: Optional[Set[str]] = None
+    for row in rows:
+        row_columns = {column for column, value in row.items() if value is not None}
+        columns = row_columns if columns is None else columns & row_columns
+    return columns or set()
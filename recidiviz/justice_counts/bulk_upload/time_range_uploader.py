@@ -23,6 +23,7 @@ from sqlalchemy.orm import Session
 
 from recidiviz.common.text_analysis import TextAnalyzer
 from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import (
+    FuzzyOptionMatcher,
     fuzzy_match_against_options,
     get_column_value,
 )
@@ -52,6 +53,7 @@ class TimeRangeUploader:
         time_range: Tuple[datetime.date, datetime.date],
         rows_for_this_time_range: List[Dict[str, Any]],
         text_analyzer: TextAnalyzer,
+        fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher],
         metricfile: MetricFile,
         existing_datapoints_dict: Dict[DatapointUniqueKey, schema.Datapoint],
         agency_name_to_metric_key_to_timerange_to_total_value: Dict[
@@ -66,6 +68,7 @@ class TimeRangeUploader:
         self.agency = agency
         self.rows_for_this_time_range = rows_for_this_time_range
         self.text_analyzer = text_analyzer
+        self.fuzzy_option_matchers = fuzzy_option_matchers
         self.metricfile = metricfile
         self.agency_name_to_metric_key_to_timerange_to_total_value = (
             agency_name_to_metric_key_to_timerange_to_total_value
@@ -121,6 +124,7 @@ class TimeRangeUploader:
             existing_datapoints_dict=self.existing_datapoints_dict,
             agency=self.agency,
             upload_method=upload_method,
+            use_bulk_upsert=True,
         )
 
         if existing_report is None:
@@ -226,6 +230,7 @@ class TimeRangeUploader:
                         ).title(),
                         metric_key_to_errors=metric_key_to_errors,
                         metric_key=metric_key,
+                        fuzzy_option_matchers=self.fuzzy_option_matchers,
                     )
                     matching_disaggregation_member = self.metricfile.disaggregation(
                         disaggregation_value
@@ -0,0 +1,246 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Functionality for reading the rows of files uploaded via Bulk Upload."""
+
+import abc
+import csv
+import io
+import math
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+from openpyxl import load_workbook  # type: ignore[import]
+
+# Cell values that are read as empty, matching the strings that pandas reads as NaN
+# by default. Rows are uploaded with None in place of each of these.
+_EMPTY_CELL_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+class WorkbookReader(abc.ABC):
+    """Reads the rows of a file uploaded via Bulk Upload. Rows are read one sheet at a
+    time and yielded as they are parsed, so that the file never needs to be held in
+    memory as a whole.
+
+    Each row is a dictionary from column name to cell value. Empty cells have the
+    value None, and rows whose cells are all empty are skipped."""
+
+    @property
+    @abc.abstractmethod
+    def sheet_names(self) -> List[str]:
+        """The names of all sheets in the file."""
+
+    @abc.abstractmethod
+    def read_rows(self, sheet_name: str) -> Iterator[Dict[str, Any]]:
+        """Yields the rows of the sheet with the given name."""
+
+
+class ExcelWorkbookReader(WorkbookReader):
+    """Reads the rows of an .xlsx workbook, opened with openpyxl in read-only mode so
+    that the rows of each sheet are parsed from the file as they are iterated over."""
+
+    def __init__(self, workbook: Any) -> None:
+        # An openpyxl Workbook, opened in read-only mode.
+        self.workbook = workbook
+
+    @classmethod
+    def from_file(cls, file: Any) -> "ExcelWorkbookReader":
+        return cls(
+            workbook=load_workbook(
+                file, read_only=True, data_only=True, keep_links=False
+            )
+        )
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.workbook.sheetnames
+
+    def read_rows(self, sheet_name: str) -> Iterator[Dict[str, Any]]:
+        worksheet = self.workbook[sheet_name]
+        # The dimensions saved in the file are not always accurate, so don't rely on
+        # them to decide which rows and columns to read.
+        worksheet.reset_dimensions()
+        return _rows_from_values(worksheet.iter_rows(values_only=True))
+
+
+class PandasWorkbookReader(WorkbookReader):
+    """Reads the rows of an Excel workbook that openpyxl cannot open, such as a legacy
+    .xls workbook, by parsing one sheet at a time with pandas."""
+
+    def __init__(self, xls: pd.ExcelFile) -> None:
+        self.xls = xls
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return self.xls.sheet_names
+
+    def read_rows(self, sheet_name: str) -> Iterator[Dict[str, Any]]:
+        df = pd.read_excel(self.xls, sheet_name=sheet_name)
+        for row in df.to_dict("records"):
+            normalized_row = {
+                column: None
+                if isinstance(value, float) and math.isnan(value)
+                else value
+                for column, value in row.items()
+            }
+            if any(value is not None for value in normalized_row.values()):
+                yield normalized_row
+
+
+class CsvWorkbookReader(WorkbookReader):
+    """Reads the rows of an uploaded CSV file, which are read as a single sheet named
+    |sheet_name|. Rows are parsed with a csv.DictReader as they are iterated over."""
+
+    def __init__(self, file: IO[bytes], sheet_name: str) -> None:
+        self.file = file
+        self.sheet_name = sheet_name
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return [self.sheet_name]
+
+    def read_rows(self, sheet_name: str) -> Iterator[Dict[str, Any]]:
+        if sheet_name != self.sheet_name:
+            raise KeyError(f"Worksheet {sheet_name} does not exist.")
+        # The file may have been read elsewhere (e.g. when it was uploaded to GCS)
+        # since this reader was created.
+        self.file.seek(0)
+        text_file = io.TextIOWrapper(self.file, encoding="utf-8-sig", newline="")
+        try:
+            reader = csv.DictReader(text_file)
+            reader.fieldnames = _get_column_names(reader.fieldnames or [])
+            for row in reader:
+                # Cells past the last column header are collected under the None key.
+                row.pop(None, None)  # type: ignore[call-overload]
+                normalized_row = {
+                    column: _parse_csv_value(value) for column, value in row.items()
+                }
+                if any(value is not None for value in normalized_row.values()):
+                    yield normalized_row
+        finally:
+            # Don't close the underlying file along with the wrapper.
+            text_file.detach()
+
+
+class RowsWorkbookReader(WorkbookReader):
+    """Reads sheets whose rows have already been read from the uploaded file, such as
+    the per-metric sheets of a single-page upload. Each sheet can only be read once, so
+    that its rows can be released as soon as they have been uploaded."""
+
+    def __init__(self, sheet_name_to_rows: Dict[str, Iterable[Dict[str, Any]]]) -> None:
+        self.sheet_name_to_rows = sheet_name_to_rows
+        self._sheet_names = list(sheet_name_to_rows.keys())
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return self._sheet_names
+
+    def read_rows(self, sheet_name: str) -> Iterator[Dict[str, Any]]:
+        return iter(self.sheet_name_to_rows.pop(sheet_name))
+
+
+def get_workbook_reader(xls: Union[pd.ExcelFile, WorkbookReader]) -> WorkbookReader:
+    """Returns a WorkbookReader for the given file, wrapping it if it is a pandas
+    ExcelFile. Workbooks that pandas opened with openpyxl are read directly from the
+    openpyxl workbook."""
+    if isinstance(xls, WorkbookReader):
+        return xls
+    if xls.engine == "openpyxl":
+        return ExcelWorkbookReader(workbook=xls.book)
+    return PandasWorkbookReader(xls=xls)
+
+
+def _get_column_names(header: Sequence[Any]) -> List[str]:
+    """Returns the column names for the given header row, naming columns the way
+    pandas does: columns without a header are named "Unnamed: <index>", and repeated
+    column names are suffixed with ".1", ".2", etc."""
+    column_names: List[str] = []
+    name_to_count: Dict[str, int] = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None or value == "" else str(value)
+        count = name_to_count.get(name, 0)
+        name_to_count[name] = count + 1
+        column_names.append(f"{name}.{count}" if count > 0 else name)
+    return column_names
+
+
+def _normalize_excel_value(value: Any) -> Any:
+    if isinstance(value, str) and value in _EMPTY_CELL_VALUES:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _parse_csv_value(value: Optional[str]) -> Any:
+    """Converts a CSV cell to a number if it holds one, or None if it is empty."""
+    if value is None or value in _EMPTY_CELL_VALUES:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _rows_from_values(
+    values_by_row: Iterable[Sequence[Any]],
+) -> Iterator[Dict[str, Any]]:
+    """Yields a dictionary for each row of cell values, keyed by the column names in
+    the first row that has any values."""
+    column_names: Optional[List[str]] = None
+    for row_values in values_by_row:
+        values = [_normalize_excel_value(value) for value in row_values]
+        while values and values[-1] is None:
+            values.pop()
+        if not values:
+            continue
+        if column_names is None:
+            column_names = _get_column_names(values)
+            continue
+        if len(values) > len(column_names):
+            column_names = _get_column_names(
+                column_names + [None] * (len(values) - len(column_names))
+            )
+        yield {
+            column_name: values[i] if i < len(values) else None
+            for i, column_name in enumerate(column_names)
+        }
@@ -17,19 +17,24 @@
 """Functionality for bulk upload of an Excel workbook into the Justice Counts database."""
 
 import datetime
+import itertools
 import logging
-import math
 from collections import defaultdict
-from itertools import groupby
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 from sqlalchemy.orm import Session
 
 from recidiviz.common.text_analysis import TextAnalyzer, TextMatchingConfiguration
+from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import FuzzyOptionMatcher
 from recidiviz.justice_counts.bulk_upload.spreadsheet_uploader import (
     SpreadsheetUploader,
 )
+from recidiviz.justice_counts.bulk_upload.workbook_reader import (
+    RowsWorkbookReader,
+    WorkbookReader,
+    get_workbook_reader,
+)
 from recidiviz.justice_counts.datapoint import DatapointInterface
 from recidiviz.justice_counts.exceptions import (
     BulkUploadMessageType,
@@ -93,6 +98,10 @@ class WorkbookUploader:
                 stop_words_to_remove={"other", "not"}
             )
         )
+        # fuzzy_option_matchers starts out empty and will be populated with a
+        # FuzzyOptionMatcher for each list of options that a value is fuzzy matched
+        # against during the upload, so that each is built once per upload.
+        self.fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher] = {}
         self.agency_name_to_metric_key_to_timerange_to_total_value: Dict[
             str,
             Dict[str, Dict[Tuple[datetime.date, datetime.date], Optional[int]]],
@@ -110,7 +119,7 @@ class WorkbookUploader:
     def upload_workbook(
         self,
         session: Session,
-        xls: pd.ExcelFile,
+        xls: Union[pd.ExcelFile, WorkbookReader],
         metric_definitions: List[MetricDefinition],
         filename: Optional[str],
         upload_method: UploadMethod,
@@ -121,7 +130,7 @@ class WorkbookUploader:
     ]:
         """
         Iterate through all tabs in an Excel spreadsheet and upload them
-        to the Justice Counts database.
+        to the Justice Counts database. Tabs are read and uploaded one at a time.
         upload_filetype: The type of file that was originally uploaded (CSV, XLSX, etc).
         """
         # 1. Fetch existing reports and datapoints for this agency, so that
@@ -136,7 +145,7 @@ class WorkbookUploader:
         reports_sorted_by_agency_id = sorted(reports, key=lambda x: x.source_id)
         reports_by_agency_id = {
             k: list(v)
-            for k, v in groupby(
+            for k, v in itertools.groupby(
                 reports_sorted_by_agency_id,
                 key=lambda x: x.source_id,
             )
@@ -152,7 +161,7 @@ class WorkbookUploader:
             )
             reports_by_time_range = {
                 k: list(v)
-                for k, v in groupby(
+                for k, v in itertools.groupby(
                     reports_sorted_by_time_range,
                     key=lambda x: (x.date_range_start, x.date_range_end),
                 )
@@ -177,34 +186,37 @@ class WorkbookUploader:
         # If there is a single sheet in the workbook, and the sheet has a column called "metric",
         # we are assuming it is a single-page template with data for multiple metrics.
         # In this case, we convert it to the standard multi-page template.
-        if len(xls.sheet_names) == 1:
-            df_combined = pd.read_excel(xls)
-            if "metric" in df_combined.columns:
-                xls = self._transform_combined_metric_file_upload(
-                    df=df_combined,
+        reader = get_workbook_reader(xls)
+        if len(reader.sheet_names) == 1:
+            sheet_name = reader.sheet_names[0]
+            rows_iter = reader.read_rows(sheet_name)
+            first_row = next(rows_iter, None)
+            if first_row is not None and "metric" in first_row:
+                reader = self._transform_combined_metric_file_upload(
+                    rows=itertools.chain([first_row], rows_iter),
                     filename=filename,
                 )
+            else:
+                # Don't read the first row of the sheet a second time below.
+                reader = RowsWorkbookReader(
+                    {
+                        sheet_name: itertools.chain(
+                            [first_row] if first_row is not None else [], rows_iter
+                        )
+                    }
+                )
 
-        actual_sheet_names = sorted(xls.sheet_names)
+        actual_sheet_names = sorted(reader.sheet_names)
 
-        # 3. Now run through all sheets and process each in turn.
+        # 3. Now run through all sheets and process each in turn. The rows of each
+        # sheet are passed to the SpreadsheetUploader as they are read.
         invalid_sheet_names: List[str] = []
-        sheet_name_to_df = pd.read_excel(xls, sheet_name=None)
         for sheet_name in actual_sheet_names:
             logging.info("Uploading %s", sheet_name)
-            df = sheet_name_to_df[sheet_name]
-            # Drop any rows that contain any NaN values
-            try:
-                df = df.dropna(axis=0, how="any", subset=["value"])
-            except (KeyError, TypeError):
-                # We will be in this case if the value column is missing,
-                # and it's safe to ignore the error because we'll raise
-                # an error about the missing value column later on in
-                # _get_column_value.
-                pass
-            rows = df.to_dict("records")
+            rows = _drop_rows_without_value(reader.read_rows(sheet_name))
             spreadsheet_uploader = SpreadsheetUploader(
                 text_analyzer=self.text_analyzer,
+                fuzzy_option_matchers=self.fuzzy_option_matchers,
                 system=self.system,
                 agency=self.agency,
                 user_account=self.user_account,
@@ -337,102 +349,77 @@ class WorkbookUploader:
 
     def _transform_combined_metric_file_upload(
         self,
-        df: pd.DataFrame,
+        rows: Iterable[Dict[str, Any]],
         filename: Optional[str],
-    ) -> pd.ExcelFile:
+    ) -> RowsWorkbookReader:
         """
         This function transforms an uploaded file that contains only 1 sheet.
         In this case, the file contains a single sheet that includes data for
         more than 1 metric (distinguished by the 'metric' column). This function breaks
-        the data up by metric and breakdown_category (if present). It then exports the
-        data into a temporary excel file that contains one sheet per metric/breakdown.
-        It then loads the new temporary file and returns the xls to continue the rest of
-        the Bulk Upload process.
+        the rows up by metric and breakdown_category (if present), and returns a
+        reader with one sheet per metric/breakdown to continue the rest of the
+        Bulk Upload process.
         """
-        with pd.ExcelWriter(  # pylint: disable=abstract-class-instantiated
-            filename
-        ) as writer:
-            for metric in df["metric"].unique():
-                metric_df = df[df["metric"] == metric]
-                if "breakdown_category" not in df.columns:
-                    metric_df = self._process_metric_df(df=metric_df)
-                    metric_df.to_excel(writer, sheet_name=metric, index=False)
-                    continue
-
-                for breakdown_category in metric_df["breakdown_category"].unique():
-                    # example breakdown_category: funding_type, biological_sex, race/ethnicity
-                    if isinstance(breakdown_category, float) and math.isnan(
-                        breakdown_category
-                    ):
-                        # If the value for the breakdown_category column is empty (i.e. nan)
-                        # that means this an aggregate metric row
-                        aggregate_df = metric_df[
-                            metric_df["breakdown_category"].isnull()
-                        ]
-                        aggregate_df = self._process_metric_df(df=aggregate_df)
-                        aggregate_df.to_excel(writer, sheet_name=metric, index=False)
-                    else:
-                        breakdown_df = metric_df[
-                            metric_df["breakdown_category"] == breakdown_category
-                        ]
-                        # Need to get proper/expected sheet name for breakdown
-                        sheet_name = METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME[
-                            metric, breakdown_category
-                        ]
-                        breakdown_df = self._process_metric_df(
-                            df=breakdown_df, breakdown_category=breakdown_category
-                        )
-                        breakdown_df.to_excel(
-                            writer, sheet_name=sheet_name, index=False
-                        )
+        logging.info("Splitting %s into one sheet per metric/breakdown", filename)
+        sheet_name_to_rows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        sheet_name_to_breakdown_category: Dict[str, Optional[str]] = {}
+        for row in rows:
+            metric = row["metric"]
+            if metric is None:
+                continue
+            # example breakdown_category: funding_type, biological_sex, race/ethnicity
+            # If the value for the breakdown_category column is empty, that means
+            # this is an aggregate metric row.
+            breakdown_category = row.get("breakdown_category")
+            sheet_name = (
+                metric
+                if breakdown_category is None
+                # Need to get proper/expected sheet name for breakdown
+                else METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME[metric, breakdown_category]
+            )
+            sheet_name_to_rows[sheet_name].append(row)
+            sheet_name_to_breakdown_category[sheet_name] = breakdown_category
 
-        xls = pd.ExcelFile(filename)
-        return xls
+        for sheet_name, sheet_rows in sheet_name_to_rows.items():
+            self._process_metric_rows(
+                rows=sheet_rows,
+                breakdown_category=sheet_name_to_breakdown_category[sheet_name],
+            )
+        return RowsWorkbookReader(dict(sheet_name_to_rows))
 
-    def _process_metric_df(
+    def _process_metric_rows(
         self,
-        df: pd.DataFrame,
+        rows: List[Dict[str, Any]],
         breakdown_category: Optional[str] = None,
-    ) -> pd.DataFrame:
+    ) -> None:
         """
-        Helper function to process/convert a dataframe from single-page bulk upload.
-        This function drops and renames columns so that they align with what the rest
-        of the Bulk Upload flow expects.
+        Helper function to process/convert the rows of a metric from single-page bulk
+        upload. This function drops and renames columns in place so that they align
+        with what the rest of the Bulk Upload flow expects.
         """
         # Drop any columns in which the entire column is empty
         # Examples of this:
         # - month column for annual metrics
         # - breakdown_category and breakdown columns for aggregate metrics
-        df = df.dropna(
-            axis=1,
-            how="all",
-        )
+        non_empty_columns = {
+            column for row in rows for column, value in row.items() if value is not None
+        }
         # Drop metric column
         # We already used this to break up the single sheet into multiple sheets
         # (1 sheet for each metric)
         # This column would cause an error further in the Bulk Upload flow if kept
-        df = df.drop(
-            labels=["metric"],
-            axis=1,
-        )
         # Drop breakdown_category column
         # We already used this column to get the appropriate sheet_name for the given
         # (metric, breakdown) pair
         # This column would cause an error further in the Bulk Upload flow if kept
-        if "breakdown_category" in df.columns:
-            df = df.drop(
-                labels=["breakdown_category"],
-                axis=1,
-            )
-        # Rename breakdown_value, aggregate_value, and breakdown columns if present
-        # The rest of the Bulk Upload flow will expect 'value' and the breakdown_category
-        df = df.rename(
-            {
-                "breakdown": breakdown_category,
-            },
-            axis=1,
-        )
-        return df
+        non_empty_columns -= {"metric", "breakdown_category"}
+        for row in rows:
+            for column in [c for c in row if c not in non_empty_columns]:
+                del row[column]
+            # Rename breakdown column if present
+            # The rest of the Bulk Upload flow will expect the breakdown_category
+            if breakdown_category is not None and "breakdown" in row:
+                row[breakdown_category] = row.pop("breakdown")
 
     def _add_workbook_errors(
         self,
@@ -565,3 +552,14 @@ class WorkbookUploader:
                     # only need 1 totals warning per metric
                     break
         return None
+
+
+def _drop_rows_without_value(
+    rows: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Drops any rows that are missing a value. If the value column is missing
+    entirely, all rows are kept, since an error about the missing value column will be
+    raised later on in get_column_value."""
+    for row in rows:
+        if "value" not in row or row["value"] is not None:
+            yield row
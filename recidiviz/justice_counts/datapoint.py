@@ -23,8 +23,11 @@ import logging
 from collections import defaultdict
 from typing import Any, Dict, List, Optional, Tuple
 
+import attr
 from sqlalchemy import false
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
 from recidiviz.common.constants.justice_counts import ContextKey, ValueType
 from recidiviz.justice_counts.datapoints_for_metric import DatapointsForMetric
@@ -70,6 +73,41 @@ DatapointUniqueKey = Tuple[
     Optional[str],
 ]
 
+# The datapoint columns that are updated when an existing report datapoint is saved
+# via DatapointInterface.bulk_add_report_datapoints(). All other columns either make
+# up the datapoint's unique key or never change after the datapoint is created.
+_REPORT_DATAPOINT_UPDATE_COLUMNS = [
+    "value",
+    "value_type",
+    "last_updated",
+    "report_id",
+    "is_report_datapoint",
+    "upload_method",
+]
+
+
+@attr.define(frozen=True)
+class ReportDatapointWrite:
+    """A single value to save as a report datapoint via
+    DatapointInterface.bulk_add_report_datapoints(). Mirrors the value-related
+    arguments of DatapointInterface.add_report_datapoint().
+    """
+
+    value: Any
+    context_key: Optional[ContextKey] = None
+    value_type: Optional[ValueType] = None
+    dimension: Optional[DimensionBase] = None
+    uploaded_via_breakdown_sheet: bool = False
+
+
+def _get_datapoint_row(datapoint: schema.Datapoint, include_id: bool) -> Dict[str, Any]:
+    """Returns the column values of the given datapoint, for use in a Core INSERT."""
+    return {
+        column.name: getattr(datapoint, column.name)
+        for column in schema.Datapoint.__table__.columns
+        if include_id or column.name != "id"
+    }
+
 
 class DatapointInterface:
     """Contains methods for working with Datapoint.
@@ -370,35 +408,18 @@ class DatapointInterface:
         in which case we save the incoming value.
         """
 
-        # Don't save invalid datapoint values when publishing
-        if (
-            report.status == schema.ReportStatus.PUBLISHED
-            and value is not None
-            and (value_type is None or value_type == ValueType.NUMBER)
-        ):
-            try:
-                float(value)
-            except ValueError as e:
-                raise JusticeCountsServerError(
-                    code="invalid_datapoint_value",
-                    description=(
-                        "Datapoint represents a float value, but is a string. "
-                        f"Datapoint ID: {report.id}, value: {value}"
-                    ),
-                ) from e
+        DatapointInterface._validate_report_datapoint_value(
+            report=report, value=value, value_type=value_type
+        )
 
         # Check if there is an existing datapoint that needs to be updated,
         # or if we need to create a new one. Datapoints are unique by a tuple of:
         # <report, metric definition, context key, disaggregations>
-        datapoint_key = (
-            report.date_range_start,
-            report.date_range_end,
-            report.source_id,
-            metric_definition_key,
-            context_key.value if context_key else None,
-            json.dumps({dimension.dimension_identifier(): dimension.dimension_name})
-            if dimension
-            else None,
+        datapoint_key = DatapointInterface._get_report_datapoint_key(
+            report=report,
+            metric_definition_key=metric_definition_key,
+            context_key=context_key,
+            dimension=dimension,
         )
         existing_datapoint = existing_datapoints_dict.get(datapoint_key)
         if uploaded_via_breakdown_sheet:
@@ -490,6 +511,308 @@ class DatapointInterface:
             else None
         )
 
+    @staticmethod
+    def bulk_add_report_datapoints(
+        session: Session,
+        report: schema.Report,
+        existing_datapoints_dict: Dict[DatapointUniqueKey, schema.Datapoint],
+        datapoint_writes: List[ReportDatapointWrite],
+        metric_definition_key: str,
+        current_time: datetime.datetime,
+        upload_method: UploadMethod,
+        user_account: Optional[schema.UserAccount] = None,
+        agency: Optional[schema.Agency] = None,
+    ) -> List[DatapointJson]:
+        """Set-based equivalent of calling add_report_datapoint() for each of the
+        given datapoint_writes, which saves the same datapoints and datapoint histories.
+
+        add_report_datapoint() merges each datapoint into the session individually,
+        which results in at least one statement per datapoint when the session is
+        flushed. Instead, this diffs all datapoints against existing_datapoints_dict
+        up front and writes them with at most three statements: one INSERT for new
+        datapoints, one INSERT ... ON CONFLICT DO UPDATE for existing datapoints, and
+        one INSERT for the histories of datapoints whose value changed. The datapoint
+        objects in the session are then updated to match what was written, without
+        scheduling any further writes.
+        """
+        # Write any pending changes to the database first (including the report
+        # itself, if it is new), so that the report has an id and pending changes to
+        # existing datapoints aren't later flushed on top of the statements below.
+        session.add(report)
+        session.flush()
+
+        desired_datapoints = DatapointInterface._get_desired_report_datapoints(
+            report=report,
+            existing_datapoints_dict=existing_datapoints_dict,
+            datapoint_writes=datapoint_writes,
+            metric_definition_key=metric_definition_key,
+            current_time=current_time,
+            upload_method=upload_method,
+        )
+
+        # Diff the desired datapoints against the existing datapoints.
+        new_datapoints: Dict[DatapointUniqueKey, schema.Datapoint] = {}
+        updated_datapoints: Dict[DatapointUniqueKey, schema.Datapoint] = {}
+        key_to_old_value: Dict[DatapointUniqueKey, Optional[str]] = {}
+        history_rows: List[Dict[str, Any]] = []
+        for datapoint_key, desired_datapoint in desired_datapoints.items():
+            existing_datapoint = existing_datapoints_dict.get(datapoint_key)
+            if existing_datapoint is None:
+                new_datapoints[datapoint_key] = desired_datapoint
+                continue
+
+            desired_datapoint.id = existing_datapoint.id
+            updated_datapoints[datapoint_key] = desired_datapoint
+            # Compare values using `get_value` so e.g. 3 == 3.0
+            if get_value(datapoint=desired_datapoint) == get_value(
+                datapoint=existing_datapoint
+            ):
+                desired_datapoint.last_updated = existing_datapoint.last_updated
+                continue
+
+            key_to_old_value[datapoint_key] = existing_datapoint.value
+            history_rows.append(
+                {
+                    "datapoint_id": existing_datapoint.id,
+                    "user_account_id": user_account.id
+                    if user_account is not None
+                    else None,
+                    "timestamp": current_time,
+                    "old_value": existing_datapoint.value,
+                    "new_value": desired_datapoint.value,
+                    "old_upload_method": existing_datapoint.upload_method,
+                    "new_upload_method": upload_method.value,
+                }
+            )
+
+        DatapointInterface._insert_report_datapoints(
+            session=session, report=report, new_datapoints=new_datapoints
+        )
+        if updated_datapoints:
+            upsert_statement = insert(schema.Datapoint).values(
+                [
+                    _get_datapoint_row(datapoint, include_id=True)
+                    for datapoint in updated_datapoints.values()
+                ]
+            )
+            upsert_statement = upsert_statement.on_conflict_do_update(
+                index_elements=[schema.Datapoint.id],
+                set_={
+                    column: upsert_statement.excluded[column]
+                    for column in _REPORT_DATAPOINT_UPDATE_COLUMNS
+                },
+            )
+            session.execute(upsert_statement)
+        if history_rows:
+            session.execute(insert(schema.DatapointHistory).values(history_rows))
+
+        # Bring the session up to date with what was written, without scheduling
+        # any further writes. New datapoints are added to the session as if they
+        # were loaded from the database, and existing datapoints have the written
+        # values set as their committed state.
+        for datapoint_key, datapoint in new_datapoints.items():
+            make_transient_to_detached(datapoint)
+            session.add(datapoint)
+            set_committed_value(datapoint, "report", report)
+            existing_datapoints_dict[datapoint_key] = datapoint
+        if new_datapoints and "datapoints" in report.__dict__:
+            set_committed_value(
+                report,
+                "datapoints",
+                list(report.datapoints) + list(new_datapoints.values()),
+            )
+        moved_datapoints = False
+        for datapoint_key, desired_datapoint in updated_datapoints.items():
+            existing_datapoint = existing_datapoints_dict[datapoint_key]
+            old_report_id = existing_datapoint.report_id
+            for column in _REPORT_DATAPOINT_UPDATE_COLUMNS:
+                set_committed_value(
+                    existing_datapoint, column, getattr(desired_datapoint, column)
+                )
+            if old_report_id != report.id:
+                # The datapoint has moved to this report, so reload its report and
+                # the datapoints of its old report the next time they are accessed.
+                moved_datapoints = True
+                session.expire(existing_datapoint, ["report"])
+                old_report = (
+                    session.identity_map.get(
+                        Session.identity_key(schema.Report, old_report_id)
+                    )
+                    if old_report_id is not None
+                    else None
+                )
+                if old_report is not None:
+                    session.expire(old_report, ["datapoints"])
+            if datapoint_key in key_to_old_value:
+                # Histories have been added for this datapoint, so reload them the
+                # next time they are accessed.
+                session.expire(existing_datapoint, ["datapoint_histories"])
+        if moved_datapoints:
+            session.expire(report, ["datapoints"])
+
+        # Return datapoint json because datapoint values and metadata will be
+        # used in the bulk upload data summary pages.
+        return [
+            DatapointInterface.to_json_response(
+                datapoint=existing_datapoints_dict[datapoint_key],
+                is_published=report.status == schema.ReportStatus.PUBLISHED,
+                frequency=schema.ReportingFrequency[report.type],
+                old_value=key_to_old_value.get(datapoint_key),
+                agency_name=agency.name if agency is not None else None,
+            )
+            for datapoint_key in desired_datapoints
+        ]
+
+    @staticmethod
+    def _get_desired_report_datapoints(
+        report: schema.Report,
+        existing_datapoints_dict: Dict[DatapointUniqueKey, schema.Datapoint],
+        datapoint_writes: List[ReportDatapointWrite],
+        metric_definition_key: str,
+        current_time: datetime.datetime,
+        upload_method: UploadMethod,
+    ) -> Dict[DatapointUniqueKey, schema.Datapoint]:
+        """Returns the datapoints that bulk_add_report_datapoints() should save for
+        the given datapoint_writes, keyed by datapoint unique key. The returned
+        datapoints are not added to the session.
+        """
+        desired_datapoints: Dict[DatapointUniqueKey, schema.Datapoint] = {}
+        for write in datapoint_writes:
+            DatapointInterface._validate_report_datapoint_value(
+                report=report, value=write.value, value_type=write.value_type
+            )
+            datapoint_key = DatapointInterface._get_report_datapoint_key(
+                report=report,
+                metric_definition_key=metric_definition_key,
+                context_key=write.context_key,
+                dimension=write.dimension,
+            )
+            existing_datapoint = existing_datapoints_dict.get(datapoint_key)
+            if (
+                write.uploaded_via_breakdown_sheet
+                and existing_datapoint is not None
+                and existing_datapoint.value is not None
+            ):
+                # If this flag is set and there is an existing aggregate value, keep
+                # the existing aggregate value.
+                logging.info(
+                    "An aggregate value already exists in the database. Keeping the existing value."
+                )
+                continue
+
+            desired_datapoints[datapoint_key] = schema.Datapoint(
+                value=str(write.value) if write.value is not None else write.value,
+                report_id=report.id,
+                metric_definition_key=metric_definition_key,
+                context_key=write.context_key.value if write.context_key else None,
+                value_type=write.value_type,
+                start_date=report.date_range_start,
+                end_date=report.date_range_end,
+                created_at=current_time
+                if existing_datapoint is None
+                else existing_datapoint.created_at,
+                last_updated=current_time,
+                dimension_identifier_to_member={
+                    write.dimension.dimension_identifier(): write.dimension.dimension_name
+                }
+                if write.dimension
+                else None,
+                source_id=report.source_id,
+                is_report_datapoint=True,
+                upload_method=upload_method.value,
+                includes_excludes_key=None,
+                enabled=None,
+            )
+        return desired_datapoints
+
+    @staticmethod
+    def _insert_report_datapoints(
+        session: Session,
+        report: schema.Report,
+        new_datapoints: Dict[DatapointUniqueKey, schema.Datapoint],
+    ) -> None:
+        """Inserts the given new report datapoints with a single INSERT statement and
+        sets the id of each datapoint to the id of its inserted row."""
+        if not new_datapoints:
+            return
+
+        insert_statement = (
+            insert(schema.Datapoint)
+            .values(
+                [
+                    _get_datapoint_row(datapoint, include_id=False)
+                    for datapoint in new_datapoints.values()
+                ]
+            )
+            .returning(
+                schema.Datapoint.id,
+                schema.Datapoint.metric_definition_key,
+                schema.Datapoint.context_key,
+                schema.Datapoint.dimension_identifier_to_member,
+            )
+        )
+        for (
+            datapoint_id,
+            metric_definition_key,
+            context_key,
+            dimension_identifier_to_member,
+        ) in session.execute(insert_statement):
+            # Postgres doesn't guarantee that RETURNING rows are in the order of the
+            # inserted values, so match them to datapoints by unique key.
+            new_datapoints[
+                (
+                    report.date_range_start,
+                    report.date_range_end,
+                    report.source_id,
+                    metric_definition_key,
+                    context_key,
+                    json.dumps(dimension_identifier_to_member)
+                    if dimension_identifier_to_member is not None
+                    else None,
+                )
+            ].id = datapoint_id
+
+    @staticmethod
+    def _validate_report_datapoint_value(
+        report: schema.Report,
+        value: Any,
+        value_type: Optional[ValueType],
+    ) -> None:
+        # Don't save invalid datapoint values when publishing
+        if (
+            report.status == schema.ReportStatus.PUBLISHED
+            and value is not None
+            and (value_type is None or value_type == ValueType.NUMBER)
+        ):
+            try:
+                float(value)
+            except ValueError as e:
+                raise JusticeCountsServerError(
+                    code="invalid_datapoint_value",
+                    description=(
+                        "Datapoint represents a float value, but is a string. "
+                        f"Datapoint ID: {report.id}, value: {value}"
+                    ),
+                ) from e
+
+    @staticmethod
+    def _get_report_datapoint_key(
+        report: schema.Report,
+        metric_definition_key: str,
+        context_key: Optional[ContextKey],
+        dimension: Optional[DimensionBase],
+    ) -> DatapointUniqueKey:
+        return (
+            report.date_range_start,
+            report.date_range_end,
+            report.source_id,
+            metric_definition_key,
+            context_key.value if context_key else None,
+            json.dumps({dimension.dimension_identifier(): dimension.dimension_name})
+            if dimension
+            else None,
+        )
+
     ### Save Path: Agency Datapoints ###
 
     @staticmethod
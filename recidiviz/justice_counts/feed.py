@@ -17,15 +17,19 @@
 """Interface for working with public Justice Counts data feeds."""
 
 import calendar
+import csv
+import io
 import itertools
+import threading
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, OrderedDict, Tuple
 
-import pandas as pd
 from flask import Response, make_response
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
 
 from recidiviz.justice_counts.exceptions import JusticeCountsServerError
+from recidiviz.justice_counts.metricfile import MetricFile
 from recidiviz.justice_counts.metricfiles.metricfile_registry import (
     SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE,
 )
@@ -36,9 +40,34 @@ from recidiviz.justice_counts.utils.datapoint_utils import (
     get_dimension_member,
     is_datapoint_deprecated,
 )
+from recidiviz.persistence.database.schema.justice_counts import schema
 
 from .utils.date_utils import convert_date_range_to_year_month
 
+# Maps a system and the canonical filename of one of its metricfiles to the
+# (system, metric key, dimension id) of the datapoints that make up that file.
+SYSTEM_AND_FILENAME_TO_SYSTEM_METRIC_KEY_AND_DIM_ID = {
+    (system.value, metricfile.canonical_filename): (system, metric_key, dimension_id)
+    for (
+        system,
+        metric_key,
+        dimension_id,
+    ), metricfile in SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE.items()
+}
+
+# The maximum number of feed CSVs that are kept in memory by each process.
+_FEED_CACHE_MAX_SIZE = 512
+
+# Cache of (agency id, include unpublished data, system, metric) to the version of
+# the agency's reports that the feed CSV was built from, and that CSV. Feeds are
+# polled by external consumers, so rather than rebuilding them on every request,
+# they are rebuilt only when one of the agency's reports is created, updated,
+# published, or deleted.
+_FEED_CACHE: OrderedDict[
+    Tuple[int, bool, Optional[str], Optional[str]], Tuple[Tuple, str]
+] = OrderedDict()
+_FEED_CACHE_LOCK = threading.Lock()
+
 
 class FeedInterface:
     """Contains methods for working with public data feeds."""
@@ -53,24 +82,102 @@ class FeedInterface:
     ) -> Response:
         """Returns an agency's  data in csv form. Used by both a public and protected endpoint.
         For the public endoint, only published data is returned. For the protected endpoint, all data
-        is returned."""
-        rows = []
+        is returned. The csv is cached per agency, system, and metric, and is only rebuilt
+        once one of the agency's reports has changed."""
+        version = FeedInterface._get_feed_version(session=session, agency_id=agency_id)
+        cache_key = (agency_id, include_unpublished_data, system, metric)
 
-        system_to_filename_to_rows = FeedInterface.get_feed_for_agency_id(
-            session,
-            agency_id=agency_id,
-            include_unpublished_data=include_unpublished_data,
+        feed_csv = None
+        with _FEED_CACHE_LOCK:
+            cached_version_and_csv = _FEED_CACHE.get(cache_key)
+            if cached_version_and_csv is not None:
+                cached_version, cached_csv = cached_version_and_csv
+                if cached_version == version:
+                    _FEED_CACHE.move_to_end(cache_key)
+                    feed_csv = cached_csv
+
+        if feed_csv is None:
+            feed_csv = FeedInterface._build_csv_of_feed(
+                session=session,
+                agency_id=agency_id,
+                include_unpublished_data=include_unpublished_data,
+                metric=metric,
+                system=system,
+            )
+            with _FEED_CACHE_LOCK:
+                _FEED_CACHE[cache_key] = (version, feed_csv)
+                _FEED_CACHE.move_to_end(cache_key)
+                while len(_FEED_CACHE) > _FEED_CACHE_MAX_SIZE:
+                    _FEED_CACHE.popitem(last=False)
+
+        feed_response = make_response(feed_csv)
+        feed_response.headers["Content-type"] = "text/plain"
+        return feed_response
+
+    @staticmethod
+    def clear_feed_cache() -> None:
+        with _FEED_CACHE_LOCK:
+            _FEED_CACHE.clear()
+
+    @staticmethod
+    def _get_feed_version(session: Session, agency_id: int) -> Tuple:
+        """Returns a summary of an agency's reports that changes whenever one of them is
+        created, deleted, published, or updated (which sets `last_modified_at`)."""
+        return tuple(
+            session.query(
+                func.count(schema.Report.id),
+                func.count(schema.Report.id).filter(
+                    schema.Report.status == schema.ReportStatus.PUBLISHED
+                ),
+                func.max(schema.Report.id),
+                func.max(schema.Report.last_modified_at),
+            )
+            .filter(schema.Report.source_id == agency_id)
+            .one()
         )
 
-        if not system_to_filename_to_rows:
-            feed_response = make_response("")
-            feed_response.headers["Content-type"] = "text/plain"
-            return feed_response
+    @staticmethod
+    def _build_csv_of_feed(
+        session: Session,
+        agency_id: int,
+        include_unpublished_data: bool,
+        metric: Optional[str],
+        system: Optional[str],
+    ) -> str:
+        """Builds the csv of a single file of an agency's feed. Rather than building the
+        entire feed, only the datapoints that make up the requested file are fetched."""
+        rows: List[Dict[str, Any]] = []
+        if system and metric:
+            rows = FeedInterface._get_rows_for_feed_file(
+                session=session,
+                agency_id=agency_id,
+                include_unpublished_data=include_unpublished_data,
+                system=system,
+                filename=metric,
+            )
+
+        if not rows:
+            first_system = FeedInterface._get_first_system_of_feed(
+                session=session,
+                agency_id=agency_id,
+                include_unpublished_data=include_unpublished_data,
+            )
+            if first_system is None:
+                # The feed is empty
+                return ""
 
-        if system is None:
-            # If the agency has only provided for one system,
-            # no need to specify `system` parameter
-            system = list(system_to_filename_to_rows.items())[0][0]
+            if system is None:
+                # If the agency has only provided for one system,
+                # no need to specify `system` parameter
+                system = first_system
+                if metric:
+                    rows = FeedInterface._get_rows_for_feed_file(
+                        session=session,
+                        agency_id=agency_id,
+                        include_unpublished_data=include_unpublished_data,
+                        system=system,
+                        filename=metric,
+                    )
 
         # Invalid state: metric parameter is present, but not system
         # Since some metrics are present in multiple systems, we can't
@@ -82,28 +189,134 @@ class FeedInterface:
                 "multi-system, then you must also provide the `system` parameter.",
             )
 
-        # Valid state: both metric and system parameters are present
-        # Return plaintext csv of metric rows
-        if system and metric:
-            if (
-                system in system_to_filename_to_rows
-                and metric in system_to_filename_to_rows[system]
-            ):
-                rows = system_to_filename_to_rows[system][metric]
-            else:
-                rows = []
+        return FeedInterface._write_csv(rows=rows)
 
+    @staticmethod
+    def _write_csv(rows: List[Dict[str, Any]]) -> str:
+        """Writes the rows of a feed file as csv, with a column for each key that
+        appears in any row (in order of first appearance), and month numbers replaced
+        by month names."""
+        fieldnames: Dict[str, None] = {}
+        for row in rows:
+            fieldnames.update(dict.fromkeys(row))
+
+        output = io.StringIO()
+        writer = csv.DictWriter(
+            output, fieldnames=list(fieldnames), restval="", lineterminator="\n"
+        )
+        writer.writeheader()
         for row in rows:
             if "month" in row:
-                month_number = int(row["month"])
-                row["month"] = calendar.month_name[month_number]
+                row = {**row, "month": calendar.month_name[int(row["month"])]}
+            writer.writerow(row)
+        return output.getvalue()
 
-        df = pd.DataFrame.from_dict(rows)
-        csv = df.to_csv(index=False)
+    @staticmethod
+    def _get_feed_report_ids(
+        session: Session, agency_id: int, include_unpublished_data: bool
+    ) -> List[int]:
+        """Returns the ids of the agency's reports in the feed, in the same order as
+        ReportInterface.get_reports_by_agency_id()."""
+        q = session.query(schema.Report.id).filter(schema.Report.source_id == agency_id)
+        if include_unpublished_data is False:
+            q = q.filter(schema.Report.status == schema.ReportStatus.PUBLISHED)
+        return [
+            report_id
+            for (report_id,) in q.order_by(schema.Report.date_range_end.desc())
+        ]
 
-        feed_response = make_response(csv)
-        feed_response.headers["Content-type"] = "text/plain"
-        return feed_response
+    @staticmethod
+    def _get_feed_datapoints(
+        session: Session,
+        agency_id: int,
+        include_unpublished_data: bool,
+        query: Query,
+    ) -> List[Any]:
+        """Returns the results of a query over Datapoint, restricted to the agency's
+        non-context report datapoints, in the order they are added to the feed. Like
+        the `Report.datapoints` relationship, the datapoints of all reports are fetched
+        together and are then grouped by report, so that they are in the same order
+        as in get_feed_for_agency_id()."""
+        report_ids = FeedInterface._get_feed_report_ids(
+            session=session,
+            agency_id=agency_id,
+            include_unpublished_data=include_unpublished_data,
+        )
+        if not report_ids:
+            return []
+
+        report_id_to_results = defaultdict(list)
+        for result in query.filter(
+            schema.Datapoint.report_id.in_(report_ids),
+            schema.Datapoint.context_key.is_(None),
+        ):
+            report_id_to_results[result.report_id].append(result)
+        return list(
+            itertools.chain.from_iterable(
+                report_id_to_results[report_id] for report_id in report_ids
+            )
+        )
+
+    @staticmethod
+    def _get_first_system_of_feed(
+        session: Session, agency_id: int, include_unpublished_data: bool
+    ) -> Optional[str]:
+        """Returns the first system in the agency's feed, or None if the feed is
+        empty."""
+        for result in FeedInterface._get_feed_datapoints(
+            session=session,
+            agency_id=agency_id,
+            include_unpublished_data=include_unpublished_data,
+            query=session.query(
+                schema.Datapoint.report_id,
+                schema.Datapoint.metric_definition_key,
+                schema.Datapoint.dimension_identifier_to_member,
+            ),
+        ):
+            datapoint = schema.Datapoint(
+                metric_definition_key=result.metric_definition_key,
+                dimension_identifier_to_member=result.dimension_identifier_to_member,
+            )
+            if is_datapoint_deprecated(datapoint) is False:
+                return METRIC_KEY_TO_METRIC[result.metric_definition_key].system.value
+        return None
+
+    @staticmethod
+    def _get_rows_for_feed_file(
+        session: Session,
+        agency_id: int,
+        include_unpublished_data: bool,
+        system: str,
+        filename: str,
+    ) -> List[Dict[str, Any]]:
+        """Returns the rows of a single file of the agency's feed, fetching only the
+        datapoints of that file's metric."""
+        system_metric_key_and_dim_id = (
+            SYSTEM_AND_FILENAME_TO_SYSTEM_METRIC_KEY_AND_DIM_ID.get((system, filename))
+        )
+        if system_metric_key_and_dim_id is None:
+            return []
+        _, metric_key, dimension_id = system_metric_key_and_dim_id
+
+        datapoints = [
+            d
+            for d in FeedInterface._get_feed_datapoints(
+                session=session,
+                agency_id=agency_id,
+                include_unpublished_data=include_unpublished_data,
+                query=session.query(schema.Datapoint).filter(
+                    schema.Datapoint.metric_definition_key == metric_key
+                ),
+            )
+            if is_datapoint_deprecated(d) is False
+            and get_dimension_id(datapoint=d) == dimension_id
+        ]
+        return FeedInterface._get_rows_for_metricfile(
+            metricfile=SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE[
+                system_metric_key_and_dim_id
+            ],
+            datapoints=datapoints,
+        )
 
     @staticmethod
     def get_feed_for_agency_id(
@@ -176,52 +389,66 @@ class FeedInterface:
             metric_key,
             dimension_id,
         ), datapoints in system_metric_key_and_dim_id_to_datapoints.items():
-            rows = []
             metricfile = SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE[
                 (system, metric_key, dimension_id)
             ]
-
-            # 4. Group the datapoints by time range (reverse chronological order)
-            datapoints_sorted_by_time_range = sorted(
-                datapoints, key=lambda x: (x.start_date, x.end_date), reverse=True
+            rows = FeedInterface._get_rows_for_metricfile(
+                metricfile=metricfile, datapoints=datapoints
             )
-            datapoints_by_time_range = {
-                k: list(v)
-                for k, v in itertools.groupby(
-                    datapoints_sorted_by_time_range,
-                    key=lambda x: (x.start_date, x.end_date),
-                )
-            }
-
-            for (
-                start_date,
-                end_date,
-            ), time_range_datapoints in datapoints_by_time_range.items():
-                # 5. Create a row for each datapoint and add to the file.
-                year, month = convert_date_range_to_year_month(
-                    start_date=start_date, end_date=end_date
-                )
-                for datapoint in time_range_datapoints:
-                    row: Dict[str, Any] = {}
-                    row["year"] = year
-                    if month is not None:
-                        row["month"] = month
-
-                    if metricfile.disaggregation:
-                        if metricfile.disaggregation_column_name is None:
-                            raise ValueError(
-                                "metricfile.disaggregation_column_name must be not None "
-                                "if metricfile.disaggregation is specified"
-                            )
-                        row[
-                            metricfile.disaggregation_column_name
-                        ] = get_dimension_member(datapoint=datapoint)
-
-                    row["value"] = datapoint.value
-                    rows.append(row)
-
             system_to_filename_to_rows[system.value][
                 metricfile.canonical_filename
             ] = rows
 
         return system_to_filename_to_rows
+
+    @staticmethod
+    def _get_rows_for_metricfile(
+        metricfile: MetricFile, datapoints: Iterable[schema.Datapoint]
+    ) -> List[Dict[str, Any]]:
+        """Creates the rows of a feed file from the datapoints of its metricfile."""
+        rows = []
+
+        # 4. Group the datapoints by time range (reverse chronological order). Within
+        # each time range, datapoints are ordered by dimension member, so that rows
+        # do not depend on the order in which the database returned the datapoints.
+        datapoints_sorted_by_time_range = sorted(
+            sorted(datapoints, key=lambda x: get_dimension_member(datapoint=x) or ""),
+            key=lambda x: (x.start_date, x.end_date),
+            reverse=True,
+        )
+        datapoints_by_time_range = {
+            k: list(v)
+            for k, v in itertools.groupby(
+                datapoints_sorted_by_time_range,
+                key=lambda x: (x.start_date, x.end_date),
+            )
+        }
+
+        for (
+            start_date,
+            end_date,
+        ), time_range_datapoints in datapoints_by_time_range.items():
+            # 5. Create a row for each datapoint and add to the file.
+            year, month = convert_date_range_to_year_month(
+                start_date=start_date, end_date=end_date
+            )
+            for datapoint in time_range_datapoints:
+                row: Dict[str, Any] = {}
+                row["year"] = year
+                if month is not None:
+                    row["month"] = month
+
+                if metricfile.disaggregation:
+                    if metricfile.disaggregation_column_name is None:
+                        raise ValueError(
+                            "metricfile.disaggregation_column_name must be not None "
+                            "if metricfile.disaggregation is specified"
+                        )
+                    row[metricfile.disaggregation_column_name] = get_dimension_member(
+                        datapoint=datapoint
+                    )
+
+                row["value"] = datapoint.value
+                rows.append(row)
+
+        return rows
@@ -24,7 +24,11 @@ from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query, Session, joinedload, lazyload
 
-from recidiviz.justice_counts.datapoint import DatapointInterface, DatapointUniqueKey
+from recidiviz.justice_counts.datapoint import (
+    DatapointInterface,
+    DatapointUniqueKey,
+    ReportDatapointWrite,
+)
 from recidiviz.justice_counts.datapoints_for_metric import DatapointsForMetric
 from recidiviz.justice_counts.dimensions.base import DimensionBase
 from recidiviz.justice_counts.dimensions.dimension_registry import (
@@ -494,6 +498,7 @@ class ReportInterface:
         ] = None,
         user_account: Optional[schema.UserAccount] = None,
         agency: Optional[schema.Agency] = None,
+        use_bulk_upsert: bool = False,
     ) -> List[DatapointJson]:
         """Given a Report and a MetricInterface, either add this metric
         to the report, or if the metric already exists on the report,
@@ -510,35 +515,32 @@ class ReportInterface:
         and fallback to whatever value is already in the db. If `datapoint.value`
         is specified, prefer the existing value in the db, unless there isn't one,
         in which case we save the incoming value.
+
+        If `use_bulk_upsert` is True, all of the metric's datapoints are written
+        with a few set-based statements via
+        DatapointInterface.bulk_add_report_datapoints(), rather than merged into
+        the session one at a time.
         """
         existing_datapoints_dict = (
             existing_datapoints_dict
             or ReportInterface.get_existing_datapoints_dict(reports=[report])
         )
 
-        datapoint_json_list: List[Optional[DatapointJson]] = []
-        # First, add a datapoint for the aggregated_value
         current_time = datetime.datetime.now(tz=datetime.timezone.utc)
         metric_definition = METRIC_KEY_TO_METRIC[report_metric.key]
+        datapoint_writes: List[ReportDatapointWrite] = []
 
+        # First, add a datapoint for the aggregated_value
         # If we're not supposed to use the existing aggregate value, then we should
         # definitely perform the add/update. If we're supposed to use the existing
         # value but the incoming datapoint has its own value, we should still go
         # into this method, because if there is no existing value in the DB,
         # we should save the incoming one.
         if not uploaded_via_breakdown_sheet or report_metric.value is not None:
-            datapoint_json_list.append(
-                DatapointInterface.add_report_datapoint(
-                    session=session,
-                    existing_datapoints_dict=existing_datapoints_dict,
-                    user_account=user_account,
-                    current_time=current_time,
-                    metric_definition_key=metric_definition.key,
-                    report=report,
+            datapoint_writes.append(
+                ReportDatapointWrite(
                     value=report_metric.value,
                     uploaded_via_breakdown_sheet=uploaded_via_breakdown_sheet,
-                    agency=agency,
-                    upload_method=upload_method,
                 )
             )
 
@@ -559,19 +561,8 @@ class ReportInterface:
                     # datapoint, which will overwrite any previously reported values.
                     continue
 
-                datapoint_json_list.append(
-                    DatapointInterface.add_report_datapoint(
-                        session=session,
-                        existing_datapoints_dict=existing_datapoints_dict,
-                        user_account=user_account,
-                        current_time=current_time,
-                        metric_definition_key=metric_definition.key,
-                        report=report,
-                        value=all_dimensions_to_values[d],
-                        dimension=d,
-                        agency=agency,
-                        upload_method=upload_method,
-                    )
+                datapoint_writes.append(
+                    ReportDatapointWrite(value=all_dimensions_to_values[d], dimension=d)
                 )
 
         # Finally, add a datapoint for each context
@@ -584,21 +575,45 @@ class ReportInterface:
                 # datapoint, which will overwrite any previously reported values.
                 continue
 
-            datapoint_json_list.append(
-                DatapointInterface.add_report_datapoint(
-                    session=session,
-                    existing_datapoints_dict=existing_datapoints_dict,
-                    user_account=user_account,
-                    current_time=current_time,
-                    metric_definition_key=metric_definition.key,
-                    report=report,
+            datapoint_writes.append(
+                ReportDatapointWrite(
                     value=context_key_to_value[context.key],
                     context_key=context.key,
                     value_type=context.value_type,
-                    agency=agency,
-                    upload_method=upload_method,
                 )
             )
+
+        if use_bulk_upsert:
+            return DatapointInterface.bulk_add_report_datapoints(
+                session=session,
+                report=report,
+                existing_datapoints_dict=existing_datapoints_dict,
+                datapoint_writes=datapoint_writes,
+                metric_definition_key=metric_definition.key,
+                current_time=current_time,
+                upload_method=upload_method,
+                user_account=user_account,
+                agency=agency,
+            )
+
+        datapoint_json_list = [
+            DatapointInterface.add_report_datapoint(
+                session=session,
+                existing_datapoints_dict=existing_datapoints_dict,
+                user_account=user_account,
+                current_time=current_time,
+                metric_definition_key=metric_definition.key,
+                report=report,
+                value=datapoint_write.value,
+                context_key=datapoint_write.context_key,
+                value_type=datapoint_write.value_type,
+                dimension=datapoint_write.dimension,
+                uploaded_via_breakdown_sheet=datapoint_write.uploaded_via_breakdown_sheet,
+                agency=agency,
+                upload_method=upload_method,
+            )
+            for datapoint_write in datapoint_writes
+        ]
         return [dp for dp in datapoint_json_list if dp is not None]
 
     ### Helpers ###
@@ -20,8 +20,8 @@ import itertools
 import json
 import logging
 import os
-from io import StringIO
-from typing import Any, Dict, List, Optional, Set, Tuple
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 from google.cloud import storage
@@ -38,6 +38,12 @@ from recidiviz.justice_counts.agency import AgencyInterface
 from recidiviz.justice_counts.agency_user_account_association import (
     AgencyUserAccountAssociationInterface,
 )
+from recidiviz.justice_counts.bulk_upload.workbook_reader import (
+    CsvWorkbookReader,
+    ExcelWorkbookReader,
+    WorkbookReader,
+    get_workbook_reader,
+)
 from recidiviz.justice_counts.bulk_upload.workbook_uploader import WorkbookUploader
 from recidiviz.justice_counts.datapoint import DatapointInterface
 from recidiviz.justice_counts.exceptions import (
@@ -239,7 +245,7 @@ class SpreadsheetInterface:
     @staticmethod
     def ingest_spreadsheet(
         session: Session,
-        xls: pd.ExcelFile,
+        xls: Union[pd.ExcelFile, WorkbookReader],
         spreadsheet: schema.Spreadsheet,
         metric_key_to_agency_datapoints: Dict[str, List[schema.Datapoint]],
         metric_definitions: List[MetricDefinition],
@@ -593,23 +599,27 @@ class SpreadsheetInterface:
     @staticmethod
     def convert_file_to_excel(
         file: Any, filename: str
-    ) -> Tuple[pd.ExcelFile, str, BulkUploadFileType]:
-        # source: https://stackoverflow.com/questions/47379476/how-to-convert-bytes-data-into-a-python-pandas-dataframe
+    ) -> Tuple[WorkbookReader, str, BulkUploadFileType]:
         # Note that invalid metrics will be caught in workbook_uploader._add_invalid_sheet_name_error()
-        # new_file_name is the path of the new xlsx file that we create in line 520
-        # Return value is a tuple of (1) the Excel file XLS, (2) the filename, and
-        # (3) the uploaded file's file type.
+        # Return value is a tuple of (1) a reader for the rows of the file, with a
+        # single sheet for CSV files, (2) the filename, and (3) the uploaded file's
+        # file type. Rows are only parsed from the file as they are uploaded.
         file_type = BulkUploadFileType.from_suffix(filename.rsplit(".", 1)[1].lower())
+        if isinstance(file, bytes):
+            file = BytesIO(file)
+        elif isinstance(file, FileStorage):
+            file = file.stream
         if file_type == BulkUploadFileType.CSV:
+            # new_file_name is the name the file would have if it were uploaded as
+            # an Excel workbook, and the sheet is named after the metric in the name.
             new_file_name = filename.rsplit(".", 1)[0] + ".xlsx"  # type: ignore[union-attr]
             metric = new_file_name.rsplit(".", 1)[0].split("/")[-1]
-            if isinstance(file, bytes):
-                s = str(file, "utf-8")
-                file = StringIO(s)
-            csv_df = pd.read_csv(file)
-            csv_df.to_excel(new_file_name, sheet_name=metric, index=False)
-            xls = pd.ExcelFile(new_file_name)
-            return xls, new_file_name, file_type
-
-        xls = pd.ExcelFile(file)
-        return xls, filename, file_type
+            return (
+                CsvWorkbookReader(file=file, sheet_name=metric),
+                new_file_name,
+                file_type,
+            )
+        if file_type == BulkUploadFileType.XLS:
+            # openpyxl cannot read legacy .xls workbooks.
+            return get_workbook_reader(pd.ExcelFile(file)), filename, file_type
+        return ExcelWorkbookReader.from_file(file), filename, file_type
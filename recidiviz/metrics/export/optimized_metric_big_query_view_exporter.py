@@ -30,8 +30,9 @@ import gzip
 import io
 import json
 import logging
+from array import array
 from concurrent import futures
-from typing import Any, Callable, Dict, List, Sequence, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Union
 
 import attr
 from google.cloud import bigquery, storage
@@ -49,6 +50,12 @@ from recidiviz.utils import structured_logging
 # 10000 rows appears to be a reasonable balance of speed and memory usage from local testing
 QUERY_PAGE_SIZE = 10000
 
+# The number of query result pages fetched ahead of the page being processed, so that
+# processing a page overlaps with fetching the next ones. Each exporter worker keeps at
+# most this many page fetches in flight, well within the BigQuery client's connection
+# pool.
+QUERY_PREFETCH_PAGES = 2
+
 DEFAULT_DATA_VALUE = 0
 
 # We set this to lower than 10 because urllib3 (used by Google BigQuery client) has a default limit of 10 connections,
@@ -59,6 +66,10 @@ DEFAULT_DATA_VALUE = 0
 # Setting to 5 workers to reduce pod memory usage
 OPTIMIZED_VIEW_EXPORTER_MAX_WORKERS = 5
 
+# The number of values from the value matrix joined into a single string before it is
+# handed to the gzip writer when streaming the transmission format to Cloud Storage
+TRANSMISSION_FORMAT_BATCH_SIZE = 10000
+
 
 @attr.s(frozen=True)
 class OptimizedMetricRepresentation:
@@ -82,9 +93,15 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         bq_client: BigQueryClient,
         validators: Sequence[BigQueryViewExportValidator],
         should_compress: bool = False,
+        single_pass: bool = False,
     ):
         super().__init__(bq_client, validators)
         self.should_compress = should_compress
+        # If True, query results are read once into columnar buffers and the
+        # flattened value matrix is streamed through a gzip writer to Cloud Storage,
+        # rather than reading the results twice and compressing the whole file in
+        # memory. Both modes produce identical files.
+        self.single_pass = single_pass
 
     def export(
         self, export_configs: Sequence[ExportBigQueryViewConfig[MetricBigQueryView]]
@@ -125,6 +142,14 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         query_job = self.bq_client.run_query_async(
             query_str=config.query, use_query_cache=True, query_parameters=[]
         )
+        if self.single_pass:
+            value_matrix_builder = self.read_query_results_into_value_matrix_builder(
+                query_job, config
+            )
+            return self._stream_optimized_format(
+                config, value_matrix_builder, storage_client
+            )
+
         optimized_format = self.convert_query_results_to_optimized_value_matrix(
             query_job, config
         )
@@ -139,6 +164,10 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         export_config: ExportBigQueryViewConfig[MetricBigQueryView],
     ) -> OptimizedMetricRepresentation:
         """Prepares an optimized metric file format for the results of the given query job and export configuration."""
+        if self.single_pass:
+            return self.read_query_results_into_value_matrix_builder(
+                query_job, export_config
+            ).build()
 
         # Identifies the full set of keys for the given view, as well as those for for dimensions and values
         export_view = export_config.view
@@ -173,7 +202,10 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         )
         assemble_manifest_fn = _gen_assemble_manifest(dimension_values_by_key)
         self.bq_client.paged_read_and_process(
-            query_job, QUERY_PAGE_SIZE, assemble_manifest_fn
+            query_job,
+            QUERY_PAGE_SIZE,
+            assemble_manifest_fn,
+            prefetch_pages=QUERY_PREFETCH_PAGES,
         )
         logging.info(
             "Produced dictionary-based manifest for view: %s", export_view.view_id
@@ -207,7 +239,10 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
             data_values, value_keys, dimension_manifest
         )
         self.bq_client.paged_read_and_process(
-            query_job, QUERY_PAGE_SIZE, place_value_in_matrix_fn
+            query_job,
+            QUERY_PAGE_SIZE,
+            place_value_in_matrix_fn,
+            prefetch_pages=QUERY_PREFETCH_PAGES,
         )
         logging.info(
             "Finished paged read and process for view: %s", export_view.view_id
@@ -220,6 +255,85 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
             value_keys=value_keys,
         )
 
+    def read_query_results_into_value_matrix_builder(
+        self,
+        query_job: bigquery.QueryJob,
+        export_config: ExportBigQueryViewConfig[MetricBigQueryView],
+    ) -> "ColumnarValueMatrixBuilder":
+        """Reads the results of the given query job in a single pass into a
+        ColumnarValueMatrixBuilder, from which the same optimized representation that
+        convert_query_results_to_optimized_value_matrix produces can be assembled.
+        """
+        export_view = export_config.view
+
+        logging.info(
+            "Reading query results into columnar buffers for view: %s",
+            export_view.view_id,
+        )
+
+        table = self.bq_client.get_table(
+            self.bq_client.dataset_ref_for_id(export_view.dataset_id),
+            export_view.view_id,
+        )
+        all_keys = [field.name for field in table.schema]
+
+        if len(all_keys) == 0:
+            logging.warning(
+                "No columns for this view query, returning an empty representation "
+            )
+            return ColumnarValueMatrixBuilder(dimension_keys=(), value_keys=[])
+
+        dimension_keys = export_view.dimensions
+        value_keys = sorted(list(set(all_keys) - set(dimension_keys)))
+
+        value_matrix_builder = ColumnarValueMatrixBuilder(dimension_keys, value_keys)
+        self.bq_client.paged_read_and_process(
+            query_job,
+            QUERY_PAGE_SIZE,
+            value_matrix_builder.add_rows,
+            prefetch_pages=QUERY_PREFETCH_PAGES,
+        )
+        logging.info(
+            "Finished paged read and process for view: %s", export_view.view_id
+        )
+        return value_matrix_builder
+
+    def _stream_optimized_format(
+        self,
+        export_config: ExportBigQueryViewConfig,
+        value_matrix_builder: "ColumnarValueMatrixBuilder",
+        storage_client: storage.Client,
+    ) -> GcsfsFilePath:
+        """Streams the optimized metric representation held by the given builder to
+        Cloud Storage through an incremental gzip writer, based on the export
+        configuration. Returns the output path the file was written to.
+        """
+        output_path = export_config.output_path(extension="txt")
+
+        logging.info(
+            "Streaming optimized metric file %s to GCS bucket %s...",
+            output_path.blob_name,
+            output_path.bucket_name,
+        )
+
+        blob = storage.Blob.from_string(output_path.uri(), client=storage_client)
+        blob.metadata = _format_metadata(
+            value_matrix_builder.dimension_manifest(),
+            value_matrix_builder.value_keys,
+            value_matrix_builder.total_data_points,
+        )
+        blob.content_encoding = "gzip"
+        with blob.open("wb", content_type="text/plain", ignore_flush=True) as f:
+            self._write_transmission_format(value_matrix_builder.iter_value_matrix(), f)
+
+        logging.info(
+            "Optimized metric file %s written to GCS bucket %s.",
+            output_path.blob_name,
+            output_path.bucket_name,
+        )
+
+        return output_path
+
     def _export_optimized_format(
         self,
         export_config: ExportBigQueryViewConfig,
@@ -268,12 +382,9 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
         total_data_points = (
             len(formatted.value_matrix[0]) if formatted.value_matrix else 0
         )
-        metadata = {
-            "dimension_manifest": json.dumps(formatted.dimension_manifest),
-            "value_keys": json.dumps(formatted.value_keys),
-            "total_data_points": total_data_points,
-        }
-        blob.metadata = metadata
+        blob.metadata = _format_metadata(
+            formatted.dimension_manifest, formatted.value_keys, total_data_points
+        )
 
         if should_compress:
             blob.content_encoding = "gzip"
@@ -306,6 +417,130 @@ class OptimizedMetricBigQueryViewExporter(BigQueryViewExporter):
 
         return out.getvalue()
 
+    @staticmethod
+    def _write_transmission_format(
+        value_matrix: Iterator[Sequence[Any]], fileobj: io.IOBase
+    ) -> None:
+        """Writes the value matrix to the given binary file object as a
+        gzip-compressed, flattened comma-separated string of values, a batch of values
+        at a time. The output is identical to that of _produce_transmission_format with
+        should_compress=True.
+        """
+        # GzipFile compresses each write incrementally and the deflate stream does not
+        # depend on how its input is split, so this matches compressing the whole
+        # string at once.
+        with gzip.GzipFile(filename="", fileobj=fileobj, mode="w") as fo:
+            separator = ""
+            for values in value_matrix:
+                for start in range(0, len(values), TRANSMISSION_FORMAT_BATCH_SIZE):
+                    batch = values[start : start + TRANSMISSION_FORMAT_BATCH_SIZE]
+                    fo.write((separator + ",".join(map(str, batch))).encode())
+                    separator = ","
+
+
+class ColumnarValueMatrixBuilder:
+    """Accumulates query result rows into the compact matrix of an
+    OptimizedMetricRepresentation in a single pass.
+
+    Each dimension value is stored as the code of the order in which that value was
+    first seen in an unsigned integer array, and each value key's values are stored in
+    a 64-bit integer array for as long as every value is an int. Once all rows have
+    been added, the dimension manifest is sorted and codes are remapped to the index of
+    each value in the manifest.
+    """
+
+    def __init__(self, dimension_keys: Tuple[str, ...], value_keys: List[str]):
+        self.value_keys = value_keys
+        self._num_rows = 0
+
+        self._dimension_keys = sorted(_initialize_dimension_manifest(dimension_keys))
+        self._codes_by_value: List[Dict[str, int]] = [{} for _ in self._dimension_keys]
+        self._dimension_codes = [array("L") for _ in self._dimension_keys]
+        self._value_columns: List[Union["array[int]", List[Any]]] = [
+            array("q") for _ in value_keys
+        ]
+
+    def add_rows(self, rows: List[bigquery.table.Row]) -> None:
+        data_points = [dict(row) for row in rows]
+        for key, codes_by_value, codes in zip(
+            self._dimension_keys, self._codes_by_value, self._dimension_codes
+        ):
+            for data_point in data_points:
+                normalized_value = _normalize_dimension_value(data_point[key])
+                codes.append(
+                    codes_by_value.setdefault(normalized_value, len(codes_by_value))
+                )
+
+        for i, value_key in enumerate(self.value_keys):
+            values = [dp.get(value_key, DEFAULT_DATA_VALUE) for dp in data_points]
+            self._add_values(i, values)
+
+        self._num_rows += len(data_points)
+
+    @property
+    def total_data_points(self) -> int:
+        if not self._dimension_keys and not self.value_keys:
+            return 0
+        return self._num_rows
+
+    def _add_values(self, column_index: int, values: List[Any]) -> None:
+        column = self._value_columns[column_index]
+        if isinstance(column, array):
+            # bools are ints but are written as "True" / "False", so they are not
+            # kept in the typed array
+            if all(
+                isinstance(value, int) and not isinstance(value, bool)
+                for value in values
+            ):
+                try:
+                    column.extend(values)
+                    return
+                except OverflowError:
+                    pass
+            column = self._value_columns[column_index] = list(column)
+        column.extend(values)
+
+    def dimension_manifest(self) -> List[Tuple[str, List[str]]]:
+        return [
+            (key, sorted(codes_by_value))
+            for key, codes_by_value in zip(self._dimension_keys, self._codes_by_value)
+        ]
+
+    def iter_value_matrix(self) -> Iterator[Sequence[Any]]:
+        """Yields each row of the value matrix: one for each dimension key, holding
+        the index of each data point's value in the dimension manifest, followed by
+        one for each value key."""
+        for codes_by_value, codes in zip(self._codes_by_value, self._dimension_codes):
+            manifest_index_by_code = array("L", [0]) * len(codes_by_value)
+            for i, value in enumerate(sorted(codes_by_value)):
+                manifest_index_by_code[codes_by_value[value]] = i
+            yield array("L", map(manifest_index_by_code.__getitem__, codes))
+
+        yield from self._value_columns
+
+    def build(self) -> OptimizedMetricRepresentation:
+        if not self._dimension_keys and not self.value_keys:
+            return OptimizedMetricRepresentation(
+                value_matrix=[], dimension_manifest=[], value_keys=[]
+            )
+        return OptimizedMetricRepresentation(
+            value_matrix=[list(values) for values in self.iter_value_matrix()],
+            dimension_manifest=self.dimension_manifest(),
+            value_keys=self.value_keys,
+        )
+
+
+def _format_metadata(
+    dimension_manifest: List[Tuple[str, List[str]]],
+    value_keys: List[str],
+    total_data_points: int,
+) -> Dict[str, Any]:
+    return {
+        "dimension_manifest": json.dumps(dimension_manifest),
+        "value_keys": json.dumps(value_keys),
+        "total_data_points": total_data_points,
+    }
+
 
 def _initialize_dimension_manifest(
     dimension_keys: Tuple[str, ...]
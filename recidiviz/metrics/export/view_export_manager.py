@@ -314,8 +314,12 @@ def get_delegate_export_map(
     json_exporter = JsonLinesBigQueryViewExporter(
         bq_client, validators_for_type.get(ExportOutputFormatType.JSON, [])
     )
+    # Metric exports read each query's results once, streaming the compressed file to
+    # Cloud Storage, rather than holding the whole transmission format in memory.
     metric_exporter = OptimizedMetricBigQueryViewExporter(
-        bq_client, validators_for_type.get(ExportOutputFormatType.METRIC, [])
+        bq_client,
+        validators_for_type.get(ExportOutputFormatType.METRIC, []),
+        single_pass=True,
     )
     with_metadata_query_exporter = WithMetadataQueryBigQueryViewExporter(
         bq_client,
@@ -16,6 +16,7 @@
 # =============================================================================
 """Implements Querier abstractions for Outliers data sources"""
 import logging
+from collections import defaultdict
 from copy import copy
 from datetime import date
 from functools import cached_property
@@ -63,6 +64,76 @@ from recidiviz.persistence.database.schema.outliers.schema import (
 from recidiviz.persistence.database.schema_type import SchemaType
 
 
+@attr.s(auto_attribs=True)
+class MetricEntitiesBySupervisor:
+    """The officer entities for a single metric, partitioned by supervisor so that each
+    supervisor's report can be assembled without scanning every officer in the state."""
+
+    # Rates of all officers with each target status, in the order of the entities
+    status_to_rates: Dict[TargetStatus, List[float]]
+    # Indices into status_to_rates[TargetStatus.FAR] of the rates of each
+    # supervisor's officers
+    supervisor_id_to_far_rate_indices: Dict[str, List[int]]
+    # Entities of each supervisor's officers with a FAR target status
+    supervisor_id_to_far_entities: Dict[str, List[OfficerMetricEntity]]
+
+    @classmethod
+    def build(cls, entities: List[OfficerMetricEntity]) -> "MetricEntitiesBySupervisor":
+        status_to_rates: Dict[TargetStatus, List[float]] = {
+            TargetStatus.FAR: [],
+            TargetStatus.MET: [],
+            TargetStatus.NEAR: [],
+        }
+        supervisor_id_to_far_rate_indices: Dict[str, List[int]] = defaultdict(list)
+        supervisor_id_to_far_entities: Dict[
+            str, List[OfficerMetricEntity]
+        ] = defaultdict(list)
+
+        for entity in entities:
+            rates = status_to_rates[entity.target_status]
+            if entity.target_status == TargetStatus.FAR:
+                supervisor_id_to_far_rate_indices[entity.supervisor_external_id].append(
+                    len(rates)
+                )
+                supervisor_id_to_far_entities[entity.supervisor_external_id].append(
+                    entity
+                )
+            rates.append(entity.rate)
+
+        return cls(
+            status_to_rates=status_to_rates,
+            supervisor_id_to_far_rate_indices=dict(supervisor_id_to_far_rate_indices),
+            supervisor_id_to_far_entities=dict(supervisor_id_to_far_entities),
+        )
+
+    def get_highlighted_officers(self, supervisor_id: str) -> List[OfficerMetricEntity]:
+        """Returns the supervisor's officers with a FAR target status."""
+        return list(self.supervisor_id_to_far_entities.get(supervisor_id, []))
+
+    def get_other_officer_rates(
+        self, supervisor_id: str
+    ) -> Dict[TargetStatus, List[float]]:
+        """Returns the rates of all officers with each target status, excluding the
+        supervisor's highlighted officers.
+
+        The MET and NEAR lists are shared by the results for every supervisor, so they
+        must not be modified. Only the FAR list, which excludes the supervisor's own
+        officers, is built for each supervisor."""
+        far_rates = self.status_to_rates[TargetStatus.FAR]
+        other_far_rates: List[float] = []
+        start = 0
+        for index in self.supervisor_id_to_far_rate_indices.get(supervisor_id, []):
+            other_far_rates.extend(far_rates[start:index])
+            start = index + 1
+        other_far_rates.extend(far_rates[start:])
+
+        return {
+            TargetStatus.FAR: other_far_rates,
+            TargetStatus.MET: self.status_to_rates[TargetStatus.MET],
+            TargetStatus.NEAR: self.status_to_rates[TargetStatus.NEAR],
+        }
+
+
 @attr.s(auto_attribs=True)
 class OutliersQuerier:
     """Implements Querier abstractions for Outliers data sources"""
@@ -147,6 +218,13 @@ class OutliersQuerier:
                 for metric in state_config.metrics
             }
 
+            # Partition each metric's officers by supervisor once, rather than
+            # scanning every metric's officers for each supervisor.
+            metric_to_entities_by_supervisor = {
+                metric: MetricEntitiesBySupervisor.build(metric_context.entities)
+                for metric, metric_context in metric_name_to_metric_context.items()
+            }
+
             officer_supervisor_id_to_data = {}
 
             for (
@@ -160,6 +238,7 @@ class OutliersQuerier:
                 ) = self._get_officer_level_data_for_officer_supervisor(
                     external_id,
                     metric_name_to_metric_context,
+                    metric_to_entities_by_supervisor,
                 )
 
                 officer_supervisor_id_to_data[
@@ -182,6 +261,9 @@ class OutliersQuerier:
     def _get_officer_level_data_for_officer_supervisor(
         supervision_officer_supervisor_id: str,
         metric_id_to_metric_context: Dict[OutliersMetricConfig, MetricContext],
+        metric_to_entities_by_supervisor: Dict[
+            OutliersMetricConfig, MetricEntitiesBySupervisor
+        ],
     ) -> Tuple[List[OutlierMetricInfo], List[OutliersMetricConfig]]:
         """
         Given the supervision_officer_supervisor_id, get the officer-level data for all officers supervised by
@@ -191,33 +273,18 @@ class OutliersQuerier:
         metrics_without_outliers = []
 
         for metric, metric_context in metric_id_to_metric_context.items():
-            entities = metric_context.entities
-
-            other_officer_rates: Dict[TargetStatus, List[float]] = {
-                TargetStatus.FAR: [],
-                TargetStatus.MET: [],
-                TargetStatus.NEAR: [],
-            }
-            highlighted_officers: List[OfficerMetricEntity] = []
-
-            for entity in entities:
-                target_status = entity.target_status
-                rate = entity.rate
-
-                if (
-                    target_status == TargetStatus.FAR
-                    and entity.supervisor_external_id
-                    == supervision_officer_supervisor_id
-                ):
-                    highlighted_officers.append(entity)
-                else:
-                    other_officer_rates[target_status].append(rate)
+            entities_by_supervisor = metric_to_entities_by_supervisor[metric]
+            highlighted_officers = entities_by_supervisor.get_highlighted_officers(
+                supervision_officer_supervisor_id
+            )
 
             if highlighted_officers:
                 info = OutlierMetricInfo(
                     metric=metric,
                     target=metric_context.target,
-                    other_officers=other_officer_rates,
+                    other_officers=entities_by_supervisor.get_other_officer_rates(
+                        supervision_officer_supervisor_id
+                    ),
                     highlighted_officers=highlighted_officers,
                     target_status_strategy=metric_context.target_status_strategy,
                 )
@@ -278,14 +345,12 @@ class OutliersQuerier:
             )
         )
 
-        previous_period_officer_metrics = list(
-            filter(
-                lambda officer_metric_record: (
-                    officer_metric_record.end_date == prev_end_date
-                ),
-                copy(combined_period_officer_metrics),
-            )
-        )
+        officer_id_to_previous_period_officer_metrics = defaultdict(list)
+        for officer_metric_record in combined_period_officer_metrics:
+            if officer_metric_record.end_date == prev_end_date:
+                officer_id_to_previous_period_officer_metrics[
+                    officer_metric_record.officer_id
+                ].append(officer_metric_record)
 
         # Generate the OfficerMetricEntity object for all officers
         entities: List[OfficerMetricEntity] = []
@@ -293,12 +358,9 @@ class OutliersQuerier:
             rate = officer_metric_record.metric_rate
             target_status = officer_metric_record.status
 
-            prev_period_record = [
-                past_officer_metric_record
-                for past_officer_metric_record in previous_period_officer_metrics
-                if past_officer_metric_record.officer_id
-                == officer_metric_record.officer_id
-            ]
+            prev_period_record = officer_id_to_previous_period_officer_metrics.get(
+                officer_metric_record.officer_id, []
+            )
 
             if len(prev_period_record) > 1:
                 raise ValueError(
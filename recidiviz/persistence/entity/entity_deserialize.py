@@ -68,24 +68,59 @@ class EntityFieldConverter(Generic[T]):
         return self.conversion_function(field_value)
 
 
-def entity_deserialize(
-    cls: Type[EntityT],
-    converter_overrides: Dict[str, EntityFieldConverter],
-    defaults: Dict[str, Any],
-    **kwargs: DeserializableEntityFieldValue,
-) -> EntityT:
-    """Factory function that parses ingested versions of the Entity constructor args
-    into database-ready, normalized values and uses the normalized values to construct
-    an instance of the object.
+@attr.define(frozen=True)
+class _DeserializableFieldInfo:
+    """Type information about a single field on an Entity class that determines how
+    values for that field are converted in entity_deserialize().
+    """
 
-    Each field type is normalized in a standard way, but you can also pass in
-    non-standard converters for any field via the |converter_overrides_opt| param.
+    name: str
+    is_str: bool
+    is_datetime: bool
+    is_date: bool
+    is_int: bool
+    is_bool: bool
+    is_enum: bool
+    # Values for forward ref and list fields are passed through unchanged
+    is_forward_ref_or_list: bool
 
-    Null values will never be passed to an EntityFieldConverter. If you want to add a
-    default value that will override any null field value, pass in the default via the
-    |defaults| map.
+    @classmethod
+    def for_field(cls, field: attr.Attribute) -> "_DeserializableFieldInfo":
+        return cls(
+            name=field.name,
+            is_str=is_str(field),
+            is_datetime=is_datetime(field),
+            is_date=is_date(field),
+            is_int=is_int(field),
+            is_bool=is_bool(field),
+            is_enum=is_enum(field),
+            is_forward_ref_or_list=is_forward_ref(field) or is_list(field),
+        )
+
+
+# Maps each Entity class to type information for its fields, keyed by field name.
+_DESERIALIZABLE_FIELD_INFOS_BY_CLASS: Dict[
+    Type[Entity], Dict[str, _DeserializableFieldInfo]
+] = {}
+
+
+def _deserializable_field_infos(
+    cls: Type[Entity],
+) -> Dict[str, _DeserializableFieldInfo]:
+    """Returns type information for every field on the given Entity class, keyed by
+    field name. Entity classes are static, so this is only computed once per class
+    rather than for every entity that is deserialized.
     """
+    if cls not in _DESERIALIZABLE_FIELD_INFOS_BY_CLASS:
+        _DESERIALIZABLE_FIELD_INFOS_BY_CLASS[cls] = _build_deserializable_field_infos(
+            cls
+        )
+    return _DESERIALIZABLE_FIELD_INFOS_BY_CLASS[cls]
+
 
+def _build_deserializable_field_infos(
+    cls: Type[Entity],
+) -> Dict[str, _DeserializableFieldInfo]:
     if not is_attr_decorated(cls):
         raise ValueError(
             f"Can only deserialize attrs classes with entity_deserialize() - found class [{cls}]."
@@ -96,87 +131,116 @@ def entity_deserialize(
             f"Can only deserialize Entity classes with entity_deserialize() - found class [{cls}]."
         )
 
-    def convert_field_value(
-        field: attr.Attribute, field_value: DeserializableEntityFieldValue
-    ) -> Any:
-        if field_value is None:
+    return {
+        field_name: _DeserializableFieldInfo.for_field(field)
+        for field_name, field in attr.fields_dict(cls).items()
+    }
+
+
+def _convert_field_value(
+    field: _DeserializableFieldInfo,
+    field_value: DeserializableEntityFieldValue,
+    converter_overrides: Dict[str, EntityFieldConverter],
+) -> Any:
+    """Converts a single ingested field value into a normalized value for the given
+    field.
+    """
+    if field_value is None:
+        return None
+
+    if isinstance(field_value, str):
+        if not field_value or not field_value.strip():
             return None
 
-        if isinstance(field_value, str):
-            if not field_value or not field_value.strip():
-                return None
-
-        if field.name in converter_overrides:
-            converter = converter_overrides[field.name]
-            if not isinstance(field_value, converter.field_type):
-                raise ValueError(
-                    f"Found converter for field [{field.name}] in the converter_overrides, but expected "
-                    f"field type [{converter.field_type}] does not match actual field type "
-                    f"[{type(field_value)}]"
-                )
-            return converter.convert(field_value)
-
-        if isinstance(field_value, NormalizedJSON):
-            if is_str(field):
-                return field_value.normalized_value
-
-        if isinstance(field_value, str):
-            if is_str(field):
-                return normalize(field_value)
-            if is_datetime(field):
-                # Pick an arbitrary from_dt so parsing is deterministic (used for
-                # parsing strings like 10Y 1D into dates).
-                return parse_datetime(
-                    field_value, from_dt=datetime.datetime(2020, 1, 1)
-                )
-            if is_date(field):
-                # Pick an arbitrary from_dt so parsing is deterministic (used for
-                # parsing strings like 10Y 1D into dates).
-                return parse_date(field_value, from_dt=datetime.datetime(2020, 1, 1))
-            if is_int(field):
-                return parse_int(field_value)
-            if is_bool(field):
-                return parse_bool(field_value)
-
-        if isinstance(field_value, Enum):
-            if is_enum(field):
-                return field_value
-
-        if isinstance(field_value, datetime.datetime):
-            if is_datetime(field):
-                return field_value
-
-        if isinstance(field_value, datetime.date):
-            if is_date(field):
-                return field_value
-
-        if isinstance(field_value, int):
-            if is_int(field):
-                return field_value
-
-        if isinstance(field_value, bool):
-            if is_bool(field):
-                return field_value
-
-        if is_forward_ref(field) or is_list(field):
+    if field.name in converter_overrides:
+        converter = converter_overrides[field.name]
+        if not isinstance(field_value, converter.field_type):
+            raise ValueError(
+                f"Found converter for field [{field.name}] in the converter_overrides, but expected "
+                f"field type [{converter.field_type}] does not match actual field type "
+                f"[{type(field_value)}]"
+            )
+        return converter.convert(field_value)
+
+    if isinstance(field_value, NormalizedJSON):
+        if field.is_str:
+            return field_value.normalized_value
+
+    if isinstance(field_value, str):
+        if field.is_str:
+            return normalize(field_value)
+        if field.is_datetime:
+            # Pick an arbitrary from_dt so parsing is deterministic (used for
+            # parsing strings like 10Y 1D into dates).
+            return parse_datetime(field_value, from_dt=datetime.datetime(2020, 1, 1))
+        if field.is_date:
+            # Pick an arbitrary from_dt so parsing is deterministic (used for
+            # parsing strings like 10Y 1D into dates).
+            return parse_date(field_value, from_dt=datetime.datetime(2020, 1, 1))
+        if field.is_int:
+            return parse_int(field_value)
+        if field.is_bool:
+            return parse_bool(field_value)
+
+    if isinstance(field_value, Enum):
+        if field.is_enum:
             return field_value
 
-        raise ValueError(
-            f"Unsupported field {field.name} with value: "
-            f"{field_value} ({type(field_value)})."
-        )
+    if isinstance(field_value, datetime.datetime):
+        if field.is_datetime:
+            return field_value
+
+    if isinstance(field_value, datetime.date):
+        if field.is_date:
+            return field_value
+
+    if isinstance(field_value, int):
+        if field.is_int:
+            return field_value
+
+    if isinstance(field_value, bool):
+        if field.is_bool:
+            return field_value
+
+    if field.is_forward_ref_or_list:
+        return field_value
+
+    raise ValueError(
+        f"Unsupported field {field.name} with value: "
+        f"{field_value} ({type(field_value)})."
+    )
+
+
+def entity_deserialize(
+    cls: Type[EntityT],
+    converter_overrides: Dict[str, EntityFieldConverter],
+    defaults: Dict[str, Any],
+    **kwargs: DeserializableEntityFieldValue,
+) -> EntityT:
+    """Factory function that parses ingested versions of the Entity constructor args
+    into database-ready, normalized values and uses the normalized values to construct
+    an instance of the object.
+
+    Each field type is normalized in a standard way, but you can also pass in
+    non-standard converters for any field via the |converter_overrides_opt| param.
+
+    Null values will never be passed to an EntityFieldConverter. If you want to add a
+    default value that will override any null field value, pass in the default via the
+    |defaults| map.
+    """
+    field_infos = _deserializable_field_infos(cls)
 
     converted_args = {}
-    fields = set()
-    for field_name, field_ in attr.fields_dict(cls).items():
-        if field_name in kwargs:
-            converted_args[field_name] = convert_field_value(field_, kwargs[field_name])
-        if field_name in defaults:
-            if converted_args.get(field_name, None) is None:
-                converted_args[field_name] = defaults[field_name]
-        fields.add(field_name)
-
-    unexpected_kwargs = set(kwargs.keys()).difference(fields)
+    for field_name, field_value in kwargs.items():
+        if field_name in field_infos:
+            converted_args[field_name] = _convert_field_value(
+                field_infos[field_name], field_value, converter_overrides
+            )
+    for field_name, default in defaults.items():
+        if field_name in field_infos and converted_args.get(field_name) is None:
+            converted_args[field_name] = default
+
+    unexpected_kwargs = kwargs.keys() - field_infos.keys()
     if unexpected_kwargs:
         # Throw if there are unexpected args. NOTE: if there are missing required args,
         # that will be caught by the object construction itself.
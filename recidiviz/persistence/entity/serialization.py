@@ -17,7 +17,9 @@
 """Utilities for serializing entities into JSON-serializable dictionaries."""
 import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import attr
 
 from recidiviz.common.attr_mixins import attr_field_referenced_cls_name_for_field_name
 from recidiviz.persistence.entity.base_entity import CoreEntity
@@ -31,56 +33,104 @@ from recidiviz.persistence.entity.entity_utils import (
 from recidiviz.persistence.entity.state import entities as state_entities
 
 
-def serialize_entity_into_json(
-    entity: CoreEntity,
-    field_index: CoreEntityFieldIndex,
-    back_edge_values: Optional[Dict[str, int]] = None,
-) -> Dict[str, Any]:
-    """Generate a JSON string of an entity's serialized flat field and backedge values.
+@attr.define(frozen=True)
+class _EntitySerializationPlan:
+    """The fields to read when serializing entities of a given class, so that this
+    only needs to be derived from the class structure once rather than for every
+    entity serialized.
+    """
 
-    If |back_edge_values| is given, this means that the entity itself may not have its backedges
-    populated, but that we have values for its backedges to be filled in at a later time.
-    This is only used for serialization of new entities that are generated at normalization
-    time.
+    flat_fields: Tuple[str, ...]
+
+    # Pairs of (back edge field name, name of the id field of the class that back edge
+    # references) for all back edges that are not part of a many-to-many relationship.
+    back_edge_id_fields: Tuple[Tuple[str, str], ...]
+
+
+# Maps each entity class to the plan for serializing entities of that class.
+_SERIALIZATION_PLAN_BY_CLASS: Dict[Type[CoreEntity], _EntitySerializationPlan] = {}
+
+
+def _get_serialization_plan(
+    entity_cls: Type[CoreEntity], field_index: CoreEntityFieldIndex
+) -> _EntitySerializationPlan:
+    """Returns the plan for serializing entities of the given class. The plan only
+    depends on the structure of the class, so it is cached by class alone, rather than
+    by |field_index|, which is often constructed anew for each use.
+    """
+    if entity_cls not in _SERIALIZATION_PLAN_BY_CLASS:
+        _SERIALIZATION_PLAN_BY_CLASS[entity_cls] = _build_serialization_plan(
+            entity_cls, field_index
+        )
+    return _SERIALIZATION_PLAN_BY_CLASS[entity_cls]
+
+
+def _build_serialization_plan(
+    entity_cls: Type[CoreEntity], field_index: CoreEntityFieldIndex
+) -> _EntitySerializationPlan:
+    """Derives the plan for serializing entities of the given class from the class
+    structure.
     """
     flat_fields = field_index.get_all_core_entity_fields(
-        entity.__class__, EntityFieldType.FLAT_FIELD
+        entity_cls, EntityFieldType.FLAT_FIELD
     )
     back_edges = field_index.get_all_core_entity_fields(
-        entity.__class__, EntityFieldType.BACK_EDGE
+        entity_cls, EntityFieldType.BACK_EDGE
     )
     for back_edge in back_edges:
-        if is_one_to_one_relationship(entity.__class__, back_edge):
+        if is_one_to_one_relationship(entity_cls, back_edge):
             raise ValueError(
-                f"Unexpected one-to-one relationship here: {entity.__class__} {back_edge}"
+                f"Unexpected one-to-one relationship here: {entity_cls} {back_edge}"
             )
 
-    many_to_many_relationships = get_many_to_many_relationships(
-        entity.__class__, field_index
-    )
-
-    entity_field_dict: Dict[str, Any] = {
-        **{field_name: getattr(entity, field_name) for field_name in flat_fields}
-    }
+    many_to_many_relationships = get_many_to_many_relationships(entity_cls, field_index)
 
+    back_edge_id_fields = []
     for field_name in back_edges:
         if field_name in many_to_many_relationships:
             continue
         id_field = get_entity_class_in_module_with_name(
             entities_module=state_entities,
             class_name=attr_field_referenced_cls_name_for_field_name(
-                entity.__class__, field_name
+                entity_cls, field_name
             ),
         ).get_class_id_name()
+        back_edge_id_fields.append((field_name, id_field))
+
+    return _EntitySerializationPlan(
+        flat_fields=tuple(flat_fields), back_edge_id_fields=tuple(back_edge_id_fields)
+    )
+
+
+def serialize_entity_into_json(
+    entity: CoreEntity,
+    field_index: CoreEntityFieldIndex,
+    back_edge_values: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """Generate a JSON string of an entity's serialized flat field and backedge values.
+
+    If |back_edge_values| is given, this means that the entity itself may not have its backedges
+    populated, but that we have values for its backedges to be filled in at a later time.
+    This is only used for serialization of new entities that are generated at normalization
+    time.
+    """
+    plan = _get_serialization_plan(type(entity), field_index)
 
-        if getattr(entity, field_name):
-            entity_field_dict[id_field] = getattr(entity, field_name).get_id()
+    entity_field_dict: Dict[str, Any] = {}
+    for field_name in plan.flat_fields:
+        entity_field_dict[field_name] = _json_serializable_value(
+            field_name, getattr(entity, field_name), list_serializer=None
+        )
+
+    for field_name, id_field in plan.back_edge_id_fields:
+        if parent := getattr(entity, field_name):
+            entity_field_dict[id_field] = parent.get_id()
         elif back_edge_values and field_name in back_edge_values:
             entity_field_dict[id_field] = back_edge_values[field_name]
         else:
             entity_field_dict[id_field] = None
 
-    return json_serializable_dict(entity_field_dict)
+    return entity_field_dict
 
 
 def json_serializable_dict(
@@ -95,25 +145,34 @@ def json_serializable_dict(
     If any of the fields are list types, must provide a |list_serializer| which will
     handle serializing list values to a serializable string value.
     """
-    serializable_dict: Dict[str, Any] = {}
-
-    for key, v in element.items():
-        if isinstance(v, Enum):
-            serializable_dict[key] = v.value
-        elif isinstance(v, (datetime.date, datetime.datetime)):
-            # By using isoformat, we are guaranteed a string in the form YYYY-MM-DD,
-            # padded with leading zeros if necessary. For datetime values, the format
-            # will be YYYY-MM-DDTHH:MM:SS, with an optional milliseconds component if
-            # relevant.
-            serializable_dict[key] = v.isoformat()
-        elif isinstance(v, list):
-            if not list_serializer:
-                raise ValueError(
-                    "Must provide list_serializer if there are list "
-                    f"values in dict. Found list in key: [{key}]."
-                )
-
-            serializable_dict[key] = list_serializer(key, v)
-        else:
-            serializable_dict[key] = v
-    return serializable_dict
+    return {
+        key: _json_serializable_value(key, v, list_serializer)
+        for key, v in element.items()
+    }
+
+
+def _json_serializable_value(
+    key: str,
+    v: Any,
+    list_serializer: Optional[Callable[[str, List[Any]], str]],
+) -> Any:
+    """Converts a single value into a format that is JSON serializable. See
+    json_serializable_dict().
+    """
+    if isinstance(v, Enum):
+        return v.value
+    if isinstance(v, (datetime.date, datetime.datetime)):
+        # By using isoformat, we are guaranteed a string in the form YYYY-MM-DD,
+        # padded with leading zeros if necessary. For datetime values, the format
+        # will be YYYY-MM-DDTHH:MM:SS, with an optional milliseconds component if
+        # relevant.
+        return v.isoformat()
+    if isinstance(v, list):
+        if not list_serializer:
+            raise ValueError(
+                "Must provide list_serializer if there are list "
+                f"values in dict. Found list in key: [{key}]."
+            )
+
+        return list_serializer(key, v)
+    return v
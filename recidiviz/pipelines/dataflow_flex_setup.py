@@ -70,6 +70,7 @@ REQUIRED_PACKAGES = [
     "pyjwt",
     "psycopg2-binary",
     "pytablewriter",
+    "rapidfuzz",
     "SQLAlchemy==1.4.51",
     "thefuzz",
     "us",
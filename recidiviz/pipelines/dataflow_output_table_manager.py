@@ -86,6 +86,11 @@ from recidiviz.pipelines.ingest.state.generate_ingest_view_results import (
 from recidiviz.pipelines.normalization.utils.entity_normalization_manager_utils import (
     NORMALIZATION_MANAGERS,
 )
+from recidiviz.pipelines.normalization.utils.incremental_normalization_utils import (
+    NORMALIZATION_CACHE_ROOT_ENTITY_TYPES,
+    bq_schema_for_normalization_cache_table,
+    normalization_cache_table_id,
+)
 from recidiviz.pipelines.normalization.utils.normalized_entity_conversion_utils import (
     bq_schema_for_normalized_state_entity,
 )
@@ -225,6 +230,30 @@ def update_normalized_table_schemas_in_dataset(
     return normalized_table_ids
 
 
+def update_normalization_cache_table_schemas_in_dataset(
+    normalized_state_dataset_id: str,
+) -> None:
+    """Ensures that the tables that store the cache used by incremental runs of the
+    normalization pipeline exist in the dataset with the expected schema."""
+    bq_client = BigQueryClientImpl()
+    normalized_state_dataset_ref = bq_client.dataset_ref_for_id(
+        normalized_state_dataset_id
+    )
+    schema_for_cache_table = bq_schema_for_normalization_cache_table()
+
+    for root_entity_cls in NORMALIZATION_CACHE_ROOT_ENTITY_TYPES:
+        table_id = normalization_cache_table_id(root_entity_cls)
+
+        if bq_client.table_exists(normalized_state_dataset_ref, table_id):
+            bq_client.update_schema(
+                normalized_state_dataset_id, table_id, schema_for_cache_table
+            )
+        else:
+            bq_client.create_table_with_schema(
+                normalized_state_dataset_id, table_id, schema_for_cache_table
+            )
+
+
 def update_state_specific_normalized_state_schemas(
     sandbox_dataset_prefix: Optional[str] = None,
 ) -> None:
@@ -249,6 +278,7 @@ def update_state_specific_normalized_state_schemas(
             if sandbox_dataset_prefix
             else None,
         )
+        update_normalization_cache_table_schemas_in_dataset(normalized_state_dataset_id)
 
 
 def update_normalized_state_schema(
@@ -15,10 +15,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """A PTransform to cluster root entity IDs together."""
-from collections import defaultdict
-from typing import Dict, Generator, List, Set
+from typing import Any, Dict, Generator, Iterable, Optional, Set, Tuple
 
 import apache_beam as beam
+from more_itertools import one
 
 from recidiviz.pipelines.ingest.state.constants import (
     ExternalIdCluster,
@@ -26,9 +26,20 @@ from recidiviz.pipelines.ingest.state.constants import (
     ExternalIdKey,
 )
 
+LABEL = "label"
+NEIGHBORS = "neighbors"
+NEIGHBOR_LABEL = "neighbor_label"
+
+# The number of rounds of min-label propagation to run before contracting the graph.
+# Every connected component with a diameter of at most this many edges is fully
+# resolved by the parallel rounds, so only edges from components with a larger
+# diameter are left for the final union-find step.
+DEFAULT_NUM_LABEL_PROPAGATION_ROUNDS = 4
+
 
 class ClusterRootExternalIds(beam.PTransform):
-    """A PTransform that clusters root entity IDs together.
+    """A PTransform that clusters root entity IDs together by finding the connected
+    components of the graph of external id edges.
 
     Suppose the input looks like so:
         (external_id_1, external_id_2)
@@ -45,115 +56,269 @@ class ClusterRootExternalIds(beam.PTransform):
         (external_id_5, external_id_8)
         (external_id_9, None)
 
-    The first step will be to group by key:
-        (external_id_1, [external_id_2, None])
-        (external_id_2, [external_id_3, external_id_4, external_id_1])
+    The first step will be to build the adjacency list of every external_id, which
+    only includes neighbors linked via a non-null edge:
+        (external_id_1, [external_id_2])
+        (external_id_2, [external_id_1, external_id_3, external_id_4])
         (external_id_3, [external_id_2])
         (external_id_4, [external_id_2])
-        (external_id_5, [None, external_id_8])
+        (external_id_5, [external_id_8])
         (external_id_6, [external_id_7])
         (external_id_7, [external_id_6])
-        (external_id_9, [None])
-
-    The second step will be to make sure that the external_id is included in the list of
-    external_ids that are linked to it:
-        (external_id_1, [external_id_1, external_id_2])
-        (external_id_2, [external_id_1, external_id_2, external_id_3, external_id_4])
-        (external_id_3, [external_id_2, external_id_3])
-        (external_id_4, [external_id_2, external_id_4])
-        (external_id_5, [external_id_5, external_id_8])
-        (external_id_6, [external_id_6, external_id_7])
-        (external_id_7, [external_id_6, external_id_7])
-        (external_id_8, [external_id_5, external_id_8])
-        (external_id_9, [external_id_9])
-
-    Then the output will look like so after combining all of the external_id clusters:
-        (external_id_1, [external_id_1, external_id_2, external_id_3, external_id_4])
-        (external_id_2, [external_id_1, external_id_2, external_id_3, external_id_4])
-        (external_id_3, [external_id_1, external_id_2, external_id_3, external_id_4])
-        (external_id_4, [external_id_1, external_id_2, external_id_3, external_id_4])
-        (external_id_5, [external_id_5, external_id_8])
-        (external_id_6, [external_id_6, external_id_7])
-        (external_id_7, [external_id_6, external_id_7])
-        (external_id_8, [external_id_5, external_id_8])
-        (external_id_9, [external_id_9])
+        (external_id_8, [external_id_5])
+        (external_id_9, [])
+
+    Every external_id starts out labeled with itself. In each round of label
+    propagation, every external_id is relabeled with the minimum of its own label and
+    the labels of its neighbors. These rounds run in parallel across workers, keyed by
+    external_id. After one round, the labels look like so:
+        (external_id_1, external_id_1)
+        (external_id_2, external_id_1)
+        (external_id_3, external_id_2)
+        (external_id_4, external_id_2)
+        (external_id_5, external_id_5)
+        (external_id_6, external_id_6)
+        (external_id_7, external_id_6)
+        (external_id_8, external_id_5)
+        (external_id_9, external_id_9)
+
+    After a fixed number of rounds, the graph is contracted so that there is one edge
+    between every pair of distinct labels that are still linked by an edge:
+        (external_id_1, external_id_2)
+
+    The contracted graph only contains edges for components that are too wide to be
+    resolved by label propagation alone, so it is small and can be resolved with a
+    single union-find pass. The resolved label for every external_id is then:
+        (external_id_1, external_id_1)
+        (external_id_2, external_id_1)
+        (external_id_3, external_id_1)
+        (external_id_4, external_id_1)
+        (external_id_5, external_id_5)
+        (external_id_6, external_id_6)
+        (external_id_7, external_id_6)
+        (external_id_8, external_id_5)
+        (external_id_9, external_id_9)
+
+    Then the output will look like so after grouping external_ids by resolved label:
+        (external_id_1, {external_id_1, external_id_2, external_id_3, external_id_4})
+        (external_id_2, {external_id_1, external_id_2, external_id_3, external_id_4})
+        (external_id_3, {external_id_1, external_id_2, external_id_3, external_id_4})
+        (external_id_4, {external_id_1, external_id_2, external_id_3, external_id_4})
+        (external_id_5, {external_id_5, external_id_8})
+        (external_id_6, {external_id_6, external_id_7})
+        (external_id_7, {external_id_6, external_id_7})
+        (external_id_8, {external_id_5, external_id_8})
+        (external_id_9, {external_id_9})
     """
 
+    def __init__(
+        self,
+        num_label_propagation_rounds: int = DEFAULT_NUM_LABEL_PROPAGATION_ROUNDS,
+    ) -> None:
+        super().__init__()
+        self.num_label_propagation_rounds = num_label_propagation_rounds
+
     def expand(
         self,
         input_or_inputs: beam.PCollection[ExternalIdClusterEdge],
     ) -> beam.PCollection[ExternalIdCluster]:
-        return (
+        adjacency_lists: beam.PCollection[
+            Tuple[ExternalIdKey, Iterable[ExternalIdKey]]
+        ] = (
             input_or_inputs
-            | "For every external_id, groups all external ids or Nones directly linked via an edge to that external_id"
+            | "Emit each non-null edge in both directions, and each external_id on its own"
+            >> beam.FlatMap(self.undirected_edges)
+            | "For every external_id, group all external_ids directly linked to it"
             >> beam.GroupByKey()
-            | "Formats the edges to also include the external_id as an element of the set of linked external_ids"
+            | "Deduplicate and drop placeholders from the linked external_ids"
             >> beam.MapTuple(
-                lambda external_id, linked_external_ids: (
+                lambda external_id, neighbors: (
                     external_id,
-                    {
-                        linked_external_id
-                        for linked_external_id in linked_external_ids
-                        if linked_external_id
-                    }
-                    | {external_id},
+                    sorted({neighbor for neighbor in neighbors if neighbor}),
                 )
             )
-            | "Combine external ID clusters across all elements."
-            >> beam.CombineGlobally(CombineExternalIdClusters())
-            | "Generate a PCollection of external id clusters from the accumulator"
-            >> beam.ParDo(self.split_dictionary_into_elements)
         )
 
-    def split_dictionary_into_elements(
-        self, accumulator: Dict[ExternalIdKey, Set[ExternalIdKey]]
+        labels: beam.PCollection[Tuple[ExternalIdKey, ExternalIdKey]] = (
+            adjacency_lists
+            | "Initialize every external_id label to itself"
+            >> beam.MapTuple(lambda external_id, _: (external_id, external_id))
+        )
+
+        for i in range(self.num_label_propagation_rounds):
+            labels = (
+                {LABEL: labels, NEIGHBORS: adjacency_lists}
+                | f"Join labels with adjacency lists, round {i}" >> beam.CoGroupByKey()
+                | f"Send each label to the external_id and its neighbors, round {i}"
+                >> beam.FlatMap(self.propagate_label)
+                | f"Keep the minimum label for each external_id, round {i}"
+                >> beam.CombinePerKey(min)
+            )
+
+        contracted_edges: beam.PCollection[Tuple[ExternalIdKey, ExternalIdKey]] = (
+            {LABEL: labels, NEIGHBORS: adjacency_lists}
+            | "Join final labels with adjacency lists" >> beam.CoGroupByKey()
+            | "Send each final label to the neighbors of the external_id"
+            >> beam.FlatMap(self.send_label_to_neighbors)
+            | "Group neighbor labels with the label of each external_id"
+            >> beam.GroupByKey()
+            | "Emit an edge between every pair of distinct linked labels"
+            >> beam.FlatMap(self.contracted_label_edges)
+            # beam.Distinct is a ptransform_fn, which takes the input PCollection
+            # when applied rather than when constructed.
+            | "Deduplicate the contracted edges"
+            >> beam.Distinct()  # pylint: disable=no-value-for-parameter
+        )
+
+        resolved_labels = (
+            contracted_edges
+            | "Resolve the labels of the contracted graph with union-find"
+            >> beam.CombineGlobally(UnionFindExternalIdClusters())
+        )
+
+        return (
+            labels
+            | "Key each external_id by its resolved label"
+            >> beam.Map(
+                self.key_by_resolved_label,
+                resolved_labels=beam.pvalue.AsSingleton(resolved_labels),
+            )
+            | "Group all external ids with the same resolved label" >> beam.GroupByKey()
+            | "Generate a PCollection of external id clusters"
+            >> beam.FlatMap(self.split_cluster_into_elements)
+        )
+
+    @staticmethod
+    def undirected_edges(
+        edge: ExternalIdClusterEdge,
+    ) -> Generator[Tuple[ExternalIdKey, Optional[ExternalIdKey]], None, None]:
+        """Emits the edge in both directions, and the first external_id paired with
+        None so that it has an adjacency list even when it is not linked to any
+        other external_id."""
+        external_id, linked_external_id = edge
+        yield external_id, None
+        if linked_external_id and linked_external_id != external_id:
+            yield external_id, linked_external_id
+            yield linked_external_id, external_id
+
+    @staticmethod
+    def propagate_label(
+        element: Tuple[ExternalIdKey, Dict[str, Iterable[Any]]]
+    ) -> Generator[Tuple[ExternalIdKey, ExternalIdKey], None, None]:
+        """Emits the label of the external_id for itself and for each of its
+        neighbors."""
+        external_id, values = element
+        label = one(values[LABEL])
+        yield external_id, label
+        for neighbor in one(values[NEIGHBORS]):
+            yield neighbor, label
+
+    @staticmethod
+    def send_label_to_neighbors(
+        element: Tuple[ExternalIdKey, Dict[str, Iterable[Any]]]
+    ) -> Generator[Tuple[ExternalIdKey, Tuple[str, ExternalIdKey]], None, None]:
+        """Emits the label of the external_id, tagged as either its own label or as
+        the label of a neighbor."""
+        external_id, values = element
+        label = one(values[LABEL])
+        yield external_id, (LABEL, label)
+        for neighbor in one(values[NEIGHBORS]):
+            yield neighbor, (NEIGHBOR_LABEL, label)
+
+    @staticmethod
+    def contracted_label_edges(
+        element: Tuple[ExternalIdKey, Iterable[Tuple[str, ExternalIdKey]]]
+    ) -> Generator[Tuple[ExternalIdKey, ExternalIdKey], None, None]:
+        """Emits an edge between the label of the external_id and every distinct label
+        of its neighbors, with the smaller label first."""
+        _, tagged_labels = element
+        label: Optional[ExternalIdKey] = None
+        neighbor_labels: Set[ExternalIdKey] = set()
+        for tag, tagged_label in tagged_labels:
+            if tag == LABEL:
+                label = tagged_label
+            else:
+                neighbor_labels.add(tagged_label)
+        if label is None:
+            raise ValueError("Expected every external_id to have a label.")
+        for neighbor_label in neighbor_labels:
+            if neighbor_label != label:
+                yield min(label, neighbor_label), max(label, neighbor_label)
+
+    @staticmethod
+    def key_by_resolved_label(
+        element: Tuple[ExternalIdKey, ExternalIdKey],
+        resolved_labels: Dict[ExternalIdKey, ExternalIdKey],
+    ) -> Tuple[ExternalIdKey, ExternalIdKey]:
+        external_id, label = element
+        return resolved_labels.get(label, label), external_id
+
+    @staticmethod
+    def split_cluster_into_elements(
+        element: Tuple[ExternalIdKey, Iterable[ExternalIdKey]]
     ) -> Generator[ExternalIdCluster, None, None]:
-        for external_id, external_ids_in_cluster in accumulator.items():
+        _, external_ids = element
+        external_ids_in_cluster = set(external_ids)
+        for external_id in external_ids_in_cluster:
             yield (external_id, external_ids_in_cluster)
 
 
-class CombineExternalIdClusters(beam.CombineFn):
-    """A CombineFn that combines clusters of external IDs together."""
+class UnionFindExternalIdClusters(beam.CombineFn):
+    """A CombineFn that resolves edges between external ids (or labels) into clusters
+    using a union-find structure. The output maps every external id that appears in an
+    edge to the representative external id of its cluster.
+
+    The accumulator only stores a single parent pointer per external id, so merging
+    clusters does not copy sets of external ids around.
+    """
 
     # pylint: disable=arguments-differ,abstract-method
 
-    def create_accumulator(self) -> Dict[ExternalIdKey, Set[ExternalIdKey]]:
-        return defaultdict(set)
+    def create_accumulator(self) -> Dict[ExternalIdKey, ExternalIdKey]:
+        return {}
+
+    @staticmethod
+    def _find(
+        parents: Dict[ExternalIdKey, ExternalIdKey], external_id: ExternalIdKey
+    ) -> ExternalIdKey:
+        parent = parents.setdefault(external_id, external_id)
+        while parent != external_id:
+            # Path halving: point every other node on the path at its grandparent.
+            grandparent = parents[parent]
+            parents[external_id] = grandparent
+            external_id, parent = parent, grandparent
+        return external_id
 
     def add_input(
         self,
-        mutable_accumulator: Dict[ExternalIdKey, Set[ExternalIdKey]],
-        element: ExternalIdCluster,
-    ) -> Dict[ExternalIdKey, Set[ExternalIdKey]]:
-        external_id, external_ids_in_element_cluster = element
-        if external_id not in external_ids_in_element_cluster:
-            raise ValueError("Require that the external_id itself be in the cluster.")
-        external_ids_already_in_cluster: Set[ExternalIdKey] = mutable_accumulator[
-            external_id
-        ]
-        final_cluster = (
-            external_ids_already_in_cluster | external_ids_in_element_cluster
-        )
-        for cluster_member_external_id in final_cluster:
-            mutable_accumulator[cluster_member_external_id] = final_cluster
+        mutable_accumulator: Dict[ExternalIdKey, ExternalIdKey],
+        element: Tuple[ExternalIdKey, ExternalIdKey],
+    ) -> Dict[ExternalIdKey, ExternalIdKey]:
+        external_id_a, external_id_b = element
+        root_a = self._find(mutable_accumulator, external_id_a)
+        root_b = self._find(mutable_accumulator, external_id_b)
+        if root_a != root_b:
+            # Always keep the smaller external id as the root so that the result does
+            # not depend on the order in which edges are added.
+            mutable_accumulator[max(root_a, root_b)] = min(root_a, root_b)
         return mutable_accumulator
 
     def merge_accumulators(
         self,
-        accumulators: List[Dict[ExternalIdKey, Set[ExternalIdKey]]],
-    ) -> Dict[ExternalIdKey, Set[ExternalIdKey]]:
-        final_accumulator: Dict[ExternalIdKey, Set[ExternalIdKey]] = defaultdict(set)
-
+        accumulators: Iterable[Dict[ExternalIdKey, ExternalIdKey]],
+    ) -> Dict[ExternalIdKey, ExternalIdKey]:
+        accumulators = iter(accumulators)
+        final_accumulator = next(accumulators, None) or {}
         for accumulator in accumulators:
-            for external_id_key, external_ids_in_cluster in accumulator.items():
-                self.add_input(
-                    final_accumulator, (external_id_key, external_ids_in_cluster)
-                )
-
+            for external_id, parent in accumulator.items():
+                self.add_input(final_accumulator, (external_id, parent))
         return final_accumulator
 
     def extract_output(
         self,
-        accumulator: Dict[ExternalIdKey, Set[ExternalIdKey]],
-    ) -> Dict[ExternalIdKey, Set[ExternalIdKey]]:
-        return accumulator
+        accumulator: Dict[ExternalIdKey, ExternalIdKey],
+    ) -> Dict[ExternalIdKey, ExternalIdKey]:
+        return {
+            external_id: self._find(accumulator, external_id)
+            for external_id in list(accumulator)
+        }
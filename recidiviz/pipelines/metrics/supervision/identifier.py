@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Identifies various events related to supervision."""
+import bisect
 import datetime
 from collections import defaultdict
 from datetime import date
@@ -72,6 +73,7 @@ from recidiviz.pipelines.metrics.utils.supervision_utils import (
 )
 from recidiviz.pipelines.metrics.utils.violation_utils import (
     VIOLATION_HISTORY_WINDOW_MONTHS,
+    ViolationHistory,
     filter_violation_responses_for_violation_history,
     get_violation_and_response_history,
 )
@@ -355,6 +357,40 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
             else date.today() + relativedelta(days=1)
         )
 
+        # These attributes depend only on the supervision period, so they are computed
+        # once for the whole period rather than for every day of it.
+        supervision_type = (
+            supervision_period.supervision_type
+            if supervision_period.supervision_type
+            else StateSupervisionPeriodSupervisionType.INTERNAL_UNKNOWN
+        )
+
+        deprecated_supervising_district_external_id = (
+            supervision_delegate.get_deprecated_supervising_district_external_id(
+                level_1_supervision_location_external_id,
+                level_2_supervision_location_external_id,
+            )
+        )
+
+        projected_end_date = supervision_delegate.get_projected_completion_date(
+            supervision_period=supervision_period,
+            incarceration_sentences=incarceration_sentences,
+            supervision_sentences=supervision_sentences,
+        )
+
+        supervision_out_of_state = is_supervision_out_of_state(
+            supervision_period.custodial_authority,
+            deprecated_supervising_district_external_id,
+            supervision_delegate,
+        )
+
+        span_attributes = _PopulationSpanAttributes(
+            assessments=assessments,
+            violation_responses_for_history=violation_responses_for_history,
+            violation_delegate=violation_delegate,
+            supervision_delegate=supervision_delegate,
+        )
+
         while event_date < end_date:
             if self._in_supervision_population_for_period_on_date(
                 event_date,
@@ -362,22 +398,13 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
                 incarceration_period_index,
                 supervision_delegate,
             ):
-                supervision_type = (
-                    supervision_period.supervision_type
-                    if supervision_period.supervision_type
-                    else StateSupervisionPeriodSupervisionType.INTERNAL_UNKNOWN
-                )
-
                 assessment_score = None
                 assessment_level = None
                 assessment_type = None
                 assessment_score_bucket = DEFAULT_ASSESSMENT_SCORE_BUCKET
 
-                most_recent_assessment = assessment_utils.find_most_recent_applicable_assessment_of_class_for_state(
-                    event_date,
-                    assessments,
-                    assessment_class=StateAssessmentClass.RISK,
-                    supervision_delegate=supervision_delegate,
+                most_recent_assessment = span_attributes.most_recent_assessment(
+                    event_date
                 )
 
                 if most_recent_assessment:
@@ -389,12 +416,7 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
                         or DEFAULT_ASSESSMENT_SCORE_BUCKET
                     )
 
-                violation_history = get_violation_and_response_history(
-                    upper_bound_exclusive_date=(event_date + relativedelta(days=1)),
-                    violation_responses_for_history=violation_responses_for_history,
-                    violation_delegate=violation_delegate,
-                    incarceration_period=None,
-                )
+                violation_history = span_attributes.violation_history(event_date)
 
                 case_compliance: Optional[SupervisionCaseCompliance] = None
 
@@ -403,22 +425,6 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
                         event_date
                     )
 
-                deprecated_supervising_district_external_id = supervision_delegate.get_deprecated_supervising_district_external_id(
-                    level_1_supervision_location_external_id,
-                    level_2_supervision_location_external_id,
-                )
-
-                projected_end_date = supervision_delegate.get_projected_completion_date(
-                    supervision_period=supervision_period,
-                    incarceration_sentences=incarceration_sentences,
-                    supervision_sentences=supervision_sentences,
-                )
-
-                supervision_out_of_state = is_supervision_out_of_state(
-                    supervision_period.custodial_authority,
-                    deprecated_supervising_district_external_id,
-                    supervision_delegate,
-                )
                 event = SupervisionPopulationEvent(
                     state_code=supervision_period.state_code,
                     year=event_date.year,
@@ -450,7 +456,7 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
 
                 supervision_population_events.append(event)
 
-            event_date = event_date + relativedelta(days=1)
+            event_date = event_date + datetime.timedelta(days=1)
 
         return supervision_population_events
 
@@ -1226,3 +1232,90 @@ class SupervisionIdentifier(BaseIdentifier[List[SupervisionEvent]]):
                             )
 
         return None, None, None, None, DEFAULT_ASSESSMENT_SCORE_BUCKET
+
+
+class _PopulationSpanAttributes:
+    """Computes the assessment and violation history attributes of supervision
+    population events, caching each result for the span of days between the "change
+    points" where the underlying value could differ.
+
+    The most recent assessment can only change on a date that an assessment was taken,
+    and the violation history can only change when a violation response enters or
+    leaves the violation history lookback window, so days that fall within the same
+    span share one computed result.
+    """
+
+    def __init__(
+        self,
+        assessments: List[NormalizedStateAssessment],
+        violation_responses_for_history: List[
+            NormalizedStateSupervisionViolationResponse
+        ],
+        violation_delegate: StateSpecificViolationDelegate,
+        supervision_delegate: StateSpecificSupervisionDelegate,
+    ) -> None:
+        self._assessments = assessments
+        self._violation_responses_for_history = violation_responses_for_history
+        self._violation_delegate = violation_delegate
+        self._supervision_delegate = supervision_delegate
+
+        self._assessment_dates: List[date] = sorted(
+            {
+                assessment.assessment_date
+                for assessment in assessments
+                if assessment.assessment_date is not None
+            }
+        )
+        self._response_dates: List[date] = sorted(
+            {
+                response.response_date
+                for response in violation_responses_for_history
+                if response.response_date is not None
+            }
+        )
+
+        self._assessment_by_span: Dict[int, Optional[NormalizedStateAssessment]] = {}
+        self._violation_history_by_span: Dict[Tuple[int, int], ViolationHistory] = {}
+
+    def most_recent_assessment(
+        self, evaluation_date: date
+    ) -> Optional[NormalizedStateAssessment]:
+        """Returns the most recent applicable RISK assessment on or before the
+        |evaluation_date|."""
+        # The set of assessments on or before the date is fully determined by how many
+        # distinct assessment dates fall on or before it.
+        span_key = bisect.bisect_right(self._assessment_dates, evaluation_date)
+        if span_key not in self._assessment_by_span:
+            self._assessment_by_span[
+                span_key
+            ] = assessment_utils.find_most_recent_applicable_assessment_of_class_for_state(
+                evaluation_date,
+                self._assessments,
+                assessment_class=StateAssessmentClass.RISK,
+                supervision_delegate=self._supervision_delegate,
+            )
+        return self._assessment_by_span[span_key]
+
+    def violation_history(self, evaluation_date: date) -> ViolationHistory:
+        """Returns the violation history for the window ending on (and including) the
+        |evaluation_date|."""
+        upper_bound_exclusive_date = evaluation_date + relativedelta(days=1)
+        lower_bound_inclusive_date = upper_bound_exclusive_date - relativedelta(
+            months=VIOLATION_HISTORY_WINDOW_MONTHS
+        )
+        # The set of responses in the window is fully determined by which distinct
+        # response dates fall within [lower_bound_inclusive, upper_bound_exclusive).
+        span_key = (
+            bisect.bisect_left(self._response_dates, lower_bound_inclusive_date),
+            bisect.bisect_left(self._response_dates, upper_bound_exclusive_date),
+        )
+        if span_key not in self._violation_history_by_span:
+            self._violation_history_by_span[
+                span_key
+            ] = get_violation_and_response_history(
+                upper_bound_exclusive_date=upper_bound_exclusive_date,
+                violation_responses_for_history=self._violation_responses_for_history,
+                violation_delegate=self._violation_delegate,
+                incarceration_period=None,
+            )
+        return self._violation_history_by_span[span_key]
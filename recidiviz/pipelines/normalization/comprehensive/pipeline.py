@@ -18,12 +18,14 @@
 recidiviz/tools/calculator/run_sandbox_calculation_pipeline.py for details on how to launch a
 local run.
 """
+import datetime
 from typing import (
     Any,
     Dict,
     Generator,
     Iterable,
     List,
+    Optional,
     Sequence,
     Set,
     Tuple,
@@ -32,8 +34,10 @@ from typing import (
 )
 
 import apache_beam as beam
-from apache_beam import Pipeline
+import attr
+from apache_beam import PCollection, Pipeline
 from apache_beam.io.gcp.internal.clients import bigquery as beam_bigquery
+from apache_beam.pvalue import DoOutputsTuple
 from apache_beam.typehints import with_input_types, with_output_types
 from more_itertools import one
 
@@ -65,6 +69,18 @@ from recidiviz.pipelines.normalization.comprehensive.entity_normalizer import (
 from recidiviz.pipelines.normalization.pipeline_parameters import (
     NormalizationPipelineParameters,
 )
+from recidiviz.pipelines.normalization.utils.incremental_normalization_utils import (
+    NORMALIZATION_CACHE_INPUT_HASH_COLUMN,
+    NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN,
+    NORMALIZATION_CACHE_OUTPUT_TAG,
+    NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN,
+    bq_schema_for_normalization_cache_table,
+    deserialize_normalized_output,
+    hash_root_entity_inputs,
+    normalization_cache_table_id,
+    normalization_logic_fingerprint,
+    serialize_normalized_output,
+)
 from recidiviz.pipelines.normalization.utils.normalization_managers.assessment_normalization_manager import (
     AssessmentNormalizationManager,
     StateSpecificAssessmentNormalizationDelegate,
@@ -103,9 +119,16 @@ from recidiviz.pipelines.normalization.utils.normalized_entity_conversion_utils
     bq_schema_for_normalized_state_entity,
     convert_entities_to_normalized_dicts,
 )
-from recidiviz.pipelines.utils.beam_utils.bigquery_io_utils import WriteToBigQuery
+from recidiviz.pipelines.utils.beam_utils.bigquery_io_utils import (
+    ReadFromBigQuery,
+    WriteToBigQuery,
+)
 from recidiviz.pipelines.utils.beam_utils.extractor_utils import ExtractDataForPipeline
-from recidiviz.pipelines.utils.execution_utils import TableRow, kwargs_for_entity_lists
+from recidiviz.pipelines.utils.execution_utils import (
+    TableRow,
+    kwargs_for_entity_lists,
+    select_query,
+)
 from recidiviz.pipelines.utils.state_utils.state_calculation_config_manager import (
     get_required_state_specific_delegates,
 )
@@ -114,6 +137,11 @@ from recidiviz.pipelines.utils.state_utils.state_specific_delegate import (
 )
 from recidiviz.utils.types import assert_type
 
+# Keys for the CoGroupByKey of root entity inputs and cached normalization output in
+# incremental runs of the pipeline.
+_ROOT_ENTITY_INPUTS_KEY = "root_entity_inputs"
+_CACHED_OUTPUTS_KEY = "cached_outputs"
+
 
 # TODO(#21376) Properly refactor once strategy for separate normalization is defined.
 class ComprehensiveNormalizationPipeline(BasePipeline[NormalizationPipelineParameters]):
@@ -304,7 +332,7 @@ class ComprehensiveNormalizationPipeline(BasePipeline[NormalizationPipelineParam
                 .copy()
             )
 
-            writable_entities = (
+            root_entity_inputs = (
                 p
                 | f"Load required data for {root_entity_type.__name__}"
                 >> ExtractDataForPipeline(
@@ -321,24 +349,40 @@ class ComprehensiveNormalizationPipeline(BasePipeline[NormalizationPipelineParam
                     unifying_class=root_entity_type,
                     unifying_id_field_filter_set=person_id_filter_set,
                 )
-                | f"Normalize entities for {root_entity_type.__name__}"
-                >> beam.ParDo(
-                    NormalizeEntities(),
-                    state_code=self.pipeline_parameters.state_code,
+            )
+
+            if self.pipeline_parameters.incremental:
+                writable_entities = self._incrementally_normalize_entities(
+                    p,
+                    root_entity_inputs,
                     root_entity_type=root_entity_type,
-                    entity_normalizer=self.entity_normalizer(),
-                    state_specific_required_delegates=self.state_specific_required_delegates().get(
-                        root_entity_type
-                    ),
+                    person_id_filter_set=person_id_filter_set,
+                    output_tags=[
+                        *normalized_entity_class_names,
+                        *normalized_entity_associations,
+                    ],
                 )
-                | f"Convert to dict to be written to BQ {root_entity_type.__name__}"
-                >> beam.ParDo(
-                    NormalizedEntityTreeWritableDicts(),
-                    state_code=self.pipeline_parameters.state_code,
-                ).with_outputs(
-                    *normalized_entity_class_names, *normalized_entity_associations
+            else:
+                writable_entities = (
+                    root_entity_inputs
+                    | f"Normalize entities for {root_entity_type.__name__}"
+                    >> beam.ParDo(
+                        NormalizeEntities(),
+                        state_code=self.pipeline_parameters.state_code,
+                        root_entity_type=root_entity_type,
+                        entity_normalizer=self.entity_normalizer(),
+                        state_specific_required_delegates=self.state_specific_required_delegates().get(
+                            root_entity_type
+                        ),
+                    )
+                    | f"Convert to dict to be written to BQ {root_entity_type.__name__}"
+                    >> beam.ParDo(
+                        NormalizedEntityTreeWritableDicts(),
+                        state_code=self.pipeline_parameters.state_code,
+                    ).with_outputs(
+                        *normalized_entity_class_names, *normalized_entity_associations
+                    )
                 )
-            )
 
             for entity_class_name in normalized_entity_class_names:
                 table_id = schema_utils.get_state_database_entity_with_name(
@@ -393,6 +437,88 @@ class ComprehensiveNormalizationPipeline(BasePipeline[NormalizationPipelineParam
                     write_disposition=beam.io.BigQueryDisposition.WRITE_TRUNCATE,
                 )
 
+    def _incrementally_normalize_entities(
+        self,
+        p: Pipeline,
+        root_entity_inputs: PCollection,
+        root_entity_type: Type[Entity],
+        person_id_filter_set: Optional[Set[int]],
+        output_tags: List[str],
+    ) -> DoOutputsTuple:
+        """Normalizes only the root entities whose inputs have changed since the last
+        run of the pipeline, carrying forward the stored output for all other root
+        entities. Writes the updated normalization cache to BQ and returns the
+        normalized entity outputs, tagged in the same way as the output of
+        NormalizedEntityTreeWritableDicts.
+        """
+        cache_table_id = normalization_cache_table_id(root_entity_type)
+
+        cached_outputs = (
+            p
+            | f"Read {cache_table_id} from BigQuery"
+            >> ReadFromBigQuery(
+                query=select_query(
+                    project_id=self.pipeline_parameters.project,
+                    dataset=self.pipeline_parameters.output,
+                    table=cache_table_id,
+                    state_code_filter=self.pipeline_parameters.state_code,
+                    unifying_id_field=NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN,
+                    unifying_id_field_filter_set=person_id_filter_set,
+                )
+            )
+            | f"Key {cache_table_id} rows by root entity id"
+            >> beam.Map(
+                lambda row: (row[NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN], row)
+            )
+        )
+
+        hashed_root_entity_inputs = (
+            root_entity_inputs
+            | f"Hash normalization inputs for {root_entity_type.__name__}"
+            >> beam.ParDo(
+                HashRootEntityInputs(),
+                logic_fingerprint=normalization_logic_fingerprint(),
+                run_date=datetime.date.today(),
+            )
+        )
+
+        writable_entities = (
+            {
+                _ROOT_ENTITY_INPUTS_KEY: hashed_root_entity_inputs,
+                _CACHED_OUTPUTS_KEY: cached_outputs,
+            }
+            | f"Group {root_entity_type.__name__} inputs with cached outputs"
+            >> beam.CoGroupByKey()
+            | f"Incrementally normalize entities for {root_entity_type.__name__}"
+            >> beam.ParDo(
+                IncrementallyNormalizeEntities(),
+                state_code=self.pipeline_parameters.state_code,
+                root_entity_type=root_entity_type,
+                entity_normalizer=self.entity_normalizer(),
+                state_specific_required_delegates=self.state_specific_required_delegates().get(
+                    root_entity_type
+                ),
+            ).with_outputs(*output_tags, NORMALIZATION_CACHE_OUTPUT_TAG)
+        )
+
+        cache_bq_schema = beam_bigquery.TableSchema(
+            fields=[
+                beam_bigquery.TableFieldSchema(name=field.name, type=field.field_type)
+                for field in bq_schema_for_normalization_cache_table()
+            ]
+        )
+
+        _ = getattr(
+            writable_entities, NORMALIZATION_CACHE_OUTPUT_TAG
+        ) | f"Write to BQ table: {self.pipeline_parameters.output}.{cache_table_id}" >> WriteToBigQuery(
+            output_table=cache_table_id,
+            output_dataset=self.pipeline_parameters.output,
+            write_disposition=beam.io.BigQueryDisposition.WRITE_TRUNCATE,
+            schema=cache_bq_schema,
+        )
+
+        return writable_entities
+
     def get_primary_key_from_entity_dict(
         self, entity_dict: Dict[str, Any], entity_primary_key_name: str
     ) -> Tuple[int, Dict[str, Any]]:
@@ -544,3 +670,141 @@ class NormalizedEntityTreeWritableDicts(beam.DoFn):
             output_dict = json_serializable_dict(entity_dict)
 
             yield beam.pvalue.TaggedOutput(entity_name, output_dict)
+
+
+@attr.define(frozen=True)
+class HashedRootEntityInputs:
+    """The inputs to the normalization of a single root entity, along with a hash of
+    those inputs. Wrapping the inputs in a single object ensures that the entity graph
+    is serialized as a whole when it is shuffled, preserving references between
+    entities.
+    """
+
+    input_hash: str
+    inputs: Dict[str, Iterable[Any]]
+
+
+@with_input_types(
+    beam.typehints.Tuple[int, Dict[str, Iterable[Any]]], str, datetime.date
+)
+@with_output_types(beam.typehints.Tuple[int, HashedRootEntityInputs])
+class HashRootEntityInputs(beam.DoFn):
+    """Hashes the inputs to the normalization of a single root entity."""
+
+    # Silence `Method 'process_batch' is abstract in class 'DoFn' but is not overridden (abstract-method)`
+    # pylint: disable=W0223
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._field_index = CoreEntityFieldIndex()
+
+    # pylint: disable=arguments-differ
+    def process(
+        self,
+        element: Tuple[int, Dict[str, Iterable[Any]]],
+        logic_fingerprint: str,
+        run_date: datetime.date,
+    ) -> Generator[Tuple[int, HashedRootEntityInputs], None, None]:
+        root_entity_id, root_entity_inputs = element
+        inputs: Dict[str, Iterable[Any]] = {
+            name: list(values) for name, values in root_entity_inputs.items()
+        }
+
+        yield root_entity_id, HashedRootEntityInputs(
+            input_hash=hash_root_entity_inputs(
+                inputs, logic_fingerprint, run_date, self._field_index
+            ),
+            inputs=inputs,
+        )
+
+
+@with_input_types(
+    beam.typehints.Tuple[int, Dict[str, Iterable[Any]]],
+    str,
+    Type[Entity],
+    ComprehensiveEntityNormalizer,
+    List[Type[StateSpecificDelegate]],
+)
+@with_output_types(beam.typehints.Dict[str, Any])
+class IncrementallyNormalizeEntities(beam.DoFn):
+    """Normalizes the entities of a single root entity only if the inputs to
+    normalization have changed since the stored output was produced, otherwise
+    re-emits the stored output. Produces the same tagged outputs as
+    NormalizedEntityTreeWritableDicts, as well as the updated normalization cache row
+    for the root entity.
+    """
+
+    # Silence `Method 'process_batch' is abstract in class 'DoFn' but is not overridden (abstract-method)`
+    # pylint: disable=W0223
+
+    # pylint: disable=arguments-differ
+    def process(
+        self,
+        element: Tuple[int, Dict[str, Iterable[Any]]],
+        state_code: str,
+        root_entity_type: Type[Entity],
+        entity_normalizer: ComprehensiveEntityNormalizer,
+        state_specific_required_delegates: List[Type[StateSpecificDelegate]],
+    ) -> Generator[beam.pvalue.TaggedOutput, None, None]:
+        """Normalizes the root entity if its input hash does not match the hash
+        stored alongside its cached output.
+
+        Args:
+            element: A tuple containing the id of a single root entity and a
+                dictionary with the HashedRootEntityInputs for that root entity and
+                the cached output row for that root entity, if one exists.
+
+        Yields:
+            The rows to write to each normalized entity table, tagged with the
+                entity or association name, and a row tagged with
+                NORMALIZATION_CACHE_OUTPUT_TAG to write to the normalization cache.
+        """
+        root_entity_id, grouped_values = element
+
+        hashed_inputs: Optional[HashedRootEntityInputs] = next(
+            iter(grouped_values[_ROOT_ENTITY_INPUTS_KEY]), None
+        )
+        if not hashed_inputs:
+            # This root entity no longer exists in the input, so any cached output
+            # for it is dropped.
+            return
+
+        input_hash = hashed_inputs.input_hash
+        cached_output = next(iter(grouped_values[_CACHED_OUTPUTS_KEY]), None)
+
+        if (
+            cached_output
+            and cached_output[NORMALIZATION_CACHE_INPUT_HASH_COLUMN] == input_hash
+        ):
+            normalized_output = cached_output[
+                NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN
+            ]
+            tagged_outputs = deserialize_normalized_output(normalized_output)
+        else:
+            tagged_outputs = []
+            for normalized_entities in NormalizeEntities().process(
+                (root_entity_id, hashed_inputs.inputs),
+                state_code=state_code,
+                root_entity_type=root_entity_type,
+                entity_normalizer=entity_normalizer,
+                state_specific_required_delegates=state_specific_required_delegates,
+            ):
+                for output in NormalizedEntityTreeWritableDicts().process(
+                    normalized_entities, state_code=state_code
+                ):
+                    tagged_output = assert_type(output, beam.pvalue.TaggedOutput)
+                    tagged_outputs.append((tagged_output.tag, tagged_output.value))
+            normalized_output = serialize_normalized_output(tagged_outputs)
+
+        for tag, output_dict in tagged_outputs:
+            yield beam.pvalue.TaggedOutput(tag, output_dict)
+
+        yield beam.pvalue.TaggedOutput(
+            NORMALIZATION_CACHE_OUTPUT_TAG,
+            {
+                "state_code": state_code,
+                NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN: root_entity_id,
+                NORMALIZATION_CACHE_INPUT_HASH_COLUMN: input_hash,
+                NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN: normalized_output,
+            },
+        )
@@ -48,6 +48,12 @@ class NormalizationPipelineParameters(PipelineParameters):
         default=None, validator=attr_validators.is_opt_str
     )
 
+    incremental: bool = attr.ib(
+        default=False,
+        validator=attr_validators.is_bool,
+        converter=attr.converters.to_bool,
+    )
+
     @property
     def flex_template_name(self) -> str:
         return "normalization"
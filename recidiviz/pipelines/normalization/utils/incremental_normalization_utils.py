@@ -0,0 +1,224 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Utils for running the normalization pipeline incrementally.
+
+When run incrementally, the normalization pipeline stores, for each root entity
+(e.g. StatePerson), a hash of all inputs to that root entity's normalization alongside
+the normalized output produced from those inputs. On subsequent runs, only root
+entities whose input hash has changed are re-normalized. The stored output is carried
+forward for all other root entities.
+
+Normalization also depends on the date it runs on: for example, it clears end dates
+that are in the future and drops periods that start in the future. The run date is
+therefore part of the hash of any root entity with a date close enough to the run date
+that its output could change from one day to the next.
+"""
+import datetime
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+
+from google.cloud import bigquery
+
+import recidiviz
+from recidiviz.persistence.database import schema_utils
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.persistence.entity.entity_utils import (
+    CoreEntityFieldIndex,
+    EntityFieldType,
+)
+from recidiviz.persistence.entity.state import entities
+
+# The root entity types that the normalization pipeline stores an incremental
+# normalization cache for.
+NORMALIZATION_CACHE_ROOT_ENTITY_TYPES: List[Type[Entity]] = [
+    entities.StatePerson,
+    entities.StateStaff,
+]
+
+# The output tag used for rows that are written to the normalization cache table.
+NORMALIZATION_CACHE_OUTPUT_TAG = "normalization_cache"
+
+NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN = "root_entity_id"
+NORMALIZATION_CACHE_INPUT_HASH_COLUMN = "input_hash"
+NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN = "normalized_output"
+
+# Packages containing code that can change the output of normalization. A change to
+# any file in these packages invalidates all stored normalization output.
+_NORMALIZATION_LOGIC_PACKAGES = [
+    # Includes the state enums in common/constants/state
+    "common",
+    "persistence/entity",
+    "pipelines/normalization",
+    "pipelines/utils/state_utils",
+]
+
+# Normalization compares entity dates to the date it runs on. It clears or drops dates
+# that are after the run date, and US_TN carries forward the supervision level of open
+# supervision periods that started less than 31 days before the run date. The output
+# for a root entity whose dates are all earlier than this long before the run date does
+# not depend on the run date.
+_RUN_DATE_DEPENDENCE_WINDOW = datetime.timedelta(days=31)
+
+
+def normalization_cache_table_id(root_entity_type: Type[Entity]) -> str:
+    """Returns the id of the table in the normalized state dataset that stores the
+    incremental normalization cache for the given root entity type."""
+    root_table_id = schema_utils.get_state_database_entity_with_name(
+        root_entity_type.__name__
+    ).__tablename__
+    return f"{root_table_id}_normalization_cache"
+
+
+def bq_schema_for_normalization_cache_table() -> List[bigquery.SchemaField]:
+    """Returns the schema of the incremental normalization cache tables."""
+    return [
+        bigquery.SchemaField(
+            "state_code", bigquery.enums.SqlTypeNames.STRING.value, mode="REQUIRED"
+        ),
+        bigquery.SchemaField(
+            NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN,
+            bigquery.enums.SqlTypeNames.INTEGER.value,
+            mode="REQUIRED",
+        ),
+        bigquery.SchemaField(
+            NORMALIZATION_CACHE_INPUT_HASH_COLUMN,
+            bigquery.enums.SqlTypeNames.STRING.value,
+            mode="REQUIRED",
+        ),
+        bigquery.SchemaField(
+            NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN,
+            bigquery.enums.SqlTypeNames.STRING.value,
+            mode="REQUIRED",
+        ),
+    ]
+
+
+@lru_cache(maxsize=None)
+def normalization_logic_fingerprint() -> str:
+    """Returns a hash of the source of all code that can change the output of
+    normalization, so that stored normalization output is invalidated whenever that
+    code changes.
+    """
+    recidiviz_root = os.path.dirname(recidiviz.__file__)
+    hasher = hashlib.sha256()
+    for package in _NORMALIZATION_LOGIC_PACKAGES:
+        for dir_path, dir_names, file_names in os.walk(
+            os.path.join(recidiviz_root, package)
+        ):
+            # Walk directories in a deterministic order
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".py"):
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                hasher.update(os.path.relpath(file_path, recidiviz_root).encode())
+                with open(file_path, "rb") as f:
+                    hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def _serialized_entity(
+    entity: Entity, field_index: CoreEntityFieldIndex
+) -> Tuple[str, Optional[datetime.date]]:
+    """Returns a deterministic string representation of the flat field values of the
+    entity and the ids of all entities it is related to, along with the latest date in
+    its flat fields, if any."""
+    entity_cls = type(entity)
+    flat_fields = {}
+    latest_date: Optional[datetime.date] = None
+    for field_name in field_index.get_all_core_entity_fields(
+        entity_cls, EntityFieldType.FLAT_FIELD
+    ):
+        value = entity.get_field(field_name)
+        flat_fields[field_name] = str(value)
+        if isinstance(value, datetime.datetime):
+            value = value.date()
+        if isinstance(value, datetime.date) and (
+            latest_date is None or value > latest_date
+        ):
+            latest_date = value
+    related_ids = {
+        field_name: sorted(
+            str(related_entity.get_id())
+            for related_entity in entity.get_field_as_list(field_name)
+        )
+        for edge_type in (EntityFieldType.FORWARD_EDGE, EntityFieldType.BACK_EDGE)
+        for field_name in field_index.get_all_core_entity_fields(entity_cls, edge_type)
+    }
+    return (
+        json.dumps(
+            [entity_cls.__name__, flat_fields, related_ids],
+            sort_keys=True,
+            default=str,
+        ),
+        latest_date,
+    )
+
+
+def hash_root_entity_inputs(
+    root_entity_inputs: Mapping[str, Iterable[Any]],
+    logic_fingerprint: str,
+    run_date: datetime.date,
+    field_index: CoreEntityFieldIndex,
+) -> str:
+    """Returns a hash of all of the entities and reference table rows that are the
+    inputs to the normalization of a single root entity, combined with the
+    |logic_fingerprint| of the normalization code. If any of the entities has a date
+    within _RUN_DATE_DEPENDENCE_WINDOW of |run_date| or after it, |run_date| is part of
+    the hash as well. The hash does not depend on the order of the entities or rows in
+    the input.
+    """
+    hasher = hashlib.sha256(logic_fingerprint.encode())
+    latest_date: Optional[datetime.date] = None
+    for input_name in sorted(root_entity_inputs):
+        serialized_values = []
+        for value in root_entity_inputs[input_name]:
+            if not isinstance(value, Entity):
+                serialized_values.append(json.dumps(value, sort_keys=True, default=str))
+                continue
+            serialized_entity, entity_latest_date = _serialized_entity(
+                value, field_index
+            )
+            serialized_values.append(serialized_entity)
+            if entity_latest_date is not None and (
+                latest_date is None or entity_latest_date > latest_date
+            ):
+                latest_date = entity_latest_date
+        hasher.update(json.dumps([input_name, sorted(serialized_values)]).encode())
+    if latest_date is not None and (
+        latest_date >= run_date - _RUN_DATE_DEPENDENCE_WINDOW
+    ):
+        hasher.update(run_date.isoformat().encode())
+    return hasher.hexdigest()
+
+
+def serialize_normalized_output(
+    tagged_outputs: List[Tuple[str, Dict[str, Any]]]
+) -> str:
+    """Serializes the (output tag, row) pairs produced by normalizing a single root
+    entity so they can be stored in the normalization cache table."""
+    return json.dumps(tagged_outputs, sort_keys=True)
+
+
+def deserialize_normalized_output(
+    normalized_output: str,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Inverse of serialize_normalized_output()."""
+    return [tuple(tagged_output) for tagged_output in json.loads(normalized_output)]
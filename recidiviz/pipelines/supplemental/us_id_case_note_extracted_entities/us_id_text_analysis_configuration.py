@@ -20,9 +20,9 @@ from thefuzz import fuzz
 from recidiviz.common.text_analysis import (
     REMOVE_WORDS_WITH_NON_CHARACTERS,
     TEXT_NORMALIZERS,
+    CompiledTextAnalyzer,
     RegexFuzzyMatcher,
     ScoringFuzzyMatcher,
-    TextAnalyzer,
     TextEntity,
     TextMatchingConfiguration,
 )
@@ -272,7 +272,7 @@ class UsIdTextEntity(TextEntity):
     ]
 
 
-DEFAULT_TEXT_ANALYZER = TextAnalyzer(
+DEFAULT_TEXT_ANALYZER = CompiledTextAnalyzer(
     TextMatchingConfiguration(
         stop_words_to_remove={"in", "out"}, text_entities=list(UsIdTextEntity)
     )
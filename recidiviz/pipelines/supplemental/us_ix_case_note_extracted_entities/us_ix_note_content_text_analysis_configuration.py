@@ -20,9 +20,9 @@ from thefuzz import fuzz
 from recidiviz.common.text_analysis import (
     REMOVE_WORDS_WITH_NON_CHARACTERS,
     TEXT_NORMALIZERS,
+    CompiledTextAnalyzer,
     RegexFuzzyMatcher,
     ScoringFuzzyMatcher,
-    TextAnalyzer,
     TextEntity,
     TextMatchingConfiguration,
 )
@@ -271,7 +271,7 @@ class UsIxNoteContentTextEntity(TextEntity):
     ]
 
 
-NOTE_CONTENT_TEXT_ANALYZER = TextAnalyzer(
+NOTE_CONTENT_TEXT_ANALYZER = CompiledTextAnalyzer(
     TextMatchingConfiguration(text_entities=list(UsIxNoteContentTextEntity))
 )
 
@@ -17,7 +17,9 @@
 """Tests for BigQueryClientImpl"""
 import datetime
 import io
+import queue
 import random
+import time
 import unittest
 
 # pylint: disable=protected-access
@@ -333,6 +335,15 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.mock_client.update_table.assert_not_called()
         self.mock_client.create_table.assert_called()
 
+    def test_create_or_update_view_updates_labels(self) -> None:
+        """create_or_update_view sets and updates labels if they are provided."""
+        self.bq_client.create_or_update_view(
+            self.mock_view, labels={"some_label": "some_value"}
+        )
+        updated_view, fields_to_update = self.mock_client.update_table.call_args[0]
+        self.assertEqual({"some_label": "some_value"}, updated_view.labels)
+        self.assertEqual(["view_query", "description", "labels"], fields_to_update)
+
     def test_export_to_cloud_storage(self) -> None:
         """export_to_cloud_storage extracts the table corresponding to the
         view."""
@@ -757,6 +768,22 @@ class BigQueryClientImplTest(unittest.TestCase):
         self.mock_client.create_dataset.assert_called()
         self.mock_client.load_table_from_uri.assert_called()
 
+    def test_load_into_table_from_cloud_storage_async_parquet(self) -> None:
+        self.bq_client.load_table_from_cloud_storage_async(
+            destination_dataset_ref=self.mock_dataset_ref,
+            destination_table_id=self.mock_table_id,
+            destination_table_schema=[SchemaField("my_column", "STRING", "NULLABLE")],
+            source_uris=["gs://bucket/export-uri.parquet"],
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            source_format=bigquery.SourceFormat.PARQUET,
+        )
+
+        self.mock_client.load_table_from_uri.assert_called()
+        job_config = self.mock_client.load_table_from_uri.call_args.kwargs["job_config"]
+        self.assertEqual(bigquery.SourceFormat.PARQUET, job_config.source_format)
+        self.assertIsNone(job_config.allow_quoted_newlines)
+        self.assertIsNone(job_config.skip_leading_rows)
+
     def test_stream_into_table(self) -> None:
         self.mock_client.insert_rows.return_value = None
 
@@ -884,6 +911,29 @@ class BigQueryClientImplTest(unittest.TestCase):
             "View description:\ntest_view description",
         )
 
+    def test_materialize_view_to_table_with_labels(self) -> None:
+        mock_table = create_autospec(bigquery.Table)
+        mock_table.description = (
+            "Materialized data from view [fake-dataset.test_view]. "
+            "View description:\ntest_view description"
+        )
+        mock_table.labels = {"label": "old_value"}
+        self.mock_client.get_table.return_value = mock_table
+
+        self.bq_client.materialize_view_to_table(
+            view=self.mock_view, use_query_cache=False, labels={"label": "value"}
+        )
+
+        self.mock_client.update_table.assert_called_with(mock_table, ["labels"])
+        self.assertEqual({"label": "value"}, mock_table.labels)
+
+        # Tables that are already up to date are not updated
+        self.mock_client.update_table.reset_mock()
+        self.bq_client.materialize_view_to_table(
+            view=self.mock_view, use_query_cache=False, labels={"label": "value"}
+        )
+        self.mock_client.update_table.assert_not_called()
+
     def test_materialize_view_to_table_materialized_address_override(self) -> None:
         """Tests that the materialize_view_to_table function properly calls the function
         to create a table from a query, even when the view is configured to materialize
@@ -1481,6 +1531,119 @@ class BigQueryClientImplTest(unittest.TestCase):
             ]
         )
 
+    @staticmethod
+    def _fake_paged_query_job(
+        num_rows: int, read_delay_seconds: float = 0
+    ) -> mock.MagicMock:
+        """Returns a fake query job whose result() returns pages of num_rows rows,
+        sleeping for a random part of read_delay_seconds before each page so that
+        concurrently fetched pages complete out of order."""
+        rows = [
+            bigquery.table.Row([i, f"value_{i}"], {"id": 0, "value": 1})
+            for i in range(num_rows)
+        ]
+        rng = random.Random(0)
+        delays = [rng.random() * read_delay_seconds for _ in range(num_rows + 1)]
+
+        def _result(max_results: int, start_index: int) -> List[bigquery.table.Row]:
+            time.sleep(delays[min(start_index, num_rows)])
+            return rows[start_index : start_index + max_results]
+
+        mock_query_job = create_autospec(bigquery.QueryJob)
+        mock_query_job.result.side_effect = _result
+        return mock_query_job
+
+    def test_paged_read_prefetch_matches_serial(self) -> None:
+        for num_rows in [0, 1, 9, 10, 11, 95]:
+            serial_pages = list(
+                self.bq_client.paged_read(self._fake_paged_query_job(num_rows), 10)
+            )
+            prefetched_pages = list(
+                self.bq_client.paged_read(
+                    self._fake_paged_query_job(num_rows, read_delay_seconds=0.01),
+                    10,
+                    prefetch_pages=3,
+                )
+            )
+            self.assertEqual(serial_pages, prefetched_pages)
+            self.assertEqual(
+                [dict(row)["id"] for page in prefetched_pages for row in page],
+                list(range(num_rows)),
+            )
+
+    def test_paged_read_and_process_prefetch(self) -> None:
+        mock_query_job = self._fake_paged_query_job(25, read_delay_seconds=0.01)
+        processed_pages: List[List[Any]] = []
+
+        def _process_fn(rows: List[bigquery.table.Row]) -> None:
+            processed_pages.append([dict(row)["id"] for row in rows])
+
+        self.bq_client.paged_read_and_process(
+            mock_query_job, 10, _process_fn, prefetch_pages=2
+        )
+
+        self.assertEqual(
+            [list(range(0, 10)), list(range(10, 20)), list(range(20, 25))],
+            processed_pages,
+        )
+        # The first page is read before any others are requested. The page after the
+        # final full page may be requested before the partial final page is read, but
+        # no pages past that are.
+        self.assertEqual(
+            call(max_results=10, start_index=0),
+            mock_query_job.result.call_args_list[0],
+        )
+        requested_start_indices = {
+            c.kwargs["start_index"] for c in mock_query_job.result.call_args_list
+        }
+        self.assertTrue({0, 10, 20} <= requested_start_indices <= {0, 10, 20, 30})
+
+    def test_paged_read_prefetch_bounds_pages_in_flight(self) -> None:
+        mock_query_job = self._fake_paged_query_job(1000)
+        result_fn = mock_query_job.result.side_effect
+        fetched_start_indexes: "queue.Queue[int]" = queue.Queue()
+
+        def _result(max_results: int, start_index: int) -> List[bigquery.table.Row]:
+            fetched_start_indexes.put(start_index)
+            return result_fn(max_results=max_results, start_index=start_index)
+
+        mock_query_job.result.side_effect = _result
+
+        pages = self.bq_client.paged_read(mock_query_job, 10, prefetch_pages=3)
+        first_page = next(pages)
+        self.assertEqual(10, len(first_page))
+        # The first page, plus the 3 pages fetched ahead of it. No other pages are
+        # submitted until the next page is requested.
+        self.assertEqual(
+            {0, 10, 20, 30},
+            {fetched_start_indexes.get(timeout=10) for _ in range(4)},
+        )
+        self.assertEqual(4, mock_query_job.result.call_count)
+        pages.close()
+
+    def test_paged_read_prefetch_raises_read_errors(self) -> None:
+        mock_query_job = self._fake_paged_query_job(100)
+        result_fn = mock_query_job.result.side_effect
+
+        def _fail_on_third_page(
+            max_results: int, start_index: int
+        ) -> List[bigquery.table.Row]:
+            if start_index == 20:
+                raise exceptions.InternalServerError("Page read failed")
+            return result_fn(max_results=max_results, start_index=start_index)
+
+        mock_query_job.result.side_effect = _fail_on_third_page
+        processed_ids: List[Any] = []
+
+        def _process_fn(rows: List[bigquery.table.Row]) -> None:
+            processed_ids.extend(dict(row)["id"] for row in rows)
+
+        with self.assertRaisesRegex(exceptions.InternalServerError, "Page read failed"):
+            self.bq_client.paged_read_and_process(
+                mock_query_job, 10, _process_fn, prefetch_pages=4
+            )
+        self.assertEqual(list(range(20)), processed_ids)
+
     @mock.patch("recidiviz.big_query.big_query_client.DataTransferServiceClient")
     @mock.patch(
         "recidiviz.big_query.big_query_client.CROSS_REGION_COPY_STATUS_ATTEMPT_SLEEP_TIME_SEC",
@@ -553,6 +553,52 @@ class TestBigQueryViewDagWalkerBase(unittest.TestCase):
         }
         self.assertEqual(expected_descendant_tree_edges, descendants_tree_edges)
 
+    def test_populate_sub_dags_builds_sub_dags_lazily(self) -> None:
+        all_views_dag_walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
+
+        with patch.object(
+            BigQueryViewDagWalker,
+            "_sub_dag_for_bitset",
+            autospec=True,
+            # pylint: disable=protected-access
+            side_effect=BigQueryViewDagWalker._sub_dag_for_bitset,
+        ) as mock_sub_dag_for_bitset:
+            all_views_dag_walker.populate_ancestor_sub_dags()
+            all_views_dag_walker.populate_descendant_sub_dags()
+            # No sub-DAGs are built until they are read
+            mock_sub_dag_for_bitset.assert_not_called()
+
+            node = all_views_dag_walker.nodes_by_address[
+                BigQueryAddress(dataset_id="dataset_3", table_id="table_3")
+            ]
+            ancestors_sub_dag = node.ancestors_sub_dag
+            descendants_sub_dag = node.descendants_sub_dag
+            self.assertEqual(2, mock_sub_dag_for_bitset.call_count)
+
+            # Sub-DAGs are cached once they are built
+            self.assertIs(ancestors_sub_dag, node.ancestors_sub_dag)
+            self.assertIs(descendants_sub_dag, node.descendants_sub_dag)
+            self.assertEqual(2, mock_sub_dag_for_bitset.call_count)
+
+        self.assertEqual(
+            {"table_1", "table_2", "table_3"},
+            {v.address.table_id for v in ancestors_sub_dag.views},
+        )
+        self.assertEqual(
+            {"table_3", "table_4", "table_5", "table_6"},
+            {v.address.table_id for v in descendants_sub_dag.views},
+        )
+
+    def test_sub_dags_not_populated(self) -> None:
+        all_views_dag_walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
+        node = all_views_dag_walker.nodes_by_address[
+            BigQueryAddress(dataset_id="dataset_3", table_id="table_3")
+        ]
+        with self.assertRaises(ValueError):
+            _ = node.ancestors_sub_dag
+        with self.assertRaises(ValueError):
+            _ = node.descendants_sub_dag
+
     def test_populate_sub_dag_empty(self) -> None:
         all_views_dag_walker = BigQueryViewDagWalker([])
         all_views_dag_walker.populate_descendant_sub_dags()
@@ -617,6 +663,64 @@ class TestBigQueryViewDagWalkerBase(unittest.TestCase):
         }
         self.assertEqual(expected_ancestor_tree_edges, ancestor_tree_edges)
 
+    def test_ancestor_and_descendant_addresses(self) -> None:
+        walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
+
+        def address(i: int) -> BigQueryAddress:
+            return BigQueryAddress(dataset_id=f"dataset_{i}", table_id=f"table_{i}")
+
+        self.assertEqual(
+            {address(1), address(2)}, walker.ancestor_addresses(address(3))
+        )
+        self.assertEqual(
+            {address(4), address(5), address(6)},
+            walker.descendant_addresses(address(3)),
+        )
+        self.assertEqual(
+            {address(i) for i in range(1, 6)}, walker.ancestor_addresses(address(6))
+        )
+        self.assertEqual(set(), walker.descendant_addresses(address(6)))
+        self.assertEqual(set(), walker.ancestor_addresses(address(1)))
+
+        self.assertEqual(2, walker.num_ancestors(address(3)))
+        self.assertEqual(3, walker.num_descendants(address(3)))
+        self.assertEqual(5, walker.num_ancestors(address(6)))
+        self.assertEqual(0, walker.num_descendants(address(6)))
+        self.assertEqual(0, walker.num_ancestors(address(1)))
+        self.assertEqual(4, walker.num_descendants(address(1)))
+
+    def test_get_sub_dag_matches_dag_built_from_sub_dag_views(self) -> None:
+        all_views_dag_walker = BigQueryViewDagWalker(self.all_views)
+
+        for view in self.all_views[::100]:
+            for include_ancestors, include_descendants in [
+                (True, False),
+                (False, True),
+                (True, True),
+            ]:
+                sub_dag = all_views_dag_walker.get_sub_dag(
+                    views=[view],
+                    include_ancestors=include_ancestors,
+                    include_descendants=include_descendants,
+                )
+                rebuilt_sub_dag = BigQueryViewDagWalker(sub_dag.views)
+                self.assertEqual(
+                    set(rebuilt_sub_dag.nodes_by_address), set(sub_dag.nodes_by_address)
+                )
+                for address, node in sub_dag.nodes_by_address.items():
+                    rebuilt_node = rebuilt_sub_dag.nodes_by_address[address]
+                    self.assertEqual(
+                        rebuilt_node.parent_node_addresses, node.parent_node_addresses
+                    )
+                    self.assertEqual(
+                        rebuilt_node.child_node_addresses, node.child_node_addresses
+                    )
+                    self.assertEqual(
+                        rebuilt_node.source_addresses, node.source_addresses
+                    )
+                    self.assertEqual(rebuilt_node.is_root, node.is_root)
+                    self.assertEqual(rebuilt_node.is_leaf, node.is_leaf)
+
     def test_get_sub_dag_root_node(self) -> None:
         all_views_dag_walker = BigQueryViewDagWalker(self.x_shaped_dag_views_list)
 
@@ -1268,6 +1372,48 @@ class TestBigQueryViewDagWalkerBase(unittest.TestCase):
 
         self.assertEqual(set(walker.views), set(result.view_results))
 
+    def test_dag_critical_path_runtime(self) -> None:
+        walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
+
+        def process_simple(
+            view: BigQueryView, _parent_results: Dict[BigQueryView, None]
+        ) -> None:
+            if view.view_id == "table_4":
+                time.sleep(0.1)
+            else:
+                time.sleep(0.01)
+
+        result = walker.process_dag(
+            process_simple, synchronous=self.synchronous, perf_config=None
+        )
+
+        view_6 = walker.view_for_address(
+            BigQueryAddress(dataset_id="dataset_6", table_id="table_6")
+        )
+        # The critical path is 1 or 2 -> 3 -> 4 -> 6
+        critical_path_runtime = sum(
+            result.view_processing_stats[
+                walker.view_for_address(
+                    BigQueryAddress(dataset_id=f"dataset_{i}", table_id=f"table_{i}")
+                )
+            ].node_processing_runtime_seconds
+            for i in (3, 4, 6)
+        ) + max(
+            result.view_processing_stats[
+                walker.view_for_address(
+                    BigQueryAddress(dataset_id=f"dataset_{i}", table_id=f"table_{i}")
+                )
+            ].node_processing_runtime_seconds
+            for i in (1, 2)
+        )
+        self.assertAlmostEqual(critical_path_runtime, result.critical_path_runtime)
+        self.assertEqual(
+            result.critical_path_runtime,
+            result.view_processing_stats[view_6].longest_path_runtime_seconds,
+        )
+        self.assertGreaterEqual(result.critical_path_runtime, 0.13)
+        self.assertLessEqual(result.critical_path_runtime, result.total_runtime)
+
     @patch("recidiviz.utils.environment.in_gcp", MagicMock(return_value=True))
     def test_dag_perf_config_in_gcp_no_crash(self) -> None:
         walker = BigQueryViewDagWalker(self.diamond_shaped_dag_views_list)
@@ -1490,6 +1636,56 @@ class AsynchronousBigQueryViewDagWalkerTest(TestBigQueryViewDagWalkerBase):
         # process function for each view in series.
         self.assertLess(processing_time * 3, serial_processing_time)
 
+    def test_dag_process_prioritizes_critical_path(self) -> None:
+        # DAG with a root that starts a chain of views and a root with no children:
+        #  1     4
+        #  |
+        #  2
+        #  |
+        #  3
+        views = [
+            SimpleBigQueryViewBuilder(
+                dataset_id=f"dataset_{i}",
+                view_id=f"table_{i}",
+                description=f"table_{i} description",
+                view_query_template=f"SELECT * FROM `{{project_id}}.{parent}`",
+            ).build()
+            for i, parent in [
+                (1, "source_dataset.source_table"),
+                (2, "dataset_1.table_1"),
+                (3, "dataset_2.table_2"),
+                (4, "source_dataset.source_table"),
+            ]
+        ]
+        walker = BigQueryViewDagWalker(views)
+
+        processed_order: List[str] = []
+
+        def process_simple(
+            view: BigQueryView, _parent_results: Dict[BigQueryView, None]
+        ) -> None:
+            processed_order.append(view.view_id)
+
+        # Only allow a single worker so that nodes are processed in priority order
+        with patch(
+            "recidiviz.big_query.big_query_view_dag_walker.BQ_CLIENT_MAX_POOL_SIZE", 2
+        ):
+            walker.process_dag(process_simple, synchronous=self.synchronous)
+            self.assertEqual(["table_1", "table_2"], processed_order[:2])
+            self.assertCountEqual(
+                ["table_1", "table_2", "table_3", "table_4"], processed_order
+            )
+
+            processed_order.clear()
+            walker.process_dag(
+                process_simple,
+                synchronous=self.synchronous,
+                priority_fn=lambda n: 1 if n.view.view_id == "table_4" else 0,
+            )
+            self.assertEqual(
+                ["table_4", "table_1", "table_2", "table_3"], processed_order
+            )
+
     def test_dag_init(self) -> None:
         walker = BigQueryViewDagWalker(self.all_views)
 
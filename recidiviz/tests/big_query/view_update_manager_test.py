@@ -17,11 +17,12 @@
 
 """Tests for view_update_manager.py."""
 import unittest
-from typing import Iterator, Set, Tuple
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from unittest import mock
 from unittest.mock import MagicMock, call, create_autospec, patch
 
-from google.cloud import bigquery
+from google.cloud import bigquery, exceptions
 
 from recidiviz.big_query import view_update_manager
 from recidiviz.big_query.big_query_address import BigQueryAddress
@@ -888,6 +889,266 @@ class ViewManagerTest(unittest.TestCase):
             )
 
 
+class _FakeBigQueryClient:
+    """Fake implementation of the subset of BigQueryClient used to deploy views, which
+    keeps track of deployed tables / views and counts calls to each API method.
+    """
+
+    def __init__(self) -> None:
+        self.api_calls: Counter[str] = Counter()
+        self.view_queries: Dict[BigQueryAddress, str] = {}
+        self.labels: Dict[BigQueryAddress, Dict[str, str]] = {}
+        self.materialized_tables: Set[BigQueryAddress] = set()
+
+    def dataset_ref_for_id(self, dataset_id: str) -> bigquery.DatasetReference:
+        return bigquery.DatasetReference(_PROJECT_ID, dataset_id)
+
+    def create_dataset_if_necessary(
+        self,
+        _dataset_ref: bigquery.DatasetReference,
+        _default_table_expiration_ms: Optional[int] = None,
+    ) -> None:
+        self.api_calls["create_dataset_if_necessary"] += 1
+
+    def list_tables(self, dataset_id: str) -> List[bigquery.table.TableListItem]:
+        self.api_calls["list_tables"] += 1
+        return [
+            bigquery.table.TableListItem(
+                {
+                    "tableReference": {
+                        "projectId": _PROJECT_ID,
+                        "datasetId": address.dataset_id,
+                        "tableId": address.table_id,
+                    },
+                    "labels": self.labels.get(address, {}),
+                }
+            )
+            for address in {*self.view_queries, *self.materialized_tables}
+            if address.dataset_id == dataset_id
+        ]
+
+    def get_table(
+        self, dataset_ref: bigquery.DatasetReference, table_id: str
+    ) -> bigquery.Table:
+        self.api_calls["get_table"] += 1
+        address = BigQueryAddress(dataset_id=dataset_ref.dataset_id, table_id=table_id)
+        if address not in self.view_queries:
+            raise exceptions.NotFound(f"{address} not found")
+        table = bigquery.Table(dataset_ref.table(table_id))
+        table.view_query = self.view_queries[address]
+        return table
+
+    def delete_table(self, dataset_id: str, table_id: str) -> None:
+        self.api_calls["delete_table"] += 1
+        address = BigQueryAddress(dataset_id=dataset_id, table_id=table_id)
+        self.view_queries.pop(address, None)
+        self.labels.pop(address, None)
+
+    def create_or_update_view(
+        self,
+        view: BigQueryView,
+        might_exist: bool = True,  # pylint: disable=unused-argument
+        labels: Optional[Dict[str, str]] = None,
+    ) -> bigquery.Table:
+        self.api_calls["create_or_update_view"] += 1
+        self.view_queries[view.address] = view.view_query
+        if labels is not None:
+            self.labels[view.address] = labels
+        return bigquery.Table(view)
+
+    def table_exists(
+        self, dataset_ref: bigquery.DatasetReference, table_id: str
+    ) -> bool:
+        self.api_calls["table_exists"] += 1
+        return (
+            BigQueryAddress(dataset_id=dataset_ref.dataset_id, table_id=table_id)
+            in self.materialized_tables
+        )
+
+    def materialize_view_to_table(
+        self,
+        view: BigQueryView,
+        use_query_cache: bool,  # pylint: disable=unused-argument
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.api_calls["materialize_view_to_table"] += 1
+        if not view.materialized_address:
+            raise ValueError(f"View [{view.address}] is not materialized")
+        self.materialized_tables.add(view.materialized_address)
+        if labels is not None:
+            self.labels[view.materialized_address] = labels
+
+
+class SkipUnchangedViewsTest(unittest.TestCase):
+    """Tests for deploying views with skip_unchanged_views=True."""
+
+    def setUp(self) -> None:
+        self.metadata_patcher = mock.patch("recidiviz.utils.metadata.project_id")
+        self.metadata_patcher.start().return_value = _PROJECT_ID
+
+        self.fake_client = _FakeBigQueryClient()
+        self.client_patcher = patch(
+            "recidiviz.big_query.view_update_manager.BigQueryClientImpl",
+            return_value=self.fake_client,
+        )
+        self.client_patcher.start()
+
+    def tearDown(self) -> None:
+        self.client_patcher.stop()
+        self.metadata_patcher.stop()
+
+    @staticmethod
+    def _view_builders(
+        parent_query: str = "SELECT 1 AS col", other_query: str = "SELECT 2 AS col"
+    ) -> List[SimpleBigQueryViewBuilder]:
+        return [
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id="parent_view",
+                description="parent_view description",
+                view_query_template=parent_query,
+                should_materialize=True,
+            ),
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME,
+                view_id="child_view",
+                description="child_view description",
+                view_query_template=(
+                    f"SELECT * FROM `{{project_id}}.{_DATASET_NAME}.parent_view`"
+                ),
+            ),
+            SimpleBigQueryViewBuilder(
+                dataset_id=_DATASET_NAME_2,
+                view_id="other_view",
+                description="other_view description",
+                view_query_template=other_query,
+            ),
+        ]
+
+    def _deploy(
+        self,
+        view_builders: List[SimpleBigQueryViewBuilder],
+        skip_unchanged_views: bool = True,
+    ) -> Counter[str]:
+        self.fake_client.api_calls.clear()
+        view_update_manager.create_managed_dataset_and_deploy_views_for_view_builders(
+            view_source_table_datasets=VIEW_SOURCE_TABLE_DATASETS,
+            view_builders_to_update=view_builders,
+            historically_managed_datasets_to_clean=None,
+            skip_unchanged_views=skip_unchanged_views,
+        )
+        return self.fake_client.api_calls
+
+    def test_skip_unchanged_views(self) -> None:
+        # Nothing has been deployed yet, so all views are created and labeled
+        api_calls = self._deploy(self._view_builders())
+        self.assertEqual(3, api_calls["create_or_update_view"])
+        self.assertEqual(1, api_calls["materialize_view_to_table"])
+        self.assertEqual(
+            {
+                view_update_manager.VIEW_FINGERPRINT_LABEL,
+            },
+            {key for labels in self.fake_client.labels.values() for key in labels},
+        )
+
+        # Nothing has changed, so the only calls are to create datasets and list
+        # the tables in each dataset.
+        api_calls = self._deploy(self._view_builders())
+        self.assertEqual(
+            Counter({"create_dataset_if_necessary": 2, "list_tables": 2}), api_calls
+        )
+
+        # Only the view that changed is updated
+        api_calls = self._deploy(self._view_builders(other_query="SELECT 3 AS col"))
+        self.assertEqual(1, api_calls["get_table"])
+        self.assertEqual(1, api_calls["delete_table"])
+        self.assertEqual(1, api_calls["create_or_update_view"])
+        self.assertEqual(0, api_calls["materialize_view_to_table"])
+        self.assertEqual(
+            "SELECT 3 AS col",
+            self.fake_client.view_queries[
+                BigQueryAddress(dataset_id=_DATASET_NAME_2, table_id="other_view")
+            ],
+        )
+
+        # A change to a parent view updates that view and its descendants
+        api_calls = self._deploy(
+            self._view_builders(
+                parent_query="SELECT 4 AS col", other_query="SELECT 3 AS col"
+            )
+        )
+        self.assertEqual(2, api_calls["get_table"])
+        self.assertEqual(2, api_calls["delete_table"])
+        self.assertEqual(2, api_calls["create_or_update_view"])
+        self.assertEqual(1, api_calls["materialize_view_to_table"])
+
+    def test_skip_unchanged_views_materialization_fails(self) -> None:
+        self._deploy(self._view_builders())
+        parent_address = BigQueryAddress(
+            dataset_id=_DATASET_NAME, table_id="parent_view"
+        )
+        materialized_address = BigQueryAddress(
+            dataset_id=_DATASET_NAME, table_id="parent_view_materialized"
+        )
+
+        with patch.object(
+            self.fake_client,
+            "materialize_view_to_table",
+            side_effect=ValueError("Materialization failed"),
+        ):
+            with self.assertRaises(ValueError):
+                self._deploy(self._view_builders(parent_query="SELECT 4 AS col"))
+
+        # The view was updated, but the materialized table still has the fingerprint
+        # of the previous deploy.
+        self.assertEqual(
+            "SELECT 4 AS col", self.fake_client.view_queries[parent_address]
+        )
+        self.assertNotEqual(
+            self.fake_client.labels[parent_address],
+            self.fake_client.labels[materialized_address],
+        )
+
+        # The next deploy materializes the view even though the view itself is
+        # already up to date.
+        api_calls = self._deploy(self._view_builders(parent_query="SELECT 4 AS col"))
+        self.assertEqual(1, api_calls["materialize_view_to_table"])
+        self.assertEqual(
+            self.fake_client.labels[parent_address],
+            self.fake_client.labels[materialized_address],
+        )
+
+        # Once the view has been materialized, nothing is updated
+        api_calls = self._deploy(self._view_builders(parent_query="SELECT 4 AS col"))
+        self.assertEqual(0, api_calls["create_or_update_view"])
+        self.assertEqual(0, api_calls["materialize_view_to_table"])
+
+    def test_skip_unchanged_views_rematerializes_missing_table(self) -> None:
+        self._deploy(self._view_builders())
+        self.fake_client.materialized_tables.clear()
+
+        api_calls = self._deploy(self._view_builders())
+        self.assertEqual(0, api_calls["create_or_update_view"])
+        self.assertEqual(1, api_calls["materialize_view_to_table"])
+
+    def test_deploy_without_skip_unchanged_views(self) -> None:
+        self._deploy(self._view_builders())
+
+        # Without skip_unchanged_views, every view is fetched and re-created and
+        # existing fingerprint labels on views are dropped.
+        api_calls = self._deploy(self._view_builders(), skip_unchanged_views=False)
+        self.assertEqual(3, api_calls["get_table"])
+        self.assertEqual(3, api_calls["delete_table"])
+        self.assertEqual(3, api_calls["create_or_update_view"])
+        self.assertEqual(
+            set(), set(self.fake_client.labels) & set(self.fake_client.view_queries)
+        )
+
+        # The next deploy with skip_unchanged_views must update every view again
+        api_calls = self._deploy(self._view_builders())
+        self.assertEqual(3, api_calls["create_or_update_view"])
+
+
 class TestExecuteUpdateAllManagedViews(unittest.TestCase):
     """Tests the execute_update_all_managed_views function."""
 
@@ -16,6 +16,9 @@
 # =============================================================================
 """Implements tests for Pathways metric cache."""
 import json
+import threading
+import time
+from typing import Any, List
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
@@ -28,7 +31,11 @@ from recidiviz.case_triage.pathways.dimensions.dimension_mapping import (
     DimensionOperation,
 )
 from recidiviz.case_triage.pathways.dimensions.time_period import TimePeriod
-from recidiviz.case_triage.pathways.metric_cache import PathwaysMetricCache
+from recidiviz.case_triage.pathways.metric_cache import (
+    PathwaysMetricCache,
+    local_cache_version_cache,
+    local_metric_cache,
+)
 from recidiviz.case_triage.pathways.metric_fetcher import PathwaysMetricFetcher
 from recidiviz.case_triage.pathways.metrics.metric_query_builders import (
     ALL_METRICS_BY_NAME,
@@ -43,6 +50,8 @@ class PathwaysMetricCacheTest(TestCase):
     """Tests for pathways metric cache"""
 
     def setUp(self) -> None:
+        local_metric_cache.clear()
+        local_cache_version_cache.clear()
         self.redis = FakeRedis()
         self.query_builder = ALL_METRICS_BY_NAME["LibertyToPrisonTransitionsCount"]
 
@@ -169,3 +178,150 @@ class PathwaysMetricCacheTest(TestCase):
                 ],
                 self.metric_cache.redis.keys(),
             )
+
+    def test_fetch_sets_ttl(self) -> None:
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = [{"foo": "bar"}]
+            params = self.query_builder.build_params({})
+            self.metric_cache.fetch(self.query_builder, params)
+
+            self.assertGreater(
+                self.redis.ttl(
+                    self.metric_cache.cache_key_for(self.query_builder, params)
+                ),
+                0,
+            )
+
+    def test_fetch_from_local_cache(self) -> None:
+        """Once fetched, metrics are served from memory without reading them from
+        Redis."""
+        cached_value = [{"foo": "bar"}]
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = cached_value
+            params = self.query_builder.build_params({})
+            self.metric_cache.fetch(self.query_builder, params)
+
+            self.redis.delete(
+                self.metric_cache.cache_key_for(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.reset_mock()
+
+            with patch.object(self.redis, "get") as mock_get:
+                self.assertEqual(
+                    cached_value, self.metric_cache.fetch(self.query_builder, params)
+                )
+                mock_get.assert_not_called()
+            mock_metric_fetcher.fetch.assert_not_called()
+
+    def test_fetch_concurrent_misses_fetch_once(self) -> None:
+        """Concurrent fetches of a metric that is not cached only query the database
+        once."""
+        cached_value = [{"foo": "bar"}]
+        mock_metric_fetcher = MagicMock()
+
+        def slow_fetch(*_args: Any) -> List[Any]:
+            time.sleep(0.2)
+            return cached_value
+
+        mock_metric_fetcher.fetch.side_effect = slow_fetch
+        metric_caches = [
+            PathwaysMetricCache(
+                state_code=StateCode.US_XX,
+                metric_fetcher=mock_metric_fetcher,
+                redis=self.redis,
+            )
+            for _ in range(5)
+        ]
+        params = self.query_builder.build_params({})
+        results: List[Any] = []
+
+        def fetch(metric_cache: PathwaysMetricCache) -> None:
+            results.append(metric_cache.fetch(self.query_builder, params))
+
+        threads = [
+            threading.Thread(target=fetch, args=(metric_cache,))
+            for metric_cache in metric_caches
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([cached_value] * 5, results)
+        mock_metric_fetcher.fetch.assert_called_once()
+        self.assertEqual([], self.redis.keys("lock:*"))
+
+    def test_reset_cache(self) -> None:
+        params = self.query_builder.build_params({"group": Dimension.GENDER})
+        with patch.object(self.metric_cache, "metric_fetcher") as mock_metric_fetcher:
+            mock_metric_fetcher.fetch.return_value = [{"count": 1}]
+            self.assertEqual(
+                [{"count": 1}], self.metric_cache.fetch(self.query_builder, params)
+            )
+
+            # Resetting the cache switches readers to a new cache version and removes
+            # keys written before cache versions were introduced.
+            mock_metric_fetcher.fetch.return_value = [{"count": 2}]
+            self.metric_cache.reset_cache(self.query_builder)
+            self.assertEqual(1, self.metric_cache.cache_version(self.query_builder))
+            self.assertIsNone(
+                self.redis.get(
+                    self.metric_cache.cache_key_for(self.query_builder, params)
+                )
+            )
+            mock_metric_fetcher.fetch.reset_mock()
+            self.assertEqual(
+                [{"count": 2}], self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
+
+            # Later resets don't need to scan for keys to delete
+            mock_metric_fetcher.fetch.return_value = [{"count": 3}]
+            with patch.object(self.redis, "scan_iter") as mock_scan_iter:
+                self.metric_cache.reset_cache(self.query_builder)
+                mock_scan_iter.assert_not_called()
+            self.assertEqual(2, self.metric_cache.cache_version(self.query_builder))
+            self.assertEqual(
+                [{"count": 3}], self.metric_cache.fetch(self.query_builder, params)
+            )
+            # Keys for the previous version are left to expire
+            self.assertIsNotNone(
+                self.redis.get(
+                    self.metric_cache.cache_key_for(
+                        self.query_builder, params, version=1
+                    )
+                )
+            )
+
+    def test_reset_cache_concurrent_resets(self) -> None:
+        """A reset that finishes after a later reset does not switch readers back to
+        an earlier version."""
+        params = self.query_builder.build_params({"group": Dimension.GENDER})
+        initialize_cache = self.metric_cache.initialize_cache
+
+        def initialize_cache_during_other_reset(mapper: Any, version: int = 0) -> None:
+            if version == 1:
+                self.metric_fetcher_value = [{"count": 2}]
+                self.metric_cache.reset_cache(mapper)
+                self.metric_fetcher_value = [{"count": 1}]
+            initialize_cache(mapper, version=version)
+
+        self.metric_fetcher_value = [{"count": 1}]
+        with patch.object(
+            self.metric_cache, "metric_fetcher"
+        ) as mock_metric_fetcher, patch.object(
+            self.metric_cache,
+            "initialize_cache",
+            side_effect=initialize_cache_during_other_reset,
+        ):
+            mock_metric_fetcher.fetch.side_effect = (
+                lambda *_args: self.metric_fetcher_value
+            )
+            self.metric_cache.reset_cache(self.query_builder)
+
+            self.assertEqual(2, self.metric_cache.cache_version(self.query_builder))
+            mock_metric_fetcher.fetch.reset_mock()
+            self.assertEqual(
+                [{"count": 2}], self.metric_cache.fetch(self.query_builder, params)
+            )
+            mock_metric_fetcher.fetch.assert_not_called()
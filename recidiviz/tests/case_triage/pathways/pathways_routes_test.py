@@ -31,6 +31,10 @@ from flask.testing import FlaskClient
 from recidiviz.case_triage.error_handlers import register_error_handlers
 from recidiviz.case_triage.pathways.dimensions.dimension import Dimension
 from recidiviz.case_triage.pathways.dimensions.time_period import TimePeriod
+from recidiviz.case_triage.pathways.metric_cache import (
+    local_cache_version_cache,
+    local_metric_cache,
+)
 from recidiviz.case_triage.pathways.pathways_authorization import (
     on_successful_authorization,
 )
@@ -62,6 +66,8 @@ class PathwaysBlueprintTestCase(TestCase):
     def setUp(self) -> None:
         self.mock_authorization_handler = MagicMock()
 
+        local_metric_cache.clear()
+        local_cache_version_cache.clear()
         self.redis_patcher = mock.patch(
             "recidiviz.case_triage.pathways.metric_cache.get_pathways_metric_redis",
             return_value=FakeRedis(),
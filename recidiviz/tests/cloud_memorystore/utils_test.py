@@ -0,0 +1,83 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+""" Tests for the Redis utils """
+from typing import Any, List
+from unittest import TestCase
+from unittest.mock import patch
+
+import fakeredis
+import redis
+
+from recidiviz.cloud_memorystore.utils import get_or_set_json_with_lock
+
+
+class TestGetOrSetJsonWithLock(TestCase):
+    """TestCase for get_or_set_json_with_lock."""
+
+    def setUp(self) -> None:
+        self.cache = fakeredis.FakeRedis()
+
+    def test_get_or_set_json_with_lock(self) -> None:
+        self.assertEqual(
+            [{"foo": "bar"}],
+            get_or_set_json_with_lock(self.cache, "key", lambda: [{"foo": "bar"}]),
+        )
+        # The lock is released once the value is set
+        self.assertEqual([], self.cache.keys("lock:*"))
+
+        # Cached values are not fetched again
+        self.assertEqual(
+            [{"foo": "bar"}],
+            get_or_set_json_with_lock(self.cache, "key", lambda: [{"foo": "baz"}]),
+        )
+
+    def test_lock_expired_and_reacquired_before_release(self) -> None:
+        def fetch_value() -> List[Any]:
+            # The lock expires while the value is fetched, and another caller
+            # acquires it
+            self.cache.delete("lock:key")
+            self.cache.set("lock:key", "other-token")
+            return [{"foo": "bar"}]
+
+        self.assertEqual(
+            [{"foo": "bar"}], get_or_set_json_with_lock(self.cache, "key", fetch_value)
+        )
+        # The other caller's lock is not released
+        self.assertEqual(b"other-token", self.cache.get("lock:key"))
+
+    def test_lock_reacquired_while_releasing(self) -> None:
+        pipeline_get = redis.client.Pipeline.get
+
+        def get_then_reacquire_lock(pipeline: redis.client.Pipeline, name: str) -> Any:
+            value = pipeline_get(pipeline, name)
+            # The lock expires after its token is compared, and another caller
+            # acquires it
+            self.cache.set("lock:key", "other-token")
+            return value
+
+        with patch.object(
+            redis.client.Pipeline,
+            "get",
+            autospec=True,
+            side_effect=get_then_reacquire_lock,
+        ):
+            self.assertEqual(
+                [{"foo": "bar"}],
+                get_or_set_json_with_lock(self.cache, "key", lambda: [{"foo": "bar"}]),
+            )
+        # The other caller's lock is not released
+        self.assertEqual(b"other-token", self.cache.get("lock:key"))
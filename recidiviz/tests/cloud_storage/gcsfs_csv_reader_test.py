@@ -24,6 +24,8 @@ import pandas.errors
 
 from recidiviz.cloud_storage.gcsfs_csv_reader import (
     COMMON_RAW_FILE_ENCODINGS,
+    ENCODING_NUM_SAMPLES,
+    ENCODING_SAMPLE_SIZE_BYTES,
     GcsfsCsvReader,
     GcsfsCsvReaderDelegate,
 )
@@ -252,3 +254,62 @@ class GcsfsCsvReaderTest(unittest.TestCase):
         self.assertEqual({"UTF-8"}, {encoding for encoding, df in delegate.dataframes})
         self.assertEqual(0, delegate.decode_errors)
         self.assertEqual(1, delegate.exceptions)
+
+    def test_read_returns_successful_encoding(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        delegate = _TestGcsfsCsvReaderDelegate()
+        encoding = self.reader.streaming_read(gcs_path, delegate=delegate, chunk_size=1)
+        self.assertEqual("ISO-8859-1", encoding)
+
+    def test_filter_encodings_by_sample_small_file(self) -> None:
+        file_path = fixtures.as_filepath("encoded_latin_1.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+
+        self.assertEqual(
+            ["ISO-8859-1"],
+            self.reader.filter_encodings_by_sample(gcs_path, COMMON_RAW_FILE_ENCODINGS),
+        )
+
+        file_path = fixtures.as_filepath("encoded_utf_8.csv")
+        gcs_path = GcsfsFilePath.from_absolute_path(file_path)
+        self.fake_gcs.test_add_path(gcs_path, file_path)
+        self.assertEqual(
+            COMMON_RAW_FILE_ENCODINGS,
+            self.reader.filter_encodings_by_sample(gcs_path, COMMON_RAW_FILE_ENCODINGS),
+        )
+
+    def test_filter_encodings_by_sample_large_file(self) -> None:
+        # Multi-byte UTF-8 characters of different lengths, so that samples start in
+        # the middle of characters.
+        line = "col1,café,日本語,𝄞\n"
+        num_lines = (ENCODING_SAMPLE_SIZE_BYTES * ENCODING_NUM_SAMPLES) // len(
+            line.encode("utf-8")
+        ) + 1000
+        gcs_path = GcsfsFilePath.from_absolute_path("gs://my-bucket/large.csv")
+        self.fake_gcs.upload_from_string(gcs_path, line * num_lines, "text/csv")
+
+        self.assertEqual(
+            COMMON_RAW_FILE_ENCODINGS,
+            self.reader.filter_encodings_by_sample(gcs_path, COMMON_RAW_FILE_ENCODINGS),
+        )
+
+        # A single Latin-1 byte near the end of the file rules out UTF-8
+        utf_8_contents = (line * num_lines).encode("utf-8")
+        local_path = self.fake_gcs.real_absolute_path_for_path(gcs_path)
+        with open(local_path, "wb") as f:
+            f.write(utf_8_contents[:-10] + "é".encode("latin-1") + utf_8_contents[-10:])
+
+        self.assertEqual(
+            ["ISO-8859-1"],
+            self.reader.filter_encodings_by_sample(gcs_path, COMMON_RAW_FILE_ENCODINGS),
+        )
+
+        # If nothing can decode the samples, all encodings are returned
+        self.assertEqual(
+            ["UTF-8", "ASCII"],
+            self.reader.filter_encodings_by_sample(gcs_path, ["UTF-8", "ASCII"]),
+        )
@@ -16,6 +16,8 @@
 # =============================================================================
 """Tests for CsvNormalizing IO."""
 import csv
+import io
+import random
 import unittest
 from typing import List, Optional
 
@@ -390,3 +392,50 @@ class TestCsvNormalizingIO(unittest.TestCase):
             line_terminator="†",
             delimiter="‡",
         )
+
+    def test_read_long_lines_split_terminators(self) -> None:
+        """Tests reading files with long lines and multi-character line terminators
+        that are split across the blocks read from the underlying stream.
+        """
+        rng = random.Random(0)
+        for line_terminator in ["†", "†\n", "|||"]:
+            lines = [
+                "‡".join(
+                    "".join(rng.choice('ab"\x00 ') for _ in range(rng.randint(0, 50)))
+                    for _ in range(rng.randint(1, 200))
+                )
+                for _ in range(50)
+            ]
+            contents = line_terminator.join(lines) + line_terminator
+            expected_contents = "\n".join(
+                '"'
+                + line.replace('"', '""').replace("‡", '","').replace("\x00", "")
+                + '"'
+                if line
+                else ""
+                for line in lines + [""]
+            )
+
+            for block_size in [1, 2, 7, 300, 10000]:
+                stream = ReadOnlyCsvNormalizingStream(
+                    io.StringIO(contents),
+                    delimiter="‡",
+                    line_terminator=line_terminator,
+                    quoting=csv.QUOTE_NONE,
+                )
+                blocks = []
+                while block := stream.read(block_size):
+                    self.assertLessEqual(len(block), block_size)
+                    blocks.append(block)
+                self.assertEqual(expected_contents, "".join(blocks))
+
+            stream = ReadOnlyCsvNormalizingStream(
+                io.StringIO(contents),
+                delimiter="‡",
+                line_terminator=line_terminator,
+                quoting=csv.QUOTE_NONE,
+            )
+            read_lines = []
+            while line := stream.readline():
+                read_lines.append(line)
+            self.assertEqual(expected_contents.splitlines(keepends=True), read_lines)
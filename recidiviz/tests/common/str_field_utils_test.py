@@ -16,8 +16,11 @@
 # =============================================================================
 """Tests for str_field_utils.py"""
 import datetime
-from unittest import TestCase
+from unittest import TestCase, mock
 
+import dateparser
+
+from recidiviz.common import str_field_utils
 from recidiviz.common.str_field_utils import (
     NormalizedJSON,
     join_with_conjunction,
@@ -240,6 +243,89 @@ class TestStrFieldUtils(TestCase):
         with self.assertRaises(ValueError):
             parse_datetime("ABC")
 
+    def test_parseDateTime_fastPathFormatsMatchDateparser(self) -> None:
+        from_dt = datetime.datetime(2020, 1, 1)
+        date_strings = [
+            "05/12/2013",
+            "5/2/2013",
+            "12/31/1899",
+            "02/29/2020",
+            "05/12/2013 14:05",
+            "05/12/2013 00:00",
+            "05/12/2013 14:05:59",
+            "05/12/2013 2:05 PM",
+            "05/12/2013 12:05 am",
+            "05/12/2013 02:05:59 pm",
+            "05-12-2013",
+            "5-2-2013",
+            "2013/05/12",
+            "2013/5/2",
+        ]
+        for date_string in date_strings:
+            self.assertIsNotNone(
+                str_field_utils._parse_datetime_fast_path(  # pylint: disable=protected-access
+                    date_string
+                ),
+                date_string,
+            )
+            self.assertEqual(
+                dateparser.parse(
+                    date_string,
+                    languages=["en"],
+                    settings={"PREFER_DAY_OF_MONTH": "first", "RELATIVE_BASE": from_dt},
+                ),
+                parse_datetime(date_string, from_dt=from_dt),
+                date_string,
+            )
+
+    def test_parseDateTime_fastPathFormatOrderDoesNotAffectResults(self) -> None:
+        date_strings = ["05/12/2013", "2013/05/12", "05-12-2013", "5/12/2013 1:00 PM"]
+        expected = [
+            datetime.datetime(2013, 5, 12),
+            datetime.datetime(2013, 5, 12),
+            datetime.datetime(2013, 5, 12),
+            datetime.datetime(2013, 5, 12, 13, 0),
+        ]
+        # Parse values in alternating formats so that a different format was most
+        # recently successful each time.
+        for _ in range(2):
+            self.assertEqual(
+                expected, [parse_datetime(date_string) for date_string in date_strings]
+            )
+
+    def test_parseDateTime_fastPathDoesNotUseDateparser(self) -> None:
+        with mock.patch(
+            "recidiviz.common.str_field_utils.dateparser.parse"
+        ) as mock_parse:
+            self.assertEqual(
+                datetime.datetime(2013, 5, 12), parse_datetime("05/12/2013")
+            )
+        mock_parse.assert_not_called()
+
+    def test_parseDateTime_cachedWithFromDt(self) -> None:
+        str_field_utils._parse_datetime_with_from_dt.cache_clear()  # pylint: disable=protected-access
+        from_dt = datetime.datetime(2020, 1, 1)
+        with mock.patch(
+            "recidiviz.common.str_field_utils.dateparser.parse",
+            wraps=dateparser.parse,
+        ) as mock_parse:
+            for _ in range(3):
+                self.assertEqual(
+                    datetime.datetime(2017, 2, 3, 1, 40),
+                    parse_datetime("Feb 3, 2017 1:40", from_dt=from_dt),
+                )
+            self.assertEqual(1, mock_parse.call_count)
+
+            # A different |from_dt| is cached separately
+            self.assertEqual(
+                datetime.datetime(1998, 11, 30),
+                parse_datetime("1y 1m 1d", from_dt=datetime.datetime(2000, 1, 1)),
+            )
+            self.assertEqual(
+                datetime.datetime(1999, 11, 30),
+                parse_datetime("1y 1m 1d", from_dt=datetime.datetime(2001, 1, 1)),
+            )
+
     def test_parseJSON(self) -> None:
         self.assertEqual("{}", NormalizedJSON().normalized_value)
         self.assertEqual(
@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Tests for text_analysis.py"""
+import re
 import unittest
 from typing import Set
 
@@ -25,11 +26,14 @@ from recidiviz.common.text_analysis import (
     REMOVE_HYPHENS,
     REMOVE_MULTIPLE_WHITESPACES,
     REMOVE_WORDS_WITH_DIGITS_WEBSITES_ENCODINGS,
+    CompiledTextAnalyzer,
     RegexFuzzyMatcher,
     ScoringFuzzyMatcher,
     TextAnalyzer,
     TextEntity,
     TextMatchingConfiguration,
+    _split_top_level_alternatives,
+    _strip_unbounded_wildcards,
 )
 
 REGEX_MATCHER = RegexFuzzyMatcher(search_regex=".*hello.*")
@@ -147,3 +151,54 @@ class TestTextAnalyzer(unittest.TestCase):
                 "sufficient community service acquired"
             ),
         )
+
+
+class TestCompiledTextAnalyzer(TestTextAnalyzer):
+    """Runs the TextAnalyzer tests against the CompiledTextAnalyzer"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.text_analyzer = CompiledTextAnalyzer(self.text_matching_delegate)
+
+    def test_matchers_that_cannot_be_compiled(self) -> None:
+        class UncompiledTextEntity(TextEntity):
+            CUSTOM_REGEX_FUNCTION = [
+                RegexFuzzyMatcher(search_regex="abc", matching_function=re.match)
+            ]
+            REGEX_WITH_GROUP = [RegexFuzzyMatcher(search_regex=r"(def)\1")]
+            CUSTOM_SCORING_FUNCTION = [
+                ScoringFuzzyMatcher(
+                    search_term="xyz", matching_function=lambda a, b: 100 * (a == b)
+                )
+            ]
+
+        text_analyzer = CompiledTextAnalyzer(
+            TextMatchingConfiguration(text_entities=list(UncompiledTextEntity))
+        )
+        self.assertEqual(
+            {UncompiledTextEntity.REGEX_WITH_GROUP},
+            text_analyzer.extract_entities("xx abc defdef"),
+        )
+        self.assertEqual(
+            {UncompiledTextEntity.CUSTOM_REGEX_FUNCTION},
+            text_analyzer.extract_entities("abc def"),
+        )
+        self.assertEqual(
+            {UncompiledTextEntity.CUSTOM_SCORING_FUNCTION},
+            text_analyzer.extract_entities("xyz"),
+        )
+
+    def test_split_top_level_alternatives(self) -> None:
+        self.assertEqual(["a"], _split_top_level_alternatives("a"))
+        self.assertEqual(
+            [".*a.*", ".*b", r"c\|d", "(?:e|f)", "[|]", "[]|]"],
+            _split_top_level_alternatives(r".*a.*|.*b|c\|d|(?:e|f)|[|]|[]|]"),
+        )
+
+    def test_strip_unbounded_wildcards(self) -> None:
+        self.assertEqual("violat", _strip_unbounded_wildcards(".*violat.*"))
+        self.assertEqual("file.*review", _strip_unbounded_wildcards(".*file.*review.*"))
+        self.assertEqual(r"c\.s\.*", _strip_unbounded_wildcards(r".*c\.s\.*"))
+        self.assertEqual(r"c\\", _strip_unbounded_wildcards(r"c\\.*"))
+        self.assertEqual(".*?a", _strip_unbounded_wildcards(".*?a"))
+        self.assertEqual("", _strip_unbounded_wildcards(".*"))
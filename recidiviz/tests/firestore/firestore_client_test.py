@@ -66,6 +66,22 @@ class FirestoreClientImplTest(unittest.TestCase):
             ]
         )
 
+    def test_get_field_by_document_id(self) -> None:
+        doc_a = mock.MagicMock(id="doc_a")
+        doc_a.to_dict.return_value = {"__contentHash": "abc"}
+        doc_b = mock.MagicMock(id="doc_b")
+        doc_b.to_dict.return_value = {}
+        query = self.mock_client.collection.return_value.where.return_value.select
+        query.return_value.stream.return_value = [doc_a, doc_b]
+
+        self.assertEqual(
+            {"doc_a": "abc", "doc_b": None},
+            self.firestore_client.get_field_by_document_id(
+                "clients", "US_XX", "__contentHash"
+            ),
+        )
+        query.assert_called_once_with(["__contentHash"])
+
     def test_list_collections_with_indexes(self) -> None:
         """Tests that list_collections_with_indexes is called with the correct args and correctly parses
         the index name for the collection name."""
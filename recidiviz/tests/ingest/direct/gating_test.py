@@ -22,9 +22,10 @@ from recidiviz.common.constants.states import StateCode
 from recidiviz.ingest.direct.gating import (
     ingest_pipeline_can_run_in_dag,
     is_ingest_in_dataflow_enabled,
+    is_parallel_parquet_raw_data_import_enabled,
 )
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
-from recidiviz.utils.environment import GCP_ENVIRONMENTS
+from recidiviz.utils.environment import GCP_ENVIRONMENTS, GCPEnvironment
 
 
 class TestGating(unittest.TestCase):
@@ -42,3 +43,14 @@ class TestGating(unittest.TestCase):
                             self.assertTrue(
                                 ingest_pipeline_can_run_in_dag(state, instance)
                             )
+
+    def test_parallel_parquet_raw_data_import_disabled_in_production(self) -> None:
+        with patch(
+            "recidiviz.utils.environment.get_gcp_environment",
+            Mock(return_value=GCPEnvironment.PRODUCTION.value),
+        ), patch("recidiviz.utils.environment.in_gcp", Mock(return_value=True)):
+            for state in StateCode:
+                for instance in DirectIngestInstance:
+                    self.assertFalse(
+                        is_parallel_parquet_raw_data_import_enabled(state, instance)
+                    )
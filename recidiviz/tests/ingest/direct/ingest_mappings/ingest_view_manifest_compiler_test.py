@@ -17,10 +17,12 @@
 """Tests for IngestViewManifestCompiler."""
 import csv
 import datetime
+import functools
 import os
 import unittest
 from enum import Enum
 from typing import Dict, List, Optional, Type, Union
+from unittest import mock
 
 from recidiviz.common.constants.enum_parser import EnumParsingError
 from recidiviz.common.constants.states import StateCode
@@ -51,6 +53,9 @@ from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_par
     ingest_view_files,
     manifests,
 )
+from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser.custom_python import (
+    fake_custom_conditionals,
+)
 from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser.fake_schema.entities import (
     FakeAgent,
     FakeCharge,
@@ -2411,6 +2416,107 @@ class IngestViewManifestCompilerTest(unittest.TestCase):
         # Assert
         self.assertEqual(expected_output, parsed_output)
 
+    def test_variable_referenced_multiple_times(self) -> None:
+        # Arrange
+        expected_output = [
+            FakePerson(fake_state_code="US_XX", name="ALBERT", ssn=None),
+            FakePerson(fake_state_code="US_XX", name="BERTHA SSN", ssn=123456789),
+            FakePerson(fake_state_code="US_XX", name="CHARLES SSN", ssn=987654321),
+        ]
+        ssn_args = []
+
+        @functools.wraps(fake_custom_conditionals.should_include_ssn)
+        def should_include_ssn_with_tracking(ssn: str) -> bool:
+            ssn_args.append(ssn)
+            return ssn.startswith("123") or ssn.startswith("987")
+
+        # Act
+        with mock.patch.object(
+            fake_custom_conditionals,
+            "should_include_ssn",
+            should_include_ssn_with_tracking,
+        ):
+            parsed_output = self._run_parse_for_ingest_view(
+                "variable_referenced_multiple_times"
+            )
+
+        # Assert
+        self.assertEqual(expected_output, parsed_output)
+        # The variable is only evaluated once per row
+        self.assertEqual(["111223333", "123456789", "987654321"], ssn_args)
+
+    def test_parse_contents_matches_unmemoized_parsing(self) -> None:
+        """Checks that parsing every fixture ingest view with parse_contents() (which
+        memoizes variable values per row) produces the same result for every row as
+        building the output tree directly from a plain dict row.
+        """
+        context = FakeIngestViewContentsContext(
+            ingest_instance=DirectIngestInstance.SECONDARY,
+            is_production=False,
+            is_staging=False,
+            is_local=False,
+            results_update_datetime=datetime.datetime(2022, 1, 1),
+        )
+        ingest_view_names = sorted(
+            file_name[: -len(".csv")]
+            for file_name in os.listdir(os.path.dirname(ingest_view_files.__file__))
+            if file_name.endswith(".csv")
+        )
+        num_views_checked = 0
+        for ingest_view_name in ingest_view_names:
+            try:
+                manifest = self.compiler.compile_manifest(
+                    ingest_view_name=ingest_view_name
+                )
+            except Exception:
+                # Some fixtures are meant to fail compilation
+                continue
+
+            with open(
+                os.path.join(
+                    os.path.dirname(ingest_view_files.__file__),
+                    f"{ingest_view_name}.csv",
+                ),
+                encoding="utf-8",
+            ) as f:
+                rows = list(csv.DictReader(f))
+
+            results: Dict[int, Union[Entity, Exception]] = {}
+
+            def _collect_result(
+                i: int, _row: Dict[str, str], result: Union[Entity, Exception]
+            ) -> None:
+                results[i] = result  # pylint: disable=cell-var-from-loop
+
+            try:
+                manifest.parse_contents(
+                    contents_iterator=iter(rows),
+                    context=context,
+                    result_callable=_collect_result,
+                )
+            except ValueError:
+                # Some fixtures are meant to fail column validation or should not
+                # launch in this context.
+                continue
+
+            num_views_checked += 1
+            for i, row in enumerate(rows):
+                try:
+                    expected: Union[Entity, Exception] = manifest.output.build_from_row(
+                        dict(row), context
+                    )
+                except Exception as e:
+                    expected = e
+
+                result = results[i]
+                if isinstance(expected, Exception):
+                    self.assertIsInstance(result, type(expected), ingest_view_name)
+                    self.assertEqual(str(expected), str(result), ingest_view_name)
+                else:
+                    self.assertEqual(expected, result, ingest_view_name)
+
+        self.assertGreater(num_views_checked, 40)
+
     def test_enums_bad_mapping_mixed_enums(self) -> None:
         with self.assertRaisesRegex(
             ValueError,
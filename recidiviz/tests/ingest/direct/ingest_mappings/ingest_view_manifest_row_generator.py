@@ -0,0 +1,187 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Generates synthetic ingest view result rows for an ingest view manifest, for use
+in tests and benchmarks that need to parse rows for views that have no fixture data.
+"""
+import json
+import random
+from typing import Dict, Iterable, List, Optional, Set
+
+from recidiviz.common.attr_mixins import (
+    BuildableAttrFieldType,
+    attr_field_type_for_field_name,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
+    BooleanConditionManifest,
+    ConcatenatedStringsManifest,
+    ContainsConditionManifest,
+    DirectMappingFieldManifest,
+    EntityTreeManifest,
+    EnumMappingManifest,
+    EqualsConditionManifest,
+    JSONExtractKeyManifest,
+    ManifestNode,
+    SplitCommaSeparatedListManifest,
+    SplitJSONListManifest,
+    StringLiteralFieldManifest,
+    VariableManifestNode,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_compiler import (
+    IngestViewManifest,
+)
+
+# Values used for columns that have no values derived from the manifest, and
+# occasionally for all other columns.
+_GENERIC_VALUES = ["", "1", "12", "2020-01-01", "2021-03-15 00:00:00", "ABC", "Y", "N"]
+
+_DATE_VALUES = ["2020-01-01", "2021-03-15"]
+
+_INTEGER_VALUES = ["1", "12"]
+
+# The probability that a column with values derived from the manifest is instead
+# hydrated with a generic value.
+_GENERIC_VALUE_PROBABILITY = 0.1
+
+
+class IngestViewManifestRowGenerator:
+    """Generates random input rows for an ingest view manifest. Column values are
+    drawn from the values the manifest expects for each column where they can be
+    derived from the manifest (e.g. the raw text values in enum mappings, the options
+    in $in conditions, or dates for date fields), so that most generated rows parse
+    successfully while others exercise error paths.
+    """
+
+    def __init__(self, manifest: IngestViewManifest, seed: int = 0) -> None:
+        self.manifest = manifest
+        self.random = random.Random(seed)
+
+        self.values_by_column: Dict[str, Set[str]] = {}
+        self.json_columns: Set[str] = set()
+        self.json_list_columns: Set[str] = set()
+        self.list_columns: Set[str] = set()
+        self.json_keys: Set[str] = set()
+        for node in manifest.output.all_nodes_referenced():
+            self._collect_column_values(node)
+        self.sorted_values_by_column = {
+            column: sorted(values)
+            for column, values in self.values_by_column.items()
+            if values
+        }
+        self.sorted_json_keys = sorted(self.json_keys)
+
+    def generate_rows(self, num_rows: int) -> List[Dict[str, str]]:
+        return [self._generate_row() for _ in range(num_rows)]
+
+    def _generate_row(self) -> Dict[str, str]:
+        row = {}
+        for column in self.manifest.input_columns:
+            if column in self.json_columns:
+                row[column] = (
+                    json.dumps(self._generate_json_dict())
+                    if self.random.random() > _GENERIC_VALUE_PROBABILITY
+                    else ""
+                )
+            elif column in self.json_list_columns:
+                row[column] = json.dumps(
+                    [
+                        self._generate_json_dict()
+                        for _ in range(self.random.randint(0, 3))
+                    ]
+                )
+            elif column in self.list_columns:
+                row[column] = ",".join(
+                    self._generate_value(column=None) or "X"
+                    for _ in range(self.random.randint(0, 3))
+                )
+            else:
+                row[column] = self._generate_value(column)
+        return row
+
+    def _generate_json_dict(self) -> Dict[str, str]:
+        return {key: self._generate_value(key) for key in self.sorted_json_keys}
+
+    def _generate_value(self, column: Optional[str]) -> str:
+        if column in self.sorted_values_by_column and (
+            self.random.random() > _GENERIC_VALUE_PROBABILITY
+        ):
+            return self.random.choice(self.sorted_values_by_column[column])
+        return self.random.choice(_GENERIC_VALUES)
+
+    def _collect_column_values(self, node: ManifestNode) -> None:
+        """Records the values that the given node expects in the columns it reads."""
+        if isinstance(node, EntityTreeManifest):
+            for field_name, field_manifest in node.field_manifests.items():
+                field_type = attr_field_type_for_field_name(node.entity_cls, field_name)
+                if field_type is BuildableAttrFieldType.DATE:
+                    self._add_values(field_manifest, _DATE_VALUES)
+                elif field_type is BuildableAttrFieldType.INTEGER:
+                    self._add_values(field_manifest, _INTEGER_VALUES)
+        elif isinstance(node, EnumMappingManifest):
+            enum_parser = node.enum_parser
+            self._add_values(
+                node.raw_text_field_manifest,
+                [
+                    "",
+                    *enum_parser.ignored_raw_text_values,
+                    *(enum_parser.raw_text_mappings or {}),
+                ],
+            )
+        elif isinstance(node, ContainsConditionManifest):
+            self._add_values(
+                node.value_manifest, _literal_values(node.options_manifests)
+            )
+        elif isinstance(node, EqualsConditionManifest):
+            for value_manifest in node.value_manifests:
+                self._add_values(value_manifest, _literal_values(node.value_manifests))
+        elif isinstance(node, JSONExtractKeyManifest):
+            self.json_keys.add(node.json_key)
+            if isinstance(node.json_manifest, DirectMappingFieldManifest):
+                self.json_columns.add(node.json_manifest.mapped_column)
+        elif isinstance(node, SplitJSONListManifest):
+            self.json_list_columns.add(node.column_name)
+        elif isinstance(node, SplitCommaSeparatedListManifest):
+            self.list_columns.add(node.column_name)
+
+    def _add_values(self, node: ManifestNode, values: Iterable[str]) -> None:
+        """Records that the columns read by the given node should be hydrated with
+        values that make the node produce one of the given values.
+        """
+        if isinstance(node, DirectMappingFieldManifest):
+            self.values_by_column.setdefault(node.mapped_column, set()).update(values)
+        elif isinstance(node, VariableManifestNode):
+            self._add_values(node.value_manifest, values)
+        elif isinstance(node, BooleanConditionManifest):
+            self._add_values(node.then_manifest, values)
+            if node.else_manifest:
+                self._add_values(node.else_manifest, values)
+        elif isinstance(node, ConcatenatedStringsManifest):
+            for value in values:
+                parts = value.split(node.separator) if node.separator else [value]
+                if len(parts) != len(node.value_manifests):
+                    continue
+                for part, value_manifest in zip(parts, node.value_manifests):
+                    self._add_values(
+                        value_manifest, ["" if part == str(None).upper() else part]
+                    )
+
+
+def _literal_values(nodes: List[ManifestNode]) -> List[str]:
+    return [
+        node.literal_value
+        for node in nodes
+        if isinstance(node, StringLiteralFieldManifest) and node.literal_value
+    ]
@@ -0,0 +1,178 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for the row parsers compiled from the nodes in ingest_view_manifest.py."""
+import datetime
+import unittest
+from typing import Union
+from unittest.mock import patch
+
+from recidiviz.common.constants.enum_parser import EnumParser, EnumParsingError
+from recidiviz.ingest.direct import direct_ingest_regions
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_contents_context import (
+    IngestViewContentsContextImpl,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import (
+    BooleanConditionManifest,
+    BooleanLiteralManifest,
+    ConcatenatedStringsManifest,
+    DirectMappingFieldManifest,
+    EnumMappingManifest,
+    ManifestRow,
+    StringLiteralFieldManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_collector import (
+    IngestViewManifestCollector,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_compiler_delegate import (
+    IngestViewManifestCompilerDelegateImpl,
+)
+from recidiviz.ingest.direct.regions.direct_ingest_region_utils import (
+    get_existing_direct_ingest_states,
+)
+from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.persistence.database.schema_type import SchemaType
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.tests.ingest.direct.ingest_mappings.fixtures.ingest_view_file_parser.fake_schema.entities import (
+    FakeRace,
+)
+from recidiviz.tests.ingest.direct.ingest_mappings.ingest_view_manifest_compiler_test import (
+    FakeIngestViewContentsContext,
+)
+from recidiviz.tests.ingest.direct.ingest_mappings.ingest_view_manifest_row_generator import (
+    IngestViewManifestRowGenerator,
+)
+from recidiviz.utils import environment, metadata
+
+
+class CompiledRowParserTest(unittest.TestCase):
+    """Tests for ManifestNode.compile_row_parser()."""
+
+    def setUp(self) -> None:
+        self.context = FakeIngestViewContentsContext(
+            ingest_instance=DirectIngestInstance.SECONDARY,
+            is_production=False,
+            is_staging=False,
+            is_local=False,
+            results_update_datetime=datetime.datetime(2022, 1, 1),
+        )
+
+    def test_constant_value_computed_once(self) -> None:
+        manifest = ConcatenatedStringsManifest(
+            value_manifests=[
+                StringLiteralFieldManifest(literal_value="A"),
+                StringLiteralFieldManifest(literal_value=None),
+            ],
+            separator="-",
+            include_nulls=True,
+        )
+        with patch.object(
+            ConcatenatedStringsManifest,
+            "build_from_row",
+            autospec=True,
+            side_effect=ConcatenatedStringsManifest.build_from_row,
+        ) as mock_build_from_row:
+            parse = manifest.compile_row_parser()
+            self.assertEqual("A-NONE", parse({"COL": "1"}, self.context))
+            self.assertEqual("A-NONE", parse({"COL": "2"}, self.context))
+        mock_build_from_row.assert_called_once()
+
+    def test_constant_condition_selects_branch(self) -> None:
+        manifest = BooleanConditionManifest(
+            condition_manifest=BooleanLiteralManifest(value=False),
+            then_manifest=DirectMappingFieldManifest(mapped_column="THEN_COL"),
+            else_manifest=DirectMappingFieldManifest(mapped_column="ELSE_COL"),
+        )
+        parse = manifest.compile_row_parser()
+        # The then branch is never evaluated, so its column doesn't need to exist
+        self.assertEqual("B", parse({"ELSE_COL": "B"}, self.context))
+
+    def test_enum_mappings(self) -> None:
+        manifest: EnumMappingManifest[FakeRace] = EnumMappingManifest(
+            enum_parser=EnumParser(FakeRace)
+            .add_raw_text_mapping(FakeRace.WHITE, "W")
+            .ignore_raw_text_value("U"),
+            raw_text_field_manifest=DirectMappingFieldManifest(mapped_column="RACE"),
+        )
+        parse = manifest.compile_row_parser()
+        self.assertEqual(FakeRace.WHITE, parse({"RACE": "W"}, self.context))
+        self.assertIsNone(parse({"RACE": "U"}, self.context))
+        self.assertIsNone(parse({"RACE": ""}, self.context))
+        with self.assertRaisesRegex(
+            EnumParsingError, r"^Could not parse X when building <enum 'FakeRace'>$"
+        ):
+            parse({"RACE": "X"}, self.context)
+
+    def test_compiled_row_parsers_match_all_region_manifests(self) -> None:
+        """Checks that the compiled row parsers for every region's ingest view
+        manifests produce the same result as building the output tree directly from
+        the manifest AST, for rows generated from each manifest.
+        """
+        context = IngestViewContentsContextImpl(
+            ingest_instance=DirectIngestInstance.SECONDARY,
+            is_dataflow_pipeline=True,
+            results_update_datetime=datetime.datetime(2022, 1, 1),
+        )
+        num_rows_parsed = 0
+        num_rows_failed = 0
+        with patch.object(
+            metadata, "project_id", return_value=environment.GCP_PROJECT_STAGING
+        ):
+            for state_code in get_existing_direct_ingest_states():
+                region = direct_ingest_regions.get_direct_ingest_region(
+                    region_code=state_code.value.lower()
+                )
+                ingest_view_to_manifest = IngestViewManifestCollector(
+                    region=region,
+                    delegate=IngestViewManifestCompilerDelegateImpl(
+                        region=region, schema_type=SchemaType.STATE
+                    ),
+                ).ingest_view_to_manifest
+                for ingest_view_name, manifest in ingest_view_to_manifest.items():
+                    self.assertEqual(
+                        manifest.should_launch_manifest.build_from_row({}, context),
+                        manifest.should_launch_row_parser({}, context),
+                    )
+                    for row in IngestViewManifestRowGenerator(manifest).generate_rows(
+                        50
+                    ):
+                        expected: Union[Entity, Exception, None]
+                        try:
+                            expected = manifest.output.build_from_row(
+                                dict(row), context
+                            )
+                        except Exception as e:
+                            expected = e
+
+                        result: Union[Entity, Exception, None]
+                        try:
+                            result = manifest.output_row_parser(
+                                ManifestRow(row), context
+                            )
+                        except Exception as e:
+                            result = e
+
+                        msg = f"{state_code.value} {ingest_view_name}: {row}"
+                        if isinstance(expected, Exception):
+                            num_rows_failed += 1
+                            self.assertIsInstance(result, type(expected), msg)
+                            self.assertEqual(str(expected), str(result), msg)
+                        else:
+                            num_rows_parsed += 1
+                            self.assertEqual(expected, result, msg)
+
+        # Most generated rows should parse successfully
+        self.assertGreater(num_rows_parsed, num_rows_failed)
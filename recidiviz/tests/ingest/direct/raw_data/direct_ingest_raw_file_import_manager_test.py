@@ -0,0 +1,274 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for direct_ingest_raw_file_import_manager.py."""
+import datetime
+import random
+import unittest
+from typing import List, Optional
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from recidiviz.cloud_storage.gcsfs_csv_reader import GcsfsCsvReader
+from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath, GcsfsFilePath
+from recidiviz.fakes.fake_gcs_file_system import FakeGCSFileSystem
+from recidiviz.ingest.direct.gcs.direct_ingest_gcs_file_system import (
+    DirectIngestGCSFileSystem,
+)
+from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    DirectIngestRawDataSplittingGcsfsCsvReaderDelegate,
+    RawDataStagingFormat,
+)
+from recidiviz.ingest.direct.types.direct_ingest_constants import (
+    FILE_ID_COL_NAME,
+    IS_DELETED_COL_NAME,
+    UPDATE_DATETIME_COL_NAME,
+)
+
+# Values that exercise every kind of whitespace str.strip() removes, including the
+# ASCII separator characters and non-ASCII whitespace.
+_CELL_VALUES = [
+    "",
+    " ",
+    "\t",
+    "  \n ",
+    "\x1c\x1d\x1e\x1f",
+    "\u00a0",
+    "\u3000",
+    "value",
+    " value",
+    "value ",
+    "\tva lue\r\n",
+    "\u00a0value\u2003",
+    "\u200bvalue",
+    '"quoted", value',
+    "123",
+]
+
+
+def _legacy_transform_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """The original cell-by-cell implementation of transform_dataframe()."""
+    df = df.applymap(lambda x: x.strip())
+    return df[~pd.isnull(df.applymap(lambda x: None if x == "" else x)).all(axis=1)]
+
+
+class DirectIngestRawDataSplittingGcsfsCsvReaderDelegateTest(unittest.TestCase):
+    """Tests for DirectIngestRawDataSplittingGcsfsCsvReaderDelegate."""
+
+    def setUp(self) -> None:
+        self.delegate = DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
+            path=GcsfsFilePath.from_absolute_path(
+                "gs://my-bucket/unprocessed_2023-01-01T00:00:00:000000_raw_tagA.csv"
+            ),
+            fs=MagicMock(),
+            file_metadata=MagicMock(),
+            temp_output_directory_path=GcsfsDirectoryPath.from_absolute_path(
+                "gs://my-bucket/temp"
+            ),
+            augment_with_metadata_columns=False,
+        )
+
+    def test_transform_dataframe(self) -> None:
+        df = pd.DataFrame(
+            [
+                [" a ", "b\t", ""],
+                ["", " ", "\t"],
+                ["\u00a0", "c", "  d e  "],
+                ["", "", ""],
+            ],
+            columns=["col1", "col2", "col3"],
+        )
+
+        expected_df = pd.DataFrame(
+            [["a", "b", ""], ["", "c", "d e"]],
+            index=[0, 2],
+            columns=["col1", "col2", "col3"],
+        )
+        pd.testing.assert_frame_equal(
+            expected_df, self.delegate.transform_dataframe(df)
+        )
+
+    def test_transform_dataframe_matches_legacy_output(self) -> None:
+        rng = random.Random(0)
+        columns = [f"col_{i}" for i in range(20)]
+        rows = []
+        for _ in range(2000):
+            if rng.random() < 0.1:
+                # Rows that only contain whitespace should be filtered out
+                rows.append([rng.choice(_CELL_VALUES[:7]) for _ in columns])
+            else:
+                rows.append([rng.choice(_CELL_VALUES) for _ in columns])
+        df = pd.DataFrame(rows, columns=columns)
+
+        expected_df = _legacy_transform_dataframe(df)
+        transformed_df = self.delegate.transform_dataframe(df)
+
+        pd.testing.assert_frame_equal(expected_df, transformed_df)
+        self.assertEqual(
+            expected_df.to_csv(header=False, index=False).encode("utf-8"),
+            transformed_df.to_csv(header=False, index=False).encode("utf-8"),
+        )
+
+    def test_transform_dataframe_empty(self) -> None:
+        df = pd.DataFrame([], columns=["col1", "col2"], dtype=str)
+        pd.testing.assert_frame_equal(
+            _legacy_transform_dataframe(df), self.delegate.transform_dataframe(df)
+        )
+
+        df = pd.DataFrame([[" ", ""], ["\t", "\n"]], columns=["col1", "col2"])
+        pd.testing.assert_frame_equal(
+            _legacy_transform_dataframe(df), self.delegate.transform_dataframe(df)
+        )
+
+
+class DirectIngestRawDataChunkUploadTest(unittest.TestCase):
+    """Tests for the upload of transformed raw data chunks to temporary GCS files."""
+
+    def setUp(self) -> None:
+        self.fake_fs = FakeGCSFileSystem()
+        self.fs = DirectIngestGCSFileSystem(self.fake_fs)
+        self.csv_reader = GcsfsCsvReader(self.fake_fs)
+        self.path = GcsfsFilePath.from_absolute_path(
+            "gs://my-bucket/unprocessed_2023-01-01T00:00:00:000000_raw_tagA.csv"
+        )
+        self.temp_output_directory_path = GcsfsDirectoryPath.from_absolute_path(
+            "gs://my-bucket/temp"
+        )
+        rows = [f" {i} ,value {i},\n" if i % 7 else " , ,\n" for i in range(1000)]
+        self.fake_fs.upload_from_string(
+            self.path, "COL1,COL2,COL3\n" + "".join(rows), "text/csv"
+        )
+
+    def _delegate(
+        self,
+        *,
+        staging_format: RawDataStagingFormat = RawDataStagingFormat.CSV,
+        max_upload_workers: Optional[int] = None,
+        augment_with_metadata_columns: bool = False,
+    ) -> DirectIngestRawDataSplittingGcsfsCsvReaderDelegate:
+        return DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
+            path=self.path,
+            fs=self.fs,
+            file_metadata=MagicMock(file_id=123),
+            temp_output_directory_path=self.temp_output_directory_path,
+            augment_with_metadata_columns=augment_with_metadata_columns,
+            staging_format=staging_format,
+            max_upload_workers=max_upload_workers,
+        )
+
+    def _read(
+        self, delegate: DirectIngestRawDataSplittingGcsfsCsvReaderDelegate
+    ) -> None:
+        self.csv_reader.streaming_read(
+            self.path,
+            delegate=delegate,
+            chunk_size=30,
+            encodings_to_try=["UTF-8"],
+            keep_default_na=False,
+        )
+
+    def _temp_paths(self) -> List[GcsfsFilePath]:
+        return [
+            p
+            for p in self.fake_fs.all_paths
+            if isinstance(p, GcsfsFilePath)
+            and p.abs_path().startswith(self.temp_output_directory_path.abs_path())
+        ]
+
+    def test_parallel_upload_matches_serial_upload(self) -> None:
+        serial_delegate = self._delegate()
+        self._read(serial_delegate)
+        serial_contents = [
+            self.fake_fs.download_as_string(p) for p in serial_delegate.output_paths
+        ]
+
+        parallel_delegate = self._delegate(max_upload_workers=4)
+        self._read(parallel_delegate)
+        parallel_contents = [
+            self.fake_fs.download_as_string(p) for p in parallel_delegate.output_paths
+        ]
+
+        self.assertEqual(34, len(parallel_delegate.output_paths))
+        self.assertEqual(serial_delegate.output_paths, parallel_delegate.output_paths)
+        self.assertEqual(serial_contents, parallel_contents)
+        self.assertEqual(
+            serial_delegate.output_columns, parallel_delegate.output_columns
+        )
+
+    def test_parallel_upload_failure_cleans_up_temp_files(self) -> None:
+        delegate = self._delegate(max_upload_workers=4)
+        upload_from_string = self.fs.upload_from_string
+
+        def fail_on_chunk_10(
+            path: GcsfsFilePath, contents: str, content_type: str
+        ) -> None:
+            if path.file_name.endswith("_10.csv"):
+                raise ValueError("Upload failed")
+            upload_from_string(path, contents, content_type)
+
+        with patch.object(
+            self.fs, "upload_from_string", side_effect=fail_on_chunk_10
+        ), self.assertRaisesRegex(ValueError, "Upload failed"):
+            self._read(delegate)
+
+        self.assertEqual([], delegate.output_paths)
+        self.assertEqual([], self._temp_paths())
+
+    def test_parquet_staging(self) -> None:
+        delegate = self._delegate(
+            staging_format=RawDataStagingFormat.PARQUET,
+            max_upload_workers=2,
+            augment_with_metadata_columns=True,
+        )
+        self._read(delegate)
+
+        self.assertEqual(34, len(delegate.output_paths))
+        self.assertTrue(
+            all(p.file_name.endswith(".parquet") for p in delegate.output_paths)
+        )
+        table = pq.read_table(
+            self.fake_fs.real_absolute_path_for_path(delegate.output_paths[0])
+        )
+        self.assertEqual(
+            [
+                "COL1",
+                "COL2",
+                "COL3",
+                FILE_ID_COL_NAME,
+                UPDATE_DATETIME_COL_NAME,
+                IS_DELETED_COL_NAME,
+            ],
+            table.column_names,
+        )
+        rows = table.to_pylist()
+        # Row 0 is entirely empty and is filtered out
+        self.assertEqual(
+            {
+                "COL1": "1",
+                "COL2": "value 1",
+                "COL3": None,
+                FILE_ID_COL_NAME: 123,
+                UPDATE_DATETIME_COL_NAME: datetime.datetime(2023, 1, 1),
+                IS_DELETED_COL_NAME: False,
+            },
+            rows[0],
+        )
+        self.assertEqual(
+            len(delegate.output_paths),
+            len({p.file_name for p in self._temp_paths()}),
+        )
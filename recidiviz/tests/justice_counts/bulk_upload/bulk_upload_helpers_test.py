@@ -17,8 +17,21 @@
 """Implements tests for Justice Counts Control Panel bulk upload helpers."""
 
 
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 from unittest import TestCase
 
+from thefuzz import fuzz
+
+from recidiviz.common.text_analysis import TextAnalyzer, TextMatchingConfiguration
+from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import (
+    MONTH_NAMES,
+    NORMALIZERS,
+    FuzzyOptionMatcher,
+    fuzzy_match_against_options,
+)
+from recidiviz.justice_counts.dimensions.person import RaceAndEthnicity
+from recidiviz.justice_counts.exceptions import JusticeCountsBulkUploadException
 from recidiviz.justice_counts.metricfiles.metricfile_registry import (
     SYSTEM_TO_FILENAME_TO_METRICFILE,
 )
@@ -28,6 +41,13 @@ from recidiviz.justice_counts.metrics.metric_registry import METRICS_BY_SYSTEM
 class TestJusticeCountsBulkUploadHelpers(TestCase):
     """Implements tests for the Justice Counts Control Panel bulk upload helpers."""
 
+    def setUp(self) -> None:
+        self.text_analyzer = TextAnalyzer(
+            configuration=TextMatchingConfiguration(
+                stop_words_to_remove={"other", "not"}
+            )
+        )
+
     def test_metricfile_list(self) -> None:
         # Ensure that all of a system's metrics are present in the SYSTEM_TO_FILENAME_TO_METRICFILE dictionary.
         for system, filename_to_metricfile in SYSTEM_TO_FILENAME_TO_METRICFILE.items():
@@ -43,3 +63,104 @@ class TestJusticeCountsBulkUploadHelpers(TestCase):
                     f"{system} has the following registered metric keys: {registered_metric_keys} "
                     f"and the following metric keys in SYSTEM_TO_FILENAME_TO_METRICFILE: {metric_keys}."
                 )
+
+    def test_fuzzy_option_matcher_matches_thefuzz(self) -> None:
+        race_options = [member.value for member in RaceAndEthnicity]
+        for options, texts in [
+            (
+                MONTH_NAMES,
+                ["Febuary", "Janary", "Sept", "jUNE", "Decmber", "", "Not a month"],
+            ),
+            (
+                race_options,
+                [
+                    "White",
+                    "black",
+                    "Asain",
+                    "Hispanic or Latino",
+                    "Not Hispanic",
+                    "Unknown Race",
+                    "Other",
+                    "American Indian",
+                    "Something Else",
+                ],
+            ),
+        ]:
+            matcher = FuzzyOptionMatcher(analyzer=self.text_analyzer, options=options)
+            for text in texts:
+                # Compare against scoring every option with thefuzz directly.
+                option_to_score = {
+                    option: fuzz.ratio(
+                        self.text_analyzer.normalize_text(
+                            text, stem_tokens=True, normalizers=NORMALIZERS
+                        ),
+                        self.text_analyzer.normalize_text(
+                            option, stem_tokens=True, normalizers=NORMALIZERS
+                        ),
+                    )
+                    for option in options
+                }
+                expected_option = max(
+                    option_to_score, key=option_to_score.get  # type: ignore[arg-type]
+                )
+                self.assertEqual(
+                    (expected_option, option_to_score[expected_option]),
+                    matcher.get_best_option_and_score(text),
+                )
+                # Memoized results are the same as the first result.
+                self.assertEqual(
+                    (expected_option, option_to_score[expected_option]),
+                    matcher.get_best_option_and_score(text),
+                )
+
+    def test_fuzzy_match_against_options(self) -> None:
+        metric_key_to_errors: Dict[
+            Optional[str], List[JusticeCountsBulkUploadException]
+        ] = defaultdict(list)
+        fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher] = {}
+        for _ in range(2):
+            self.assertEqual(
+                "February",
+                fuzzy_match_against_options(
+                    analyzer=self.text_analyzer,
+                    text="Febuary",
+                    options=MONTH_NAMES,
+                    category_name="Month",
+                    metric_key_to_errors=metric_key_to_errors,
+                    metric_key="metric",
+                    fuzzy_option_matchers=fuzzy_option_matchers,
+                ),
+            )
+        self.assertEqual({}, metric_key_to_errors)
+        self.assertEqual([tuple(MONTH_NAMES)], list(fuzzy_option_matchers))
+        matcher = fuzzy_option_matchers[tuple(MONTH_NAMES)]
+
+        # Warnings are added every time an unrecognized value is matched, even when
+        # the match is memoized.
+        for _ in range(2):
+            fuzzy_match_against_options(
+                analyzer=self.text_analyzer,
+                text="Not a month",
+                options=MONTH_NAMES,
+                category_name="Month",
+                metric_key_to_errors=metric_key_to_errors,
+                metric_key="metric",
+                fuzzy_option_matchers=fuzzy_option_matchers,
+            )
+        self.assertEqual(2, len(metric_key_to_errors["metric"]))
+        self.assertEqual(
+            "Month Not Recognized", metric_key_to_errors["metric"][0].title
+        )
+        self.assertIs(matcher, fuzzy_option_matchers[tuple(MONTH_NAMES)])
+
+        # Without matchers to reuse, the options are matched with a new matcher.
+        self.assertEqual(
+            "February",
+            fuzzy_match_against_options(
+                analyzer=self.text_analyzer,
+                text="Febuary",
+                options=MONTH_NAMES,
+                category_name="Month",
+                metric_key_to_errors=metric_key_to_errors,
+            ),
+        )
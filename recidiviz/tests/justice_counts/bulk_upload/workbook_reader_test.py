@@ -0,0 +1,274 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Implements tests for reading the rows of Bulk Upload files."""
+
+import csv
+import math
+import os
+import tempfile
+from io import BytesIO
+from typing import Any, Dict, List
+from unittest import TestCase
+
+import pandas as pd
+from openpyxl import Workbook  # type: ignore[import]
+
+from recidiviz.justice_counts.bulk_upload.workbook_reader import (
+    CsvWorkbookReader,
+    ExcelWorkbookReader,
+    RowsWorkbookReader,
+    get_workbook_reader,
+)
+from recidiviz.justice_counts.bulk_upload.workbook_uploader import WorkbookUploader
+from recidiviz.justice_counts.spreadsheet import SpreadsheetInterface
+from recidiviz.justice_counts.types import BulkUploadFileType
+from recidiviz.justice_counts.utils.metric_breakdown_to_sheet_name import (
+    METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME,
+)
+from recidiviz.persistence.database.schema.justice_counts import schema
+from recidiviz.tests.justice_counts.spreadsheet_helpers import (
+    create_combined_excel_file,
+    create_csv_file,
+    create_excel_file,
+)
+
+
+def _normalize_rows(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Returns the rows of the DataFrame, with integral floats converted to ints and
+    NaN converted to None, and without rows whose values are all NaN. These are the
+    only differences between the rows pandas reads from a file and the rows that a
+    WorkbookReader reads from it."""
+    rows = []
+    for row in df.to_dict("records"):
+        normalized_row = {}
+        for column, value in row.items():
+            if isinstance(value, float) and math.isnan(value):
+                value = None
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            normalized_row[column] = value
+        if any(value is not None for value in normalized_row.values()):
+            rows.append(normalized_row)
+    return rows
+
+
+class TestWorkbookReader(TestCase):
+    """Implements tests for reading the rows of Bulk Upload files."""
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.mkdtemp()
+
+    def test_excel_workbook_reader(self) -> None:
+        file_path = create_excel_file(
+            system=schema.System.PRISONS,
+            file_name="test_prisons.xlsx",
+            sheetnames_with_null_data={"admissions"},
+        )
+        with open(file_path, "rb") as f:
+            reader, filename, file_type = SpreadsheetInterface.convert_file_to_excel(
+                file=f.read(), filename=file_path
+            )
+        self.assertIsInstance(reader, ExcelWorkbookReader)
+        self.assertEqual(file_path, filename)
+        self.assertEqual(BulkUploadFileType.XLSX, file_type)
+        self.assertTrue(reader.workbook.read_only)  # type: ignore[attr-defined]
+
+        # Rows match those read by pandas.
+        sheet_name_to_df = pd.read_excel(file_path, sheet_name=None)
+        self.assertEqual(list(sheet_name_to_df.keys()), reader.sheet_names)
+        for sheet_name, df in sheet_name_to_df.items():
+            self.assertEqual(_normalize_rows(df), list(reader.read_rows(sheet_name)))
+
+    def test_pandas_excel_file(self) -> None:
+        file_path = create_excel_file(
+            system=schema.System.PRISONS, file_name="test_prisons.xlsx"
+        )
+        xls = pd.ExcelFile(file_path)
+        reader = get_workbook_reader(xls)
+        self.assertIsInstance(reader, ExcelWorkbookReader)
+        self.assertIs(reader, get_workbook_reader(reader))
+        for sheet_name in xls.sheet_names:
+            self.assertEqual(
+                _normalize_rows(pd.read_excel(file_path, sheet_name=sheet_name)),
+                list(reader.read_rows(sheet_name)),
+            )
+
+    def test_excel_cell_values(self) -> None:
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = "admissions"
+        worksheet.append([None, None])
+        worksheet.append(["year", None, "value", "value", "month"])
+        worksheet.append([2022, 1, 10.0, 1.5, "January"])
+        worksheet.append([None, None, None])
+        worksheet.append([2022, 2, "N/A", None, "", "extra"])
+        worksheet.append([2023])
+        file_path = os.path.join(self.temp_dir, "admissions.xlsx")
+        workbook.save(file_path)
+
+        reader = SpreadsheetInterface.convert_file_to_excel(
+            file=file_path, filename=file_path
+        )[0]
+        self.assertEqual(
+            [
+                {
+                    "year": 2022,
+                    "Unnamed: 1": 1,
+                    "value": 10,
+                    "value.1": 1.5,
+                    "month": "January",
+                },
+                {
+                    "year": 2022,
+                    "Unnamed: 1": 2,
+                    "value": None,
+                    "value.1": None,
+                    "month": None,
+                    "Unnamed: 5": "extra",
+                },
+                {
+                    "year": 2023,
+                    "Unnamed: 1": None,
+                    "value": None,
+                    "value.1": None,
+                    "month": None,
+                    "Unnamed: 5": None,
+                },
+            ],
+            list(reader.read_rows("admissions")),
+        )
+
+    def test_csv_file(self) -> None:
+        file_path = create_csv_file(
+            system=schema.System.PRISONS,
+            metric="admissions",
+            file_name="admissions.csv",
+        )
+        with open(file_path, "rb") as f:
+            reader, filename, file_type = SpreadsheetInterface.convert_file_to_excel(
+                file=f.read(), filename=file_path
+            )
+        self.assertIsInstance(reader, CsvWorkbookReader)
+        self.assertEqual(file_path.replace(".csv", ".xlsx"), filename)
+        self.assertEqual(BulkUploadFileType.CSV, file_type)
+        self.assertEqual(["admissions"], reader.sheet_names)
+        self.assertFalse(os.path.exists(filename))
+
+        # Rows match those read by pandas, and can be read again after the file has
+        # been read elsewhere.
+        expected_rows = _normalize_rows(pd.read_csv(file_path))
+        self.assertEqual(expected_rows, list(reader.read_rows("admissions")))
+        reader.file.read()  # type: ignore[attr-defined]
+        self.assertEqual(expected_rows, list(reader.read_rows("admissions")))
+        self.assertFalse(reader.file.closed)  # type: ignore[attr-defined]
+
+    def test_csv_cell_values(self) -> None:
+        contents = BytesIO()
+        with open(
+            os.path.join(self.temp_dir, "admissions.csv"), "w", encoding="utf-8"
+        ) as f:
+            writer = csv.writer(f)
+            writer.writerow(["year", "", "value", "value", "month"])
+            writer.writerow(["2022", "1", "10.5", "1,000", "January"])
+            writer.writerow(["", "", "", "", ""])
+            writer.writerow(["2022", "2", "N/A", "", "February", "extra"])
+            writer.writerow(["2023"])
+        with open(os.path.join(self.temp_dir, "admissions.csv"), "rb") as f:
+            contents.write(f.read())
+
+        reader = CsvWorkbookReader(file=contents, sheet_name="admissions")
+        self.assertEqual(
+            [
+                {
+                    "year": 2022,
+                    "Unnamed: 1": 1,
+                    "value": 10.5,
+                    "value.1": "1,000",
+                    "month": "January",
+                },
+                {
+                    "year": 2022,
+                    "Unnamed: 1": 2,
+                    "value": None,
+                    "value.1": None,
+                    "month": "February",
+                },
+                {
+                    "year": 2023,
+                    "Unnamed: 1": None,
+                    "value": None,
+                    "value.1": None,
+                    "month": None,
+                },
+            ],
+            list(reader.read_rows("admissions")),
+        )
+
+    def test_combined_metric_file(self) -> None:
+        file_path = create_combined_excel_file(
+            system=schema.System.LAW_ENFORCEMENT,
+            file_name="test_single_page_combined.xlsx",
+        )
+        uploader = WorkbookUploader(
+            system=schema.System.LAW_ENFORCEMENT,
+            agency=schema.Agency(name="Agency"),
+            metric_key_to_agency_datapoints={},
+        )
+        rows = list(ExcelWorkbookReader.from_file(file_path).read_rows("Sheet1"))
+        # pylint: disable=protected-access
+        reader = uploader._transform_combined_metric_file_upload(
+            rows=ExcelWorkbookReader.from_file(file_path).read_rows("Sheet1"),
+            filename=file_path,
+        )
+        self.assertIsInstance(reader, RowsWorkbookReader)
+
+        # Each sheet has the rows for its metric/breakdown, without the columns that
+        # are empty for that metric/breakdown, and with the breakdown column renamed
+        # to the breakdown category.
+        self.assertEqual(
+            sorted(
+                {
+                    row["metric"]
+                    if row["breakdown_category"] is None
+                    else METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME[
+                        row["metric"], row["breakdown_category"]
+                    ]
+                    for row in rows
+                }
+            ),
+            sorted(reader.sheet_names),
+        )
+        arrests_by_type = list(reader.read_rows("arrests_by_type"))
+        expected_arrests_by_type = [
+            {
+                "year": row["year"],
+                "month": row["month"],
+                "offense_type": row["breakdown"],
+                "value": row["value"],
+            }
+            for row in rows
+            if row["metric"] == "arrests"
+            and row["breakdown_category"] == "offense_type"
+        ]
+        self.assertGreater(len(expected_arrests_by_type), 0)
+        self.assertEqual(expected_arrests_by_type, arrests_by_type)
+        # Columns that are empty for every row of a metric are dropped.
+        self.assertEqual(
+            [{"year": "2023", "value": 70}], list(reader.read_rows("funding"))
+        )
+        # Sheets are released once they are read.
+        self.assertNotIn("arrests_by_type", reader.sheet_name_to_rows)
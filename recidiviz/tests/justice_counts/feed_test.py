@@ -16,7 +16,15 @@
 # =============================================================================
 """This class implements tests for the Justice Counts FeedInterface."""
 
+import calendar
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from flask import Flask
+from sqlalchemy.orm import Session
+
 from recidiviz.justice_counts.feed import FeedInterface
+from recidiviz.justice_counts.report import ReportInterface
 from recidiviz.persistence.database.schema.justice_counts import schema
 from recidiviz.persistence.database.session_factory import SessionFactory
 from recidiviz.tests.justice_counts.utils.utils import (
@@ -34,12 +42,39 @@ from recidiviz.tools.justice_counts.control_panel.load_fixtures import (
 from ...justice_counts.metricfiles.metricfile_registry import SYSTEM_TO_METRICFILES
 
 
+def _get_csv_of_full_feed(
+    session: Session,
+    agency_id: int,
+    include_unpublished_data: bool,
+    metric: Optional[str],
+    system: Optional[str],
+) -> str:
+    """Returns the csv of the feed the way get_csv_of_feed() used to build it, by
+    generating the entire feed and then filtering it to the requested file."""
+    system_to_filename_to_rows = FeedInterface.get_feed_for_agency_id(
+        session, agency_id=agency_id, include_unpublished_data=include_unpublished_data
+    )
+    if not system_to_filename_to_rows:
+        return ""
+    if system is None:
+        system = list(system_to_filename_to_rows.keys())[0]
+    rows = []
+    if metric:
+        rows = system_to_filename_to_rows.get(system, {}).get(metric, [])
+    for row in rows:
+        if "month" in row:
+            row["month"] = calendar.month_name[int(row["month"])]
+    return pd.DataFrame.from_dict(rows).to_csv(index=False)
+
+
 class TestFeedInterface(JusticeCountsDatabaseTestCase):
     """Implements tests for the FeedInterface."""
 
     def setUp(self) -> None:
         super().setUp()
         self.test_schema_objects = JusticeCountsSchemaTestObjects()
+        self.app = Flask(__name__)
+        FeedInterface.clear_feed_cache()
 
     def test_get_law_enforcement_feed(self) -> None:
         reset_justice_counts_fixtures(self.engine)
@@ -123,3 +158,135 @@ class TestFeedInterface(JusticeCountsDatabaseTestCase):
                     for mfile in SYSTEM_TO_METRICFILES[schema.System.SUPERVISION]
                 },
             )
+
+    def test_get_csv_of_feed(self) -> None:
+        reset_justice_counts_fixtures(self.engine)
+
+        with SessionFactory.using_database(self.database_key) as session:
+            # Publish only some reports, so that the published and unpublished feeds
+            # differ.
+            for report in session.query(schema.Report).order_by(schema.Report.id)[::2]:
+                report.status = schema.ReportStatus.PUBLISHED
+            session.commit()
+
+            for agency_id in [
+                LAW_ENFORCEMENT_AGENCY_ID,
+                SUPERVISION_PAROLE_PROBATION_PRISONS_AGENCY_ID,
+            ]:
+                for include_unpublished_data in [False, True]:
+                    system_to_filename_to_rows = FeedInterface.get_feed_for_agency_id(
+                        session,
+                        agency_id=agency_id,
+                        include_unpublished_data=include_unpublished_data,
+                    )
+                    self.assertNotEqual(system_to_filename_to_rows, {})
+                    system_and_metrics: List[Tuple[Optional[str], Optional[str]]] = [
+                        ("PRISONS", None),
+                        ("PRISONS", "not_a_metric"),
+                    ]
+                    for (
+                        feed_system,
+                        filename_to_rows,
+                    ) in system_to_filename_to_rows.items():
+                        system_and_metrics += [
+                            (feed_system, filename) for filename in filename_to_rows
+                        ]
+                    if len(system_to_filename_to_rows) == 1:
+                        # For multi-system agencies, which system is the default
+                        # depends on the order of reports that end on the same date.
+                        system_and_metrics += [(None, None), (None, "funding")]
+                    for system, metric in system_and_metrics:
+                        expected_csv = _get_csv_of_full_feed(
+                            session,
+                            agency_id=agency_id,
+                            include_unpublished_data=include_unpublished_data,
+                            metric=metric,
+                            system=system,
+                        )
+                        # The second request is served from the cache.
+                        for _ in range(2):
+                            with self.app.app_context():
+                                response = FeedInterface.get_csv_of_feed(
+                                    session,
+                                    agency_id=agency_id,
+                                    include_unpublished_data=include_unpublished_data,
+                                    metric=metric,
+                                    system=system,
+                                )
+                            self.assertEqual(
+                                expected_csv, response.get_data(as_text=True)
+                            )
+
+    def test_get_csv_of_feed_empty(self) -> None:
+        reset_justice_counts_fixtures(self.engine)
+
+        with SessionFactory.using_database(self.database_key) as session:
+            session.query(schema.Report).update({"status": schema.ReportStatus.DRAFT})
+            session.commit()
+
+            with self.app.app_context():
+                response = FeedInterface.get_csv_of_feed(
+                    session, agency_id=LAW_ENFORCEMENT_AGENCY_ID, metric="funding"
+                )
+            self.assertEqual("", response.get_data(as_text=True))
+
+    def test_get_csv_of_feed_invalidated(self) -> None:
+        reset_justice_counts_fixtures(self.engine)
+
+        with SessionFactory.using_database(self.database_key) as session:
+            session.query(schema.Report).update(
+                {"status": schema.ReportStatus.PUBLISHED}
+            )
+            session.commit()
+
+            def get_csv() -> str:
+                with self.app.app_context():
+                    return FeedInterface.get_csv_of_feed(
+                        session,
+                        agency_id=LAW_ENFORCEMENT_AGENCY_ID,
+                        metric="funding",
+                        system="LAW_ENFORCEMENT",
+                    ).get_data(as_text=True)
+
+            csv = get_csv()
+            self.assertEqual(
+                csv,
+                _get_csv_of_full_feed(
+                    session,
+                    agency_id=LAW_ENFORCEMENT_AGENCY_ID,
+                    include_unpublished_data=False,
+                    metric="funding",
+                    system="LAW_ENFORCEMENT",
+                ),
+            )
+
+            # Updating a report invalidates the cached feed.
+            datapoint = next(
+                d
+                for d in session.query(schema.Datapoint)
+                .join(schema.Report)
+                .filter(
+                    schema.Report.source_id == LAW_ENFORCEMENT_AGENCY_ID,
+                    schema.Datapoint.metric_definition_key == "LAW_ENFORCEMENT_FUNDING",
+                    schema.Datapoint.context_key.is_(None),
+                )
+                .order_by(schema.Datapoint.id)
+                if d.dimension_identifier_to_member is None
+            )
+            datapoint.value = "123456789"
+            ReportInterface.update_report_metadata(
+                report=datapoint.report,
+                editor_id=None,
+                status=schema.ReportStatus.PUBLISHED.value,
+            )
+            session.commit()
+            updated_csv = get_csv()
+            self.assertNotEqual(csv, updated_csv)
+            self.assertIn("123456789", updated_csv)
+
+            # Unpublishing a report invalidates the cached feed.
+            session.query(schema.Report).filter(
+                schema.Report.id == datapoint.report_id
+            ).update({"status": schema.ReportStatus.DRAFT})
+            session.commit()
+            self.assertNotIn("123456789", get_csv())
@@ -18,6 +18,7 @@
 
 
 import datetime
+from typing import Any, List, Tuple
 
 from freezegun import freeze_time
 
@@ -31,6 +32,7 @@ from recidiviz.justice_counts.metrics.custom_reporting_frequency import (
     CustomReportingFrequency,
 )
 from recidiviz.justice_counts.report import ReportInterface
+from recidiviz.justice_counts.types import DatapointJson
 from recidiviz.justice_counts.user_account import UserAccountInterface
 from recidiviz.justice_counts.utils.constants import (
     REPORTING_FREQUENCY_CONTEXT_KEY,
@@ -1272,6 +1274,160 @@ class TestReportInterface(JusticeCountsDatabaseTestCase):
             self.assertEqual(datapoint_history[2].old_value, str(100))
             self.assertEqual(datapoint_history[2].new_value, str(10))
 
+    def test_bulk_upsert_matches_add_report_datapoint(self) -> None:
+        # Applies the same sequence of metric updates to two reports, one via
+        # add_report_datapoint() and one via bulk_add_report_datapoints(), and checks
+        # that both result in the same datapoints and datapoint histories.
+        report_metrics = [
+            self.test_schema_objects.reported_calls_for_service_metric,
+            JusticeCountsSchemaTestObjects.get_reported_calls_for_service_metric(
+                value=1000,
+            ),
+            # No change
+            JusticeCountsSchemaTestObjects.get_reported_calls_for_service_metric(
+                value=1000,
+            ),
+            JusticeCountsSchemaTestObjects.get_reported_calls_for_service_metric(
+                value=None, nullify_contexts_and_disaggregations=True
+            ),
+        ]
+        with SessionFactory.using_database(self.database_key) as session:
+            session.add(self.test_schema_objects.test_user_A)
+            orm_report = self.test_schema_objects.test_report_monthly
+            bulk_report = self.test_schema_objects.test_report_monthly_two
+            orm_datapoint_jsons = []
+            bulk_datapoint_jsons = []
+            for report_metric in report_metrics:
+                orm_datapoint_jsons.append(
+                    ReportInterface.add_or_update_metric(
+                        session=session,
+                        report=orm_report,
+                        report_metric=report_metric,
+                        user_account=self.test_schema_objects.test_user_A,
+                        upload_method=UploadMethod.BULK_UPLOAD,
+                    )
+                )
+                bulk_datapoint_jsons.append(
+                    ReportInterface.add_or_update_metric(
+                        session=session,
+                        report=bulk_report,
+                        report_metric=report_metric,
+                        user_account=self.test_schema_objects.test_user_A,
+                        upload_method=UploadMethod.BULK_UPLOAD,
+                        use_bulk_upsert=True,
+                    )
+                )
+            session.commit()
+
+            def datapoint_summaries(
+                report_id: int,
+            ) -> List[Tuple[Any, ...]]:
+                return sorted(
+                    (
+                        datapoint.metric_definition_key,
+                        str(datapoint.context_key),
+                        str(datapoint.dimension_identifier_to_member),
+                        str(datapoint.value),
+                        datapoint.upload_method,
+                        len(datapoint.datapoint_histories),
+                    )
+                    for datapoint in session.query(schema.Datapoint)
+                    .filter(schema.Datapoint.report_id == report_id)
+                    .all()
+                )
+
+            self.assertEqual(
+                datapoint_summaries(orm_report.id), datapoint_summaries(bulk_report.id)
+            )
+
+            def history_summaries(report_id: int) -> List[Tuple[Any, ...]]:
+                return sorted(
+                    (str(history.old_value), str(history.new_value))
+                    for history in session.query(schema.DatapointHistory)
+                    .join(schema.Datapoint)
+                    .filter(schema.Datapoint.report_id == report_id)
+                    .all()
+                )
+
+            self.assertEqual(
+                history_summaries(orm_report.id), history_summaries(bulk_report.id)
+            )
+            self.assertNotEqual([], history_summaries(bulk_report.id))
+
+            def json_summaries(
+                datapoint_jsons: List[List[DatapointJson]],
+            ) -> List[List[Tuple[Any, ...]]]:
+                return [
+                    [
+                        (
+                            datapoint_json["metric_definition_key"],
+                            datapoint_json["dimension_display_name"],
+                            datapoint_json["value"],
+                            datapoint_json["old_value"],
+                        )
+                        for datapoint_json in jsons
+                    ]
+                    for jsons in datapoint_jsons
+                ]
+
+            self.assertEqual(
+                json_summaries(orm_datapoint_jsons),
+                json_summaries(bulk_datapoint_jsons),
+            )
+
+    def test_bulk_upsert_moves_datapoints_between_reports(self) -> None:
+        # Datapoints are unique by report time range and agency, so saving a metric
+        # to a second report covering the same time range moves the first report's
+        # datapoints to the second report.
+        with SessionFactory.using_database(self.database_key) as session:
+            session.add(self.test_schema_objects.test_user_A)
+            old_report = self.test_schema_objects.test_report_monthly
+            new_report = schema.Report(
+                source=old_report.source,
+                type=old_report.type,
+                instance="06 2022 Metrics (duplicate)",
+                status=schema.ReportStatus.NOT_STARTED,
+                date_range_start=old_report.date_range_start,
+                date_range_end=old_report.date_range_end,
+                project=old_report.project,
+                acquisition_method=old_report.acquisition_method,
+            )
+            session.add(new_report)
+            ReportInterface.add_or_update_metric(
+                session=session,
+                report=old_report,
+                report_metric=self.test_schema_objects.reported_calls_for_service_metric,
+                user_account=self.test_schema_objects.test_user_A,
+                upload_method=UploadMethod.BULK_UPLOAD,
+            )
+            session.flush()
+            moved_datapoints = list(old_report.datapoints)
+            self.assertNotEqual([], moved_datapoints)
+            self.assertEqual([], new_report.datapoints)
+
+            ReportInterface.add_or_update_metric(
+                session=session,
+                report=new_report,
+                report_metric=JusticeCountsSchemaTestObjects.get_reported_calls_for_service_metric(
+                    value=1000,
+                ),
+                user_account=self.test_schema_objects.test_user_A,
+                upload_method=UploadMethod.BULK_UPLOAD,
+                existing_datapoints_dict=ReportInterface.get_existing_datapoints_dict(
+                    reports=[old_report]
+                ),
+                use_bulk_upsert=True,
+            )
+
+            self.assertEqual([], old_report.datapoints)
+            self.assertEqual(
+                {datapoint.id for datapoint in moved_datapoints},
+                {datapoint.id for datapoint in new_report.datapoints},
+            )
+            for datapoint in moved_datapoints:
+                self.assertEqual(new_report.id, datapoint.report_id)
+                self.assertIs(new_report, datapoint.report)
+
     def test_delete_datapoint(self) -> None:
         with SessionFactory.using_database(self.database_key) as session:
             session.add(self.test_schema_objects.test_user_A)
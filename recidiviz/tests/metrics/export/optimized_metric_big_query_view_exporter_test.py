@@ -17,6 +17,8 @@
 
 """Tests for optimized_metric_big_query_view_exporter.py."""
 
+import io
+import random
 import unittest
 from typing import Any, Callable, Dict, List, Set
 
@@ -468,7 +470,12 @@ class ConvertQueryResultsTest(unittest.TestCase):
             query_job: bigquery.QueryJob,
             _page_size: int,
             process_page_fn: Callable[[List[bigquery.table.Row]], None],
+            prefetch_pages: int,
         ) -> None:
+            self.assertEqual(
+                optimized_metric_big_query_view_exporter.QUERY_PREFETCH_PAGES,
+                prefetch_pages,
+            )
             rows: List[bigquery.table.Row] = []
             for row in query_job.result(
                 max_results=optimized_metric_big_query_view_exporter.QUERY_PAGE_SIZE,
@@ -523,10 +530,182 @@ class ConvertQueryResultsTest(unittest.TestCase):
             ]
         )
 
-        mock_bq_client.paged_read_and_process.assert_called()
+        self.assertEqual(2, mock_bq_client.paged_read_and_process.call_count)
         mock_bq_client.dataset_ref_for_id.assert_called()
         mock_bq_client.get_table.assert_called()
 
+    def test_convert_single_pass(self) -> None:
+        mock_bq_client = create_autospec(BigQueryClient)
+        mock_dataset_ref = create_autospec(bigquery.DatasetReference)
+        table = bigquery.Table(
+            bigquery.TableReference(mock_dataset_ref, "test_view"),
+            [
+                bigquery.SchemaField("district", "STRING"),
+                bigquery.SchemaField("year", "STRING"),
+                bigquery.SchemaField("month", "STRING"),
+                bigquery.SchemaField("supervision_type", "STRING"),
+                bigquery.SchemaField("total_revocations", "STRING"),
+            ],
+        )
+        mock_bq_client.dataset_ref_for_id.return_value = mock_dataset_ref
+        mock_bq_client.get_table.return_value = table
+
+        all_rows = [
+            transform_dict_to_bigquery_row(data_point) for data_point in _DATA_POINTS
+        ]
+
+        def fake_paged_process_fn(
+            _query_job: bigquery.QueryJob,
+            _page_size: int,
+            process_page_fn: Callable[[List[bigquery.table.Row]], None],
+            prefetch_pages: int,
+        ) -> None:
+            self.assertEqual(
+                optimized_metric_big_query_view_exporter.QUERY_PREFETCH_PAGES,
+                prefetch_pages,
+            )
+            # Split the rows across multiple pages
+            process_page_fn(all_rows[:4])
+            process_page_fn(all_rows[4:])
+
+        mock_bq_client.paged_read_and_process.side_effect = fake_paged_process_fn
+
+        view_exporter = OptimizedMetricBigQueryViewExporter(
+            mock_bq_client,
+            [create_autospec(OptimizedMetricBigQueryViewExportValidator)],
+            single_pass=True,
+        )
+        export_config = ExportBigQueryViewConfig(
+            view=MetricBigQueryViewBuilder(
+                dataset_id="test_dataset",
+                view_id="test_view",
+                description="test_view description",
+                view_query_template="you know",
+                dimensions=("district", "year", "month", "supervision_type"),
+            ).build(),
+            view_filter_clause="WHERE state_code = 'US_XX'",
+            intermediate_table_name="tubular",
+            output_directory=GcsfsDirectoryPath.from_absolute_path("gs://gnarly/blob"),
+        )
+
+        optimized_representation = (
+            view_exporter.convert_query_results_to_optimized_value_matrix(
+                create_autospec(bigquery.QueryJob), export_config
+            )
+        )
+        expected = OptimizedMetricRepresentation(
+            value_matrix=_DATA_VALUES,
+            dimension_manifest=_DIMENSION_MANIFEST,
+            value_keys=_VALUE_KEYS,
+        )
+
+        self.assertEqual(expected, optimized_representation)
+        mock_bq_client.paged_read_and_process.assert_called_once()
+
+
+class ColumnarValueMatrixBuilderTest(unittest.TestCase):
+    """Tests for ColumnarValueMatrixBuilder and the streamed transmission format."""
+
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        dimension_values = ["A", "b", "B", None, 7, "", "ünïcode"]
+        measures = [0, 1, -5, 2**40, 2**70, 1.5, None, True, "text"]
+        self.data_points = [
+            {
+                "dim_a": rng.choice(dimension_values),
+                "Dim_B": rng.choice(dimension_values),
+                # The first value key holds only ints, the second switches between
+                # types part of the way through
+                "count": rng.randint(-1000, 1000),
+                "value": rng.randint(0, 10) if i < 500 else rng.choice(measures),
+            }
+            for i in range(1000)
+        ]
+        self.dimension_keys = ("dim_a", "Dim_B")
+        self.value_keys = ["count", "value"]
+
+    def _two_pass_representation(self) -> OptimizedMetricRepresentation:
+        dimension_values_by_key = optimized_metric_big_query_view_exporter._initialize_dimension_manifest(  # pylint: disable=protected-access
+            self.dimension_keys
+        )
+        lowered_data_points = [
+            {key.lower(): value for key, value in dp.items()} for dp in self.data_points
+        ]
+        for dp in lowered_data_points:
+            optimized_metric_big_query_view_exporter.add_to_dimension_manifest(
+                dp, dimension_values_by_key
+            )
+        dimension_manifest = optimized_metric_big_query_view_exporter.transform_manifest_to_order_enforced_form(
+            dimension_values_by_key
+        )
+        data_values: List[List[Any]] = [[] for _ in range(4)]
+        for dp in lowered_data_points:
+            optimized_metric_big_query_view_exporter.place_in_compact_matrix(
+                dp, data_values, self.value_keys, dimension_manifest
+            )
+        return OptimizedMetricRepresentation(
+            value_matrix=data_values,
+            dimension_manifest=dimension_manifest,
+            value_keys=self.value_keys,
+        )
+
+    def _single_pass_builder(
+        self,
+    ) -> optimized_metric_big_query_view_exporter.ColumnarValueMatrixBuilder:
+        builder = optimized_metric_big_query_view_exporter.ColumnarValueMatrixBuilder(
+            tuple(key.lower() for key in self.dimension_keys), self.value_keys
+        )
+        rows = [
+            transform_dict_to_bigquery_row(
+                {key.lower(): value for key, value in dp.items()}
+            )
+            for dp in self.data_points
+        ]
+        for start in range(0, len(rows), 300):
+            builder.add_rows(rows[start : start + 300])
+        return builder
+
+    def test_build_matches_two_pass_representation(self) -> None:
+        builder = self._single_pass_builder()
+
+        self.assertEqual(self._two_pass_representation(), builder.build())
+        self.assertEqual(1000, builder.total_data_points)
+
+    def test_build_empty(self) -> None:
+        builder = optimized_metric_big_query_view_exporter.ColumnarValueMatrixBuilder(
+            ("dim",), ["value"]
+        )
+        self.assertEqual(
+            OptimizedMetricRepresentation(
+                value_matrix=[[], []],
+                dimension_manifest=[("dim", [])],
+                value_keys=["value"],
+            ),
+            builder.build(),
+        )
+        self.assertEqual(0, builder.total_data_points)
+
+    def test_streamed_transmission_format_matches(self) -> None:
+        view_exporter = OptimizedMetricBigQueryViewExporter(
+            create_autospec(BigQueryClient), []
+        )
+        builder = self._single_pass_builder()
+
+        out = io.BytesIO()
+        with patch("time.time", return_value=1700000000), patch.object(
+            optimized_metric_big_query_view_exporter,
+            "TRANSMISSION_FORMAT_BATCH_SIZE",
+            7,
+        ):
+            expected = view_exporter._produce_transmission_format(  # pylint: disable=protected-access
+                self._two_pass_representation(), should_compress=True
+            )
+            view_exporter._write_transmission_format(  # pylint: disable=protected-access
+                builder.iter_value_matrix(), out
+            )
+
+        self.assertEqual(expected, out.getvalue())
+
 
 class TestInitializeDimensionManifest(unittest.TestCase):
     """Tests the _initialize_dimension_manifest function."""
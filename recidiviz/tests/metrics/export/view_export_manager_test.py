@@ -38,6 +38,12 @@ from recidiviz.common.constants.states import StateCode
 from recidiviz.fakes.fake_gcs_file_system import FakeGCSFileSystem
 from recidiviz.metrics.export import view_export_manager
 from recidiviz.metrics.export.export_config import ExportViewCollectionConfig
+from recidiviz.metrics.export.optimized_metric_big_query_view_export_validator import (
+    OptimizedMetricBigQueryViewExportValidator,
+)
+from recidiviz.metrics.export.optimized_metric_big_query_view_exporter import (
+    OptimizedMetricBigQueryViewExporter,
+)
 from recidiviz.metrics.export.view_export_manager import (
     ViewExportConfigurationError,
     execute_metric_view_data_export,
@@ -491,6 +497,27 @@ class ViewCollectionExportManagerTest(unittest.TestCase):
                 state_code_filter=None,
             )
 
+    @mock.patch(
+        "recidiviz.metrics.export.view_export_manager.export_views_with_exporters"
+    )
+    def test_metric_export_uses_single_pass_exporter(
+        self, mock_export_views_with_exporters: Mock
+    ) -> None:
+        """Tests that metric exports read query results in a single pass."""
+        view_export_manager.export_view_data_to_cloud_storage(
+            self.mock_export_name, self.mock_state_code
+        )
+
+        mock_export_views_with_exporters.assert_called_once()
+        delegate_export_map = mock_export_views_with_exporters.call_args[0][2]
+        metric_exporter = delegate_export_map[ExportOutputFormatType.METRIC]
+        self.assertIsInstance(metric_exporter, OptimizedMetricBigQueryViewExporter)
+        self.assertTrue(metric_exporter.single_pass)
+        self.assertEqual(
+            [OptimizedMetricBigQueryViewExportValidator],
+            [type(validator) for validator in metric_exporter.validators],
+        )
+
     @mock.patch(
         "recidiviz.metrics.export.view_export_manager.export_view_data_to_cloud_storage"
     )
@@ -18,8 +18,9 @@
 import csv
 import json
 import os
+import random
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
@@ -32,8 +33,12 @@ from recidiviz.outliers.constants import (
     TASK_COMPLETIONS_TRANSFER_TO_LIMITED_SUPERVISION,
     VIOLATIONS,
 )
-from recidiviz.outliers.querier.querier import OutliersQuerier
+from recidiviz.outliers.querier.querier import (
+    MetricEntitiesBySupervisor,
+    OutliersQuerier,
+)
 from recidiviz.outliers.types import (
+    MetricContext,
     OfficerMetricEntity,
     OfficerSupervisorReportData,
     OutlierMetricInfo,
@@ -787,3 +792,89 @@ class TestOutliersQuerier(TestCase):
         )
 
         self.assertEqual("111", actual.client_id)  # type: ignore[union-attr]
+
+
+def _get_officer_level_data_by_scanning_all_officers(
+    supervision_officer_supervisor_id: str,
+    metric_id_to_metric_context: Dict[OutliersMetricConfig, MetricContext],
+) -> Tuple[List[OutlierMetricInfo], List[OutliersMetricConfig]]:
+    """Returns a supervisor's officer-level data by scanning every officer of every
+    metric, which is how OutliersQuerier used to assemble each supervisor's report."""
+    metrics_results: List[OutlierMetricInfo] = []
+    metrics_without_outliers = []
+    for metric, metric_context in metric_id_to_metric_context.items():
+        other_officer_rates: Dict[TargetStatus, List[float]] = {
+            TargetStatus.FAR: [],
+            TargetStatus.MET: [],
+            TargetStatus.NEAR: [],
+        }
+        highlighted_officers: List[OfficerMetricEntity] = []
+        for entity in metric_context.entities:
+            if (
+                entity.target_status == TargetStatus.FAR
+                and entity.supervisor_external_id == supervision_officer_supervisor_id
+            ):
+                highlighted_officers.append(entity)
+            else:
+                other_officer_rates[entity.target_status].append(entity.rate)
+        if highlighted_officers:
+            metrics_results.append(
+                OutlierMetricInfo(
+                    metric=metric,
+                    target=metric_context.target,
+                    other_officers=other_officer_rates,
+                    highlighted_officers=highlighted_officers,
+                    target_status_strategy=metric_context.target_status_strategy,
+                )
+            )
+        else:
+            metrics_without_outliers.append(metric)
+    return metrics_results, metrics_without_outliers
+
+
+class TestMetricEntitiesBySupervisor(TestCase):
+    """Implements tests for assembling supervisor reports from officers partitioned by
+    supervisor."""
+
+    def test_matches_scanning_all_officers(self) -> None:
+        rng = random.Random(0)
+        supervisor_ids = [str(i) for i in range(20)]
+        metric_id_to_metric_context = {
+            metric: MetricContext(
+                target=rng.random(),
+                entities=[
+                    OfficerMetricEntity(
+                        name=PersonName(given_names="OFFICER", surname=str(i)),
+                        rate=rng.random(),
+                        target_status=rng.choice(list(TargetStatus)),
+                        prev_rate=None,
+                        supervisor_external_id=rng.choice(supervisor_ids),
+                        supervision_district="1",
+                    )
+                    for i in range(200)
+                ],
+            )
+            for metric in [TEST_METRIC_1, TEST_METRIC_2, TEST_METRIC_3]
+        }
+        metric_to_entities_by_supervisor = {
+            metric: MetricEntitiesBySupervisor.build(metric_context.entities)
+            for metric, metric_context in metric_id_to_metric_context.items()
+        }
+
+        # Includes a supervisor without any officers.
+        for supervisor_id in supervisor_ids + ["unknown"]:
+            expected = _get_officer_level_data_by_scanning_all_officers(
+                supervisor_id, metric_id_to_metric_context
+            )
+            # pylint: disable=protected-access
+            actual = OutliersQuerier._get_officer_level_data_for_officer_supervisor(
+                supervisor_id,
+                metric_id_to_metric_context,
+                metric_to_entities_by_supervisor,
+            )
+            self.assertEqual(expected, actual)
+            for expected_info, actual_info in zip(expected[0], actual[0]):
+                self.assertEqual(
+                    list(expected_info.other_officers.items()),
+                    list(actual_info.other_officers.items()),
+                )
@@ -17,11 +17,11 @@
 """Tests for entity_deserialize.py."""
 from enum import Enum
 from typing import Optional
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import attr
 
-from recidiviz.common import attr_validators
+from recidiviz.common import attr_utils, attr_validators
 from recidiviz.common.constants.state.state_person import StateRace
 from recidiviz.persistence.entity.base_entity import Entity
 from recidiviz.persistence.entity.entity_deserialize import (
@@ -294,3 +294,31 @@ class TestEntityDeserialize(TestCase):
         subclass_entity = MyEntitySubclassFactory.deserialize(subclass_field="1234")
         self.assertIsInstance(subclass_entity, MyEntitySubclass)
         self.assertEqual(1234, subclass_entity.subclass_field)
+
+    def test_entity_deserialize_field_types_inspected_once_per_class(self) -> None:
+        @attr.s(eq=False)
+        class MyOtherEntity(Entity):
+            str_field: Optional[str] = attr.ib(
+                default=None, validator=attr_validators.is_opt_str
+            )
+            int_field: Optional[int] = attr.ib(
+                default=None, validator=attr_validators.is_opt_int
+            )
+
+        with mock.patch(
+            "recidiviz.persistence.entity.entity_deserialize.is_str",
+            wraps=attr_utils.is_str,
+        ) as mock_is_str:
+            for i in range(3):
+                entity = entity_deserialize(
+                    MyOtherEntity,
+                    converter_overrides={},
+                    defaults={},
+                    str_field=f"value {i}",
+                    int_field=str(i),
+                )
+                self.assertEqual(f"VALUE {i}", entity.str_field)
+                self.assertEqual(i, entity.int_field)
+
+        # Called once per field on the first deserialize() call only
+        self.assertEqual(2, mock_is_str.call_count)
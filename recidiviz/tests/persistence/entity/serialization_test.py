@@ -17,12 +17,27 @@
 """Tests for serialization methods regarding entities."""
 import datetime
 import unittest
+from unittest import mock
 
+from recidiviz.common.constants.state.state_charge import StateChargeStatus
 from recidiviz.common.constants.state.state_person import StateGender
-from recidiviz.persistence.entity.serialization import json_serializable_dict
+from recidiviz.common.constants.state.state_sentence import StateSentenceStatus
+from recidiviz.persistence.entity.entity_utils import (
+    CoreEntityFieldIndex,
+    get_all_entities_from_tree,
+    is_one_to_one_relationship,
+)
+from recidiviz.persistence.entity.serialization import (
+    json_serializable_dict,
+    serialize_entity_into_json,
+)
+from recidiviz.persistence.entity.state import entities as state_entities
 from recidiviz.pipelines.metrics.utils.metric_utils import (
     json_serializable_list_value_handler,
 )
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
 
 
 class TestJsonSerializableDict(unittest.TestCase):
@@ -110,3 +125,144 @@ class TestJsonSerializableDict(unittest.TestCase):
             json_serializable_dict(
                 metric_key, list_serializer=json_serializable_list_value_handler
             )
+
+
+class TestSerializeEntityIntoJson(unittest.TestCase):
+    """Tests for the serialize_entity_into_json function."""
+
+    def setUp(self) -> None:
+        self.field_index = CoreEntityFieldIndex()
+
+    def test_serialize_entity_into_json(self) -> None:
+        person = state_entities.StatePerson.new_with_defaults(
+            state_code="US_XX", person_id=123
+        )
+        external_id = state_entities.StatePersonExternalId.new_with_defaults(
+            state_code="US_XX",
+            external_id="ABC",
+            id_type="US_XX_ID",
+            person_external_id_id=456,
+            person=person,
+        )
+
+        self.assertEqual(
+            {
+                "state_code": "US_XX",
+                "external_id": "ABC",
+                "id_type": "US_XX_ID",
+                "person_external_id_id": 456,
+                "person_id": 123,
+            },
+            serialize_entity_into_json(external_id, self.field_index),
+        )
+
+    def test_serialize_entity_into_json_back_edge_values(self) -> None:
+        external_id = state_entities.StatePersonExternalId.new_with_defaults(
+            state_code="US_XX",
+            external_id="ABC",
+            id_type="US_XX_ID",
+            person_external_id_id=456,
+        )
+
+        self.assertEqual(
+            {
+                "state_code": "US_XX",
+                "external_id": "ABC",
+                "id_type": "US_XX_ID",
+                "person_external_id_id": 456,
+                "person_id": None,
+            },
+            serialize_entity_into_json(external_id, self.field_index),
+        )
+        self.assertEqual(
+            {
+                "state_code": "US_XX",
+                "external_id": "ABC",
+                "id_type": "US_XX_ID",
+                "person_external_id_id": 456,
+                "person_id": 123,
+            },
+            serialize_entity_into_json(
+                external_id, self.field_index, back_edge_values={"person": 123}
+            ),
+        )
+
+    def test_serialize_entity_into_json_many_to_many_and_encoded_values(
+        self,
+    ) -> None:
+        person = state_entities.StatePerson.new_with_defaults(
+            state_code="US_XX", person_id=123
+        )
+        charge = state_entities.StateCharge.new_with_defaults(
+            state_code="US_XX",
+            external_id="C1",
+            charge_id=789,
+            status=StateChargeStatus.CONVICTED,
+            offense_date=datetime.date(2020, 1, 2),
+            person=person,
+        )
+        sentence = state_entities.StateSupervisionSentence.new_with_defaults(
+            state_code="US_XX",
+            external_id="S1",
+            status=StateSentenceStatus.SERVING,
+            charges=[charge],
+            person=person,
+        )
+        charge.supervision_sentences = [sentence]
+
+        result = serialize_entity_into_json(charge, self.field_index)
+
+        self.assertEqual("CONVICTED", result["status"])
+        self.assertEqual("2020-01-02", result["offense_date"])
+        self.assertEqual(789, result["charge_id"])
+        self.assertEqual(123, result["person_id"])
+        # Charge <> sentence relationships are many-to-many and are serialized into
+        # association tables instead.
+        self.assertNotIn("supervision_sentence_id", result)
+        self.assertNotIn("incarceration_sentence_id", result)
+
+    def test_serialize_entity_into_json_full_graph(self) -> None:
+        person = generate_full_graph_state_person(
+            set_back_edges=True, include_person_back_edges=True, set_ids=True
+        )
+        entities = get_all_entities_from_tree(person, self.field_index)
+
+        with mock.patch(
+            "recidiviz.persistence.entity.serialization.is_one_to_one_relationship",
+            wraps=is_one_to_one_relationship,
+        ) as mock_is_one_to_one:
+            for _ in range(2):
+                for entity in entities:
+                    result = serialize_entity_into_json(entity, self.field_index)
+                    self.assertEqual(
+                        entity.get_id(), result[entity.get_class_id_name()]
+                    )
+                    if not isinstance(entity, state_entities.StatePerson):
+                        self.assertEqual(person.get_id(), result["person_id"])
+
+            num_calls_after_first_serialization = mock_is_one_to_one.call_count
+            for entity in entities:
+                serialize_entity_into_json(entity, self.field_index)
+
+        # Class structure is only inspected the first time a class is serialized
+        self.assertEqual(
+            num_calls_after_first_serialization, mock_is_one_to_one.call_count
+        )
+
+    def test_serialize_entity_into_json_new_field_index(self) -> None:
+        person = generate_full_graph_state_person(
+            set_back_edges=True, include_person_back_edges=True, set_ids=True
+        )
+        entities = get_all_entities_from_tree(person, self.field_index)
+        for entity in entities:
+            serialize_entity_into_json(entity, self.field_index)
+
+        with mock.patch(
+            "recidiviz.persistence.entity.serialization.is_one_to_one_relationship",
+            wraps=is_one_to_one_relationship,
+        ) as mock_is_one_to_one:
+            for entity in entities:
+                serialize_entity_into_json(entity, CoreEntityFieldIndex())
+
+        # Serialization plans are cached by class, regardless of the field index
+        mock_is_one_to_one.assert_not_called()
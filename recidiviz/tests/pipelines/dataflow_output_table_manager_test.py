@@ -50,6 +50,9 @@ from recidiviz.pipelines.metrics.recidivism.metrics import (
     ReincarcerationRecidivismRateMetric,
 )
 from recidiviz.pipelines.metrics.utils.metric_utils import RecidivizMetric
+from recidiviz.pipelines.normalization.utils.incremental_normalization_utils import (
+    bq_schema_for_normalization_cache_table,
+)
 from recidiviz.tests.persistence.database.bq_refresh.federated_cloud_sql_table_big_query_view_collector_test import (
     NO_PAUSED_REGIONS_CLOUD_SQL_CONFIG_YAML,
 )
@@ -325,6 +328,33 @@ class NormalizedStateTableManagerTest(unittest.TestCase):
         self.mock_client.update_schema.assert_called()
         self.mock_client.create_table_with_schema.assert_not_called()
 
+    def test_update_normalization_cache_table_schemas_in_dataset_create_table(
+        self,
+    ) -> None:
+        """Test that update_normalization_cache_table_schemas_in_dataset creates a
+        cache table for each root entity type when the tables do not yet exist."""
+        self.mock_client.table_exists.return_value = False
+
+        dataflow_output_table_manager.update_normalization_cache_table_schemas_in_dataset(
+            "us_xx_normalized_state"
+        )
+
+        self.mock_client.create_table_with_schema.assert_has_calls(
+            [
+                mock.call(
+                    "us_xx_normalized_state",
+                    "state_person_normalization_cache",
+                    bq_schema_for_normalization_cache_table(),
+                ),
+                mock.call(
+                    "us_xx_normalized_state",
+                    "state_staff_normalization_cache",
+                    bq_schema_for_normalization_cache_table(),
+                ),
+            ]
+        )
+        self.mock_client.update_schema.assert_not_called()
+
     @mock.patch(
         "recidiviz.pipelines.dataflow_orchestration_utils.PIPELINE_CONFIG_YAML_PATH",
         FAKE_PIPELINE_CONFIG_YAML_PATH,
@@ -817,6 +817,8 @@ def check_field_exists_in_table(table_name: str, field_name: str) -> None:
         "supervision_location_ids_to_names",
         "state_charge_offense_description_to_labels",
         "state_person_to_state_staff",
+        "state_person_normalization_cache",
+        "state_staff_normalization_cache",
     }:
         return
 
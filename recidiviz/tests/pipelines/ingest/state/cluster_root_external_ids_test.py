@@ -15,11 +15,16 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
 """Testing the ClusterRootExternalIds PTransform."""
+import unittest
+
 import apache_beam as beam
 from apache_beam.options.pipeline_options import PipelineOptions, SetupOptions
 from apache_beam.pipeline_test import TestPipeline, assert_that, equal_to
 
 from recidiviz.pipelines.ingest.state import pipeline
+from recidiviz.pipelines.ingest.state.cluster_root_external_ids import (
+    UnionFindExternalIdClusters,
+)
 from recidiviz.tests.pipelines.ingest.state.test_case import StateIngestPipelineTestCase
 
 
@@ -116,3 +121,72 @@ class TestClusterExternalIds(StateIngestPipelineTestCase):
         )
         assert_that(output, equal_to(expected_output))
         self.test_pipeline.run()
+
+    def test_cluster_external_ids_long_chain(self) -> None:
+        # A chain that is longer than the number of label propagation rounds, so it
+        # can only be fully clustered by the final union-find step.
+        chain = [(f"ID{i}", "TYPE_1") for i in range(25)]
+        expected_output = [(external_id, set(chain)) for external_id in chain]
+        output = (
+            self.test_pipeline
+            | beam.Create(
+                [
+                    (chain[i], chain[i + 1])
+                    for i in range(len(chain) - 1)
+                    # Add edges in a scrambled order so that labels are not simply
+                    # propagated from one end of the chain to the other.
+                    if i % 2 == 0
+                ]
+                + [
+                    (chain[i + 1], chain[i])
+                    for i in range(len(chain) - 1)
+                    if i % 2 == 1
+                ]
+            )
+            | pipeline.ClusterRootExternalIds(num_label_propagation_rounds=2)
+        )
+        assert_that(output, equal_to(expected_output))
+        self.test_pipeline.run()
+
+    def test_cluster_external_ids_no_label_propagation_rounds(self) -> None:
+        expected_output = [
+            (self.external_id_1, {self.external_id_1, self.external_id_2}),
+            (self.external_id_2, {self.external_id_1, self.external_id_2}),
+            (self.external_id_3, {self.external_id_3}),
+        ]
+        output = (
+            self.test_pipeline
+            | beam.Create(
+                [
+                    (self.external_id_2, self.external_id_1),
+                    (self.external_id_3, None),
+                    (self.external_id_3, self.external_id_3),
+                ]
+            )
+            | pipeline.ClusterRootExternalIds(num_label_propagation_rounds=0)
+        )
+        assert_that(output, equal_to(expected_output))
+        self.test_pipeline.run()
+
+
+class TestUnionFindExternalIdClusters(unittest.TestCase):
+    """Tests the UnionFindExternalIdClusters CombineFn."""
+
+    def test_union_find(self) -> None:
+        combine_fn = UnionFindExternalIdClusters()
+        a, b, c, d, e = [(f"ID{i}", "TYPE") for i in range(5)]
+
+        accumulator_1 = combine_fn.create_accumulator()
+        combine_fn.add_input(accumulator_1, (c, d))
+        combine_fn.add_input(accumulator_1, (a, e))
+
+        accumulator_2 = combine_fn.create_accumulator()
+        combine_fn.add_input(accumulator_2, (d, e))
+
+        merged = combine_fn.merge_accumulators([accumulator_1, accumulator_2])
+        self.assertEqual(
+            {a: a, c: a, d: a, e: a},
+            combine_fn.extract_output(merged),
+        )
+        self.assertEqual({}, combine_fn.extract_output(combine_fn.create_accumulator()))
+        self.assertNotIn(b, combine_fn.extract_output(merged))
@@ -28,9 +28,11 @@ from dateutil.relativedelta import relativedelta
 from freezegun import freeze_time
 
 import recidiviz.pipelines.metrics.utils.violation_utils
+import recidiviz.pipelines.utils.assessment_utils
 import recidiviz.pipelines.utils.supervision_period_utils
 import recidiviz.pipelines.utils.violation_response_utils
 from recidiviz.common.constants.state.state_assessment import (
+    StateAssessmentClass,
     StateAssessmentLevel,
     StateAssessmentType,
 )
@@ -3780,6 +3782,142 @@ class TestFindPopulationEventsForSupervisionPeriod(unittest.TestCase):
 
         self.assertCountEqual(expected_events, supervision_events)
 
+    def test_find_population_events_for_supervision_period_span_attributes_match_daily(
+        self,
+    ) -> None:
+        """Tests that the assessment and violation history attributes, which are
+        cached for spans of days between assessment and violation response dates,
+        match the values computed directly for every individual day of a multi-year
+        supervision period."""
+        supervision_period = NormalizedStateSupervisionPeriod.new_with_defaults(
+            supervision_period_id=111,
+            external_id="sp1",
+            state_code="US_XX",
+            start_date=date(2016, 1, 31),
+            termination_date=date(2019, 3, 31),
+            supervision_type=StateSupervisionPeriodSupervisionType.PROBATION,
+        )
+
+        assessments = [
+            NormalizedStateAssessment.new_with_defaults(
+                state_code="US_XX",
+                external_id=f"a{i}",
+                assessment_type=StateAssessmentType.ORAS_COMMUNITY_SUPERVISION,
+                assessment_score=20 + i,
+                assessment_level=StateAssessmentLevel.MODERATE,
+                assessment_date=assessment_date,
+                assessment_score_bucket=StateAssessmentLevel.MODERATE.value,
+                sequence_num=i,
+            )
+            for i, assessment_date in enumerate(
+                [
+                    date(2015, 12, 1),
+                    date(2016, 6, 15),
+                    date(2016, 6, 15),
+                    date(2018, 2, 28),
+                ]
+            )
+        ]
+
+        violation_reports: List[NormalizedStateSupervisionViolationResponse] = []
+        for i, (response_date, violation_type) in enumerate(
+            [
+                (date(2016, 2, 29), StateSupervisionViolationType.TECHNICAL),
+                (date(2016, 3, 31), StateSupervisionViolationType.FELONY),
+                (date(2017, 2, 28), StateSupervisionViolationType.MISDEMEANOR),
+                (date(2018, 8, 31), StateSupervisionViolationType.TECHNICAL),
+            ]
+        ):
+            violation_reports.append(
+                NormalizedStateSupervisionViolationResponse.new_with_defaults(
+                    state_code="US_XX",
+                    supervision_violation_response_id=1000 + i,
+                    external_id=f"svr{i}",
+                    response_date=response_date,
+                    response_type=StateSupervisionViolationResponseType.VIOLATION_REPORT,
+                    supervision_violation=NormalizedStateSupervisionViolation.new_with_defaults(
+                        supervision_violation_id=2000 + i,
+                        external_id=f"sv{i}",
+                        state_code="US_XX",
+                        violation_date=response_date,
+                        supervision_violation_types=[
+                            NormalizedStateSupervisionViolationTypeEntry.new_with_defaults(
+                                state_code="US_XX",
+                                violation_type=violation_type,
+                            ),
+                        ],
+                    ),
+                    sequence_num=i,
+                )
+            )
+
+        supervision_delegate = UsXxSupervisionDelegate(
+            DEFAULT_SUPERVISION_LOCATIONS_TO_NAMES_ASSOCIATION_LIST,
+        )
+        violation_delegate = UsXxViolationDelegate()
+
+        supervision_events = (
+            self.identifier._find_population_events_for_supervision_period(
+                self.person,
+                [],
+                [],
+                supervision_period,
+                default_normalized_sp_index_for_tests(
+                    supervision_periods=[supervision_period]
+                ),
+                default_normalized_ip_index_for_tests(),
+                assessments,
+                violation_reports,
+                [],
+                violation_delegate=violation_delegate,
+                supervision_delegate=supervision_delegate,
+            )
+        )
+
+        assert supervision_period.start_date is not None
+        assert supervision_period.termination_date is not None
+        self.assertEqual(
+            (supervision_period.termination_date - supervision_period.start_date).days,
+            len(supervision_events),
+        )
+
+        for event in supervision_events:
+            most_recent_assessment = recidiviz.pipelines.utils.assessment_utils.find_most_recent_applicable_assessment_of_class_for_state(
+                event.event_date,
+                assessments,
+                assessment_class=StateAssessmentClass.RISK,
+                supervision_delegate=supervision_delegate,
+            )
+            assert most_recent_assessment is not None
+            self.assertEqual(
+                most_recent_assessment.assessment_score, event.assessment_score
+            )
+
+            violation_history = recidiviz.pipelines.metrics.utils.violation_utils.get_violation_and_response_history(
+                upper_bound_exclusive_date=event.event_date + relativedelta(days=1),
+                violation_responses_for_history=violation_reports,
+                violation_delegate=violation_delegate,
+                incarceration_period=None,
+            )
+            self.assertEqual(
+                (
+                    violation_history.most_severe_violation_type,
+                    violation_history.most_severe_violation_type_subtype,
+                    violation_history.most_severe_violation_id,
+                    violation_history.violation_history_id_array,
+                    violation_history.most_severe_response_decision,
+                    violation_history.response_count,
+                ),
+                (
+                    event.most_severe_violation_type,
+                    event.most_severe_violation_type_subtype,
+                    event.most_severe_violation_id,
+                    event.violation_history_id_array,
+                    event.most_severe_response_decision,
+                    event.response_count,
+                ),
+            )
+
 
 class TestClassifySupervisionSuccess(unittest.TestCase):
     """Tests the classify_supervision_success function."""
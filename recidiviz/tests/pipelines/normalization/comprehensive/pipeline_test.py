@@ -16,10 +16,14 @@
 # =============================================================================
 """Tests the comprehensive normalization pipeline."""
 import datetime
+import json
 import unittest
 from typing import Any, Dict, Iterable, List, Optional, Set, Type
 
 import mock
+from apache_beam import PCollection
+from apache_beam.testing.util import assert_that
+from freezegun import freeze_time
 
 from recidiviz.common.constants.state.state_case_type import StateSupervisionCaseType
 from recidiviz.common.constants.state.state_incarceration import StateIncarcerationType
@@ -38,9 +42,20 @@ from recidiviz.persistence.database.schema_utils import (
     get_state_database_entity_with_name,
 )
 from recidiviz.persistence.entity.base_entity import Entity
-from recidiviz.persistence.entity.state.entities import StatePerson
+from recidiviz.persistence.entity.state.entities import (
+    StateIncarcerationPeriod,
+    StatePerson,
+    StateStaff,
+)
 from recidiviz.pipelines.normalization.comprehensive import pipeline
 from recidiviz.pipelines.normalization.utils import entity_normalization_manager_utils
+from recidiviz.pipelines.normalization.utils.incremental_normalization_utils import (
+    NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN,
+    NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN,
+    deserialize_normalized_output,
+    normalization_cache_table_id,
+    serialize_normalized_output,
+)
 from recidiviz.tests.persistence.database import database_test_utils
 from recidiviz.tests.pipelines.calculator_test_utils import (
     normalized_database_base_dict,
@@ -49,6 +64,7 @@ from recidiviz.tests.pipelines.calculator_test_utils import (
 from recidiviz.tests.pipelines.fake_bigquery import (
     FakeReadFromBigQueryFactory,
     FakeWriteNormalizedEntitiesToBigQuery,
+    FakeWriteToBigQuery,
     FakeWriteToBigQueryFactory,
 )
 from recidiviz.tests.pipelines.utils.run_pipeline_test_utils import (
@@ -63,6 +79,27 @@ from recidiviz.tests.pipelines.utils.state_utils.state_calculation_config_manage
 _STATE_CODE = "US_XX"
 
 
+class _CapturingWriteToBigQuery(FakeWriteToBigQuery):
+    """Fake PTransform that records the rows written to each table."""
+
+    captured_output: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Defined explicitly so that mypy does not consider this class abstract.
+    def __init__(  # pylint: disable=useless-parent-delegation
+        self, output_table: str
+    ) -> None:
+        super().__init__(output_table)
+
+    def expand(self, input_or_inputs: PCollection) -> Any:
+        output_table = self._output_table
+
+        def _capture_output(output: Iterable[Dict[str, Any]]) -> None:
+            _CapturingWriteToBigQuery.captured_output[output_table] = list(output)
+
+        assert_that(input_or_inputs, _capture_output)
+        return []
+
+
 class TestComprehensiveNormalizationPipeline(unittest.TestCase):
     """Tests the comprehensive normalization pipeline."""
 
@@ -382,6 +419,208 @@ class TestComprehensiveNormalizationPipeline(unittest.TestCase):
             data_dict=data_dict,
         )
 
+    def run_test_pipeline_and_capture_output(
+        self,
+        data_dict: Dict[str, Iterable[Dict]],
+        incremental: bool = False,
+        normalization_cache_data_dict: Optional[Dict[str, Iterable[Dict]]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Runs a test version of the normalization pipeline and returns the rows
+        written to each output table, keyed by table id."""
+        project = "recidiviz-staging"
+        output_dataset = f"{_STATE_CODE.lower()}_normalized_state"
+
+        read_from_bq_constructor = self.fake_bq_source_factory.create_fake_bq_source_constructor(
+            # TODO(#25244) Replace with actual input once supported.
+            FAKE_PIPELINE_TESTS_INPUT_DATASET,
+            data_dict,
+        )
+        read_cache_from_bq_constructor = (
+            self.fake_bq_source_factory.create_fake_bq_source_constructor(
+                output_dataset,
+                normalization_cache_data_dict
+                or {
+                    normalization_cache_table_id(StatePerson): [],
+                    normalization_cache_table_id(StateStaff): [],
+                },
+                unifying_id_field=NORMALIZATION_CACHE_ROOT_ENTITY_ID_COLUMN,
+            )
+        )
+        write_to_bq_constructor = FakeWriteToBigQueryFactory(
+            _CapturingWriteToBigQuery
+        ).create_fake_bq_sink_constructor(output_dataset)
+
+        _CapturingWriteToBigQuery.captured_output.clear()
+        with mock.patch(
+            "recidiviz.pipelines.normalization.comprehensive.pipeline.ReadFromBigQuery",
+            read_cache_from_bq_constructor,
+        ):
+            run_test_pipeline(
+                pipeline_cls=self.pipeline_class,
+                state_code=_STATE_CODE,
+                project_id=project,
+                read_from_bq_constructor=read_from_bq_constructor,
+                write_to_bq_constructor=write_to_bq_constructor,
+                incremental=incremental,
+            )
+        return {
+            table_id: sorted(rows, key=lambda row: json.dumps(row, sort_keys=True))
+            for table_id, rows in _CapturingWriteToBigQuery.captured_output.items()
+        }
+
+    def assert_incremental_output_matches_full_output(
+        self,
+        full_output: Dict[str, List[Dict[str, Any]]],
+        incremental_output: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        cache_table_ids = {
+            normalization_cache_table_id(StatePerson),
+            normalization_cache_table_id(StateStaff),
+        }
+        self.assertEqual(set(full_output) | cache_table_ids, set(incremental_output))
+        for table_id, rows in full_output.items():
+            self.assertEqual(rows, incremental_output[table_id], table_id)
+
+    def test_comprehensive_normalization_pipeline_incremental(self) -> None:
+        data_dict = self.build_comprehensive_normalization_pipeline_data_dict(
+            fake_person_id=12345, fake_staff_id=2345
+        )
+        full_output = self.run_test_pipeline_and_capture_output(data_dict)
+
+        # With no cached output, every root entity is normalized
+        incremental_output = self.run_test_pipeline_and_capture_output(
+            data_dict, incremental=True
+        )
+        self.assert_incremental_output_matches_full_output(
+            full_output, incremental_output
+        )
+
+        # With the cache from the previous run and unchanged inputs, the cached output
+        # is carried forward
+        cache_data_dict: Dict[str, Iterable[Dict]] = {
+            table_id: incremental_output[table_id]
+            for table_id in (
+                normalization_cache_table_id(StatePerson),
+                normalization_cache_table_id(StateStaff),
+            )
+        }
+        carried_forward_output = self.run_test_pipeline_and_capture_output(
+            data_dict, incremental=True, normalization_cache_data_dict=cache_data_dict
+        )
+        self.assertEqual(incremental_output, carried_forward_output)
+
+        # With a stale cache, root entities with changed inputs are re-normalized
+        changed_data_dict = self.build_comprehensive_normalization_pipeline_data_dict(
+            fake_person_id=12345, fake_staff_id=2345
+        )
+        for row in changed_data_dict[schema.StateIncarcerationPeriod.__tablename__]:
+            row["county_code"] = "125"
+        changed_full_output = self.run_test_pipeline_and_capture_output(
+            changed_data_dict
+        )
+        self.assertNotEqual(full_output, changed_full_output)
+
+        changed_incremental_output = self.run_test_pipeline_and_capture_output(
+            changed_data_dict,
+            incremental=True,
+            normalization_cache_data_dict=cache_data_dict,
+        )
+        self.assert_incremental_output_matches_full_output(
+            changed_full_output, changed_incremental_output
+        )
+        self.assertEqual(
+            incremental_output[normalization_cache_table_id(StateStaff)],
+            changed_incremental_output[normalization_cache_table_id(StateStaff)],
+        )
+
+    def test_comprehensive_normalization_pipeline_incremental_run_date_changes(
+        self,
+    ) -> None:
+        data_dict = self.build_comprehensive_normalization_pipeline_data_dict(
+            fake_person_id=12345, fake_staff_id=2345
+        )
+
+        # Before the incarceration period's release date and the supervision period's
+        # start date, normalization clears the release date and drops the
+        # supervision period
+        with freeze_time("2010-12-01"):
+            incremental_output = self.run_test_pipeline_and_capture_output(
+                data_dict, incremental=True
+            )
+        cache_data_dict: Dict[str, Iterable[Dict]] = {
+            table_id: incremental_output[table_id]
+            for table_id in (
+                normalization_cache_table_id(StatePerson),
+                normalization_cache_table_id(StateStaff),
+            )
+        }
+
+        # Once the run date has moved past those dates, the inputs are unchanged but
+        # the cached output is stale
+        with freeze_time("2011-06-01"):
+            full_output = self.run_test_pipeline_and_capture_output(data_dict)
+            later_incremental_output = self.run_test_pipeline_and_capture_output(
+                data_dict,
+                incremental=True,
+                normalization_cache_data_dict=cache_data_dict,
+            )
+        self.assertNotEqual(
+            incremental_output[schema.StateIncarcerationPeriod.__tablename__],
+            full_output[schema.StateIncarcerationPeriod.__tablename__],
+        )
+        self.assert_incremental_output_matches_full_output(
+            full_output, later_incremental_output
+        )
+
+    def test_comprehensive_normalization_pipeline_incremental_uses_cache(
+        self,
+    ) -> None:
+        data_dict = self.build_comprehensive_normalization_pipeline_data_dict(
+            fake_person_id=12345, fake_staff_id=2345
+        )
+        incremental_output = self.run_test_pipeline_and_capture_output(
+            data_dict, incremental=True
+        )
+
+        # Modify the cached output without changing the input hash to show that
+        # normalization is skipped for root entities with unchanged inputs
+        person_cache_table_id = normalization_cache_table_id(StatePerson)
+        person_cache_rows = []
+        for cache_row in incremental_output[person_cache_table_id]:
+            normalized_output = deserialize_normalized_output(
+                cache_row[NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN]
+            )
+            for tag, row in normalized_output:
+                if tag == StateIncarcerationPeriod.__name__:
+                    row["county_code"] = "CACHED"
+            person_cache_rows.append(
+                {
+                    **cache_row,
+                    NORMALIZATION_CACHE_NORMALIZED_OUTPUT_COLUMN: serialize_normalized_output(
+                        normalized_output
+                    ),
+                }
+            )
+
+        cache_data_dict: Dict[str, Iterable[Dict]] = {
+            person_cache_table_id: person_cache_rows,
+            normalization_cache_table_id(StateStaff): incremental_output[
+                normalization_cache_table_id(StateStaff)
+            ],
+        }
+        cached_output = self.run_test_pipeline_and_capture_output(
+            data_dict,
+            incremental=True,
+            normalization_cache_data_dict=cache_data_dict,
+        )
+        self.assertEqual(
+            ["CACHED"],
+            [
+                row["county_code"]
+                for row in cached_output[schema.StateIncarcerationPeriod.__tablename__]
+            ],
+        )
+
     def test_required_entities_completeness(self) -> None:
         """Tests that there are no entities in the normalized_entity_classes list of a
         normalization manager that aren't also listed as required by the pipeline."""
@@ -48,6 +48,7 @@ class TestNormalizationPipelineParameters(unittest.TestCase):
             "ingest_instance": "PRIMARY",
             "state_data_input": STATE_BASE_DATASET,
             "reference_view_input": REFERENCE_VIEWS_DATASET,
+            "incremental": "False",
             "normalized_input": normalized_state_dataset_for_state_code(
                 StateCode("US_OZ")
             ),
@@ -77,6 +78,7 @@ class TestNormalizationPipelineParameters(unittest.TestCase):
             "ingest_instance": "PRIMARY",
             "state_data_input": STATE_BASE_DATASET,
             "reference_view_input": REFERENCE_VIEWS_DATASET,
+            "incremental": "False",
         }
 
         self.assertEqual(expected_parameters, pipeline_parameters.template_parameters)
@@ -96,6 +98,7 @@ class TestNormalizationPipelineParameters(unittest.TestCase):
             state_data_input="test_input",
             normalized_input="normalized_input",
             person_filter_ids="123 12323 324",
+            incremental="True",
         ).update_with_sandbox_prefix("my_prefix")
 
         expected_parameters = {
@@ -107,6 +110,7 @@ class TestNormalizationPipelineParameters(unittest.TestCase):
             "person_filter_ids": "123 12323 324",
             "output": "my_prefix_test_output",
             "ingest_instance": "PRIMARY",
+            "incremental": "True",
         }
 
         self.assertEqual(expected_parameters, pipeline_parameters.template_parameters)
@@ -0,0 +1,195 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests the incremental_normalization_utils.py file."""
+import datetime
+import unittest
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from recidiviz.persistence.entity.entity_utils import (
+    CoreEntityFieldIndex,
+    get_all_entities_from_tree,
+)
+from recidiviz.persistence.entity.state import entities
+from recidiviz.pipelines.normalization.utils.incremental_normalization_utils import (
+    deserialize_normalized_output,
+    hash_root_entity_inputs,
+    normalization_cache_table_id,
+    normalization_logic_fingerprint,
+    serialize_normalized_output,
+)
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
+
+# Later than every date in the full graph person
+_RUN_DATE = datetime.date(2024, 1, 1)
+
+
+class TestIncrementalNormalizationUtils(unittest.TestCase):
+    """Tests the incremental_normalization_utils.py file."""
+
+    def setUp(self) -> None:
+        self.field_index = CoreEntityFieldIndex()
+
+    def _root_entity_inputs(self) -> Dict[str, List[Any]]:
+        person = generate_full_graph_state_person(
+            set_back_edges=True, include_person_back_edges=True, set_ids=True
+        )
+        root_entity_inputs: Dict[str, List[Any]] = defaultdict(list)
+        for entity in get_all_entities_from_tree(person, self.field_index):
+            root_entity_inputs[entity.__class__.__name__].append(entity)
+        root_entity_inputs["state_person_to_state_staff"] = [
+            {"person_id": person.person_id, "staff_id": 1},
+            {"person_id": person.person_id, "staff_id": 2},
+        ]
+        return root_entity_inputs
+
+    def test_hash_root_entity_inputs_order_independent(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+        reversed_inputs = {
+            name: list(reversed(values))
+            for name, values in reversed(root_entity_inputs.items())
+        }
+
+        self.assertEqual(
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+            hash_root_entity_inputs(
+                reversed_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+        )
+
+    def test_hash_root_entity_inputs_changed_entity(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+        original_hash = hash_root_entity_inputs(
+            root_entity_inputs, "abc", _RUN_DATE, self.field_index
+        )
+
+        incarceration_period = root_entity_inputs[
+            entities.StateIncarcerationPeriod.__name__
+        ][0]
+        incarceration_period.facility = "CHANGED"
+
+        self.assertNotEqual(
+            original_hash,
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+        )
+
+    def test_hash_root_entity_inputs_changed_relationship(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+        original_hash = hash_root_entity_inputs(
+            root_entity_inputs, "abc", _RUN_DATE, self.field_index
+        )
+
+        charge = root_entity_inputs[entities.StateCharge.__name__][0]
+        charge.incarceration_sentences = []
+
+        self.assertNotEqual(
+            original_hash,
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+        )
+
+    def test_hash_root_entity_inputs_changed_reference_row(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+        original_hash = hash_root_entity_inputs(
+            root_entity_inputs, "abc", _RUN_DATE, self.field_index
+        )
+
+        root_entity_inputs["state_person_to_state_staff"][0]["staff_id"] = 3
+
+        self.assertNotEqual(
+            original_hash,
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+        )
+
+    def test_hash_root_entity_inputs_changed_logic_fingerprint(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+
+        self.assertNotEqual(
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+            hash_root_entity_inputs(
+                root_entity_inputs, "def", _RUN_DATE, self.field_index
+            ),
+        )
+
+    def test_hash_root_entity_inputs_run_date(self) -> None:
+        root_entity_inputs = self._root_entity_inputs()
+        next_run_date = _RUN_DATE + datetime.timedelta(days=1)
+
+        # None of the dates are recent, so the output can't depend on the run date
+        self.assertEqual(
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", _RUN_DATE, self.field_index
+            ),
+            hash_root_entity_inputs(
+                root_entity_inputs, "abc", next_run_date, self.field_index
+            ),
+        )
+
+        incarceration_period = root_entity_inputs[
+            entities.StateIncarcerationPeriod.__name__
+        ][0]
+        for recent_date in [
+            _RUN_DATE + datetime.timedelta(days=10),
+            _RUN_DATE - datetime.timedelta(days=10),
+        ]:
+            incarceration_period.release_date = recent_date
+            self.assertNotEqual(
+                hash_root_entity_inputs(
+                    root_entity_inputs, "abc", _RUN_DATE, self.field_index
+                ),
+                hash_root_entity_inputs(
+                    root_entity_inputs, "abc", next_run_date, self.field_index
+                ),
+            )
+
+    def test_normalization_logic_fingerprint(self) -> None:
+        self.assertEqual(
+            normalization_logic_fingerprint(), normalization_logic_fingerprint()
+        )
+        self.assertEqual(64, len(normalization_logic_fingerprint()))
+
+    def test_serialize_normalized_output(self) -> None:
+        tagged_outputs: List[Tuple[str, Dict[str, Any]]] = [
+            ("StateIncarcerationPeriod", {"incarceration_period_id": 1, "a": None}),
+            ("StateCharge_StateIncarcerationSentence", {"charge_id": 2}),
+        ]
+
+        self.assertEqual(
+            tagged_outputs,
+            deserialize_normalized_output(serialize_normalized_output(tagged_outputs)),
+        )
+
+    def test_normalization_cache_table_id(self) -> None:
+        self.assertEqual(
+            "state_person_normalization_cache",
+            normalization_cache_table_id(entities.StatePerson),
+        )
+        self.assertEqual(
+            "state_staff_normalization_cache",
+            normalization_cache_table_id(entities.StateStaff),
+        )
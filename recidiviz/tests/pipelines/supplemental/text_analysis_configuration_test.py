@@ -0,0 +1,100 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests that the compiled text analyzers of the supplemental pipelines extract the
+same entities as an uncompiled TextAnalyzer with the same configuration."""
+import random
+import unittest
+from typing import List
+
+from parameterized import parameterized
+
+from recidiviz.common.text_analysis import (
+    RegexFuzzyMatcher,
+    ScoringFuzzyMatcher,
+    TextAnalyzer,
+)
+from recidiviz.pipelines.supplemental.us_id_case_note_extracted_entities.us_id_text_analysis_configuration import (
+    DEFAULT_TEXT_ANALYZER,
+)
+from recidiviz.pipelines.supplemental.us_ix_case_note_extracted_entities.us_ix_note_content_text_analysis_configuration import (
+    NOTE_CONTENT_TEXT_ANALYZER,
+)
+from recidiviz.pipelines.supplemental.us_ix_case_note_extracted_entities.us_ix_note_title_text_analysis_configuration import (
+    NOTE_TITLE_TEXT_ANALYZER,
+)
+
+_FILLER_WORDS = (
+    "Client reported to the office today and discussed employment, housing & family "
+    "with P.O. after the meeting on 12/03/2022 - see www.example.com; c/s c.s. "
+    "re: hrs ok?"
+).split()
+
+
+def _sample_notes(text_analyzer: TextAnalyzer, num_notes: int) -> List[str]:
+    """Returns notes made up of filler words and (possibly misspelled) search terms of
+    the configured entities."""
+    rng = random.Random(0)
+    search_words = []
+    for text_entity in text_analyzer.configuration.text_entities:
+        for matcher in text_entity.fuzzy_matchers:
+            if isinstance(matcher, ScoringFuzzyMatcher):
+                search_words.append(matcher.search_term)
+            elif isinstance(matcher, RegexFuzzyMatcher):
+                search_words.append(
+                    matcher.search_regex.replace(".*", " ").replace("|", " ")
+                )
+
+    def _word() -> str:
+        if rng.random() > 0.25:
+            return rng.choice(_FILLER_WORDS)
+        word = rng.choice(search_words)
+        mutation = rng.random()
+        if mutation < 0.2 and len(word) > 3:
+            i = rng.randrange(len(word))
+            return word[:i] + word[i + 1 :]
+        if mutation < 0.3:
+            return f"{word.upper()}-{rng.choice(_FILLER_WORDS)}"
+        if mutation < 0.4:
+            return f"{word}s"
+        return word
+
+    return [
+        " ".join(_word() for _ in range(rng.randrange(1, 40))) for _ in range(num_notes)
+    ]
+
+
+class CompiledTextAnalyzerParityTest(unittest.TestCase):
+    """Tests that the configured compiled text analyzers match uncompiled analyzers."""
+
+    @parameterized.expand(
+        [
+            ("us_id", DEFAULT_TEXT_ANALYZER),
+            ("us_ix_note_title", NOTE_TITLE_TEXT_ANALYZER),
+            ("us_ix_note_content", NOTE_CONTENT_TEXT_ANALYZER),
+        ]
+    )
+    def test_compiled_analyzer_parity(
+        self, _name: str, text_analyzer: TextAnalyzer
+    ) -> None:
+        uncompiled_text_analyzer = TextAnalyzer(text_analyzer.configuration)
+        num_matched_entities = 0
+        for note in _sample_notes(text_analyzer, 300):
+            expected = uncompiled_text_analyzer.extract_entities(note)
+            self.assertEqual(expected, text_analyzer.extract_entities(note), note)
+            num_matched_entities += len(expected)
+        # Sanity check that the sample notes exercise the matchers
+        self.assertGreater(num_matched_entities, 300)
@@ -258,7 +258,8 @@ def default_arg_list_for_pipeline(
             )
         )
     elif issubclass(pipeline, ComprehensiveNormalizationPipeline):
-        pass
+        if incremental := additional_pipeline_args.get("incremental"):
+            pipeline_args.extend(["--incremental", str(incremental)])
     elif issubclass(pipeline, SupplementalDatasetPipeline):
         pass
     elif issubclass(pipeline, StateIngestPipeline):
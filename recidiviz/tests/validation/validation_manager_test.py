@@ -17,7 +17,7 @@
 
 """Tests for validation/validation_manager.py."""
 import logging
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
 from unittest import TestCase
 from unittest.mock import call
 
@@ -27,6 +27,7 @@ from github.Issue import Issue
 from mock import MagicMock, patch
 
 from recidiviz.big_query.address_overrides import BigQueryAddressOverrides
+from recidiviz.big_query.big_query_client import BigQueryClient
 from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
 from recidiviz.common.constants.states import StateCode
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
@@ -61,6 +62,10 @@ from recidiviz.validation.validation_models import (
     ValidationCheckType,
     ValidationResultStatus,
 )
+from recidiviz.validation.validation_planner import (
+    ValidationBatchQueryStats,
+    ValidationQueryBatch,
+)
 from recidiviz.validation.views import view_config as validation_view_config
 
 
@@ -587,6 +592,94 @@ class TestExecuteValidationRequest(TestCase):
             sandbox_dataset_prefix=None,
         )
 
+    @patch("recidiviz.validation.validation_manager.BigQueryClientImpl")
+    @patch("recidiviz.validation.validation_manager.run_validation_query_batch")
+    @patch(
+        "recidiviz.validation.validation_manager._file_tickets_for_failing_validations"
+    )
+    @patch("recidiviz.validation.validation_manager.capture_metrics")
+    @patch("recidiviz.validation.validation_manager._run_job")
+    @patch("recidiviz.validation.validation_manager._fetch_validation_jobs_to_perform")
+    @patch(
+        "recidiviz.validation.validation_manager.store_validation_results_in_big_query"
+    )
+    @patch(
+        "recidiviz.validation.validation_manager.store_validation_run_completion_in_big_query"
+    )
+    def test_execute_validation_request_batched_queries(
+        self,
+        mock_store_run_success: MagicMock,
+        mock_store_validation_results: MagicMock,
+        mock_fetch_validations: MagicMock,
+        mock_run_job: MagicMock,
+        mock_capture_metrics: MagicMock,
+        mock_file_tickets_for_failing_validations: MagicMock,
+        mock_run_batch: MagicMock,
+        _mock_bq_client: MagicMock,
+    ) -> None:
+        mock_fetch_validations.return_value = self._TEST_VALIDATIONS
+        failing_view_id = self._TEST_VALIDATIONS[1].validation.view_builder.view_id
+
+        def _result(
+            job: DataValidationJob, status: ValidationResultStatus
+        ) -> DataValidationJobResult:
+            return DataValidationJobResult(
+                validation_job=job,
+                result_details=FakeValidationResultDetails(validation_status=status),
+            )
+
+        def _run_batch(
+            batch: ValidationQueryBatch, _bq_client: BigQueryClient
+        ) -> Tuple[List[DataValidationJobResult], ValidationBatchQueryStats]:
+            if batch.jobs[0].validation.view_builder.view_id == failing_view_id:
+                raise ValueError("Batched query failed!")
+            return (
+                [_result(job, ValidationResultStatus.FAIL_HARD) for job in batch.jobs],
+                ValidationBatchQueryStats(
+                    num_validation_jobs=len(batch.jobs),
+                    num_queries=1,
+                    num_unbatched_queries=len(batch.jobs),
+                ),
+            )
+
+        mock_run_batch.side_effect = _run_batch
+        mock_run_job.side_effect = lambda job: _result(
+            job, ValidationResultStatus.SUCCESS
+        )
+
+        execute_validation_request(
+            state_code=StateCode.US_XX,
+            ingest_instance=DirectIngestInstance.PRIMARY,
+            batch_validation_queries=True,
+        )
+
+        # Each test validation reads a different view, so each is its own batch
+        self.assertEqual(5, mock_run_batch.call_count)
+        # The job from the batch that failed is run on its own
+        mock_run_job.assert_called_once_with(self._TEST_VALIDATIONS[1])
+        ((results,), _kwargs) = mock_store_validation_results.call_args
+        self.assertEqual(5, len(results))
+        ((_, failed_hard_validations), _kwargs) = mock_capture_metrics.call_args
+        self.assertEqual(
+            {
+                job.validation.validation_name
+                for i, job in enumerate(self._TEST_VALIDATIONS)
+                if i != 1
+            },
+            {
+                result.validation_job.validation.validation_name
+                for result in failed_hard_validations
+            },
+        )
+        mock_file_tickets_for_failing_validations.assert_called_once()
+        mock_store_run_success.assert_called_with(
+            num_validations_run=5,
+            validations_runtime_sec=mock.ANY,
+            validation_run_id=mock.ANY,
+            ingest_instance=DirectIngestInstance.PRIMARY,
+            sandbox_dataset_prefix=None,
+        )
+
     @patch(
         "recidiviz.validation.validation_manager._file_tickets_for_failing_validations"
     )
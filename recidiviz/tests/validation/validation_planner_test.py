@@ -0,0 +1,316 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for validation/validation_planner.py."""
+from typing import Any, Dict, List
+from unittest import TestCase
+
+import attr
+from google.cloud import bigquery
+from mock import create_autospec, patch
+
+from recidiviz.big_query.big_query_client import BigQueryClient
+from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
+from recidiviz.validation.checks.existence_check import ExistenceDataValidationCheck
+from recidiviz.validation.checks.sameness_check import (
+    SamenessDataValidationCheck,
+    SamenessDataValidationCheckType,
+    SamenessPerRowValidationResultDetails,
+)
+from recidiviz.validation.validation_config import ValidationRegionConfig
+from recidiviz.validation.validation_models import (
+    DataValidationJob,
+    ValidationCategory,
+    ValidationResultStatus,
+)
+from recidiviz.validation.validation_planner import (
+    plan_validation_query_batches,
+    run_validation_query_batch,
+)
+
+
+def _row(values: Dict[str, Any]) -> bigquery.table.Row:
+    return bigquery.table.Row(
+        list(values.values()), {key: i for i, key in enumerate(values.keys())}
+    )
+
+
+def _view_builder(view_id: str) -> SimpleBigQueryViewBuilder:
+    return SimpleBigQueryViewBuilder(
+        dataset_id="my_dataset",
+        view_id=view_id,
+        description=f"{view_id} description",
+        view_query_template="select * from literally_anything",
+    )
+
+
+class ValidationPlannerTest(TestCase):
+    """Tests for planning and running batched validation queries."""
+
+    def setUp(self) -> None:
+        self.metadata_patcher = patch("recidiviz.utils.metadata.project_id")
+        self.metadata_patcher.start().return_value = "project-id"
+
+        region_configs = {
+            "US_XX": ValidationRegionConfig(
+                region_code="US_XX",
+                dev_mode=False,
+                exclusions={},
+                num_allowed_rows_overrides={},
+                max_allowed_error_overrides={},
+            )
+        }
+        self.existence_job = DataValidationJob(
+            region_code="US_XX",
+            validation=ExistenceDataValidationCheck(
+                validation_category=ValidationCategory.INVARIANT,
+                view_builder=_view_builder("view_a"),
+            ),
+        )
+        self.per_row_job = DataValidationJob(
+            region_code="US_XX",
+            validation=SamenessDataValidationCheck(
+                validation_category=ValidationCategory.EXTERNAL_AGGREGATE,
+                view_builder=_view_builder("view_a"),
+                validation_name_suffix="per_row",
+                comparison_columns=["a", "b"],
+                sameness_check_type=SamenessDataValidationCheckType.PER_ROW,
+                region_configs=region_configs,
+            ),
+        )
+        self.per_view_job = DataValidationJob(
+            region_code="US_XX",
+            validation=SamenessDataValidationCheck(
+                validation_category=ValidationCategory.EXTERNAL_INDIVIDUAL,
+                view_builder=_view_builder("view_a"),
+                validation_name_suffix="per_view",
+                comparison_columns=["a", "b"],
+                partition_columns=["label"],
+                sameness_check_type=SamenessDataValidationCheckType.PER_VIEW,
+            ),
+        )
+        self.other_view_job = DataValidationJob(
+            region_code="US_XX",
+            validation=ExistenceDataValidationCheck(
+                validation_category=ValidationCategory.INVARIANT,
+                view_builder=_view_builder("view_b"),
+            ),
+        )
+
+    def tearDown(self) -> None:
+        self.metadata_patcher.stop()
+
+    def test_plan_groups_jobs_by_view(self) -> None:
+        batches = plan_validation_query_batches(
+            [
+                self.existence_job,
+                self.other_view_job,
+                self.per_row_job,
+                self.per_view_job,
+            ]
+        )
+
+        self.assertEqual(
+            [
+                [self.existence_job, self.per_row_job, self.per_view_job],
+                [self.other_view_job],
+            ],
+            [batch.jobs for batch in batches],
+        )
+        self.assertEqual(1 + 2 + 3, batches[0].num_unbatched_queries)
+
+        # Jobs for another region read different rows
+        other_region_job = attr.evolve(self.existence_job, region_code="US_YY")
+        self.assertEqual(
+            2,
+            len(plan_validation_query_batches([self.existence_job, other_region_job])),
+        )
+
+    def test_plan_splits_large_batches(self) -> None:
+        batches = plan_validation_query_batches(
+            [self.existence_job] * 5, max_jobs_per_batch=2
+        )
+        self.assertEqual([2, 2, 1], [len(batch.jobs) for batch in batches])
+
+    def test_query_str(self) -> None:
+        [batch] = plan_validation_query_batches(
+            [self.existence_job, self.per_row_job, self.per_view_job]
+        )
+        query = batch.query_str()
+
+        self.assertIn(
+            f"CREATE TEMP TABLE validation_rows AS (\n    {self.existence_job.original_builder_query_str()}\n);",
+            query,
+        )
+        self.assertIn(
+            "(SELECT COUNT(*) FROM validation_rows) AS job_0__num_invalid_rows", query
+        )
+        self.assertIn(
+            "(SELECT COUNT(*) FROM validation_rows) AS job_1__total_num_rows", query
+        )
+        self.assertIn("LIMIT 1000) AS error_rows", query)
+        self.assertIn("AS job_1__failed_rows_summary", query)
+        self.assertIn("AS job_2__num_error_rows", query)
+        self.assertIn(
+            "(SELECT COUNT(*) FROM validation_rows) AS job_2__total_num_rows", query
+        )
+        self.assertIn("GROUP BY label", query)
+        self.assertIn("AS job_2__partition_count_rows", query)
+
+        # The view is only read to materialize its rows, and the error rows are
+        # computed from those rows rather than read from the error rows views.
+        self.assertEqual(1, query.count("my_dataset.view_a"))
+        self.assertIn("SELECT * FROM validation_rows", query)
+
+    def test_batched_results_match_individual_results(self) -> None:
+        error_rows: List[Dict[str, Any]] = [
+            {
+                "label": "x",
+                "a": 10,
+                "b": 12,
+                "error_rate": 0.1667,
+                "error_type": "hard",
+            },
+            {"label": "y", "a": None, "b": 3, "error_rate": 1.0, "error_type": "hard"},
+        ]
+        partition_count_rows: List[Dict[str, Any]] = [
+            {"label": "x", "a": 4, "b": 3},
+            {"label": "y", "a": 2, "b": 2},
+        ]
+
+        with patch(
+            "recidiviz.validation.checks.existence_check.BigQueryClientImpl"
+        ) as existence_client_cls, patch(
+            "recidiviz.validation.checks.sameness_check.BigQueryClientImpl"
+        ) as sameness_client_cls:
+            existence_client_cls.return_value.run_query_async.return_value = [
+                _row({"label": "x"}) for _ in range(7)
+            ]
+            existence_result = self.existence_job.validation.get_checker().run_check(
+                self.existence_job
+            )
+
+            sameness_client = sameness_client_cls.return_value
+            sameness_client.run_query_async.side_effect = [
+                [_row(r) for r in error_rows],
+                [[7]],
+            ]
+            per_row_result = self.per_row_job.validation.get_checker().run_check(
+                self.per_row_job
+            )
+            sameness_client.run_query_async.side_effect = [
+                [[2]],
+                [[7]],
+                [_row(r) for r in partition_count_rows],
+            ]
+            per_view_result = self.per_view_job.validation.get_checker().run_check(
+                self.per_view_job
+            )
+
+        [batch] = plan_validation_query_batches(
+            [self.existence_job, self.per_row_job, self.per_view_job]
+        )
+        query_job = create_autospec(bigquery.QueryJob)
+        query_job.__iter__.return_value = iter(
+            [
+                _row(
+                    {
+                        "job_0__num_invalid_rows": 7,
+                        "job_1__total_num_rows": 7,
+                        "job_1__failed_rows_summary": {
+                            "num_failed_rows": 2,
+                            "num_hard_failed_rows": 2,
+                            "num_soft_failed_rows": 0,
+                            "error_rows": error_rows,
+                        },
+                        "job_2__num_error_rows": 2,
+                        "job_2__total_num_rows": 7,
+                        "job_2__partition_count_rows": partition_count_rows,
+                    }
+                )
+            ]
+        )
+        query_job.total_bytes_processed = 1000
+        query_job.total_bytes_billed = 10485760
+        query_job.slot_millis = 50
+        bq_client = create_autospec(BigQueryClient)
+        bq_client.run_query_async.return_value = query_job
+
+        results, stats = run_validation_query_batch(batch, bq_client)
+
+        self.assertEqual([existence_result, per_row_result, per_view_result], results)
+        bq_client.run_query_async.assert_called_once_with(
+            query_str=batch.query_str(), use_query_cache=True, query_parameters=[]
+        )
+        self.assertEqual(3, stats.num_validation_jobs)
+        self.assertEqual(1, stats.num_queries)
+        self.assertEqual(6, stats.num_unbatched_queries)
+        self.assertEqual(10485760, stats.total_bytes_billed)
+        self.assertEqual(50, stats.total_slot_millis)
+
+    def test_batched_per_row_result_counts_truncated_failed_rows(self) -> None:
+        error_rows: List[Dict[str, Any]] = [
+            {"label": "y", "a": None, "b": 3, "error_rate": 1.0, "error_type": "hard"},
+            {"label": "x", "a": 10, "b": 12, "error_rate": 0.5, "error_type": "hard"},
+        ]
+
+        result = self.per_row_job.validation.get_checker().result_from_batched_values(
+            self.per_row_job,
+            {
+                "total_num_rows": 5000,
+                "failed_rows_summary": {
+                    "num_failed_rows": 3000,
+                    "num_hard_failed_rows": 2000,
+                    "num_soft_failed_rows": 1000,
+                    "error_rows": error_rows,
+                },
+            },
+        )
+
+        result_details = result.result_details
+        self.assertIsInstance(result_details, SamenessPerRowValidationResultDetails)
+        assert isinstance(result_details, SamenessPerRowValidationResultDetails)
+        self.assertEqual(2, len(result_details.failed_rows))
+        self.assertEqual(
+            ValidationResultStatus.FAIL_HARD, result.validation_result_status
+        )
+        self.assertEqual(1.0, result_details.highest_error)
+        self.assertEqual(
+            "3000 row(s) had unacceptable margins of error. Of those rows, 2000 row(s) "
+            "exceeded the hard threshold and 1000 row(s) exceeded the soft threshold. "
+            "The acceptable margin of error is only 0.02 (hard) and 0.02 (soft), but "
+            "the validation returned rows with errors as high as 1.0.",
+            result_details.failure_description(),
+        )
+
+    def test_batched_per_row_result_no_failed_rows(self) -> None:
+        result = self.per_row_job.validation.get_checker().result_from_batched_values(
+            self.per_row_job,
+            {
+                "total_num_rows": 7,
+                "failed_rows_summary": {
+                    "num_failed_rows": 0,
+                    "num_hard_failed_rows": 0,
+                    "num_soft_failed_rows": 0,
+                    "error_rows": None,
+                },
+            },
+        )
+
+        self.assertEqual(
+            ValidationResultStatus.SUCCESS, result.validation_result_status
+        )
+        self.assertIsNone(result.result_details.failure_description())
@@ -148,7 +148,7 @@ class TestValidationResultStorage(unittest.TestCase):
                 "validation_result_status": "SUCCESS",
                 "failure_description": None,
                 "result_details_type": "SamenessPerRowValidationResultDetails",
-                "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 924, "dev_mode": false}',
+                "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 924, "dev_mode": false, "num_failed_rows": null, "num_hard_failed_rows": null, "num_soft_failed_rows": null}',
                 "validation_category": "EXTERNAL_AGGREGATE",
                 "exception_log": None,
                 "trace_id": result.trace_id,
@@ -330,7 +330,8 @@ class TestValidationResultStorage(unittest.TestCase):
                 "result_details": '{"failed_rows": [[{"label_values": ["US_XX"], '
                 '"comparison_values": [5, 10]}, 0.5]], '
                 '"hard_max_allowed_error": 0.0, "soft_max_allowed_error": '
-                '0.0, "total_num_rows": 8, "dev_mode": false}',
+                '0.0, "total_num_rows": 8, "dev_mode": false, "num_failed_rows": '
+                'null, "num_hard_failed_rows": null, "num_soft_failed_rows": null}',
                 "result_details_type": "SamenessPerRowValidationResultDetails",
                 "validation_category": "EXTERNAL_AGGREGATE",
                 "trace_id": result.trace_id,
@@ -568,7 +569,7 @@ class TestValidationResultStorage(unittest.TestCase):
                     "validation_result_status": "SUCCESS",
                     "failure_description": None,
                     "result_details_type": "SamenessPerRowValidationResultDetails",
-                    "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 3, "dev_mode": false}',
+                    "result_details": '{"failed_rows": [], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 3, "dev_mode": false, "num_failed_rows": null, "num_hard_failed_rows": null, "num_soft_failed_rows": null}',
                     "validation_category": "EXTERNAL_AGGREGATE",
                     "exception_log": None,
                     "trace_id": storage_result_1.trace_id,
@@ -588,7 +589,7 @@ class TestValidationResultStorage(unittest.TestCase):
                     "validation_result_status": "FAIL_HARD",
                     "failure_description": "1 row(s) had unacceptable margins of error. The acceptable margin of error is only 0.0, but the validation returned rows with errors as high as 0.5.",
                     "result_details_type": "SamenessPerRowValidationResultDetails",
-                    "result_details": '{"failed_rows": [[{"label_values": ["US_XX"], "comparison_values": [5, 10]}, 0.5]], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 5, "dev_mode": false}',
+                    "result_details": '{"failed_rows": [[{"label_values": ["US_XX"], "comparison_values": [5, 10]}, 0.5]], "hard_max_allowed_error": 0.0, "soft_max_allowed_error": 0.0, "total_num_rows": 5, "dev_mode": false, "num_failed_rows": null, "num_hard_failed_rows": null, "num_soft_failed_rows": null}',
                     "validation_category": "EXTERNAL_AGGREGATE",
                     "exception_log": None,
                     "trace_id": storage_result_2.trace_id,
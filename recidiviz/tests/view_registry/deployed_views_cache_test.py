@@ -0,0 +1,176 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Tests for deployed_views_cache.py"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.view_registry.deployed_views_cache import (
+    CachedBigQueryView,
+    build_all_deployed_views_dag_walker_with_cache,
+)
+
+
+def _build_test_dag_walker() -> BigQueryViewDagWalker:
+    return BigQueryViewDagWalker(
+        [
+            BigQueryView(
+                dataset_id="dataset_1",
+                view_id="table_1",
+                description="table_1 description",
+                bq_description="table_1 description",
+                view_query_template="SELECT * FROM `{project_id}.source_dataset.source_table`",
+                materialized_address=BigQueryAddress(
+                    dataset_id="dataset_1", table_id="table_1_materialized"
+                ),
+                clustering_fields=["state_code"],
+            ),
+            BigQueryView(
+                dataset_id="dataset_2",
+                view_id="table_2",
+                description="table_2 description",
+                bq_description="table_2 description",
+                view_query_template="""SELECT STRUCT(a AS {b}), '{{}}' AS braces FROM `{project_id}.dataset_1.table_1_materialized`
+JOIN `{project_id}.source_dataset.source_table_2` USING (col)""",
+                b="b",
+            ),
+        ]
+    )
+
+
+class DeployedViewsCacheTest(unittest.TestCase):
+    """Tests for deployed_views_cache.py"""
+
+    def setUp(self) -> None:
+        self.metadata_patcher = patch(
+            "recidiviz.utils.metadata.project_id",
+            MagicMock(return_value="test-project"),
+        )
+        self.metadata_patcher.start()
+
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.source_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_root)
+        self.root_patcher = patch(
+            "recidiviz.view_registry.deployed_views_cache._RECIDIVIZ_ROOT",
+            self.source_root,
+        )
+        self.root_patcher.start()
+        self._write_source_file("views.yaml", "foo: bar")
+
+        self.mock_build_dag_walker = MagicMock(side_effect=_build_test_dag_walker)
+        self.build_patcher = patch(
+            "recidiviz.view_registry.deployed_views.build_all_deployed_views_dag_walker",
+            self.mock_build_dag_walker,
+        )
+        self.build_patcher.start()
+
+    def tearDown(self) -> None:
+        self.build_patcher.stop()
+        self.root_patcher.stop()
+        self.metadata_patcher.stop()
+
+    def _write_source_file(self, path: str, contents: str) -> None:
+        with open(os.path.join(self.source_root, path), "w", encoding="utf-8") as f:
+            f.write(contents)
+
+    def test_warm_load_matches_cold_build(self) -> None:
+        built = build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(1, self.mock_build_dag_walker.call_count)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.cache_dir, "test-project.json"))
+        )
+
+        cached = build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(1, self.mock_build_dag_walker.call_count)
+
+        self.assertEqual(set(built.nodes_by_address), set(cached.nodes_by_address))
+        for address, node in built.nodes_by_address.items():
+            cached_node = cached.nodes_by_address[address]
+            self.assertIsInstance(cached_node.view, CachedBigQueryView)
+            self.assertEqual(node.view.view_query, cached_node.view.view_query)
+            self.assertEqual(node.view.description, cached_node.view.description)
+            self.assertEqual(node.view.bq_description, cached_node.view.bq_description)
+            self.assertEqual(
+                node.view.materialized_address, cached_node.view.materialized_address
+            )
+            self.assertEqual(
+                node.view.clustering_fields, cached_node.view.clustering_fields
+            )
+            self.assertEqual(node.parent_tables, cached_node.parent_tables)
+            self.assertEqual(
+                node.parent_node_addresses, cached_node.parent_node_addresses
+            )
+            self.assertEqual(
+                node.child_node_addresses, cached_node.child_node_addresses
+            )
+
+        self.assertEqual(
+            {
+                BigQueryAddress(dataset_id="dataset_1", table_id="table_1"),
+            },
+            cached.nodes_by_address[
+                BigQueryAddress(dataset_id="dataset_2", table_id="table_2")
+            ].parent_node_addresses,
+        )
+
+    def test_changed_data_file_invalidates_cache(self) -> None:
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self._write_source_file("views.yaml", "foo: baz")
+
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(2, self.mock_build_dag_walker.call_count)
+
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(2, self.mock_build_dag_walker.call_count)
+
+    def test_new_module_invalidates_cache(self) -> None:
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self._write_source_file("new_view.py", "VIEW_BUILDER = None")
+
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(2, self.mock_build_dag_walker.call_count)
+
+    def test_different_project_not_cached(self) -> None:
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+
+        with patch(
+            "recidiviz.utils.metadata.project_id",
+            MagicMock(return_value="other-project"),
+        ):
+            build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(2, self.mock_build_dag_walker.call_count)
+
+    def test_corrupt_cache_file_rebuilds(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(
+            os.path.join(self.cache_dir, "test-project.json"),
+            "w",
+            encoding="utf-8",
+        ) as f:
+            f.write("{not json")
+
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(1, self.mock_build_dag_walker.call_count)
+        build_all_deployed_views_dag_walker_with_cache(self.cache_dir)
+        self.assertEqual(1, self.mock_build_dag_walker.call_count)
@@ -175,10 +175,24 @@ class TestWorkflowsETLRoutes(unittest.TestCase):
                 json={"state_code": state_code, "filename": filename},
             )
             mock_delegate.supports_file.assert_called_with(filename)
-            mock_delegate.run_etl.assert_called_with(filename)
+            mock_delegate.run_etl.assert_called_with(filename, incremental=False)
             self.assertEqual(HTTPStatus.OK, response.status_code)
             self.assertEqual(b"", response.data)
 
+    @patch("recidiviz.workflows.etl.routes.get_workflows_delegates")
+    def test_run_firestore_etl_incremental(self, mock_get_delegates: MagicMock) -> None:
+        mock_delegate = MagicMock()
+        mock_get_delegates.return_value = [mock_delegate]
+        filename = "test_file.json"
+        with self.test_app.test_client() as client:
+            response = client.post(
+                "/practices-etl/_run_firestore_etl",
+                headers=self.headers,
+                json={"state_code": "US_XX", "filename": filename, "incremental": True},
+            )
+            mock_delegate.run_etl.assert_called_with(filename, incremental=True)
+            self.assertEqual(HTTPStatus.OK, response.status_code)
+
     @patch("recidiviz.workflows.etl.routes.get_workflows_delegates")
     def test_run_firestore_etl_unsupported_file(
         self, mock_get_delegates: MagicMock
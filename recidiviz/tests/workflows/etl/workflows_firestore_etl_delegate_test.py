@@ -15,8 +15,9 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #  =============================================================================
 """Tests for the Workflows Firestore ETL Delegate."""
+import threading
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
@@ -26,8 +27,10 @@ from google.api_core.exceptions import AlreadyExists
 from google.cloud.firestore_admin_v1 import CreateIndexRequest
 
 from recidiviz.common.constants.states import StateCode
+from recidiviz.firestore.firestore_client import FirestoreClient
 from recidiviz.utils.metadata import local_project_id_override
 from recidiviz.workflows.etl.workflows_etl_delegate import (
+    CONTENT_HASH_KEY,
     MAX_FIRESTORE_RECORDS_PER_BATCH,
     WorkflowsFirestoreETLDelegate,
 )
@@ -80,6 +83,237 @@ class FakeFileStream:
         return str(self.values_written)
 
 
+class FakeDocumentReference:
+    def __init__(self, collection_path: str, document_id: str) -> None:
+        self.collection_path = collection_path
+        self.id = document_id
+
+
+class FakeCollectionReference:
+    def __init__(self, collection_path: str) -> None:
+        self.collection_path = collection_path
+
+    def document(self, document_id: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self.collection_path, document_id)
+
+
+class FakeWriteBatch:
+    """Write batch that applies its writes to a FakeFirestoreClient on commit."""
+
+    def __init__(self, client: "FakeFirestoreClient") -> None:
+        self.client = client
+        self.writes: List[Tuple[FakeDocumentReference, Optional[dict]]] = []
+
+    def set(self, document: FakeDocumentReference, data: dict) -> None:
+        self.writes.append((document, data))
+
+    def delete(self, document: FakeDocumentReference) -> None:
+        self.writes.append((document, None))
+
+    def commit(self) -> None:
+        if len(self.writes) > MAX_FIRESTORE_RECORDS_PER_BATCH:
+            raise ValueError(f"Batch has too many writes: {len(self.writes)}")
+        with self.client.lock:
+            self.client.num_commits += 1
+            for document, data in self.writes:
+                collection = self.client.collections.setdefault(
+                    document.collection_path, {}
+                )
+                if data is None:
+                    collection.pop(document.id, None)
+                    self.client.num_deletes += 1
+                else:
+                    collection[document.id] = data
+                    self.client.num_sets += 1
+
+
+class FakeFirestoreClient(FirestoreClient):
+    """In-memory Firestore client that counts the writes committed to it."""
+
+    def __init__(self) -> None:
+        self.collections: Dict[str, Dict[str, dict]] = {}
+        self.lock = threading.Lock()
+        self.num_commits = 0
+        self.num_sets = 0
+        self.num_deletes = 0
+
+    @property
+    def project_id(self) -> str:
+        return "test-project"
+
+    def get_collection(self, collection_path: str) -> Any:
+        return FakeCollectionReference(collection_path)
+
+    def batch(self) -> Any:
+        return FakeWriteBatch(self)
+
+    def get_field_by_document_id(
+        self, collection_path: str, state_code: str, field: str
+    ) -> Dict[str, Any]:
+        return {
+            document_id: document.get(field)
+            for document_id, document in self.collections.get(
+                collection_path, {}
+            ).items()
+            if document.get("stateCode") == state_code
+        }
+
+    def get_collection_group(self, collection_path: str) -> Any:
+        raise NotImplementedError
+
+    def get_document(self, document_path: str) -> Any:
+        raise NotImplementedError
+
+    def set_document(self, document_path: str, data: Dict) -> None:
+        raise NotImplementedError
+
+    def list_collections_with_indexes(self) -> List[str]:
+        raise NotImplementedError
+
+    def index_exists_for_collection(self, collection_name: str) -> bool:
+        raise NotImplementedError
+
+    def create_index(self, collection_name: str, create_index_request: Any) -> Any:
+        raise NotImplementedError
+
+    def delete_collection(self, collection_path: str) -> None:
+        raise NotImplementedError
+
+    def delete_old_documents(
+        self,
+        collection_path: str,
+        state_code: str,
+        timestamp_field: str,
+        cutoff: datetime,
+    ) -> None:
+        raise NotImplementedError
+
+
+class FakeRecordsFileStream:
+    def __init__(self, lines: List[str]) -> None:
+        self.lines = iter(lines)
+
+    def readline(self) -> Optional[str]:
+        return next(self.lines, None)
+
+
+class TestStateCodeETLDelegate(TestETLDelegate):
+    def transform_row(self, row: str) -> Tuple[str, dict]:
+        row_id, value = row.split(":")
+        return row_id, {"stateCode": "US_XX", "value": value}
+
+
+@patch(
+    "recidiviz.workflows.etl.workflows_etl_delegate.WorkflowsETLDelegate.get_file_stream"
+)
+class WorkflowsFirestoreIncrementalEtlTest(TestCase):
+    """Tests for the incremental Firestore ETL."""
+
+    def setUp(self) -> None:
+        self.firestore_client = FakeFirestoreClient()
+        self.delegate = TestStateCodeETLDelegate(StateCode.US_XX)
+
+    def _run_etl(self, mock_get_file_stream: mock.MagicMock, lines: List[str]) -> None:
+        mock_get_file_stream.return_value = [FakeRecordsFileStream(lines)]
+        self.firestore_client.num_sets = 0
+        self.firestore_client.num_deletes = 0
+        self.firestore_client.num_commits = 0
+        with local_project_id_override("test-project"):
+            self.delegate.run_incremental_etl("test_export.json", self.firestore_client)
+
+    def test_incremental_etl_writes_only_changes(
+        self, mock_get_file_stream: mock.MagicMock
+    ) -> None:
+        first_run = datetime(2022, 5, 1, tzinfo=timezone.utc)
+        with freeze_time(first_run):
+            self._run_etl(mock_get_file_stream, ["a:1", "b:2", "c:3"])
+        self.assertEqual(3, self.firestore_client.num_sets)
+        self.assertEqual(0, self.firestore_client.num_deletes)
+
+        second_run = datetime(2022, 5, 2, tzinfo=timezone.utc)
+        with freeze_time(second_run):
+            self._run_etl(mock_get_file_stream, ["a:1", "b:20", "d:4"])
+
+        # Only b changed and d is new; c is gone
+        self.assertEqual(2, self.firestore_client.num_sets)
+        self.assertEqual(1, self.firestore_client.num_deletes)
+        documents = self.firestore_client.collections["testOpportunity"]
+        self.assertEqual({"us_xx_a", "us_xx_b", "us_xx_d"}, set(documents))
+        self.assertEqual("20", documents["us_xx_b"]["value"])
+        self.assertEqual(first_run, documents["us_xx_a"]["__loadedAt"])
+        self.assertEqual(second_run, documents["us_xx_b"]["__loadedAt"])
+        self.assertEqual(
+            documents["us_xx_a"][CONTENT_HASH_KEY],
+            self.firestore_client.get_field_by_document_id(
+                "testOpportunity", "US_XX", CONTENT_HASH_KEY
+            )["us_xx_a"],
+        )
+
+        # Nothing changed, so nothing is written
+        self._run_etl(mock_get_file_stream, ["a:1", "b:20", "d:4"])
+        self.assertEqual(0, self.firestore_client.num_sets)
+        self.assertEqual(0, self.firestore_client.num_deletes)
+        self.assertEqual(0, self.firestore_client.num_commits)
+
+    def test_incremental_etl_rewrites_documents_without_hash(
+        self, mock_get_file_stream: mock.MagicMock
+    ) -> None:
+        self.firestore_client.collections["testOpportunity"] = {
+            "us_xx_a": {"stateCode": "US_XX", "value": "1"},
+            "us_yy_a": {"stateCode": "US_YY", "value": "1"},
+        }
+        self._run_etl(mock_get_file_stream, ["a:1"])
+
+        self.assertEqual(1, self.firestore_client.num_sets)
+        self.assertIn(
+            CONTENT_HASH_KEY,
+            self.firestore_client.collections["testOpportunity"]["us_xx_a"],
+        )
+        # Documents for other states are left alone
+        self.assertEqual(0, self.firestore_client.num_deletes)
+        self.assertIn("us_yy_a", self.firestore_client.collections["testOpportunity"])
+
+    def test_incremental_etl_respects_batching(
+        self, mock_get_file_stream: mock.MagicMock
+    ) -> None:
+        self._run_etl(mock_get_file_stream, [f"{i}:{i}" for i in range(3000)])
+        self.assertEqual(3000, self.firestore_client.num_sets)
+        self.assertEqual(7, self.firestore_client.num_commits)
+        self.assertEqual(
+            3000, len(self.firestore_client.collections["testOpportunity"])
+        )
+
+        self._run_etl(mock_get_file_stream, [f"{i}:{i}" for i in range(1000)])
+        self.assertEqual(0, self.firestore_client.num_sets)
+        self.assertEqual(2000, self.firestore_client.num_deletes)
+        self.assertEqual(5, self.firestore_client.num_commits)
+
+    def test_incremental_etl_dedupes_documents(
+        self, mock_get_file_stream: mock.MagicMock
+    ) -> None:
+        # The two rows for a would otherwise be written in different batches
+        self._run_etl(
+            mock_get_file_stream,
+            ["a:1"] + [f"{i}:{i}" for i in range(1000)] + ["a:2"],
+        )
+
+        self.assertEqual(1001, self.firestore_client.num_sets)
+        documents = self.firestore_client.collections["testOpportunity"]
+        self.assertEqual("2", documents["us_xx_a"]["value"])
+
+        # The stored hash is that of the last row, so it is not rewritten
+        self._run_etl(mock_get_file_stream, ["a:1", "a:2"])
+        self.assertEqual(0, self.firestore_client.num_sets)
+        self.assertEqual(1000, self.firestore_client.num_deletes)
+
+    def test_incremental_etl_raises_on_failed_commit(
+        self, mock_get_file_stream: mock.MagicMock
+    ) -> None:
+        with patch.object(FakeWriteBatch, "commit", side_effect=ValueError("Boom")):
+            with self.assertRaises(ValueError):
+                self._run_etl(mock_get_file_stream, ["a:1"])
+
+
 # Because we are testing an abstract class, we need to subclass it within this test,
 # which ultimately means we have to patch the individual client methods instead of the
 # entire class (because our test instance already has a reference to the real class,
@@ -0,0 +1,117 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the throughput of BigQueryClientImpl.paged_read_and_process() with
+different numbers of prefetched pages, using a fake query job whose result() sleeps to
+simulate the round trip for each page.
+
+Usage:
+    python -m recidiviz.tools.benchmark_big_query_paged_read \
+        [--num_rows NUM_ROWS] [--page_size PAGE_SIZE] \
+        [--page_latency_seconds PAGE_LATENCY_SECONDS] \
+        [--process_seconds_per_page PROCESS_SECONDS_PER_PAGE]
+"""
+import argparse
+import logging
+import time
+from typing import List
+from unittest.mock import create_autospec, patch
+
+from google.cloud import bigquery
+
+from recidiviz.big_query.big_query_client import BigQueryClientImpl
+
+_PREFETCH_PAGES = [0, 1, 2, 4]
+
+
+def _fake_query_job(num_rows: int, page_latency_seconds: float) -> bigquery.QueryJob:
+    rows = [
+        bigquery.table.Row([i, f"value_{i}"], {"id": 0, "value": 1})
+        for i in range(num_rows)
+    ]
+
+    def _result(max_results: int, start_index: int) -> List[bigquery.table.Row]:
+        time.sleep(page_latency_seconds)
+        return rows[start_index : start_index + max_results]
+
+    query_job = create_autospec(bigquery.QueryJob)
+    query_job.result.side_effect = _result
+    return query_job
+
+
+def main(
+    num_rows: int,
+    page_size: int,
+    page_latency_seconds: float,
+    process_seconds_per_page: float,
+) -> None:
+    """Times reading and processing |num_rows| rows from a fake query job with each
+    number of prefetched pages."""
+    with patch("recidiviz.big_query.big_query_client.client"):
+        bq_client = BigQueryClientImpl(project_id="recidiviz-bq-benchmark")
+    query_job = _fake_query_job(num_rows, page_latency_seconds)
+    logging.info(
+        "Reading [%s] rows in pages of [%s] rows, with [%s]s latency per page and "
+        "[%s]s of processing per page.",
+        num_rows,
+        page_size,
+        page_latency_seconds,
+        process_seconds_per_page,
+    )
+
+    for prefetch_pages in _PREFETCH_PAGES:
+        num_rows_processed = 0
+
+        def _process_page(rows: List[bigquery.table.Row]) -> None:
+            nonlocal num_rows_processed
+            time.sleep(process_seconds_per_page)
+            num_rows_processed += len(rows)
+
+        start = time.perf_counter()
+        bq_client.paged_read_and_process(
+            query_job, page_size, _process_page, prefetch_pages=prefetch_pages
+        )
+        elapsed = time.perf_counter() - start
+        if num_rows_processed != num_rows:
+            raise ValueError(
+                f"Expected to process [{num_rows}] rows, found [{num_rows_processed}]."
+            )
+        logging.info(
+            "prefetch_pages=%s: %.2fs (%.0f rows/sec)",
+            prefetch_pages,
+            elapsed,
+            num_rows / elapsed,
+        )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rows", type=int, default=500000)
+    parser.add_argument("--page_size", type=int, default=10000)
+    parser.add_argument("--page_latency_seconds", type=float, default=0.5)
+    parser.add_argument("--process_seconds_per_page", type=float, default=0.2)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(
+        args.num_rows,
+        args.page_size,
+        args.page_latency_seconds,
+        args.process_seconds_per_page,
+    )
@@ -0,0 +1,135 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the throughput of ReadOnlyCsvNormalizingStream on synthetic files with
+multi-character delimiters and line terminators.
+
+For each line length, reports MB/s when the stream is:
+  - read by pandas.read_csv() (the way GcsfsCsvReader reads it)
+  - read in small fixed-size blocks
+  - read line by line with readline()
+
+Usage:
+    python -m recidiviz.tools.benchmark_csv_normalizing_stream \
+        [--file_size_mb FILE_SIZE_MB] [--block_size BLOCK_SIZE]
+"""
+import argparse
+import csv
+import functools
+import io
+import logging
+import time
+from typing import Callable
+
+import pandas as pd
+
+from recidiviz.cloud_storage.read_only_csv_normalizing_stream import (
+    ReadOnlyCsvNormalizingStream,
+)
+
+_DELIMITER = "‡"
+_LINE_TERMINATOR = "†\n"
+
+# (number of columns, characters per cell)
+_LINE_SHAPES = [(10, 10), (100, 20), (1000, 100), (10000, 100)]
+
+
+def _build_file(file_size_mb: float, num_columns: int, cell_size: int) -> str:
+    line = _DELIMITER.join(
+        ("x" * (cell_size - 2) + '"' + str(i % 10))[:cell_size]
+        for i in range(num_columns)
+    )
+    num_lines = max(int(file_size_mb * 1e6 / len(line)), 2)
+    return _LINE_TERMINATOR.join([line] * num_lines) + _LINE_TERMINATOR
+
+
+def _stream(contents: str) -> ReadOnlyCsvNormalizingStream:
+    return ReadOnlyCsvNormalizingStream(
+        io.StringIO(contents),
+        delimiter=_DELIMITER,
+        line_terminator=_LINE_TERMINATOR,
+        quoting=csv.QUOTE_NONE,
+    )
+
+
+def _read_with_pandas(contents: str) -> None:
+    for _ in pd.read_csv(
+        _stream(contents),
+        dtype=str,
+        header=None,
+        quoting=csv.QUOTE_ALL,
+        engine="c",
+        chunksize=10000,
+    ):
+        pass
+
+
+def _read_blocks(contents: str, block_size: int) -> None:
+    stream = _stream(contents)
+    while stream.read(block_size):
+        pass
+
+
+def _read_lines(contents: str) -> None:
+    stream = _stream(contents)
+    while stream.readline():
+        pass
+
+
+def _time_read(description: str, contents: str, read_fn: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    read_fn()
+    elapsed = time.perf_counter() - start
+    logging.info(
+        "  %s: %.2fs (%.1f MB/s)", description, elapsed, len(contents) / 1e6 / elapsed
+    )
+
+
+def main(file_size_mb: float, block_size: int) -> None:
+    """Times reading a generated file of each line shape through the normalizing
+    stream with pandas, fixed-size reads and readline()."""
+    for num_columns, cell_size in _LINE_SHAPES:
+        contents = _build_file(file_size_mb, num_columns, cell_size)
+        logging.info(
+            "[%s] columns x [%s] chars per cell (%.1f MB):",
+            num_columns,
+            cell_size,
+            len(contents) / 1e6,
+        )
+        _time_read(
+            "pandas.read_csv()",
+            contents,
+            functools.partial(_read_with_pandas, contents),
+        )
+        _time_read(
+            f"read({block_size})",
+            contents,
+            functools.partial(_read_blocks, contents, block_size),
+        )
+        _time_read("readline()", contents, functools.partial(_read_lines, contents))
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file_size_mb", type=float, default=20)
+    parser.add_argument("--block_size", type=int, default=1024)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.file_size_mb, args.block_size)
@@ -0,0 +1,126 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks loading the deployed view graph with and without the on-disk deployed
+views cache.
+
+Reports the time for a fresh Python process to:
+  - build the deployed view graph when there is no cache (cold start). This imports
+    all view builder modules and writes the cache.
+  - load the deployed view graph from the cache written by the cold start (warm
+    start).
+
+Then checks that the graph loaded from the cache matches the graph built from the view
+builders.
+
+Usage:
+    python -m recidiviz.tools.benchmark_deployed_views_cache \
+        [--project_id PROJECT_ID]
+"""
+import argparse
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
+from recidiviz.utils.metadata import local_project_id_override
+from recidiviz.view_registry.deployed_views_cache import (
+    build_all_deployed_views_dag_walker_with_cache,
+)
+
+
+def _time_load_in_new_process(project_id: str, cache_dir: str) -> float:
+    """Returns the time it takes a new Python process to import the cache module and
+    load the deployed view graph, including interpreter startup."""
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "recidiviz.tools.benchmark_deployed_views_cache",
+            "--project_id",
+            project_id,
+            "--cache_dir",
+            cache_dir,
+            "--load_only",
+        ],
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def _check_parity(cached: BigQueryViewDagWalker, built: BigQueryViewDagWalker) -> None:
+    if set(cached.nodes_by_address) != set(built.nodes_by_address):
+        raise ValueError("Found mismatched set of views in cached DAG.")
+    for address, node in built.nodes_by_address.items():
+        cached_node = cached.nodes_by_address[address]
+        view, cached_view = node.view, cached_node.view
+        if (
+            cached_view.view_query != view.view_query
+            or cached_view.materialized_address != view.materialized_address
+            or cached_view.clustering_fields != view.clustering_fields
+            or cached_node.parent_node_addresses != node.parent_node_addresses
+        ):
+            raise ValueError(f"Found mismatched cached view for [{address}]")
+
+
+def main(project_id: str) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold_seconds = _time_load_in_new_process(project_id, cache_dir)
+        logging.info("Cold start (no cache): %.2fs", cold_seconds)
+
+        warm_seconds = _time_load_in_new_process(project_id, cache_dir)
+        logging.info("Warm start (cached): %.2fs", warm_seconds)
+
+    # Some view queries depend on set iteration order, which varies between Python
+    # processes, so compare a freshly built DAG to one loaded from a cache written by
+    # the same process.
+    with tempfile.TemporaryDirectory() as cache_dir, local_project_id_override(
+        project_id
+    ):
+        built_dag_walker = build_all_deployed_views_dag_walker_with_cache(cache_dir)
+        cached_dag_walker = build_all_deployed_views_dag_walker_with_cache(cache_dir)
+        _check_parity(cached_dag_walker, built_dag_walker)
+    logging.info(
+        "Cached DAG with [%s] views matches the DAG built from view builders.",
+        len(cached_dag_walker.views),
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--project_id",
+        default=GCP_PROJECT_STAGING,
+        choices=[GCP_PROJECT_STAGING, GCP_PROJECT_PRODUCTION],
+    )
+    # Used internally to time a single load of the DAG in a fresh process.
+    parser.add_argument("--cache_dir", help=argparse.SUPPRESS)
+    parser.add_argument("--load_only", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if args.load_only:
+        with local_project_id_override(args.project_id):
+            build_all_deployed_views_dag_walker_with_cache(args.cache_dir)
+    else:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        main(args.project_id)
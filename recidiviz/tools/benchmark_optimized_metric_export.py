@@ -0,0 +1,196 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the conversion of query results into the optimized metric file format
+(see OptimizedMetricBigQueryViewExporter) on a synthetic dashboard view with many
+dimensions.
+
+Reports the wall time and peak Python memory used to produce the compressed file
+with the default two-pass exporter and with the single_pass exporter, and checks
+that both produce byte-identical files.
+
+Usage:
+    python -m recidiviz.tools.benchmark_optimized_metric_export \
+        [--num_rows NUM_ROWS] [--num_dimensions NUM_DIMENSIONS] \
+        [--num_value_keys NUM_VALUE_KEYS]
+"""
+import argparse
+import io
+import logging
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+from unittest.mock import create_autospec, patch
+
+from google.cloud import bigquery
+
+from recidiviz.big_query.big_query_client import BigQueryClient
+from recidiviz.big_query.big_query_utils import transform_dict_to_bigquery_row
+from recidiviz.big_query.export.export_query_config import ExportBigQueryViewConfig
+from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath
+from recidiviz.metrics.export import optimized_metric_big_query_view_exporter
+from recidiviz.metrics.export.optimized_metric_big_query_view_exporter import (
+    OptimizedMetricBigQueryViewExporter,
+)
+from recidiviz.metrics.metric_big_query_view import MetricBigQueryViewBuilder
+from recidiviz.utils.environment import GCP_PROJECT_STAGING
+from recidiviz.utils.metadata import local_project_id_override
+
+
+def _fake_bq_client(
+    rows: List[bigquery.table.Row], schema: List[bigquery.SchemaField]
+) -> BigQueryClient:
+    bq_client = create_autospec(BigQueryClient)
+    dataset_ref = create_autospec(bigquery.DatasetReference)
+    bq_client.dataset_ref_for_id.return_value = dataset_ref
+    bq_client.get_table.return_value = bigquery.Table(
+        bigquery.TableReference(dataset_ref, "benchmark_view"), schema
+    )
+
+    def paged_read_and_process(
+        _query_job: bigquery.QueryJob,
+        page_size: int,
+        process_page_fn: Callable[[List[bigquery.table.Row]], None],
+    ) -> None:
+        for start in range(0, len(rows), page_size):
+            process_page_fn(rows[start : start + page_size])
+
+    bq_client.paged_read_and_process.side_effect = paged_read_and_process
+    return bq_client
+
+
+def _export(
+    view_exporter: OptimizedMetricBigQueryViewExporter,
+    export_config: ExportBigQueryViewConfig,
+) -> bytes:
+    query_job = create_autospec(bigquery.QueryJob)
+    if not view_exporter.single_pass:
+        # pylint: disable=protected-access
+        return view_exporter._produce_transmission_format(  # type: ignore[return-value]
+            view_exporter.convert_query_results_to_optimized_value_matrix(
+                query_job, export_config
+            ),
+            should_compress=True,
+        )
+
+    builder = view_exporter.read_query_results_into_value_matrix_builder(
+        query_job, export_config
+    )
+    out = io.BytesIO()
+    # pylint: disable=protected-access
+    view_exporter._write_transmission_format(builder.iter_value_matrix(), out)
+    return out.getvalue()
+
+
+def _time_export(
+    description: str,
+    view_exporter: OptimizedMetricBigQueryViewExporter,
+    export_config: ExportBigQueryViewConfig,
+) -> bytes:
+    tracemalloc.start()
+    start = time.perf_counter()
+    output = _export(view_exporter, export_config)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logging.info(
+        "%s: %.2fs, %.1f MB peak memory, %.1f MB compressed output",
+        description,
+        elapsed,
+        peak / 1e6,
+        len(output) / 1e6,
+    )
+    return output
+
+
+def main(num_rows: int, num_dimensions: int, num_value_keys: int) -> None:
+    """Times exporting |num_rows| synthetic metric rows to the optimized format with
+    the two pass and single pass exporters and checks that the outputs match."""
+    rng = random.Random(0)
+    dimensions = tuple(f"dimension_{i}" for i in range(num_dimensions))
+    value_keys = [f"value_{i}" for i in range(num_value_keys)]
+    # Dimensions have between 2 and ~500 distinct values, like the districts,
+    # officers, months and demographic breakdowns of dashboard views
+    cardinalities = [2 + (i * 97) % 500 for i in range(num_dimensions)]
+    rows = [
+        transform_dict_to_bigquery_row(
+            {
+                **{
+                    d: f"VALUE_{rng.randrange(c)}"
+                    for d, c in zip(dimensions, cardinalities)
+                },
+                **{v: rng.randrange(10000) for v in value_keys},
+            }
+        )
+        for _ in range(num_rows)
+    ]
+    schema = [bigquery.SchemaField(d, "STRING") for d in dimensions] + [
+        bigquery.SchemaField(v, "INTEGER") for v in value_keys
+    ]
+    export_config = ExportBigQueryViewConfig(
+        view=MetricBigQueryViewBuilder(
+            dataset_id="benchmark_dataset",
+            view_id="benchmark_view",
+            description="benchmark_view description",
+            view_query_template="SELECT 1",
+            dimensions=dimensions,
+        ).build(),
+        view_filter_clause=None,
+        intermediate_table_name="benchmark_view_table",
+        output_directory=GcsfsDirectoryPath.from_absolute_path("gs://bucket/export"),
+    )
+    logging.info(
+        "Exporting [%s] rows with [%s] dimensions and [%s] value keys.",
+        num_rows,
+        num_dimensions,
+        num_value_keys,
+    )
+
+    bq_client = _fake_bq_client(rows, schema)
+    # Fix the gzip header timestamp so that the outputs can be compared
+    with patch("time.time", return_value=1700000000):
+        two_pass_output = _time_export(
+            "Two pass",
+            OptimizedMetricBigQueryViewExporter(bq_client, []),
+            export_config,
+        )
+        single_pass_output = _time_export(
+            "Single pass",
+            OptimizedMetricBigQueryViewExporter(bq_client, [], single_pass=True),
+            export_config,
+        )
+    if two_pass_output != single_pass_output:
+        raise ValueError("Single pass output does not match two pass output.")
+    logging.info(
+        "Outputs are identical (batch size [%s]).",
+        optimized_metric_big_query_view_exporter.TRANSMISSION_FORMAT_BATCH_SIZE,
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rows", type=int, default=500000)
+    parser.add_argument("--num_dimensions", type=int, default=8)
+    parser.add_argument("--num_value_keys", type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    with local_project_id_override(GCP_PROJECT_STAGING):
+        main(args.num_rows, args.num_dimensions, args.num_value_keys)
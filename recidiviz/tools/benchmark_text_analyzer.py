@@ -0,0 +1,138 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the number of notes per second that TextAnalyzer.extract_entities()
+processes for each of the case note text analysis configurations, with an uncompiled
+TextAnalyzer and with a CompiledTextAnalyzer, on synthetic case notes built from the
+configured search terms.
+
+Also checks that both analyzers extract the same entities from every note.
+
+Usage:
+    python -m recidiviz.tools.benchmark_text_analyzer \
+        [--num_notes NUM_NOTES] [--max_words_per_note MAX_WORDS_PER_NOTE]
+"""
+import argparse
+import logging
+import random
+import time
+from typing import List, Set
+
+from recidiviz.common.text_analysis import (
+    CompiledTextAnalyzer,
+    RegexFuzzyMatcher,
+    ScoringFuzzyMatcher,
+    TextAnalyzer,
+    TextEntity,
+)
+from recidiviz.pipelines.supplemental.us_id_case_note_extracted_entities.us_id_text_analysis_configuration import (
+    DEFAULT_TEXT_ANALYZER,
+)
+from recidiviz.pipelines.supplemental.us_ix_case_note_extracted_entities.us_ix_note_content_text_analysis_configuration import (
+    NOTE_CONTENT_TEXT_ANALYZER,
+)
+from recidiviz.pipelines.supplemental.us_ix_case_note_extracted_entities.us_ix_note_title_text_analysis_configuration import (
+    NOTE_TITLE_TEXT_ANALYZER,
+)
+
+_FILLER_WORDS = (
+    "Client reported to the office today and discussed employment, housing & family "
+    "with P.O. after the meeting on 12/03/2022 regarding his UA results and payments "
+    "- see www.example.com; c/s c.s. re: hrs ok? will follow up next week"
+).split()
+
+
+def _synthetic_notes(
+    text_analyzer: TextAnalyzer, num_notes: int, max_words_per_note: int
+) -> List[str]:
+    rng = random.Random(0)
+    search_words = []
+    for text_entity in text_analyzer.configuration.text_entities:
+        for matcher in text_entity.fuzzy_matchers:
+            if isinstance(matcher, ScoringFuzzyMatcher):
+                search_words.append(matcher.search_term)
+            elif isinstance(matcher, RegexFuzzyMatcher):
+                search_words.append(
+                    matcher.search_regex.replace(".*", " ").replace("|", " ")
+                )
+
+    def _word() -> str:
+        if rng.random() > 0.1:
+            return rng.choice(_FILLER_WORDS)
+        word = rng.choice(search_words)
+        if rng.random() < 0.2 and len(word) > 3:
+            i = rng.randrange(len(word))
+            return word[:i] + word[i + 1 :]
+        return word
+
+    return [
+        " ".join(_word() for _ in range(rng.randrange(1, max_words_per_note)))
+        for _ in range(num_notes)
+    ]
+
+
+def _time_extraction(
+    description: str, text_analyzer: TextAnalyzer, notes: List[str]
+) -> List[Set[TextEntity]]:
+    start = time.perf_counter()
+    results = [text_analyzer.extract_entities(note) for note in notes]
+    elapsed = time.perf_counter() - start
+    logging.info("  %s: %.0f notes/sec", description, len(notes) / elapsed)
+    return results
+
+
+def main(num_notes: int, max_words_per_note: int) -> None:
+    for name, configured_analyzer in [
+        ("us_id", DEFAULT_TEXT_ANALYZER),
+        ("us_ix_note_title", NOTE_TITLE_TEXT_ANALYZER),
+        ("us_ix_note_content", NOTE_CONTENT_TEXT_ANALYZER),
+    ]:
+        configuration = configured_analyzer.configuration
+        notes = _synthetic_notes(configured_analyzer, num_notes, max_words_per_note)
+        logging.info(
+            "%s: [%s] entities, [%s] notes of up to [%s] words",
+            name,
+            len(configuration.text_entities),
+            num_notes,
+            max_words_per_note,
+        )
+        uncompiled_results = _time_extraction(
+            "TextAnalyzer", TextAnalyzer(configuration), notes
+        )
+        compiled_results = _time_extraction(
+            "CompiledTextAnalyzer", CompiledTextAnalyzer(configuration), notes
+        )
+        num_mismatches = sum(
+            uncompiled != compiled
+            for uncompiled, compiled in zip(uncompiled_results, compiled_results)
+        )
+        if num_mismatches:
+            raise ValueError(
+                f"[{num_mismatches}] notes have different entities for {name}."
+            )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_notes", type=int, default=2000)
+    parser.add_argument("--max_words_per_note", type=int, default=80)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.num_notes, args.max_words_per_note)
@@ -0,0 +1,143 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks ancestor / descendant sub-DAG computation on the full deployed view graph.
+
+Reports the time to:
+  - populate ancestor sub-DAGs on every node by unioning the sub-DAGs of each node's
+    parents into a new BigQueryViewDagWalker, the way populate_ancestor_sub_dags()
+    used to.
+  - set the ancestor and descendant reachability bitsets on every node, and then
+    build every node's ancestor and descendant sub-DAG from them on first read.
+  - answer get_sub_dag() queries (ancestors and descendants) for a sample of views.
+
+Usage:
+    python -m recidiviz.tools.benchmark_view_dag_sub_dags \
+        [--project_id PROJECT_ID] [--num_sub_dag_queries NUM_SUB_DAG_QUERIES]
+"""
+import argparse
+import logging
+import time
+from typing import Dict
+
+from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
+from recidiviz.utils.metadata import local_project_id_override
+from recidiviz.view_registry.deployed_views_cache import (
+    build_all_deployed_views_dag_walker_with_cache,
+)
+
+
+def _populate_ancestor_sub_dags_by_union(
+    dag_walker: BigQueryViewDagWalker,
+) -> Dict[BigQueryView, BigQueryViewDagWalker]:
+    sub_dags: Dict[BigQueryView, BigQueryViewDagWalker] = {}
+
+    def union_parent_sub_dags(
+        v: BigQueryView, parent_results: Dict[BigQueryView, None]
+    ) -> None:
+        sub_dags[v] = BigQueryViewDagWalker.union_dags(
+            BigQueryViewDagWalker([v]), *[sub_dags[p] for p in parent_results]
+        )
+
+    dag_walker.process_dag(union_parent_sub_dags, synchronous=True)
+    return sub_dags
+
+
+def main(num_sub_dag_queries: int) -> None:
+    """Times building the sub-DAGs of the deployed views DAG from reachability
+    bitsets against unioning parent sub-DAGs, and answering |num_sub_dag_queries|
+    get_sub_dag() queries."""
+    start = time.perf_counter()
+    dag_walker = build_all_deployed_views_dag_walker_with_cache()
+    logging.info(
+        "Built DAG with [%s] views in %.2fs.",
+        len(dag_walker.views),
+        time.perf_counter() - start,
+    )
+
+    start = time.perf_counter()
+    sub_dags_by_union = _populate_ancestor_sub_dags_by_union(dag_walker)
+    logging.info(
+        "Ancestor sub-DAGs built by unioning parent sub-DAGs: %.2fs",
+        time.perf_counter() - start,
+    )
+
+    start = time.perf_counter()
+    dag_walker.populate_ancestor_sub_dags()
+    logging.info(
+        "Ancestor reachability bitsets set on every node: %.2fs",
+        time.perf_counter() - start,
+    )
+    start = time.perf_counter()
+    for node in dag_walker.nodes_by_address.values():
+        _ = node.ancestors_sub_dag
+    logging.info(
+        "Ancestor sub-DAGs built from reachability bitsets on first read: %.2fs",
+        time.perf_counter() - start,
+    )
+    for view, sub_dag in sub_dags_by_union.items():
+        if set(sub_dag.views) != set(
+            dag_walker.node_for_view(view).ancestors_sub_dag.views
+        ):
+            raise ValueError(f"Found mismatched ancestor sub-DAG for [{view.address}]")
+
+    start = time.perf_counter()
+    dag_walker.populate_descendant_sub_dags()
+    logging.info(
+        "Descendant reachability bitsets set on every node: %.2fs",
+        time.perf_counter() - start,
+    )
+    start = time.perf_counter()
+    for node in dag_walker.nodes_by_address.values():
+        _ = node.descendants_sub_dag
+    logging.info(
+        "Descendant sub-DAGs built from reachability bitsets on first read: %.2fs",
+        time.perf_counter() - start,
+    )
+
+    sample_views = dag_walker.views[
+        :: max(len(dag_walker.views) // num_sub_dag_queries, 1)
+    ]
+    start = time.perf_counter()
+    for view in sample_views:
+        dag_walker.get_sub_dag(
+            views=[view], include_ancestors=True, include_descendants=True
+        )
+    logging.info(
+        "Answered [%s] get_sub_dag() queries: %.2fs",
+        len(sample_views),
+        time.perf_counter() - start,
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--project_id",
+        default=GCP_PROJECT_STAGING,
+        choices=[GCP_PROJECT_STAGING, GCP_PROJECT_PRODUCTION],
+    )
+    parser.add_argument("--num_sub_dag_queries", type=int, default=100)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    with local_project_id_override(args.project_id):
+        main(args.num_sub_dag_queries)
@@ -0,0 +1,272 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""
+Benchmarks SupervisionPopulationEvent generation in the SupervisionIdentifier on a
+synthetic person with a long supervision period and many assessments and violation
+responses.
+
+Each population event produced by the identifier (which caches assessment and
+violation history attributes per span of days) is checked against those attributes
+recomputed directly for that day, the way the identifier used to do for every day, and
+the runtime of both approaches is reported.
+
+Run locally with the following command:
+
+    python -m recidiviz.tools.calculator.benchmark_supervision_population_events \
+        --years [YEARS] \
+        --num-assessments [NUM_ASSESSMENTS] \
+        --num-violation-responses [NUM_VIOLATION_RESPONSES]
+"""
+import argparse
+import datetime
+import logging
+import random
+import time
+from datetime import date
+from typing import List, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from recidiviz.common.constants.state.state_assessment import (
+    StateAssessmentClass,
+    StateAssessmentLevel,
+    StateAssessmentType,
+)
+from recidiviz.common.constants.state.state_supervision_period import (
+    StateSupervisionPeriodSupervisionType,
+)
+from recidiviz.common.constants.state.state_supervision_violation import (
+    StateSupervisionViolationType,
+)
+from recidiviz.common.constants.state.state_supervision_violation_response import (
+    StateSupervisionViolationResponseType,
+)
+from recidiviz.persistence.entity.state.entities import StatePerson
+from recidiviz.persistence.entity.state.normalized_entities import (
+    NormalizedStateAssessment,
+    NormalizedStateSupervisionPeriod,
+    NormalizedStateSupervisionViolation,
+    NormalizedStateSupervisionViolationResponse,
+    NormalizedStateSupervisionViolationTypeEntry,
+)
+from recidiviz.pipelines.metrics.supervision.events import SupervisionPopulationEvent
+from recidiviz.pipelines.metrics.supervision.identifier import SupervisionIdentifier
+from recidiviz.pipelines.metrics.utils.violation_utils import (
+    get_violation_and_response_history,
+)
+from recidiviz.pipelines.utils import assessment_utils
+from recidiviz.pipelines.utils.entity_normalization.normalized_incarceration_period_index import (
+    NormalizedIncarcerationPeriodIndex,
+)
+from recidiviz.pipelines.utils.entity_normalization.normalized_supervision_period_index import (
+    NormalizedSupervisionPeriodIndex,
+)
+from recidiviz.pipelines.utils.state_utils.templates.us_xx.us_xx_incarceration_delegate import (
+    UsXxIncarcerationDelegate,
+)
+from recidiviz.pipelines.utils.state_utils.templates.us_xx.us_xx_supervision_delegate import (
+    UsXxSupervisionDelegate,
+)
+from recidiviz.pipelines.utils.state_utils.templates.us_xx.us_xx_violations_delegate import (
+    UsXxViolationDelegate,
+)
+
+_STATE_CODE = "US_XX"
+_START_DATE = date(2010, 1, 1)
+
+
+def _build_synthetic_entities(
+    years: int, num_assessments: int, num_violation_responses: int
+) -> Tuple[
+    NormalizedStateSupervisionPeriod,
+    List[NormalizedStateAssessment],
+    List[NormalizedStateSupervisionViolationResponse],
+]:
+    """Builds a supervision period spanning |years| years along with assessments and
+    violation responses spread randomly over that period."""
+    termination_date = _START_DATE + relativedelta(years=years)
+    num_days = (termination_date - _START_DATE).days
+    rng = random.Random(0)
+
+    supervision_period = NormalizedStateSupervisionPeriod.new_with_defaults(
+        supervision_period_id=1,
+        external_id="sp1",
+        state_code=_STATE_CODE,
+        start_date=_START_DATE,
+        termination_date=termination_date,
+        supervision_type=StateSupervisionPeriodSupervisionType.PROBATION,
+        sequence_num=0,
+    )
+
+    assessment_dates = sorted(
+        _START_DATE + datetime.timedelta(days=rng.randrange(num_days))
+        for _ in range(num_assessments)
+    )
+    assessments = [
+        NormalizedStateAssessment.new_with_defaults(
+            state_code=_STATE_CODE,
+            external_id=f"a{i}",
+            assessment_id=i,
+            assessment_type=StateAssessmentType.LSIR,
+            assessment_score=rng.randrange(40),
+            assessment_level=StateAssessmentLevel.MODERATE,
+            assessment_date=assessment_date,
+            sequence_num=i,
+        )
+        for i, assessment_date in enumerate(assessment_dates)
+    ]
+
+    response_dates = sorted(
+        _START_DATE + datetime.timedelta(days=rng.randrange(num_days))
+        for _ in range(num_violation_responses)
+    )
+    violation_responses = [
+        NormalizedStateSupervisionViolationResponse.new_with_defaults(
+            state_code=_STATE_CODE,
+            external_id=f"svr{i}",
+            supervision_violation_response_id=i,
+            response_date=response_date,
+            response_type=StateSupervisionViolationResponseType.VIOLATION_REPORT,
+            supervision_violation=NormalizedStateSupervisionViolation.new_with_defaults(
+                state_code=_STATE_CODE,
+                external_id=f"sv{i}",
+                supervision_violation_id=i,
+                violation_date=response_date,
+                supervision_violation_types=[
+                    NormalizedStateSupervisionViolationTypeEntry.new_with_defaults(
+                        state_code=_STATE_CODE,
+                        violation_type=rng.choice(list(StateSupervisionViolationType)),
+                    )
+                ],
+            ),
+            sequence_num=i,
+        )
+        for i, response_date in enumerate(response_dates)
+    ]
+    return supervision_period, assessments, violation_responses
+
+
+def _check_against_daily_recomputation(
+    events: List[SupervisionPopulationEvent],
+    assessments: List[NormalizedStateAssessment],
+    violation_responses: List[NormalizedStateSupervisionViolationResponse],
+    supervision_delegate: UsXxSupervisionDelegate,
+    violation_delegate: UsXxViolationDelegate,
+) -> None:
+    """Recomputes the assessment and violation history attributes for the date of
+    every event and raises if any of them differ from the event's values."""
+    for event in events:
+        assessment = (
+            assessment_utils.find_most_recent_applicable_assessment_of_class_for_state(
+                event.event_date,
+                assessments,
+                assessment_class=StateAssessmentClass.RISK,
+                supervision_delegate=supervision_delegate,
+            )
+        )
+        violation_history = get_violation_and_response_history(
+            upper_bound_exclusive_date=event.event_date + relativedelta(days=1),
+            violation_responses_for_history=violation_responses,
+            violation_delegate=violation_delegate,
+            incarceration_period=None,
+        )
+        expected = (
+            assessment.assessment_score if assessment else None,
+            violation_history.most_severe_violation_type,
+            violation_history.most_severe_violation_id,
+            violation_history.violation_history_id_array,
+            violation_history.most_severe_response_decision,
+            violation_history.response_count,
+        )
+        actual = (
+            event.assessment_score,
+            event.most_severe_violation_type,
+            event.most_severe_violation_id,
+            event.violation_history_id_array,
+            event.most_severe_response_decision,
+            event.response_count,
+        )
+        if expected != actual:
+            raise ValueError(
+                f"Mismatch on [{event.event_date}]: expected {expected}, found {actual}."
+            )
+
+
+def main(years: int, num_assessments: int, num_violation_responses: int) -> None:
+    """Times building the population events of one synthetic supervision period and
+    checks them against a daily recomputation."""
+    supervision_period, assessments, violation_responses = _build_synthetic_entities(
+        years, num_assessments, num_violation_responses
+    )
+    supervision_delegate = UsXxSupervisionDelegate([])
+    violation_delegate = UsXxViolationDelegate()
+
+    start = time.perf_counter()
+    # Time the per-period step on its own, which identify() only reaches after
+    # normalizing a whole person's entities.
+    # pylint: disable=protected-access
+    events = SupervisionIdentifier()._find_population_events_for_supervision_period(
+        person=StatePerson.new_with_defaults(state_code=_STATE_CODE, person_id=1),
+        supervision_sentences=[],
+        incarceration_sentences=[],
+        supervision_period=supervision_period,
+        supervision_period_index=NormalizedSupervisionPeriodIndex(
+            sorted_supervision_periods=[supervision_period]
+        ),
+        incarceration_period_index=NormalizedIncarcerationPeriodIndex(
+            sorted_incarceration_periods=[],
+            incarceration_delegate=UsXxIncarcerationDelegate(),
+        ),
+        assessments=assessments,
+        violation_responses_for_history=violation_responses,
+        supervision_contacts=[],
+        violation_delegate=violation_delegate,
+        supervision_delegate=supervision_delegate,
+    )
+    identifier_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _check_against_daily_recomputation(
+        events,
+        assessments,
+        violation_responses,
+        supervision_delegate,
+        violation_delegate,
+    )
+    daily_seconds = time.perf_counter() - start
+
+    logging.info(
+        "Generated [%s] population events; all match daily recomputation.", len(events)
+    )
+    logging.info("Span-cached identifier: %.3fs", identifier_seconds)
+    logging.info(
+        "Daily recomputation of assessment/violation fields: %.3fs", daily_seconds
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--num-assessments", type=int, default=50)
+    parser.add_argument("--num-violation-responses", type=int, default=100)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.years, args.num_assessments, args.num_violation_responses)
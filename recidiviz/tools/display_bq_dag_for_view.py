@@ -27,13 +27,17 @@ from recidiviz.big_query.big_query_address import BigQueryAddress
 from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
 from recidiviz.utils.metadata import local_project_id_override
 from recidiviz.utils.params import str_to_bool
-from recidiviz.view_registry.deployed_views import build_all_deployed_views_dag_walker
+from recidiviz.view_registry.deployed_views_cache import (
+    build_all_deployed_views_dag_walker_with_cache,
+)
 
 
 def print_dfs_tree(
     dataset_id: str, view_id: str, print_downstream_tree: bool = False
 ) -> None:
-    dag_walker = build_all_deployed_views_dag_walker()
+    # The view graph is loaded from an on-disk cache when no source files have changed
+    # since the last run, which makes repeated runs of this script much faster.
+    dag_walker = build_all_deployed_views_dag_walker_with_cache()
 
     address = BigQueryAddress(dataset_id=dataset_id, table_id=view_id)
     if address not in dag_walker.nodes_by_address:
@@ -137,7 +137,9 @@ from recidiviz.validation.views.dataset_config import EXTERNAL_ACCURACY_DATASET
 from recidiviz.validation.views.dataset_config import (
     VIEWS_DATASET as VALIDATION_VIEWS_DATASET,
 )
-from recidiviz.view_registry.deployed_views import build_all_deployed_views_dag_walker
+from recidiviz.view_registry.deployed_views_cache import (
+    build_all_deployed_views_dag_walker_with_cache,
+)
 
 # List of views that are definitely not referenced in Looker (as of 11/29/23). This list
 # is # incomplete and you should add to this list / update the date in this comment as
@@ -418,7 +420,9 @@ def get_unused_addresses_from_all_views_dag(
 
 
 def main() -> None:
-    dag_walker = build_all_deployed_views_dag_walker()
+    # Only the structure of the view graph is needed, so it is loaded from the
+    # on-disk cache when no source files have changed since the last run.
+    dag_walker = build_all_deployed_views_dag_walker_with_cache()
     unused_addresses = get_unused_addresses_from_all_views_dag(dag_walker)
 
     if not unused_addresses:
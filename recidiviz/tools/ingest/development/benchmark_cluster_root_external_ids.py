@@ -0,0 +1,169 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Script that benchmarks the ClusterRootExternalIds PTransform on a synthetic graph of
+external id edges.
+
+The graph is made up of clusters of --cluster_size external ids. Each cluster is a
+chain of edges (the worst case for label propagation) plus a few random extra edges
+within the cluster, and a fraction of the external ids also emit an edge to None, as
+root entities without linked external ids do in the ingest pipeline. Edges are
+generated inside the pipeline so that very large graphs do not need to fit in memory on
+the launching machine.
+
+Any additional arguments are passed through as Beam pipeline options, so the benchmark
+can be run on the DirectRunner locally or on Dataflow for 10M+ edge graphs.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_cluster_root_external_ids \
+        --num_edges NUM_EDGES \
+        [--cluster_size CLUSTER_SIZE] \
+        [--num_label_propagation_rounds NUM_ROUNDS] \
+        [BEAM_PIPELINE_OPTIONS...]
+
+Examples:
+    python -m recidiviz.tools.ingest.development.benchmark_cluster_root_external_ids \
+        --num_edges 1000000 \
+        --direct_num_workers 8 \
+        --direct_running_mode multi_processing
+
+    python -m recidiviz.tools.ingest.development.benchmark_cluster_root_external_ids \
+        --num_edges 10000000 \
+        --cluster_size 20 \
+        --runner DataflowRunner \
+        --project recidiviz-staging \
+        --region us-central1 \
+        --temp_location gs://my-bucket/tmp
+"""
+import argparse
+import logging
+import random
+import time
+from typing import Generator, List, Tuple
+
+import apache_beam as beam
+from apache_beam.options.pipeline_options import PipelineOptions
+
+from recidiviz.pipelines.ingest.state.cluster_root_external_ids import (
+    DEFAULT_NUM_LABEL_PROPAGATION_ROUNDS,
+    ClusterRootExternalIds,
+)
+from recidiviz.pipelines.ingest.state.constants import (
+    ExternalIdCluster,
+    ExternalIdClusterEdge,
+)
+
+# The number of clusters generated by each element of the seed PCollection.
+_CLUSTERS_PER_SHARD = 1000
+
+
+def _generate_edges_for_shard(
+    shard: int, cluster_size: int, edges_per_cluster: int
+) -> Generator[ExternalIdClusterEdge, None, None]:
+    rng = random.Random(shard)
+    for cluster in range(
+        shard * _CLUSTERS_PER_SHARD, (shard + 1) * _CLUSTERS_PER_SHARD
+    ):
+        external_ids = [
+            (f"ID_{cluster}_{i}", f"TYPE_{i % 3}") for i in range(cluster_size)
+        ]
+        rng.shuffle(external_ids)
+        for i in range(edges_per_cluster):
+            if i < cluster_size - 1:
+                # Chain every external id in the cluster together
+                yield external_ids[i], external_ids[i + 1]
+            elif i < cluster_size + cluster_size // 2:
+                yield rng.choice(external_ids), None
+            else:
+                yield rng.choice(external_ids), rng.choice(external_ids)
+
+
+def _check_cluster_sizes(
+    element: ExternalIdCluster, cluster_size: int
+) -> ExternalIdCluster:
+    _, cluster = element
+    if len(cluster) != cluster_size:
+        raise ValueError(
+            f"Expected clusters of size [{cluster_size}], found [{len(cluster)}]."
+        )
+    return element
+
+
+def run_benchmark(
+    num_edges: int,
+    cluster_size: int,
+    num_label_propagation_rounds: int,
+    pipeline_args: List[str],
+) -> None:
+    """Times clustering roughly |num_edges| synthetic edges and checks that every
+    cluster has |cluster_size| external ids."""
+    edges_per_cluster = max(2 * cluster_size, 1)
+    num_clusters = max(num_edges // edges_per_cluster, 1)
+    num_shards = max(num_clusters // _CLUSTERS_PER_SHARD, 1)
+    logging.info(
+        "Clustering [%s] edges in [%s] clusters of [%s] external ids.",
+        num_shards * _CLUSTERS_PER_SHARD * edges_per_cluster,
+        num_shards * _CLUSTERS_PER_SHARD,
+        cluster_size,
+    )
+
+    start = time.perf_counter()
+    with beam.Pipeline(options=PipelineOptions(pipeline_args)) as p:
+        _ = (
+            p
+            | "Create shards" >> beam.Create(list(range(num_shards)))
+            | "Reshuffle shards" >> beam.Reshuffle()
+            | "Generate edges"
+            >> beam.FlatMap(
+                _generate_edges_for_shard,
+                cluster_size=cluster_size,
+                edges_per_cluster=edges_per_cluster,
+            )
+            | ClusterRootExternalIds(
+                num_label_propagation_rounds=num_label_propagation_rounds
+            )
+            | "Check cluster sizes"
+            >> beam.Map(_check_cluster_sizes, cluster_size=cluster_size)
+            | "Count external ids" >> beam.combiners.Count.Globally()
+            | "Log count"
+            >> beam.Map(
+                lambda count: logging.info("Clustered [%s] external ids.", count)
+            )
+        )
+    logging.info("Pipeline finished in %.1fs.", time.perf_counter() - start)
+
+
+def parse_arguments() -> Tuple[argparse.Namespace, List[str]]:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_edges", type=int, required=True)
+    parser.add_argument("--cluster_size", type=int, default=10)
+    parser.add_argument(
+        "--num_label_propagation_rounds",
+        type=int,
+        default=DEFAULT_NUM_LABEL_PROPAGATION_ROUNDS,
+    )
+    return parser.parse_known_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    known_args, beam_args = parse_arguments()
+    run_benchmark(
+        num_edges=known_args.num_edges,
+        cluster_size=known_args.cluster_size,
+        num_label_propagation_rounds=known_args.num_label_propagation_rounds,
+        pipeline_args=beam_args,
+    )
@@ -0,0 +1,140 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Microbenchmark for entity_deserialize() over every class in state/entities.py.
+
+For each entity class, builds a set of string kwargs for every flat field (the way
+ingest mappings pass raw values to EntityFactory.deserialize()) and deserializes an
+entity from them repeatedly. Throughput is reported both with the per-class field
+type information cached (the normal code path) and with that cache cleared before
+every call, which approximates re-inspecting every field's type for every entity.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_entity_deserialize \
+        [--iterations ITERATIONS]
+"""
+import argparse
+import logging
+import time
+from typing import Dict, List, Tuple, Type
+
+import attr
+
+from recidiviz.common.attr_utils import (
+    get_enum_cls,
+    is_bool,
+    is_date,
+    is_datetime,
+    is_enum,
+    is_forward_ref,
+    is_int,
+    is_list,
+    is_str,
+)
+from recidiviz.persistence.entity.base_entity import Entity
+from recidiviz.persistence.entity.entity_deserialize import (
+    _DESERIALIZABLE_FIELD_INFOS_BY_CLASS,
+    DeserializableEntityFieldValue,
+    entity_deserialize,
+)
+from recidiviz.persistence.entity.entity_utils import get_all_entity_classes_in_module
+from recidiviz.persistence.entity.state import entities as state_entities
+
+
+def _build_kwargs(
+    entity_cls: Type[Entity],
+) -> Dict[str, DeserializableEntityFieldValue]:
+    """Builds deserialize() kwargs with a valid raw value for every flat field."""
+    kwargs: Dict[str, DeserializableEntityFieldValue] = {}
+    for field_name, field in attr.fields_dict(entity_cls).items():
+        if is_forward_ref(field) or is_list(field):
+            continue
+        if is_enum(field):
+            enum_cls = get_enum_cls(field)
+            if enum_cls is None:
+                raise ValueError(f"Expected enum class for field [{field_name}]")
+            kwargs[field_name] = list(enum_cls)[0]
+        elif is_str(field):
+            kwargs[field_name] = "SOME VALUE"
+        elif is_datetime(field):
+            kwargs[field_name] = "2020-01-02 03:04:05"
+        elif is_date(field):
+            kwargs[field_name] = "2020-01-02"
+        elif is_int(field):
+            kwargs[field_name] = "123"
+        elif is_bool(field):
+            kwargs[field_name] = "True"
+    return kwargs
+
+
+def _deserialize_all(
+    inputs: List[Tuple[Type[Entity], Dict[str, DeserializableEntityFieldValue]]],
+    iterations: int,
+    clear_cache: bool,
+) -> float:
+    """Deserializes every input |iterations| times, returning the elapsed seconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for entity_cls, kwargs in inputs:
+            if clear_cache:
+                _DESERIALIZABLE_FIELD_INFOS_BY_CLASS.clear()
+            entity_deserialize(
+                entity_cls, converter_overrides={}, defaults={}, **kwargs
+            )
+    return time.perf_counter() - start
+
+
+def main(iterations: int) -> None:
+    inputs = []
+    for entity_cls in sorted(
+        get_all_entity_classes_in_module(state_entities), key=lambda c: c.__name__
+    ):
+        kwargs = _build_kwargs(entity_cls)
+        try:
+            entity_deserialize(
+                entity_cls, converter_overrides={}, defaults={}, **kwargs
+            )
+        except Exception as e:
+            logging.warning("Skipping [%s]: %s", entity_cls.__name__, e)
+            continue
+        inputs.append((entity_cls, kwargs))
+
+    num_entities = iterations * len(inputs)
+    logging.info(
+        "Deserializing [%s] entities across [%s] classes.", num_entities, len(inputs)
+    )
+    for description, clear_cache in (
+        ("Field types inspected per entity", True),
+        ("Field types cached per class", False),
+    ):
+        elapsed = _deserialize_all(inputs, iterations, clear_cache=clear_cache)
+        logging.info(
+            "%s: %.2fs (%.0f entities/sec)",
+            description,
+            elapsed,
+            num_entities / elapsed,
+        )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(parse_arguments().iterations)
@@ -0,0 +1,202 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmark for parsing ingest view rows with every region's ingest view manifests.
+
+Rows are generated from each launchable manifest with the
+IngestViewManifestRowGenerator, keeping only rows that parse successfully. Throughput
+is reported both for rows parsed by walking the manifest AST (build_from_row()) and
+for rows parsed with the row parsers compiled from each manifest (which
+parse_contents() uses). The share of the compiled parsing time that is spent
+constructing entities in EntityFactory.deserialize() is reported as well.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_ingest_view_manifest_parsing \
+        [--rows-per-view ROWS_PER_VIEW] [--repeats REPEATS]
+"""
+import argparse
+import datetime
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+from recidiviz.ingest.direct import direct_ingest_regions
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_contents_context import (
+    IngestViewContentsContextImpl,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest import ManifestRow
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_collector import (
+    IngestViewManifestCollector,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_compiler import (
+    IngestViewManifest,
+)
+from recidiviz.ingest.direct.ingest_mappings.ingest_view_manifest_compiler_delegate import (
+    IngestViewManifestCompilerDelegateImpl,
+)
+from recidiviz.ingest.direct.regions.direct_ingest_region_utils import (
+    get_existing_direct_ingest_states,
+)
+from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
+from recidiviz.persistence.database.schema_type import SchemaType
+from recidiviz.persistence.entity import entity_deserialize
+from recidiviz.tests.ingest.direct.ingest_mappings.ingest_view_manifest_row_generator import (
+    IngestViewManifestRowGenerator,
+)
+from recidiviz.utils.environment import GCP_PROJECT_STAGING
+from recidiviz.utils.metadata import local_project_id_override
+
+_CONTEXT = IngestViewContentsContextImpl(
+    ingest_instance=DirectIngestInstance.SECONDARY,
+    is_dataflow_pipeline=True,
+    results_update_datetime=datetime.datetime(2022, 1, 1),
+)
+
+
+def _collect_parseable_rows(
+    rows_per_view: int,
+) -> List[Tuple[IngestViewManifest, List[Dict[str, str]]]]:
+    """Returns every launchable manifest along with generated rows that parse
+    successfully with that manifest."""
+    manifests_and_rows = []
+    for state_code in get_existing_direct_ingest_states():
+        region = direct_ingest_regions.get_direct_ingest_region(
+            region_code=state_code.value.lower()
+        )
+        ingest_view_to_manifest = IngestViewManifestCollector(
+            region=region,
+            delegate=IngestViewManifestCompilerDelegateImpl(
+                region=region, schema_type=SchemaType.STATE
+            ),
+        ).ingest_view_to_manifest
+        for manifest in ingest_view_to_manifest.values():
+            if not manifest.should_launch(_CONTEXT):
+                continue
+            rows = []
+            # Generate extra rows, since some will fail to parse
+            for row in IngestViewManifestRowGenerator(manifest).generate_rows(
+                rows_per_view * 3
+            ):
+                try:
+                    manifest.output.build_from_row(dict(row), _CONTEXT)
+                except Exception:
+                    continue
+                rows.append(row)
+            manifests_and_rows.append((manifest, rows[:rows_per_view]))
+    return manifests_and_rows
+
+
+def _parse_with_ast(
+    manifests_and_rows: List[Tuple[IngestViewManifest, List[Dict[str, str]]]]
+) -> None:
+    for manifest, rows in manifests_and_rows:
+        for row in rows:
+            manifest.output.build_from_row(ManifestRow(row), _CONTEXT)
+
+
+def _parse_with_compiled_row_parsers(
+    manifests_and_rows: List[Tuple[IngestViewManifest, List[Dict[str, str]]]]
+) -> None:
+    for manifest, rows in manifests_and_rows:
+        for row in rows:
+            manifest.output_row_parser(ManifestRow(row), _CONTEXT)
+
+
+def _min_elapsed(fn: Callable[[], None], repeats: int) -> float:
+    elapsed = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def _entity_construction_seconds(
+    manifests_and_rows: List[Tuple[IngestViewManifest, List[Dict[str, str]]]]
+) -> float:
+    """Returns the seconds spent in entity_deserialize() when parsing every row with
+    the compiled row parsers."""
+    total = 0.0
+    original_entity_deserialize = entity_deserialize.entity_deserialize
+
+    def _timed_entity_deserialize(*args: Any, **kwargs: Any) -> Any:
+        nonlocal total
+        start = time.perf_counter()
+        try:
+            return original_entity_deserialize(*args, **kwargs)
+        finally:
+            total += time.perf_counter() - start
+
+    with patch(
+        "recidiviz.persistence.entity.state.deserialize_entity_factories.entity_deserialize",
+        new=_timed_entity_deserialize,
+    ):
+        _parse_with_compiled_row_parsers(manifests_and_rows)
+    return total
+
+
+def main(rows_per_view: int, repeats: int) -> None:
+    """Parses generated rows for every launchable ingest view and logs the parsing
+    throughput with and without the compiled row parsers."""
+    # Custom parsers log warnings for many generated values, which would dominate the
+    # parsing time.
+    logging.disable(logging.WARNING)
+    with local_project_id_override(GCP_PROJECT_STAGING):
+        manifests_and_rows = _collect_parseable_rows(rows_per_view)
+    num_rows = sum(len(rows) for _, rows in manifests_and_rows)
+
+    elapsed_by_description = {
+        "Manifest AST walked per row": _min_elapsed(
+            lambda: _parse_with_ast(manifests_and_rows), repeats
+        ),
+        "Compiled row parsers": _min_elapsed(
+            lambda: _parse_with_compiled_row_parsers(manifests_and_rows), repeats
+        ),
+    }
+    compiled_elapsed = _min_elapsed(
+        lambda: _parse_with_compiled_row_parsers(manifests_and_rows), 1
+    )
+    entity_construction_elapsed = _entity_construction_seconds(manifests_and_rows)
+    logging.disable(logging.NOTSET)
+
+    logging.info(
+        "Parsed [%s] rows across [%s] ingest views.",
+        num_rows,
+        len(manifests_and_rows),
+    )
+    for description, elapsed in elapsed_by_description.items():
+        logging.info(
+            "%s: %.2fs (%.0f rows/sec)", description, elapsed, num_rows / elapsed
+        )
+    logging.info(
+        "Entity construction: %.2fs (~%.0f%% of compiled parsing time)",
+        entity_construction_elapsed,
+        100 * entity_construction_elapsed / compiled_elapsed,
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows-per-view", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    known_args = parse_arguments()
+    main(known_args.rows_per_view, known_args.repeats)
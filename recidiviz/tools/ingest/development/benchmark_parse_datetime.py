@@ -0,0 +1,118 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks parse_datetime() throughput for each of the date string formats we
+commonly see in ingested data.
+
+For each format, parses --num-values values drawn from a pool of --num-distinct-values
+distinct date strings (ingested date columns contain many repeated values) with the
+same |from_dt| that entity deserialization uses. Reports throughput for:
+  - dateparser: calling dateparser.parse() directly, the fallback for any value that
+    does not match an exact format.
+  - uncached: parse_datetime() logic without the result cache.
+  - cached: parse_datetime(), starting from an empty cache.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_parse_datetime \
+        [--num-values NUM_VALUES] [--num-distinct-values NUM_DISTINCT_VALUES]
+"""
+import argparse
+import datetime
+import logging
+import random
+import time
+from typing import Callable, List
+
+import dateparser
+
+from recidiviz.common import str_field_utils
+
+_FROM_DT = datetime.datetime(2020, 1, 1)
+
+_FORMATS = {
+    "ISO (YYYY-MM-DD HH:MM:SS)": lambda d: d.strftime("%Y-%m-%d %H:%M:%S"),
+    "YYYYMMDD": lambda d: d.strftime("%Y%m%d"),
+    "MMDDYYYY": lambda d: d.strftime("%m%d%Y"),
+    "MM/DD/YYYY": lambda d: d.strftime("%m/%d/%Y"),
+    "MM/DD/YYYY HH:MM:SS AM": lambda d: d.strftime("%m/%d/%Y %I:%M:%S %p"),
+    "YYYY/MM/DD": lambda d: d.strftime("%Y/%m/%d"),
+    "Free-form (Mon DD, YYYY)": lambda d: d.strftime("%b %d, %Y"),
+    "Relative (NY NM ND)": lambda d: f"{d.year % 10}Y {d.month}M {d.day}D",
+}
+
+
+def _time_parse(
+    parse_fn: Callable[[str], object], values: List[str], description: str
+) -> None:
+    start = time.perf_counter()
+    for value in values:
+        parse_fn(value)
+    elapsed = time.perf_counter() - start
+    logging.info(
+        "  %-12s %8.3fs (%.0f values/sec)", description, elapsed, len(values) / elapsed
+    )
+
+
+def main(num_values: int, num_distinct_values: int) -> None:
+    """Times parsing |num_values| datetime strings, drawn from |num_distinct_values|
+    distinct dates, in each format with and without caching."""
+    rng = random.Random(0)
+    dates = [
+        datetime.datetime(1950, 1, 1)
+        + datetime.timedelta(days=rng.randrange(365 * 70), seconds=rng.randrange(86400))
+        for _ in range(num_distinct_values)
+    ]
+
+    for format_name, format_fn in _FORMATS.items():
+        distinct_values = [format_fn(d) for d in dates]
+        values = [rng.choice(distinct_values) for _ in range(num_values)]
+        logging.info("%s (e.g. %s):", format_name, values[0])
+
+        _time_parse(
+            lambda v: dateparser.parse(
+                v,
+                languages=["en"],
+                settings={"PREFER_DAY_OF_MONTH": "first", "RELATIVE_BASE": _FROM_DT},
+            ),
+            values,
+            "dateparser",
+        )
+        _time_parse(
+            # pylint: disable=protected-access
+            lambda v: str_field_utils._parse_datetime(v, from_dt=_FROM_DT),
+            values,
+            "uncached",
+        )
+        # pylint: disable=protected-access
+        str_field_utils._parse_datetime_with_from_dt.cache_clear()
+        _time_parse(
+            lambda v: str_field_utils.parse_datetime(v, from_dt=_FROM_DT),
+            values,
+            "cached",
+        )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-values", type=int, default=10000)
+    parser.add_argument("--num-distinct-values", type=int, default=1000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.num_values, args.num_distinct_values)
@@ -0,0 +1,176 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the read / transform / upload stage of a raw data import (everything up
+to the BigQuery load job) on a synthetic raw file stored in a fake GCS filesystem.
+
+Reports wall time and the total size of the staged temp files for each combination of
+staging format and number of upload workers. Since the fake filesystem writes to local
+disk, --upload_latency_seconds can be used to simulate the time each upload to GCS
+takes.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_raw_data_chunk_upload \
+        [--num_rows NUM_ROWS] [--num_columns NUM_COLUMNS] [--chunk_size CHUNK_SIZE] \
+        [--upload_latency_seconds UPLOAD_LATENCY_SECONDS] \
+        [--max_upload_workers MAX_UPLOAD_WORKERS]
+"""
+import argparse
+import logging
+import os
+import random
+import time
+from typing import Dict, Optional
+from unittest.mock import MagicMock
+
+from recidiviz.cloud_storage.gcsfs_csv_reader import GcsfsCsvReader
+from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath, GcsfsFilePath
+from recidiviz.common.io.file_contents_handle import FileContentsHandle
+from recidiviz.fakes.fake_gcs_file_system import FakeGCSFileSystem
+from recidiviz.ingest.direct.gcs.direct_ingest_gcs_file_system import (
+    DirectIngestGCSFileSystem,
+)
+from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    DirectIngestRawDataSplittingGcsfsCsvReaderDelegate,
+    RawDataStagingFormat,
+)
+
+_CELL_VALUES = ["", " ", "A", " 12345 ", "2020-01-01 00:00:00", "SOME TEXT  "]
+
+
+class _SlowUploadFakeGCSFileSystem(FakeGCSFileSystem):
+    """FakeGCSFileSystem that sleeps on every upload to simulate network latency."""
+
+    def __init__(self, upload_latency_seconds: float) -> None:
+        super().__init__()
+        self.upload_latency_seconds = upload_latency_seconds
+
+    def upload_from_string(
+        self, path: GcsfsFilePath, contents: str, content_type: str
+    ) -> None:
+        time.sleep(self.upload_latency_seconds)
+        super().upload_from_string(path, contents, content_type)
+
+    def upload_from_contents_handle_stream(
+        self,
+        path: GcsfsFilePath,
+        contents_handle: FileContentsHandle,
+        content_type: str,
+        timeout: int = 60,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        time.sleep(self.upload_latency_seconds)
+        super().upload_from_contents_handle_stream(
+            path, contents_handle, content_type, timeout, metadata
+        )
+
+
+def _benchmark(
+    fake_fs: _SlowUploadFakeGCSFileSystem,
+    path: GcsfsFilePath,
+    chunk_size: int,
+    staging_format: RawDataStagingFormat,
+    max_upload_workers: Optional[int],
+) -> None:
+    """Times splitting the file at |path| into chunks that are staged in the given
+    format, uploading them with |max_upload_workers| threads (or inline if None)."""
+    delegate = DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
+        path=path,
+        fs=DirectIngestGCSFileSystem(fake_fs),
+        file_metadata=MagicMock(file_id=1),
+        temp_output_directory_path=GcsfsDirectoryPath.from_absolute_path(
+            "gs://bucket/temp"
+        ),
+        augment_with_metadata_columns=True,
+        staging_format=staging_format,
+        max_upload_workers=max_upload_workers,
+    )
+    start = time.perf_counter()
+    GcsfsCsvReader(fake_fs).streaming_read(
+        path,
+        delegate=delegate,
+        chunk_size=chunk_size,
+        encodings_to_try=["UTF-8"],
+        keep_default_na=False,
+    )
+    elapsed = time.perf_counter() - start
+
+    staged_bytes = sum(
+        os.path.getsize(fake_fs.real_absolute_path_for_path(p))
+        for p in delegate.output_paths
+    )
+    logging.info(
+        "%s, max_upload_workers=%s: %.2fs, [%s] chunks, %.1f MB staged",
+        staging_format.name,
+        max_upload_workers,
+        elapsed,
+        len(delegate.output_paths),
+        staged_bytes / 1e6,
+    )
+    for output_path in delegate.output_paths:
+        fake_fs.delete(output_path)
+
+
+def main(
+    num_rows: int,
+    num_columns: int,
+    chunk_size: int,
+    upload_latency_seconds: float,
+    max_upload_workers: int,
+) -> None:
+    rng = random.Random(0)
+    fake_fs = _SlowUploadFakeGCSFileSystem(upload_latency_seconds)
+    path = GcsfsFilePath.from_absolute_path(
+        "gs://bucket/unprocessed_2023-01-01T00:00:00:000000_raw_tag.csv"
+    )
+    header = ",".join(f"col_{i}" for i in range(num_columns))
+    rows = (
+        ",".join(rng.choice(_CELL_VALUES) for _ in range(num_columns))
+        for _ in range(num_rows)
+    )
+    fake_fs.upload_from_string(path, "\n".join([header, *rows]) + "\n", "text/csv")
+    logging.info(
+        "Importing [%s] rows with [%s] columns in chunks of [%s] rows.",
+        num_rows,
+        num_columns,
+        chunk_size,
+    )
+
+    for staging_format in RawDataStagingFormat:
+        for workers in [None, max_upload_workers]:
+            _benchmark(fake_fs, path, chunk_size, staging_format, workers)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rows", type=int, default=500000)
+    parser.add_argument("--num_columns", type=int, default=30)
+    parser.add_argument("--chunk_size", type=int, default=25000)
+    parser.add_argument("--upload_latency_seconds", type=float, default=0.5)
+    parser.add_argument("--max_upload_workers", type=int, default=4)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(
+        args.num_rows,
+        args.num_columns,
+        args.chunk_size,
+        args.upload_latency_seconds,
+        args.max_upload_workers,
+    )
@@ -0,0 +1,104 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks the transform applied to each chunk of a raw data file before it is
+uploaded for import (see DirectIngestRawDataSplittingGcsfsCsvReaderDelegate) on a wide
+synthetic raw file chunk.
+
+Reports rows/sec for the cell-by-cell DataFrame.applymap() implementation that was
+previously used and for the current implementation, and checks that both produce the
+same CSV output.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_raw_data_transform \
+        [--num_rows NUM_ROWS] [--num_columns NUM_COLUMNS]
+"""
+import argparse
+import logging
+import random
+import time
+from typing import Callable
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from recidiviz.cloud_storage.gcsfs_path import GcsfsDirectoryPath, GcsfsFilePath
+from recidiviz.ingest.direct.raw_data.direct_ingest_raw_file_import_manager import (
+    DirectIngestRawDataSplittingGcsfsCsvReaderDelegate,
+)
+
+_CELL_VALUES = ["", " ", "  ", "A", " 12345 ", "2020-01-01 00:00:00", "SOME TEXT  "]
+
+
+def _applymap_transform_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.applymap(lambda x: x.strip())
+    return df[~pd.isnull(df.applymap(lambda x: None if x == "" else x)).all(axis=1)]
+
+
+def _time_transform(
+    transform_fn: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    description: str,
+) -> pd.DataFrame:
+    start = time.perf_counter()
+    transformed_df = transform_fn(df)
+    elapsed = time.perf_counter() - start
+    logging.info(
+        "%s: %.2fs (%.0f rows/sec)", description, elapsed, df.shape[0] / elapsed
+    )
+    return transformed_df
+
+
+def main(num_rows: int, num_columns: int) -> None:
+    rng = random.Random(0)
+    df = pd.DataFrame(
+        [
+            [rng.choice(_CELL_VALUES) for _ in range(num_columns)]
+            for _ in range(num_rows)
+        ],
+        columns=[f"col_{i}" for i in range(num_columns)],
+    )
+    logging.info("Transforming [%s] rows with [%s] columns.", num_rows, num_columns)
+
+    delegate = DirectIngestRawDataSplittingGcsfsCsvReaderDelegate(
+        path=GcsfsFilePath.from_absolute_path(
+            "gs://bucket/unprocessed_2023-01-01T00:00:00:000000_raw_tag.csv"
+        ),
+        fs=MagicMock(),
+        file_metadata=MagicMock(),
+        temp_output_directory_path=GcsfsDirectoryPath.from_absolute_path(
+            "gs://bucket/temp"
+        ),
+        augment_with_metadata_columns=False,
+    )
+
+    applymap_df = _time_transform(_applymap_transform_dataframe, df, "applymap")
+    transformed_df = _time_transform(delegate.transform_dataframe, df, "Current")
+    if applymap_df.to_csv(index=False) != transformed_df.to_csv(index=False):
+        raise ValueError("Transformed output does not match applymap output.")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rows", type=int, default=200000)
+    parser.add_argument("--num_columns", type=int, default=100)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.num_rows, args.num_columns)
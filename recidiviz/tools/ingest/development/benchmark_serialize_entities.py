@@ -0,0 +1,92 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Microbenchmark for serialize_entity_into_json() over StatePerson trees that contain
+at least one of every state entity type.
+
+Throughput is reported both with the per-class serialization plans cached (the normal
+code path) and with that cache cleared before every call, which approximates deriving
+each entity's fields and back edge id columns from its class for every entity.
+
+Usage:
+    python -m recidiviz.tools.ingest.development.benchmark_serialize_entities \
+        [--num-people NUM_PEOPLE]
+"""
+import argparse
+import logging
+import time
+from typing import List
+
+from recidiviz.persistence.entity.base_entity import CoreEntity
+from recidiviz.persistence.entity.entity_utils import (
+    CoreEntityFieldIndex,
+    get_all_entities_from_tree,
+)
+from recidiviz.persistence.entity.serialization import (
+    _get_serialization_plan,
+    serialize_entity_into_json,
+)
+from recidiviz.tests.persistence.entity.state.entities_test_utils import (
+    generate_full_graph_state_person,
+)
+
+
+def _serialize_all(
+    entities: List[CoreEntity], field_index: CoreEntityFieldIndex, clear_cache: bool
+) -> float:
+    """Serializes every entity, returning the elapsed seconds."""
+    start = time.perf_counter()
+    for entity in entities:
+        if clear_cache:
+            _get_serialization_plan.cache_clear()
+        serialize_entity_into_json(entity, field_index)
+    return time.perf_counter() - start
+
+
+def main(num_people: int) -> None:
+    field_index = CoreEntityFieldIndex()
+    entities: List[CoreEntity] = []
+    for _ in range(num_people):
+        person = generate_full_graph_state_person(
+            set_back_edges=True, include_person_back_edges=True, set_ids=True
+        )
+        entities.extend(get_all_entities_from_tree(person, field_index))
+
+    logging.info(
+        "Serializing [%s] entities from [%s] people.", len(entities), num_people
+    )
+    for description, clear_cache in (
+        ("Serialization plan derived per entity", True),
+        ("Serialization plan cached per class", False),
+    ):
+        elapsed = _serialize_all(entities, field_index, clear_cache=clear_cache)
+        logging.info(
+            "%s: %.2fs (%.0f entities/sec)",
+            description,
+            elapsed,
+            len(entities) / elapsed,
+        )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-people", type=int, default=500)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(parse_arguments().num_people)
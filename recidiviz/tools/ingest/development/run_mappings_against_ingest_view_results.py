@@ -32,6 +32,7 @@ import argparse
 import logging
 import os
 import tempfile
+import time
 import traceback
 from datetime import datetime
 from typing import Dict, Union
@@ -150,11 +151,14 @@ def parse_results(
         results_path, "w", encoding="utf-8"
     ) as results_file:
         num_errors = 0
+        num_rows = 0
 
         def result_processor(
             i: int, row: Dict[str, str], result: Union[Entity, Exception]
         ) -> None:
-            nonlocal num_errors
+            nonlocal num_errors, num_rows
+
+            num_rows += 1
 
             if isinstance(result, BaseException):
                 logging.info("Error: %s", result)
@@ -171,9 +175,9 @@ def parse_results(
                 print_entity_tree(result, file=results_file)
             progress.update()
 
-        manifest_compiler.compile_manifest(
-            ingest_view_name=ingest_view_name
-        ).parse_contents(
+        manifest = manifest_compiler.compile_manifest(ingest_view_name=ingest_view_name)
+        start = time.perf_counter()
+        manifest.parse_contents(
             contents_iterator=contents_handle.get_contents_iterator(),
             result_callable=result_processor,
             context=IngestViewContentsContextImpl(
@@ -183,7 +187,16 @@ def parse_results(
             ),
         )
 
+        elapsed_seconds = time.perf_counter() - start
+
         progress.close()
+        logging.info(
+            "Parsed %d rows in %.1fs (%.0f rows/sec, including time spent reading "
+            "query results).",
+            num_rows,
+            elapsed_seconds,
+            num_rows / elapsed_seconds if elapsed_seconds else 0,
+        )
         if num_errors:
             logging.info(
                 "Parsing completed with %d failures, see full failures at %s",
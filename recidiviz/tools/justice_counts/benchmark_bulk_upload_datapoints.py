@@ -0,0 +1,270 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks saving bulk upload datapoints one at a time via
+DatapointInterface.add_report_datapoint() versus with set-based statements via
+DatapointInterface.bulk_add_report_datapoints().
+
+For each approach, uploads a multi-agency workbook for a superagency with
+NUM_CHILD_AGENCIES child agencies into a fresh local Postgres database (creating all
+reports and datapoints), then uploads it again with changed values (updating
+datapoints and writing datapoint histories). Reports the wall time and number of
+database statements executed for each upload, then checks that both approaches
+saved the same datapoints and datapoint histories.
+
+Requires Postgres to be installed locally (see recidiviz/tools/postgres).
+
+Usage:
+    python -m recidiviz.tools.justice_counts.benchmark_bulk_upload_datapoints \
+        [--system SYSTEM] [--num_child_agencies NUM_CHILD_AGENCIES]
+"""
+import argparse
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from recidiviz.justice_counts.agency import AgencyInterface
+from recidiviz.justice_counts.bulk_upload.workbook_uploader import WorkbookUploader
+from recidiviz.justice_counts.metricfiles.metricfile_registry import (
+    SYSTEM_TO_FILENAME_TO_METRICFILE,
+)
+from recidiviz.justice_counts.metrics.metric_registry import METRICS_BY_SYSTEM
+from recidiviz.justice_counts.report import ReportInterface
+from recidiviz.justice_counts.types import BulkUploadFileType
+from recidiviz.justice_counts.utils.constants import UploadMethod
+from recidiviz.persistence.database.schema.justice_counts import schema
+from recidiviz.persistence.database.schema_type import SchemaType
+from recidiviz.persistence.database.sqlalchemy_database_key import SQLAlchemyDatabaseKey
+from recidiviz.persistence.database.sqlalchemy_engine_manager import (
+    SQLAlchemyEngineManager,
+)
+from recidiviz.tests.justice_counts.spreadsheet_helpers import create_excel_file
+from recidiviz.tools.postgres import local_postgres_helpers
+
+_ORIGINAL_ADD_OR_UPDATE_METRIC = ReportInterface.add_or_update_metric
+
+
+def _add_or_update_metric_without_bulk_upsert(**kwargs: Any) -> Any:
+    return _ORIGINAL_ADD_OR_UPDATE_METRIC(**{**kwargs, "use_bulk_upsert": False})
+
+
+def _create_agencies(
+    engine: Engine, system: schema.System, num_child_agencies: int
+) -> Tuple[int, int]:
+    """Creates a user and a superagency with |num_child_agencies| child agencies.
+    Returns the ids of the user and the superagency."""
+    with Session(bind=engine) as session:
+        user_account = schema.UserAccount(
+            name="Benchmark User", auth0_user_id="benchmark_user"
+        )
+        super_agency = schema.Agency(
+            name="Benchmark Superagency",
+            state_code="US_CA",
+            systems=[system.value, schema.System.SUPERAGENCY.value],
+            is_superagency=True,
+        )
+        session.add_all([user_account, super_agency])
+        session.flush()
+        session.add_all(
+            [
+                schema.Agency(
+                    name=f"Benchmark Child Agency {i}",
+                    state_code="US_CA",
+                    systems=[system.value],
+                    super_agency_id=super_agency.id,
+                )
+                for i in range(num_child_agencies)
+            ]
+        )
+        session.commit()
+        return user_account.id, super_agency.id
+
+
+def _upload_workbook(
+    engine: Engine,
+    system: schema.System,
+    user_account_id: int,
+    super_agency_id: int,
+    file_path: str,
+) -> Tuple[float, int]:
+    """Uploads the workbook at |file_path| for the superagency. Returns the time
+    taken and the number of statements executed."""
+    statement_count = 0
+
+    def count_statement(*_args: Any) -> None:
+        nonlocal statement_count
+        statement_count += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    start = time.perf_counter()
+    with Session(bind=engine) as session:
+        super_agency = AgencyInterface.get_agency_by_id(
+            session=session, agency_id=super_agency_id
+        )
+        child_agencies = AgencyInterface.get_child_agencies_for_agency(
+            session=session, agency=super_agency
+        )
+        WorkbookUploader(
+            system=system,
+            agency=super_agency,
+            user_account=session.query(schema.UserAccount).get(user_account_id),
+            metric_key_to_agency_datapoints={},
+            child_agency_name_to_agency={
+                a.name.strip().lower(): a for a in child_agencies
+            },
+        ).upload_workbook(
+            session=session,
+            xls=pd.ExcelFile(file_path),
+            metric_definitions=METRICS_BY_SYSTEM[system.value],
+            filename=file_path,
+            upload_filetype=BulkUploadFileType.XLSX,
+            upload_method=UploadMethod.BULK_UPLOAD,
+        )
+        session.commit()
+    seconds = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count_statement)
+    return seconds, statement_count
+
+
+def _get_saved_datapoints(engine: Engine) -> Tuple[List[Tuple], List[Tuple]]:
+    """Returns summaries of all saved report datapoints and datapoint histories."""
+    with Session(bind=engine) as session:
+        datapoints = sorted(
+            (
+                str(datapoint.source_id),
+                str(datapoint.start_date),
+                str(datapoint.end_date),
+                datapoint.metric_definition_key,
+                str(datapoint.context_key),
+                str(datapoint.dimension_identifier_to_member),
+                str(datapoint.value),
+                str(datapoint.upload_method),
+            )
+            for datapoint in session.query(schema.Datapoint)
+        )
+        histories = sorted(
+            (
+                str(datapoint.source_id),
+                str(datapoint.start_date),
+                datapoint.metric_definition_key,
+                str(datapoint.dimension_identifier_to_member),
+                str(history.old_value),
+                str(history.new_value),
+            )
+            for history, datapoint in session.query(
+                schema.DatapointHistory, schema.Datapoint
+            ).join(schema.Datapoint)
+        )
+    return datapoints, histories
+
+
+def main(system: schema.System, num_child_agencies: int) -> None:
+    """Uploads the same workbooks with each approach to saving datapoints in a local
+    Postgres database, times them and checks that they save the same datapoints."""
+    database_key = SQLAlchemyDatabaseKey.for_schema(SchemaType.JUSTICE_COUNTS)
+    temp_db_dir = local_postgres_helpers.start_on_disk_postgresql_database()
+    try:
+        engine = SQLAlchemyEngineManager.init_engine_for_postgres_instance(
+            database_key=database_key,
+            db_url=local_postgres_helpers.on_disk_postgres_db_url(),
+        )
+        child_agency_names = [
+            f"Benchmark Child Agency {i}" for i in range(num_child_agencies)
+        ]
+        child_agencies = [schema.Agency(name=name) for name in child_agency_names]
+        initial_file_path = create_excel_file(
+            system=system,
+            child_agencies=child_agencies,
+            file_name="benchmark_initial.xlsx",
+        )
+        updated_file_path = create_excel_file(
+            system=system,
+            child_agencies=child_agencies,
+            file_name="benchmark_updated.xlsx",
+            sheet_names_to_vary_values=set(
+                SYSTEM_TO_FILENAME_TO_METRICFILE[system.value]
+            ),
+        )
+
+        saved_datapoints: Dict[str, Tuple[List[Tuple], List[Tuple]]] = {}
+        for approach, use_bulk_upsert in [
+            ("add_report_datapoint", False),
+            ("bulk_add_report_datapoints", True),
+        ]:
+            database_key.declarative_meta.metadata.drop_all(engine)
+            database_key.declarative_meta.metadata.create_all(engine)
+            user_account_id, super_agency_id = _create_agencies(
+                engine, system, num_child_agencies
+            )
+            with patch.object(
+                ReportInterface,
+                "add_or_update_metric",
+                _ORIGINAL_ADD_OR_UPDATE_METRIC
+                if use_bulk_upsert
+                else _add_or_update_metric_without_bulk_upsert,
+            ):
+                for upload_name, file_path in [
+                    ("initial", initial_file_path),
+                    ("updated", updated_file_path),
+                ]:
+                    seconds, statement_count = _upload_workbook(
+                        engine, system, user_account_id, super_agency_id, file_path
+                    )
+                    logging.info(
+                        "[%s] %s upload: %.2fs, [%s] statements",
+                        approach,
+                        upload_name,
+                        seconds,
+                        statement_count,
+                    )
+            saved_datapoints[approach] = _get_saved_datapoints(engine)
+
+        datapoints, histories = saved_datapoints["bulk_add_report_datapoints"]
+        if saved_datapoints["add_report_datapoint"] != (datapoints, histories):
+            raise ValueError("Approaches saved different datapoints or histories.")
+        logging.info(
+            "Both approaches saved the same [%s] datapoints and [%s] datapoint "
+            "histories.",
+            len(datapoints),
+            len(histories),
+        )
+    finally:
+        SQLAlchemyEngineManager.teardown_engines()
+        local_postgres_helpers.stop_and_clear_on_disk_postgresql_database(temp_db_dir)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--system",
+        type=schema.System,
+        choices=list(schema.System),
+        default=schema.System.PRISONS,
+    )
+    parser.add_argument("--num_child_agencies", type=int, default=10)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.system, args.num_child_agencies)
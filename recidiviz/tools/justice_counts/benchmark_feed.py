@@ -0,0 +1,324 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Load tests serving Justice Counts agency feeds via FeedInterface.get_csv_of_feed().
+
+Seeds a fresh local Postgres database with NUM_AGENCIES agencies, each with NUM_YEARS
+years of published monthly reports containing a datapoint for every metric and
+breakdown of SYSTEM. Then requests each file of one agency's feed in turn,
+NUM_REQUESTS times, and reports the p50/p99 latency of:
+  - building the entire feed, filtering it to the requested file and converting it
+    to csv with pandas, which is how get_csv_of_feed() used to serve every request.
+  - get_csv_of_feed() with an empty cache, so that every request is built by
+    fetching only the datapoints of the requested file.
+  - get_csv_of_feed() with a warm cache, updating one of the agency's reports every
+    UPDATE_EVERY requests, so that some requests are rebuilt.
+
+Then checks that both approaches return the same csv for every file of the feed.
+
+Requires Postgres to be installed locally (see recidiviz/tools/postgres).
+
+Usage:
+    python -m recidiviz.tools.justice_counts.benchmark_feed \
+        [--system SYSTEM] [--num_agencies NUM_AGENCIES] [--num_years NUM_YEARS] \
+        [--num_requests NUM_REQUESTS] [--update_every UPDATE_EVERY]
+"""
+import argparse
+import calendar
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from flask import Flask
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from recidiviz.justice_counts.feed import FeedInterface
+from recidiviz.justice_counts.metricfiles.metricfile_registry import (
+    SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE,
+)
+from recidiviz.justice_counts.report import ReportInterface
+from recidiviz.persistence.database.schema.justice_counts import schema
+from recidiviz.persistence.database.schema_type import SchemaType
+from recidiviz.persistence.database.sqlalchemy_database_key import SQLAlchemyDatabaseKey
+from recidiviz.persistence.database.sqlalchemy_engine_manager import (
+    SQLAlchemyEngineManager,
+)
+from recidiviz.tools.postgres import local_postgres_helpers
+
+
+def _seed_agencies(
+    engine: Engine, system: schema.System, num_agencies: int, num_years: int
+) -> List[int]:
+    """Creates |num_agencies| agencies with |num_years| years of published monthly
+    reports, each with a datapoint for every metric and breakdown of |system|.
+    Returns the ids of the agencies."""
+    metric_key_and_dimension_members: List[Tuple[str, Optional[Dict[str, str]]]] = []
+    for (
+        metricfile_system,
+        metric_key,
+        dimension_id,
+    ), metricfile in SYSTEM_METRIC_KEY_AND_DIM_ID_TO_METRICFILE.items():
+        if metricfile_system != system:
+            continue
+        if dimension_id is None or metricfile.disaggregation is None:
+            metric_key_and_dimension_members.append((metric_key, None))
+            continue
+        metric_key_and_dimension_members += [
+            (metric_key, {dimension_id: member.name})
+            for member in metricfile.disaggregation  # type: ignore[attr-defined]
+        ]
+
+    agency_ids = []
+    with Session(bind=engine) as session:
+        for i in range(num_agencies):
+            agency = schema.Agency(
+                name=f"Benchmark Agency {i}",
+                state_code="US_CA",
+                systems=[system.value],
+            )
+            session.add(agency)
+            session.flush()
+            agency_ids.append(agency.id)
+
+            reports = [
+                ReportInterface.create_report_object(
+                    agency_id=agency.id,
+                    user_account_id=None,
+                    year=year,
+                    month=month,
+                    frequency=schema.ReportingFrequency.MONTHLY.value,
+                )
+                for year in range(2023 - num_years, 2023)
+                for month in range(1, 13)
+            ]
+            for report in reports:
+                report.status = schema.ReportStatus.PUBLISHED
+            session.add_all(reports)
+            session.flush()
+
+            session.bulk_insert_mappings(
+                schema.Datapoint,
+                [
+                    {
+                        "report_id": report.id,
+                        "source_id": agency.id,
+                        "is_report_datapoint": True,
+                        "metric_definition_key": metric_key,
+                        "start_date": report.date_range_start,
+                        "end_date": report.date_range_end,
+                        "dimension_identifier_to_member": dimension_identifier_to_member,
+                        "value": str(j),
+                    }
+                    for report in reports
+                    for j, (metric_key, dimension_identifier_to_member) in enumerate(
+                        metric_key_and_dimension_members
+                    )
+                ],
+            )
+        session.commit()
+    return agency_ids
+
+
+def _get_csv_of_full_feed(
+    session: Session, agency_id: int, metric: Optional[str], system: Optional[str]
+) -> str:
+    """Returns the csv of the feed the way get_csv_of_feed() used to build it, by
+    generating the entire feed and then filtering it to the requested file."""
+    system_to_filename_to_rows = FeedInterface.get_feed_for_agency_id(
+        session, agency_id=agency_id
+    )
+    if not system_to_filename_to_rows:
+        return ""
+    if system is None:
+        system = list(system_to_filename_to_rows.keys())[0]
+    rows = []
+    if metric:
+        rows = system_to_filename_to_rows.get(system, {}).get(metric, [])
+    for row in rows:
+        if "month" in row:
+            row["month"] = calendar.month_name[int(row["month"])]
+    return pd.DataFrame.from_dict(rows).to_csv(index=False)
+
+
+def _get_csv_of_feed(
+    session: Session, agency_id: int, metric: Optional[str], system: Optional[str]
+) -> str:
+    return FeedInterface.get_csv_of_feed(
+        session, agency_id=agency_id, metric=metric, system=system
+    ).get_data(as_text=True)
+
+
+def _update_report(session: Session, agency_id: int) -> None:
+    """Updates the value of a datapoint in one of the agency's reports, the way the
+    Control Panel does when a report is edited."""
+    datapoint = (
+        session.query(schema.Datapoint)
+        .filter(schema.Datapoint.source_id == agency_id)
+        .order_by(schema.Datapoint.id)
+        .first()
+    )
+    datapoint.value = str(int(datapoint.value) + 1)
+    ReportInterface.update_report_metadata(
+        report=session.query(schema.Report).get(datapoint.report_id),
+        editor_id=None,
+        status=schema.ReportStatus.PUBLISHED.value,
+    )
+    session.commit()
+
+
+def _time_requests(
+    engine: Engine,
+    agency_id: int,
+    system: schema.System,
+    filenames: List[str],
+    num_requests: int,
+    get_csv: Callable[..., str],
+    before_request: Callable[[Session, int], None],
+) -> List[float]:
+    """Requests each file of the agency's feed in turn, |num_requests| times. Returns
+    the latency of each request in milliseconds."""
+    latencies = []
+    with Session(bind=engine) as session:
+        for i in range(num_requests):
+            before_request(session, i)
+            start = time.perf_counter()
+            get_csv(
+                session,
+                agency_id=agency_id,
+                metric=filenames[i % len(filenames)],
+                system=system.value,
+            )
+            latencies.append(1000 * (time.perf_counter() - start))
+            # End the transaction, as the end of each request does.
+            session.commit()
+    return latencies
+
+
+def main(
+    system: schema.System,
+    num_agencies: int,
+    num_years: int,
+    num_requests: int,
+    update_every: int,
+) -> None:
+    """Seeds a local Postgres database, times each approach to serving the feed and
+    checks that they return the same csv."""
+    database_key = SQLAlchemyDatabaseKey.for_schema(SchemaType.JUSTICE_COUNTS)
+    temp_db_dir = local_postgres_helpers.start_on_disk_postgresql_database()
+    try:
+        engine = SQLAlchemyEngineManager.init_engine_for_postgres_instance(
+            database_key=database_key,
+            db_url=local_postgres_helpers.on_disk_postgres_db_url(),
+        )
+        database_key.declarative_meta.metadata.create_all(engine)
+        agency_ids = _seed_agencies(engine, system, num_agencies, num_years)
+        agency_id = agency_ids[0]
+        with Session(bind=engine) as session:
+            filenames = list(
+                FeedInterface.get_feed_for_agency_id(session, agency_id=agency_id)[
+                    system.value
+                ]
+            )
+            logging.info(
+                "Seeded [%s] agencies with [%s] datapoints; agency feed has [%s] "
+                "files.",
+                num_agencies,
+                session.query(schema.Datapoint).count(),
+                len(filenames),
+            )
+
+        def clear_cache(_session: Session, _i: int) -> None:
+            FeedInterface.clear_feed_cache()
+
+        def update_report_periodically(session: Session, i: int) -> None:
+            if i > 0 and i % update_every == 0:
+                _update_report(session, agency_id)
+
+        def do_nothing(_session: Session, _i: int) -> None:
+            pass
+
+        with Flask(__name__).app_context():
+            for approach, get_csv, before_request in [
+                ("full rebuild + pandas", _get_csv_of_full_feed, do_nothing),
+                ("get_csv_of_feed(), cold cache", _get_csv_of_feed, clear_cache),
+                (
+                    f"get_csv_of_feed(), report updated every {update_every} requests",
+                    _get_csv_of_feed,
+                    update_report_periodically,
+                ),
+            ]:
+                latencies = _time_requests(
+                    engine,
+                    agency_id,
+                    system,
+                    filenames,
+                    num_requests,
+                    get_csv,
+                    before_request,
+                )
+                logging.info(
+                    "%s: p50 %.2fms, p99 %.2fms over [%s] requests",
+                    approach,
+                    np.percentile(latencies, 50),
+                    np.percentile(latencies, 99),
+                    len(latencies),
+                )
+
+            with Session(bind=engine) as session:
+                FeedInterface.clear_feed_cache()
+                for metric in filenames + ["not_a_metric", None]:
+                    if _get_csv_of_full_feed(
+                        session, agency_id=agency_id, metric=metric, system=None
+                    ) != _get_csv_of_feed(
+                        session, agency_id=agency_id, metric=metric, system=None
+                    ):
+                        raise ValueError(f"Found mismatched csv for [{metric}].")
+        logging.info(
+            "Both approaches returned the same csv for all [%s] files.", len(filenames)
+        )
+    finally:
+        SQLAlchemyEngineManager.teardown_engines()
+        local_postgres_helpers.stop_and_clear_on_disk_postgresql_database(temp_db_dir)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--system",
+        type=schema.System,
+        choices=list(schema.System),
+        default=schema.System.PRISONS,
+    )
+    parser.add_argument("--num_agencies", type=int, default=10)
+    parser.add_argument("--num_years", type=int, default=10)
+    parser.add_argument("--num_requests", type=int, default=1_000)
+    parser.add_argument("--update_every", type=int, default=100)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(
+        args.system,
+        args.num_agencies,
+        args.num_years,
+        args.num_requests,
+        args.update_every,
+    )
@@ -0,0 +1,175 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks fuzzy matching the disaggregation and month columns of a synthetic bulk
+upload sheet against their valid options.
+
+Compares:
+  - scoring every option with thefuzz and re-normalizing the input text and every
+    option on every call, which is how fuzzy_match_against_options() used to work.
+  - fuzzy_match_against_options(), which reuses a FuzzyOptionMatcher per option set
+    for the whole sheet, as the WorkbookUploader does for each upload.
+
+Since scoring with thefuzz takes several milliseconds per cell, it is only run on the
+first NUM_BASELINE_ROWS rows of the sheet, and the two approaches are compared by their
+time per cell. Then checks that both approaches picked the same option for every cell
+in those rows.
+
+Usage:
+    python -m recidiviz.tools.justice_counts.benchmark_fuzzy_matching \
+        [--num_rows NUM_ROWS] [--num_baseline_rows NUM_BASELINE_ROWS]
+"""
+import argparse
+import logging
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from thefuzz import fuzz
+
+from recidiviz.common.text_analysis import TextAnalyzer, TextMatchingConfiguration
+from recidiviz.justice_counts.bulk_upload.bulk_upload_helpers import (
+    MONTH_NAMES,
+    NORMALIZERS,
+    FuzzyOptionMatcher,
+    fuzzy_match_against_options,
+)
+from recidiviz.justice_counts.dimensions.person import RaceAndEthnicity
+from recidiviz.justice_counts.exceptions import JusticeCountsBulkUploadException
+
+
+def _misspell(rng: random.Random, value: str) -> str:
+    """Returns |value| with a random typo or change in case, or unchanged."""
+    choice = rng.randrange(4)
+    if choice == 0 and len(value) > 1:
+        i = rng.randrange(len(value))
+        return value[:i] + value[i + 1 :]
+    if choice == 1:
+        return value.lower()
+    if choice == 2:
+        return value.upper()
+    return value
+
+
+def _build_sheet(num_rows: int) -> List[Tuple[str, List[str], str]]:
+    """Returns (category name, options, text) for each fuzzy matched cell of a sheet
+    with |num_rows| rows, each with a misspelled month and race/ethnicity."""
+    rng = random.Random(0)
+    race_options = [member.value for member in RaceAndEthnicity]
+    cells = []
+    for _ in range(num_rows):
+        cells.append(("Month", MONTH_NAMES, _misspell(rng, rng.choice(MONTH_NAMES))))
+        cells.append(
+            (
+                "Race And Ethnicity",
+                race_options,
+                _misspell(rng, rng.choice(race_options)),
+            )
+        )
+    return cells
+
+
+def _match_with_thefuzz(
+    analyzer: TextAnalyzer,
+    text: str,
+    options: List[str],
+    category_name: str,
+    metric_key_to_errors: Dict[Optional[str], List[JusticeCountsBulkUploadException]],
+    fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher],
+) -> str:
+    del category_name, metric_key_to_errors, fuzzy_option_matchers  # Unused
+    option_to_score = {
+        option: fuzz.ratio(
+            analyzer.normalize_text(text, stem_tokens=True, normalizers=NORMALIZERS),
+            analyzer.normalize_text(option, stem_tokens=True, normalizers=NORMALIZERS),
+        )
+        for option in options
+    }
+    return max(option_to_score, key=option_to_score.get)  # type: ignore[arg-type]
+
+
+def _time_matching(
+    match_fn: Callable[..., str],
+    cells: List[Tuple[str, List[str], str]],
+) -> Tuple[float, List[str]]:
+    # Use a new analyzer and matchers for each run, as the WorkbookUploader does for
+    # each upload.
+    analyzer = TextAnalyzer(
+        configuration=TextMatchingConfiguration(stop_words_to_remove={"other", "not"})
+    )
+    fuzzy_option_matchers: Dict[Tuple[str, ...], FuzzyOptionMatcher] = {}
+    metric_key_to_errors: Dict[
+        Optional[str], List[JusticeCountsBulkUploadException]
+    ] = defaultdict(list)
+    start = time.perf_counter()
+    matches = [
+        match_fn(
+            analyzer=analyzer,
+            text=text,
+            options=options,
+            category_name=category_name,
+            metric_key_to_errors=metric_key_to_errors,
+            fuzzy_option_matchers=fuzzy_option_matchers,
+        )
+        for category_name, options, text in cells
+    ]
+    return time.perf_counter() - start, matches
+
+
+def main(num_rows: int, num_baseline_rows: int) -> None:
+    cells = _build_sheet(num_rows)
+    baseline_cells = cells[: 2 * num_baseline_rows]
+
+    thefuzz_seconds, thefuzz_matches = _time_matching(
+        _match_with_thefuzz, baseline_cells
+    )
+    logging.info(
+        "Scoring every option with thefuzz: %.2fs for [%s] cells (%.1fus per cell)",
+        thefuzz_seconds,
+        len(baseline_cells),
+        1e6 * thefuzz_seconds / len(baseline_cells),
+    )
+
+    matcher_seconds, matcher_matches = _time_matching(
+        fuzzy_match_against_options, cells
+    )
+    logging.info(
+        "fuzzy_match_against_options(): %.2fs for [%s] cells (%.1fus per cell)",
+        matcher_seconds,
+        len(cells),
+        1e6 * matcher_seconds / len(cells),
+    )
+
+    if thefuzz_matches != matcher_matches[: len(baseline_cells)]:
+        raise ValueError("Found mismatched fuzzy matching results.")
+    logging.info(
+        "Both approaches matched all [%s] compared cells to the same option.",
+        len(baseline_cells),
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_rows", type=int, default=100_000)
+    parser.add_argument("--num_baseline_rows", type=int, default=1_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.num_rows, args.num_baseline_rows)
@@ -0,0 +1,364 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks reading and grouping the rows of large Bulk Upload workbooks.
+
+Generates two workbooks with NUM_ROWS_PER_SHEET rows for each sheet of SYSTEM (the
+defaults generate workbooks of roughly 50MB):
+  - a standard workbook, with one sheet per metric/breakdown.
+  - a single-page workbook, with the rows for all metrics/breakdowns in one sheet.
+
+For each workbook, reports the wall time and peak RSS of a fresh Python process that:
+  - reads every sheet at once with pandas, first writing single-page workbooks to a
+    new Excel file with one sheet per metric/breakdown and reading that file, which is
+    how WorkbookUploader.upload_workbook() used to read workbooks, then passes each
+    sheet's rows to SpreadsheetUploader.upload_sheet().
+  - runs WorkbookUploader.upload_workbook() on the workbook as it is opened for an
+    upload, which streams the rows of each sheet into SpreadsheetUploader.upload_sheet().
+In both cases the rows are grouped by time range as they would be for an upload, and
+only the upload of each time range's rows to the database is stubbed out.
+
+Then checks that both approaches passed the same rows to each time range.
+
+Usage:
+    python -m recidiviz.tools.justice_counts.benchmark_workbook_reading \
+        [--system SYSTEM] [--num_rows_per_sheet NUM_ROWS_PER_SHEET]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from recidiviz.justice_counts.bulk_upload.spreadsheet_uploader import (
+    SpreadsheetUploader,
+)
+from recidiviz.justice_counts.bulk_upload.time_range_uploader import TimeRangeUploader
+from recidiviz.justice_counts.bulk_upload.workbook_uploader import WorkbookUploader
+from recidiviz.justice_counts.metricfiles.metricfile_registry import (
+    SYSTEM_TO_FILENAME_TO_METRICFILE,
+)
+from recidiviz.justice_counts.metrics.metric_registry import METRICS_BY_SYSTEM
+from recidiviz.justice_counts.report import ReportInterface
+from recidiviz.justice_counts.spreadsheet import SpreadsheetInterface
+from recidiviz.justice_counts.utils.constants import UploadMethod
+from recidiviz.justice_counts.utils.metric_breakdown_to_sheet_name import (
+    METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME,
+    metric_definition_key_to_aggregate_metricfile,
+)
+from recidiviz.persistence.database.schema.justice_counts import schema
+
+_OLD_APPROACH = "read_all_sheets"
+_NEW_APPROACH = "stream_rows"
+
+
+def _generate_workbook(
+    file_path: str, system: schema.System, num_rows_per_sheet: int, single_page: bool
+) -> None:
+    """Writes a workbook with |num_rows_per_sheet| rows of random data for each
+    metric/breakdown sheet of |system|. If |single_page| is True, all rows are written
+    to a single sheet, distinguished by the metric and breakdown_category columns."""
+    rng = random.Random(0)
+    sheet_name_to_df: Dict[str, pd.DataFrame] = {}
+    for sheet_name, metricfile in SYSTEM_TO_FILENAME_TO_METRICFILE[
+        system.value
+    ].items():
+        members = (
+            [member.value for member in metricfile.disaggregation]  # type: ignore[attr-defined]
+            if metricfile.disaggregation is not None
+            else [None]
+        )
+        df = pd.DataFrame(
+            {
+                "year": [2000 + (i // 12) % 25 for i in range(num_rows_per_sheet)],
+                "month": [i % 12 + 1 for i in range(num_rows_per_sheet)],
+                "value": [rng.randrange(10_000) for _ in range(num_rows_per_sheet)],
+            }
+        )
+        if single_page:
+            df.insert(
+                0,
+                "metric",
+                metric_definition_key_to_aggregate_metricfile[
+                    metricfile.definition.key
+                ].canonical_filename,
+            )
+            df["breakdown_category"] = metricfile.disaggregation_column_name
+            df["breakdown"] = [
+                members[i % len(members)] for i in range(num_rows_per_sheet)
+            ]
+        elif metricfile.disaggregation_column_name is not None:
+            df[metricfile.disaggregation_column_name] = [
+                members[i % len(members)] for i in range(num_rows_per_sheet)
+            ]
+        sheet_name_to_df[sheet_name] = df
+
+    with pd.ExcelWriter(  # pylint: disable=abstract-class-instantiated
+        file_path
+    ) as writer:
+        if single_page:
+            pd.concat(sheet_name_to_df.values()).to_excel(
+                writer, sheet_name="Sheet 1", index=False
+            )
+        else:
+            for sheet_name, df in sheet_name_to_df.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _get_rows_hash(metricfile_name: str, rows: List[Dict[str, Any]]) -> int:
+    """Returns a hash of the rows uploaded for a single time range. Integral floats and
+    ints, and NaN and None, are treated the same, since values are cast to their
+    expected types when they are uploaded."""
+    hasher = hashlib.sha256(metricfile_name.encode())
+    for row in rows:
+        hasher.update(
+            json.dumps(
+                {column: _normalize_value(value) for column, value in row.items()},
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+    return int(hasher.hexdigest(), 16)
+
+
+def _read_all_sheets(
+    file_path: str,
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Yields the rows of each sheet the way WorkbookUploader.upload_workbook() used
+    to read them."""
+    xls = pd.ExcelFile(file_path)
+    if len(xls.sheet_names) == 1:
+        df_combined = pd.read_excel(xls)
+        if "metric" in df_combined.columns:
+            split_file_path = file_path.replace(".xlsx", "_split.xlsx")
+            with pd.ExcelWriter(  # pylint: disable=abstract-class-instantiated
+                split_file_path
+            ) as writer:
+                for (metric, breakdown_category), df in df_combined.groupby(
+                    ["metric", "breakdown_category"], dropna=False, sort=False
+                ):
+                    df = df.dropna(axis=1, how="all").drop(
+                        columns=["metric", "breakdown_category"], errors="ignore"
+                    )
+                    if isinstance(breakdown_category, str):
+                        df = df.rename(columns={"breakdown": breakdown_category})
+                        sheet_name = METRIC_BREAKDOWN_PAIR_TO_SHEET_NAME[
+                            metric, breakdown_category
+                        ]
+                    else:
+                        sheet_name = metric
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            xls = pd.ExcelFile(split_file_path)
+
+    sheet_name_to_df = pd.read_excel(xls, sheet_name=None)
+    for sheet_name in sorted(xls.sheet_names):
+        df = sheet_name_to_df[sheet_name].dropna(axis=0, how="any", subset=["value"])
+        yield sheet_name, df.to_dict("records")
+
+
+def _get_peak_rss_mb() -> float:
+    """Returns the peak RSS of this process. This is read from /proc rather than with
+    resource.getrusage(), since on Linux ru_maxrss carries over the peak RSS of the
+    parent process across fork() and exec()."""
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                # e.g. "VmHWM:     123456 kB"
+                return int(line.split()[1]) / 1024
+    raise ValueError("Could not find VmHWM in /proc/self/status")
+
+
+def _run_approach(approach: str, file_path: str, system: schema.System) -> None:
+    """Reads the workbook with the given approach, then prints the wall time, peak
+    RSS and a hash of all rows as JSON."""
+    rows_hash = 0
+
+    def upload_time_range(
+        time_range_uploader: TimeRangeUploader, **_kwargs: Any
+    ) -> Tuple[schema.Report, List[Any]]:
+        nonlocal rows_hash
+        # Combine the hashes of each time range so that the order in which time
+        # ranges are uploaded doesn't matter.
+        rows_hash = (
+            rows_hash
+            + _get_rows_hash(
+                time_range_uploader.metricfile.canonical_filename,
+                time_range_uploader.rows_for_this_time_range,
+            )
+        ) % 2**256
+        return schema.Report(), []
+
+    agency = schema.Agency(id=1, name="Benchmark Agency")
+    start = time.perf_counter()
+    with patch.object(TimeRangeUploader, "upload_time_range", upload_time_range):
+        if approach == _OLD_APPROACH:
+            agency_id_to_time_range_to_reports: Dict[
+                int, Dict[Tuple[Any, Any], List[schema.Report]]
+            ] = defaultdict(dict)
+            workbook_uploader = WorkbookUploader(
+                system=system, agency=agency, metric_key_to_agency_datapoints={}
+            )
+            for sheet_name, rows in _read_all_sheets(file_path):
+                SpreadsheetUploader(
+                    text_analyzer=workbook_uploader.text_analyzer,
+                    fuzzy_option_matchers=workbook_uploader.fuzzy_option_matchers,
+                    system=system,
+                    agency=agency,
+                    metric_key_to_agency_datapoints={},
+                    sheet_name=sheet_name,
+                    agency_id_to_time_range_to_reports=agency_id_to_time_range_to_reports,
+                    existing_datapoints_dict={},
+                    agency_name_to_metric_key_to_timerange_to_total_value=workbook_uploader.agency_name_to_metric_key_to_timerange_to_total_value,
+                    child_agency_name_to_agency={},
+                ).upload_sheet(
+                    session=MagicMock(),
+                    rows=rows,
+                    invalid_sheet_names=[],
+                    metric_key_to_datapoint_jsons=defaultdict(list),
+                    metric_key_to_errors=defaultdict(list),
+                    uploaded_reports=set(),
+                    upload_method=UploadMethod.BULK_UPLOAD,
+                )
+        else:
+            with patch.object(
+                ReportInterface, "get_reports_by_agency_ids", return_value=[]
+            ):
+                with open(file_path, "rb") as f:
+                    (
+                        reader,
+                        _,
+                        upload_filetype,
+                    ) = SpreadsheetInterface.convert_file_to_excel(
+                        file=f, filename=file_path
+                    )
+                    WorkbookUploader(
+                        system=system, agency=agency, metric_key_to_agency_datapoints={}
+                    ).upload_workbook(
+                        session=MagicMock(),
+                        xls=reader,
+                        metric_definitions=METRICS_BY_SYSTEM[system.value],
+                        filename=file_path,
+                        upload_method=UploadMethod.BULK_UPLOAD,
+                        upload_filetype=upload_filetype,
+                    )
+    seconds = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "seconds": seconds,
+                "max_rss_mb": _get_peak_rss_mb(),
+                "hash": rows_hash,
+            }
+        )
+    )
+
+
+def _run_approach_in_new_process(
+    approach: str, file_path: str, system: schema.System
+) -> Dict[str, Any]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "recidiviz.tools.justice_counts.benchmark_workbook_reading",
+            "--system",
+            system.value,
+            "--approach",
+            approach,
+            "--file_path",
+            file_path,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(system: schema.System, num_rows_per_sheet: int) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        for workbook_name, single_page in [("standard", False), ("single-page", True)]:
+            file_path = os.path.join(tempdir, f"{workbook_name}.xlsx")
+            _generate_workbook(file_path, system, num_rows_per_sheet, single_page)
+            logging.info(
+                "Generated %s workbook: %.1fMB",
+                workbook_name,
+                os.path.getsize(file_path) / 1024 / 1024,
+            )
+
+            approach_to_result = {
+                approach: _run_approach_in_new_process(approach, file_path, system)
+                for approach in [_OLD_APPROACH, _NEW_APPROACH]
+            }
+            for approach, result in approach_to_result.items():
+                logging.info(
+                    "[%s] %s: %.2fs, peak RSS %.0fMB",
+                    workbook_name,
+                    approach,
+                    result["seconds"],
+                    result["max_rss_mb"],
+                )
+            if (
+                approach_to_result[_OLD_APPROACH]["hash"]
+                != approach_to_result[_NEW_APPROACH]["hash"]
+            ):
+                raise ValueError(f"Found mismatched rows for {workbook_name} workbook.")
+            logging.info("[%s] Both approaches read the same rows.", workbook_name)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--system",
+        type=schema.System,
+        choices=list(schema.System),
+        default=schema.System.PRISONS,
+    )
+    parser.add_argument("--num_rows_per_sheet", type=int, default=150_000)
+    # Used internally to run a single approach in a fresh process.
+    parser.add_argument(
+        "--approach", choices=[_OLD_APPROACH, _NEW_APPROACH], help=argparse.SUPPRESS
+    )
+    parser.add_argument("--file_path", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    if args.approach:
+        _run_approach(args.approach, args.file_path, args.system)
+    else:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        main(args.system, args.num_rows_per_sheet)
@@ -0,0 +1,385 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Benchmarks OutliersQuerier.get_officer_level_report_data_for_all_officer_supervisors()
+on a synthetic state.
+
+Loads a fresh local Postgres database with NUM_SUPERVISORS supervisors, NUM_OFFICERS
+officers, and outlier statuses and benchmarks for every US_PA metric in the current and
+previous periods. Then reports the wall time of assembling every supervisor's report:
+  - scanning every officer of every metric for each supervisor, and scanning the
+    previous period's statuses for each officer, which is how OutliersQuerier used to
+    assemble reports.
+  - with officers partitioned by supervisor and previous period statuses indexed by
+    officer, which is how OutliersQuerier assembles reports now.
+
+Then checks that both approaches assembled the same reports.
+
+Requires Postgres to be installed locally (see recidiviz/tools/postgres).
+
+Usage:
+    python -m recidiviz.tools.outliers.benchmark_officer_supervisor_reports \
+        [--num_supervisors NUM_SUPERVISORS] [--num_officers NUM_OFFICERS]
+"""
+import argparse
+import logging
+import random
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+import attr
+from dateutil.relativedelta import relativedelta
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from recidiviz.aggregated_metrics.metric_time_periods import MetricTimePeriod
+from recidiviz.common.constants.states import StateCode
+from recidiviz.outliers.outliers_configs import OUTLIERS_CONFIGS_BY_STATE
+from recidiviz.outliers.querier.querier import OutliersQuerier
+from recidiviz.outliers.types import (
+    MetricContext,
+    OfficerMetricEntity,
+    OfficerSupervisorReportData,
+    OutlierMetricInfo,
+    OutliersMetricConfig,
+    PersonName,
+    TargetStatus,
+)
+from recidiviz.persistence.database.schema.outliers.schema import (
+    MetricBenchmark,
+    SupervisionDistrictManager,
+    SupervisionOfficer,
+    SupervisionOfficerOutlierStatus,
+    SupervisionOfficerSupervisor,
+)
+from recidiviz.persistence.database.schema_type import SchemaType
+from recidiviz.persistence.database.sqlalchemy_database_key import SQLAlchemyDatabaseKey
+from recidiviz.persistence.database.sqlalchemy_engine_manager import (
+    SQLAlchemyEngineManager,
+)
+from recidiviz.tools.postgres import local_persistence_helpers, local_postgres_helpers
+
+_STATE_CODE = StateCode.US_PA
+_END_DATE = date(2023, 5, 1)
+_PREV_END_DATE = _END_DATE - relativedelta(months=1)
+_NUM_DISTRICTS = 50
+
+
+def _load_synthetic_state(
+    engine: Engine, num_supervisors: int, num_officers: int
+) -> None:
+    """Loads supervisors, district managers and officers, and an outlier status for
+    every officer and metric in the current and previous periods."""
+    rng = random.Random(0)
+    state_code = _STATE_CODE.value
+    metrics = OUTLIERS_CONFIGS_BY_STATE[_STATE_CODE].metrics
+    with Session(bind=engine) as session:
+        session.bulk_insert_mappings(
+            SupervisionDistrictManager,
+            [
+                {
+                    "state_code": state_code,
+                    "external_id": f"M{i}",
+                    "full_name": {"given_names": "MANAGER", "surname": str(i)},
+                    "email": f"manager{i}@recidiviz.org",
+                    "supervision_district": str(i),
+                }
+                for i in range(_NUM_DISTRICTS)
+            ],
+        )
+        session.bulk_insert_mappings(
+            SupervisionOfficerSupervisor,
+            [
+                {
+                    "state_code": state_code,
+                    "external_id": f"S{i}",
+                    "staff_id": i,
+                    "full_name": {"given_names": "SUPERVISOR", "surname": str(i)},
+                    "pseudonymized_id": f"supervisorhash{i}",
+                    "email": f"supervisor{i}@recidiviz.org",
+                    "supervision_district": str(i % _NUM_DISTRICTS),
+                }
+                for i in range(num_supervisors)
+            ],
+        )
+        session.bulk_insert_mappings(
+            SupervisionOfficer,
+            [
+                {
+                    "state_code": state_code,
+                    "external_id": f"O{i}",
+                    "staff_id": num_supervisors + i,
+                    "full_name": {"given_names": "OFFICER", "surname": str(i)},
+                    "pseudonymized_id": f"officerhash{i}",
+                    "supervisor_external_id": f"S{i % num_supervisors}",
+                    "supervision_district": str(i % num_supervisors % _NUM_DISTRICTS),
+                }
+                for i in range(num_officers)
+            ],
+        )
+        for metric in metrics:
+            for end_date in [_PREV_END_DATE, _END_DATE]:
+                session.add(
+                    MetricBenchmark(
+                        state_code=state_code,
+                        metric_id=metric.name,
+                        period=MetricTimePeriod.YEAR.value,
+                        end_date=end_date,
+                        caseload_type="ALL",
+                        target=0.1,
+                        threshold=0.05,
+                    )
+                )
+                session.bulk_insert_mappings(
+                    SupervisionOfficerOutlierStatus,
+                    [
+                        {
+                            "state_code": state_code,
+                            "officer_id": f"O{i}",
+                            "caseload_type": "ALL",
+                            "metric_id": metric.name,
+                            "period": MetricTimePeriod.YEAR.value,
+                            "end_date": end_date,
+                            "metric_rate": rng.random() / 4,
+                            "target": 0.1,
+                            "threshold": 0.05,
+                            "status": rng.choices(
+                                list(TargetStatus), weights=[70, 20, 10]
+                            )[0].value,
+                        }
+                        for i in range(num_officers)
+                    ],
+                )
+        session.commit()
+
+
+def _get_metric_context_by_scanning_previous_period(
+    self: OutliersQuerier,
+    session: Session,
+    metric: OutliersMetricConfig,
+    end_date: date,
+    prev_end_date: date,
+) -> MetricContext:
+    """Returns the metric context the way OutliersQuerier used to build it, by scanning
+    all of the previous period's statuses for each officer's current status."""
+    target, target_status_strategy = self.get_target_from_db(session, metric, end_date)
+
+    combined_period_officer_metrics = (
+        session.query(SupervisionOfficerOutlierStatus)
+        .join(
+            SupervisionOfficer,
+            SupervisionOfficer.external_id
+            == SupervisionOfficerOutlierStatus.officer_id,
+        )
+        .filter(
+            SupervisionOfficerOutlierStatus.metric_id == metric.name,
+            SupervisionOfficerOutlierStatus.end_date.in_([end_date, prev_end_date]),
+            SupervisionOfficerOutlierStatus.period == MetricTimePeriod.YEAR.value,
+        )
+        .with_entities(
+            SupervisionOfficerOutlierStatus.officer_id,
+            SupervisionOfficerOutlierStatus.end_date,
+            SupervisionOfficerOutlierStatus.metric_rate,
+            SupervisionOfficerOutlierStatus.status,
+            SupervisionOfficer.full_name,
+            SupervisionOfficer.supervisor_external_id,
+            SupervisionOfficer.supervision_district,
+        )
+        .all()
+    )
+    current_period_officer_metrics = [
+        record
+        for record in combined_period_officer_metrics
+        if record.end_date == end_date
+    ]
+    previous_period_officer_metrics = [
+        record
+        for record in combined_period_officer_metrics
+        if record.end_date == prev_end_date
+    ]
+
+    entities: List[OfficerMetricEntity] = []
+    for officer_metric_record in current_period_officer_metrics:
+        prev_period_record = [
+            past_officer_metric_record
+            for past_officer_metric_record in previous_period_officer_metrics
+            if past_officer_metric_record.officer_id == officer_metric_record.officer_id
+        ]
+        if len(prev_period_record) > 1:
+            raise ValueError("Expected at most one entry for the previous period")
+        prev_rate = (
+            prev_period_record[0].metric_rate if len(prev_period_record) == 1 else None
+        )
+        prev_target_status = prev_period_record[0].status if prev_rate else None
+        entities.append(
+            OfficerMetricEntity(
+                name=PersonName(**officer_metric_record.full_name),
+                rate=officer_metric_record.metric_rate,
+                target_status=TargetStatus(officer_metric_record.status),
+                prev_rate=prev_rate,
+                prev_target_status=TargetStatus(prev_target_status)
+                if prev_target_status
+                else None,
+                supervisor_external_id=officer_metric_record.supervisor_external_id,
+                supervision_district=officer_metric_record.supervision_district,
+            )
+        )
+
+    return MetricContext(
+        target=target,
+        entities=entities,
+        target_status_strategy=target_status_strategy,
+    )
+
+
+def _get_officer_level_data_by_scanning_all_officers(
+    supervision_officer_supervisor_id: str,
+    metric_id_to_metric_context: Dict[OutliersMetricConfig, MetricContext],
+    *_args: object,
+) -> Tuple[List[OutlierMetricInfo], List[OutliersMetricConfig]]:
+    """Returns a supervisor's officer-level data the way OutliersQuerier used to
+    assemble it, by scanning every officer of every metric."""
+    metrics_results: List[OutlierMetricInfo] = []
+    metrics_without_outliers = []
+    for metric, metric_context in metric_id_to_metric_context.items():
+        other_officer_rates: Dict[TargetStatus, List[float]] = {
+            TargetStatus.FAR: [],
+            TargetStatus.MET: [],
+            TargetStatus.NEAR: [],
+        }
+        highlighted_officers: List[OfficerMetricEntity] = []
+        for entity in metric_context.entities:
+            if (
+                entity.target_status == TargetStatus.FAR
+                and entity.supervisor_external_id == supervision_officer_supervisor_id
+            ):
+                highlighted_officers.append(entity)
+            else:
+                other_officer_rates[entity.target_status].append(entity.rate)
+        if highlighted_officers:
+            metrics_results.append(
+                OutlierMetricInfo(
+                    metric=metric,
+                    target=metric_context.target,
+                    other_officers=other_officer_rates,
+                    highlighted_officers=highlighted_officers,
+                    target_status_strategy=metric_context.target_status_strategy,
+                )
+            )
+        else:
+            metrics_without_outliers.append(metric)
+    return metrics_results, metrics_without_outliers
+
+
+def _with_officers_sorted(
+    report: OfficerSupervisorReportData,
+) -> OfficerSupervisorReportData:
+    """Returns the report with the rates and officers of each metric sorted. Officers
+    are listed in the order their statuses are read from the database, which isn't
+    guaranteed to be the same across queries."""
+    return attr.evolve(
+        report,
+        metrics=[
+            attr.evolve(
+                metric_info,
+                other_officers={
+                    status: sorted(rates)
+                    for status, rates in metric_info.other_officers.items()
+                },
+                highlighted_officers=sorted(
+                    metric_info.highlighted_officers,
+                    key=lambda officer: officer.name.surname,
+                ),
+            )
+            for metric_info in report.metrics
+        ],
+    )
+
+
+def _time_reports(
+    querier: OutliersQuerier,
+) -> Tuple[float, Dict[str, OfficerSupervisorReportData]]:
+    start = time.perf_counter()
+    reports = querier.get_officer_level_report_data_for_all_officer_supervisors(
+        end_date=_END_DATE
+    )
+    return time.perf_counter() - start, reports
+
+
+def main(num_supervisors: int, num_officers: int) -> None:
+    """Loads a synthetic state into a local Postgres database, times each approach to
+    assembling every supervisor's report and checks that they assemble the same
+    reports."""
+    database_key = SQLAlchemyDatabaseKey(
+        SchemaType.OUTLIERS, db_name=_STATE_CODE.value.lower()
+    )
+    temp_db_dir = local_postgres_helpers.start_on_disk_postgresql_database()
+    try:
+        engine = local_persistence_helpers.use_on_disk_postgresql_database(database_key)
+        _load_synthetic_state(engine, num_supervisors, num_officers)
+        logging.info(
+            "Loaded [%s] supervisors, [%s] officers and [%s] metrics.",
+            num_supervisors,
+            num_officers,
+            len(OUTLIERS_CONFIGS_BY_STATE[_STATE_CODE].metrics),
+        )
+
+        querier = OutliersQuerier(_STATE_CODE)
+        with patch.object(
+            OutliersQuerier,
+            "_get_metric_context_from_db",
+            _get_metric_context_by_scanning_previous_period,
+        ), patch.object(
+            OutliersQuerier,
+            "_get_officer_level_data_for_officer_supervisor",
+            staticmethod(_get_officer_level_data_by_scanning_all_officers),
+        ):
+            scan_seconds, scan_reports = _time_reports(querier)
+        logging.info("Scanning all officers per supervisor: %.2fs", scan_seconds)
+
+        partitioned_seconds, partitioned_reports = _time_reports(querier)
+        logging.info("Partitioning officers by supervisor: %.2fs", partitioned_seconds)
+
+        if {
+            supervisor_id: _with_officers_sorted(report)
+            for supervisor_id, report in scan_reports.items()
+        } != {
+            supervisor_id: _with_officers_sorted(report)
+            for supervisor_id, report in partitioned_reports.items()
+        }:
+            raise ValueError("Approaches assembled different reports.")
+        logging.info(
+            "Both approaches assembled the same [%s] supervisor reports.",
+            len(partitioned_reports),
+        )
+    finally:
+        SQLAlchemyEngineManager.teardown_engines()
+        local_postgres_helpers.stop_and_clear_on_disk_postgresql_database(temp_db_dir)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_supervisors", type=int, default=500)
+    parser.add_argument("--num_officers", type=int, default=10_000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_arguments()
+    main(args.num_supervisors, args.num_officers)
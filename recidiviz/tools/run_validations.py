@@ -29,7 +29,8 @@ python -m recidiviz.tools.run_validations \
     --state-code [state_code] \
     --ingest-instance [ingest_instance] \
     --sandbox_dataset_prefix [SANDBOX_DATASET_PREFIX] \
-    --validation-name-filter [regex]
+    --validation-name-filter [regex] \
+    --batch-validation-queries [true|false]
 """
 import argparse
 import logging
@@ -40,6 +41,7 @@ from recidiviz.common.constants.states import StateCode
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
 from recidiviz.utils.environment import GCP_PROJECT_PRODUCTION, GCP_PROJECT_STAGING
 from recidiviz.utils.metadata import local_project_id_override
+from recidiviz.utils.params import str_to_bool
 from recidiviz.validation.validation_manager import execute_validation
 
 
@@ -77,6 +79,12 @@ def create_parser() -> argparse.ArgumentParser:
         default=None,
         help="Regex name filter - when set, will only run validations with names that match this regex.",
     )
+    parser.add_argument(
+        "--batch-validation-queries",
+        default=False,
+        type=str_to_bool,
+        help="If True, computes all checks against the same validation view in a single query.",
+    )
     return parser
 
 
@@ -85,6 +93,7 @@ def main(
     state_code: StateCode,
     ingest_instance: DirectIngestInstance,
     validation_name_filter: Optional[str],
+    batch_validation_queries: bool,
 ) -> None:
     validation_regex = (
         re.compile(validation_name_filter) if validation_name_filter else None
@@ -95,6 +104,7 @@ def main(
         validation_name_filter=validation_regex,
         sandbox_dataset_prefix=sandbox_dataset_prefix,
         file_tickets_on_failure=False,
+        batch_validation_queries=batch_validation_queries,
     )
 
 
@@ -108,4 +118,5 @@ if __name__ == "__main__":
             args.state_code,
             args.ingest_instance,
             args.validation_name_filter,
+            args.batch_validation_queries,
         )
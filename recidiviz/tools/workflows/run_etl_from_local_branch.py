@@ -20,6 +20,7 @@ To run the ETL for a specific file and state, run:
     python -m recidiviz.tools.workflows.run_etl_from_local_branch \
        --filename [file name]
        --state_code [state_code]
+       [--incremental true]
 
 """
 import argparse
@@ -28,19 +29,21 @@ import logging
 from recidiviz.common.constants.states import StateCode
 from recidiviz.utils.environment import GCP_PROJECT_STAGING
 from recidiviz.utils.metadata import local_project_id_override
+from recidiviz.utils.params import str_to_bool
 from recidiviz.workflows.etl.routes import get_workflows_delegates
 
 
 def main(
     filename: str,
     state_code: str,
+    incremental: bool,
 ) -> None:
     logging.getLogger().setLevel(logging.INFO)
     with local_project_id_override(GCP_PROJECT_STAGING):
         for delegate in get_workflows_delegates(StateCode(state_code)):
             try:
                 if delegate.supports_file(filename):
-                    delegate.run_etl(filename)
+                    delegate.run_etl(filename, incremental=incremental)
             except ValueError:
                 logging.info(
                     "Error running Firestore ETL for file %s for state_code %s",
@@ -69,6 +72,15 @@ def parse_arguments() -> argparse.Namespace:
         required=True,
     )
 
+    parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        help="If true, only writes the documents that have changed since the last "
+        "incremental export",
+        type=str_to_bool,
+        default=False,
+    )
+
     return parser.parse_args()
 
 
@@ -80,4 +92,5 @@ if __name__ == "__main__":
     main(
         filename=args.filename,
         state_code=args.state_code,
+        incremental=args.incremental,
     )
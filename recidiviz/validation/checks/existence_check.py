@@ -18,7 +18,7 @@
 """Models an existence check, which identifies a validation issue by observing that there is any row returned
 in a given validation result set."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import attr
 import more_itertools
@@ -27,6 +27,7 @@ from recidiviz.big_query.big_query_client import BigQueryClientImpl
 from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
 from recidiviz.validation.validation_config import ValidationRegionConfig
 from recidiviz.validation.validation_models import (
+    BATCHED_VALIDATION_ROWS_TABLE_NAME,
     DataValidationCheck,
     DataValidationJob,
     DataValidationJobResult,
@@ -186,10 +187,33 @@ class ExistenceValidationChecker(ValidationChecker[ExistenceDataValidationCheck]
             query_parameters=[],
         )
 
+        return cls._build_result(validation_job, more_itertools.ilen(query_job))
+
+    @classmethod
+    def get_batched_select_expressions(
+        cls, validation_job: DataValidationJob[ExistenceDataValidationCheck]
+    ) -> Dict[str, str]:
+        return {
+            "num_invalid_rows": f"(SELECT COUNT(*) FROM {BATCHED_VALIDATION_ROWS_TABLE_NAME})"
+        }
+
+    @classmethod
+    def result_from_batched_values(
+        cls,
+        validation_job: DataValidationJob[ExistenceDataValidationCheck],
+        values: Dict[str, Any],
+    ) -> DataValidationJobResult:
+        return cls._build_result(validation_job, values["num_invalid_rows"])
+
+    @staticmethod
+    def _build_result(
+        validation_job: DataValidationJob[ExistenceDataValidationCheck],
+        num_invalid_rows: int,
+    ) -> DataValidationJobResult:
         return DataValidationJobResult(
             validation_job=validation_job,
             result_details=ExistenceValidationResultDetails(
-                num_invalid_rows=more_itertools.ilen(query_job),
+                num_invalid_rows=num_invalid_rows,
                 dev_mode=validation_job.validation.dev_mode,
                 hard_num_allowed_rows=validation_job.validation.hard_num_allowed_rows,
                 soft_num_allowed_rows=validation_job.validation.soft_num_allowed_rows,
@@ -19,15 +19,17 @@
 columns are not the same."""
 
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import attr
 from google.cloud.bigquery.table import Row
 
 from recidiviz.big_query.big_query_client import BigQueryClientImpl
 from recidiviz.big_query.big_query_view import SimpleBigQueryViewBuilder
+from recidiviz.utils.string import StrictStringFormatter
 from recidiviz.validation.validation_config import ValidationRegionConfig
 from recidiviz.validation.validation_models import (
+    BATCHED_VALIDATION_ROWS_TABLE_NAME,
     DataValidationCheck,
     DataValidationJob,
     DataValidationJobResult,
@@ -56,6 +58,11 @@ ERROR_ROWS_VIEW_BUILDER_TEMPLATE: str = """
     {validation_check}
     """
 
+# The maximum number of failed rows, those with the highest errors, that a batched
+# PER_ROW check fetches. The failed rows are counted separately, so the result still
+# reports how many rows failed.
+MAX_BATCHED_FAILED_ROWS = 1000
+
 
 @attr.s(frozen=True)
 class SamenessDataValidationCheck(DataValidationCheck):
@@ -332,12 +339,37 @@ class SamenessPerRowValidationResultDetails(DataValidationJobResultDetails):
     total_num_rows: Optional[int] = attr.ib(default=None)
     dev_mode: bool = attr.ib(default=False)
 
+    # The number of failed rows in total and of those that failed the hard and soft
+    # thresholds. Only set when |failed_rows| holds just the rows with the highest
+    # errors, otherwise the counts are those of |failed_rows|.
+    num_failed_rows: Optional[int] = attr.ib(default=None)
+    num_hard_failed_rows: Optional[int] = attr.ib(default=None)
+    num_soft_failed_rows: Optional[int] = attr.ib(default=None)
+
     @property
     def has_data(self) -> bool:
         # Historical records do not have `total_num_rows`, so we default to True if it
         # is not set.
         return self.total_num_rows > 0 if self.total_num_rows is not None else True
 
+    @property
+    def failed_row_count(self) -> int:
+        if self.num_failed_rows is not None:
+            return self.num_failed_rows
+        return len(self.failed_rows)
+
+    @property
+    def hard_failed_row_count(self) -> int:
+        if self.num_hard_failed_rows is not None:
+            return self.num_hard_failed_rows
+        return len(self.rows_hard_failure or [])
+
+    @property
+    def soft_failed_row_count(self) -> int:
+        if self.num_soft_failed_rows is not None:
+            return self.num_soft_failed_rows
+        return len(self.rows_soft_failure or [])
+
     @property
     def is_dev_mode(self) -> bool:
         return self.dev_mode
@@ -407,15 +439,15 @@ class SamenessPerRowValidationResultDetails(DataValidationJobResultDetails):
             return None
         if validation_result_status == ValidationResultStatus.FAIL_SOFT:
             return (
-                f"{len(self.failed_rows)} row(s) exceeded the soft_max_allowed_error threshold. The "
+                f"{self.failed_row_count} row(s) exceeded the soft_max_allowed_error threshold. The "
                 f"acceptable margin of error is {self.soft_max_allowed_error} (soft), but the "
                 f"validation returned rows with errors as high as {round(self.highest_error, 4)}."
             )
         if validation_result_status == ValidationResultStatus.FAIL_HARD:
             return (
-                f"{len(self.failed_rows)} row(s) had unacceptable margins of error. Of those rows, "
-                f"{len(self.rows_hard_failure or [])} row(s) exceeded the hard threshold and "
-                f"{len(self.rows_soft_failure or [])} row(s) exceeded the soft threshold. The "
+                f"{self.failed_row_count} row(s) had unacceptable margins of error. Of those rows, "
+                f"{self.hard_failed_row_count} row(s) exceeded the hard threshold and "
+                f"{self.soft_failed_row_count} row(s) exceeded the soft threshold. The "
                 f"acceptable margin of error is only {self.hard_max_allowed_error} (hard) "
                 f"and {self.soft_max_allowed_error} (soft), but the "
                 f"validation returned rows with errors as high as {round(self.highest_error, 4)}."
@@ -425,8 +457,9 @@ class SamenessPerRowValidationResultDetails(DataValidationJobResultDetails):
         )
 
     def is_better(self, other: "SamenessPerRowValidationResultDetails") -> bool:
-        return self.highest_error < other.highest_error or len(self.failed_rows) < len(
-            other.failed_rows
+        return (
+            self.highest_error < other.highest_error
+            or self.failed_row_count < other.failed_row_count
         )
 
 
@@ -437,13 +470,12 @@ class SamenessPerRowValidationChecker(ValidationChecker[SamenessDataValidationCh
     Each row should be a number.
     """
 
+    num_queries_per_check = 2
+
     @classmethod
     def run_check(
         cls, validation_job: DataValidationJob[SamenessDataValidationCheck]
     ) -> DataValidationJobResult:
-        comparison_columns = validation_job.validation.comparison_columns
-        validation = validation_job.validation
-
         error_query_job = BigQueryClientImpl().run_query_async(
             query_str=validation_job.error_builder_query_str(),
             use_query_cache=True,
@@ -455,14 +487,82 @@ class SamenessPerRowValidationChecker(ValidationChecker[SamenessDataValidationCh
         )
 
         [[total_num_rows]] = num_total_query_job
-        failed_rows: List[Tuple[ResultRow, float]] = []
 
         row: Row
-        for row in error_query_job:
+        return cls._build_result(
+            validation_job,
+            total_num_rows=total_num_rows,
+            error_rows=[dict(row) for row in error_query_job],
+        )
+
+    @classmethod
+    def get_batched_select_expressions(
+        cls, validation_job: DataValidationJob[SamenessDataValidationCheck]
+    ) -> Dict[str, str]:
+        validation = validation_job.validation
+        # Only fetches the failed rows with the highest errors, which determine the
+        # status of the result, and counts the rest.
+        failed_rows_summary_query = f"""(
+    SELECT AS STRUCT
+        COUNT(*) AS num_failed_rows,
+        COUNTIF(error_rate > {validation.hard_max_allowed_error}) AS num_hard_failed_rows,
+        COUNTIF(error_rate > {validation.soft_max_allowed_error} AND error_rate <= {validation.hard_max_allowed_error}) AS num_soft_failed_rows,
+        ARRAY_AGG(error_rows ORDER BY error_rate DESC LIMIT {MAX_BATCHED_FAILED_ROWS}) AS error_rows
+    FROM ({_get_batched_error_rows_query(validation)}) error_rows
+)"""
+        return {
+            "total_num_rows": f"(SELECT COUNT(*) FROM {BATCHED_VALIDATION_ROWS_TABLE_NAME})",
+            "failed_rows_summary": failed_rows_summary_query,
+        }
+
+    @classmethod
+    def result_from_batched_values(
+        cls,
+        validation_job: DataValidationJob[SamenessDataValidationCheck],
+        values: Dict[str, Any],
+    ) -> DataValidationJobResult:
+        failed_rows_summary = values["failed_rows_summary"]
+        # ARRAY_AGG returns NULL rather than an empty array when there are no rows
+        error_rows = failed_rows_summary["error_rows"] or []
+        is_truncated = failed_rows_summary["num_failed_rows"] > len(error_rows)
+        return cls._build_result(
+            validation_job,
+            total_num_rows=values["total_num_rows"],
+            error_rows=error_rows,
+            num_failed_rows=(
+                failed_rows_summary["num_failed_rows"] if is_truncated else None
+            ),
+            num_hard_failed_rows=(
+                failed_rows_summary["num_hard_failed_rows"] if is_truncated else None
+            ),
+            num_soft_failed_rows=(
+                failed_rows_summary["num_soft_failed_rows"] if is_truncated else None
+            ),
+        )
+
+    @staticmethod
+    def _build_result(
+        validation_job: DataValidationJob[SamenessDataValidationCheck],
+        *,
+        total_num_rows: int,
+        error_rows: List[Dict[str, Any]],
+        num_failed_rows: Optional[int] = None,
+        num_hard_failed_rows: Optional[int] = None,
+        num_soft_failed_rows: Optional[int] = None,
+    ) -> DataValidationJobResult:
+        """Builds the result from the total number of rows in the validation view and
+        the rows of the error rows view. The counts of failed rows should only be
+        passed if |error_rows| does not hold all of the error rows."""
+        comparison_columns = validation_job.validation.comparison_columns
+        validation = validation_job.validation
+
+        failed_rows: List[Tuple[ResultRow, float]] = []
+
+        for error_row in error_rows:
             label_values: List[str] = []
             comparison_values: List[Optional[float]] = []
 
-            for column, value in row.items():
+            for column, value in error_row.items():
                 if column in ["error_rate", "error_type"]:
                     continue
                 if column in comparison_columns:
@@ -480,7 +580,7 @@ class SamenessPerRowValidationChecker(ValidationChecker[SamenessDataValidationCh
                 else:
                     label_values.append(str(value))
 
-            error = float(row.get("error_rate"))
+            error = float(error_row["error_rate"])
             failed_rows.append(
                 (
                     ResultRow(
@@ -499,6 +599,9 @@ class SamenessPerRowValidationChecker(ValidationChecker[SamenessDataValidationCh
                 dev_mode=validation.dev_mode,
                 hard_max_allowed_error=validation.hard_max_allowed_error,
                 soft_max_allowed_error=validation.soft_max_allowed_error,
+                num_failed_rows=num_failed_rows,
+                num_hard_failed_rows=num_hard_failed_rows,
+                num_soft_failed_rows=num_soft_failed_rows,
             ),
         )
 
@@ -601,6 +704,19 @@ SELECT COUNT(*) FROM initial_query;
     """
 
 
+def _get_batched_error_rows_query(validation: SamenessDataValidationCheck) -> str:
+    """Returns a query for the error rows of |validation| among the validation view rows
+    in the BATCHED_VALIDATION_ROWS_TABLE_NAME table. This is the query of the error rows
+    view, but reads the rows that the batched query already materialized rather than
+    reading the validation view again.
+    """
+    return StrictStringFormatter().format(
+        ERROR_ROWS_VIEW_BUILDER_TEMPLATE,
+        validation_view=f"SELECT * FROM {BATCHED_VALIDATION_ROWS_TABLE_NAME}",
+        validation_check=validation.get_checker().get_validation_query_str(validation),
+    )
+
+
 def _get_partition_count_query(
     initial_query: str, validation: SamenessDataValidationCheck
 ) -> str:
@@ -625,6 +741,21 @@ def _get_partition_count_query(
     | foo | 2    | 1    |
     | bar | 2    | 2    |
     """
+    return f"""
+WITH initial_query AS (
+    {initial_query}
+)
+{_get_partition_count_select("initial_query", validation)}
+    """
+
+
+def _get_partition_count_select(
+    table_name: str, validation: SamenessDataValidationCheck, as_struct: bool = False
+) -> str:
+    """Returns a SELECT statement that counts the number of non-null values in each
+    comparison column for each partition of the rows in |table_name|. See
+    _get_partition_count_query.
+    """
     count_columns = [
         f"COUNTIF({column} IS NOT NULL) AS {column}"
         for column in validation.comparison_columns
@@ -635,15 +766,10 @@ def _get_partition_count_query(
         if validation.partition_columns is None
         else f"GROUP BY {', '.join(validation.partition_columns)}"
     )
-    return f"""
-WITH initial_query AS (
-    {initial_query}
-)
-SELECT
+    return f"""SELECT{" AS STRUCT" if as_struct else ""}
     {", ".join(select_columns)}
-FROM initial_query
-{group_by_clause}
-    """
+FROM {table_name}
+{group_by_clause}"""
 
 
 class SamenessPerViewValidationChecker(ValidationChecker[SamenessDataValidationCheck]):
@@ -652,11 +778,12 @@ class SamenessPerViewValidationChecker(ValidationChecker[SamenessDataValidationC
     This is done by dividing the number of rows that have mismatching columns with the total number of rows in the view.
     """
 
+    num_queries_per_check = 3
+
     @classmethod
     def run_check(
         cls, validation_job: DataValidationJob[SamenessDataValidationCheck]
     ) -> DataValidationJobResult:
-        comparison_columns = validation_job.validation.comparison_columns
         validation = validation_job.validation
 
         num_errors_query_job = BigQueryClientImpl().run_query_async(
@@ -676,26 +803,73 @@ class SamenessPerViewValidationChecker(ValidationChecker[SamenessDataValidationC
 
         [[num_errors]] = num_errors_query_job
         [[num_rows]] = num_total_query_job
+
+        row: Row
+        return cls._build_result(
+            validation_job,
+            num_error_rows=num_errors,
+            total_num_rows=num_rows,
+            partition_count_rows=[dict(row) for row in partition_count_query_job],
+        )
+
+    @classmethod
+    def get_batched_select_expressions(
+        cls, validation_job: DataValidationJob[SamenessDataValidationCheck]
+    ) -> Dict[str, str]:
+        return {
+            "num_error_rows": f"(SELECT COUNT(*) FROM ({_get_batched_error_rows_query(validation_job.validation)}))",
+            "total_num_rows": f"(SELECT COUNT(*) FROM {BATCHED_VALIDATION_ROWS_TABLE_NAME})",
+            "partition_count_rows": f"ARRAY({_get_partition_count_select(BATCHED_VALIDATION_ROWS_TABLE_NAME, validation_job.validation, as_struct=True)})",
+        }
+
+    @classmethod
+    def result_from_batched_values(
+        cls,
+        validation_job: DataValidationJob[SamenessDataValidationCheck],
+        values: Dict[str, Any],
+    ) -> DataValidationJobResult:
+        return cls._build_result(
+            validation_job,
+            num_error_rows=values["num_error_rows"],
+            total_num_rows=values["total_num_rows"],
+            partition_count_rows=values["partition_count_rows"],
+        )
+
+    @staticmethod
+    def _build_result(
+        validation_job: DataValidationJob[SamenessDataValidationCheck],
+        *,
+        num_error_rows: int,
+        total_num_rows: int,
+        partition_count_rows: List[Dict[str, Any]],
+    ) -> DataValidationJobResult:
+        """Builds the result from the number of error rows, the total number of rows in
+        the validation view and the rows of the partition count query."""
+        comparison_columns = validation_job.validation.comparison_columns
+        validation = validation_job.validation
+
         non_null_counts_per_column_per_partition: Dict[
             Tuple[str, ...], Dict[str, int]
         ] = {}
 
-        row: Row
-        for row in partition_count_query_job:
+        for partition_count_row in partition_count_rows:
             partition_key = (
-                tuple(str(row.get(column)) for column in validation.partition_columns)
+                tuple(
+                    str(partition_count_row.get(column))
+                    for column in validation.partition_columns
+                )
                 if validation.partition_columns
                 else tuple()
             )
             non_null_counts_per_column_per_partition[partition_key] = {
-                column: row.get(column) for column in comparison_columns
+                column: partition_count_row[column] for column in comparison_columns
             }
 
         return DataValidationJobResult(
             validation_job=validation_job,
             result_details=SamenessPerViewValidationResultDetails(
-                num_error_rows=num_errors,
-                total_num_rows=num_rows,
+                num_error_rows=num_error_rows,
+                total_num_rows=total_num_rows,
                 dev_mode=validation.dev_mode,
                 hard_max_allowed_error=validation.hard_max_allowed_error,
                 soft_max_allowed_error=validation.soft_max_allowed_error,
@@ -22,12 +22,15 @@ import re
 import uuid
 from concurrent import futures
 from itertools import groupby
-from typing import Any, Dict, List, Optional, Pattern, Tuple
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 
 import pytz
 
 from recidiviz.big_query.address_overrides import BigQueryAddressOverrides
-from recidiviz.big_query.big_query_client import BQ_CLIENT_MAX_POOL_SIZE
+from recidiviz.big_query.big_query_client import (
+    BQ_CLIENT_MAX_POOL_SIZE,
+    BigQueryClientImpl,
+)
 from recidiviz.common.constants.states import StateCode
 from recidiviz.ingest.direct.types.direct_ingest_instance import DirectIngestInstance
 from recidiviz.monitoring import trace
@@ -50,6 +53,11 @@ from recidiviz.validation.validation_models import (
     DataValidationJobResult,
     ValidationResultStatus,
 )
+from recidiviz.validation.validation_planner import (
+    ValidationBatchQueryStats,
+    plan_validation_query_batches,
+    run_validation_query_batch,
+)
 from recidiviz.validation.validation_result_storage import (
     ValidationResultForStorage,
     store_validation_results_in_big_query,
@@ -93,6 +101,7 @@ def execute_validation_request(
     state_code: StateCode,
     ingest_instance: DirectIngestInstance,
     sandbox_prefix: Optional[str] = None,
+    batch_validation_queries: bool = False,
 ) -> None:
     if ingest_instance == DirectIngestInstance.SECONDARY and not sandbox_prefix:
         raise ValueError(
@@ -104,6 +113,7 @@ def execute_validation_request(
         region_code=state_code.value,
         ingest_instance=ingest_instance,
         sandbox_dataset_prefix=sandbox_prefix,
+        batch_validation_queries=batch_validation_queries,
     )
     end_datetime = datetime.datetime.now()
 
@@ -124,6 +134,7 @@ def execute_validation(
     validation_name_filter: Optional[Pattern] = None,
     sandbox_dataset_prefix: Optional[str] = None,
     file_tickets_on_failure: bool = True,
+    batch_validation_queries: bool = False,
 ) -> Tuple[str, int]:
     """Executes validation checks for |region_code|.
     |ingest_instance| is the ingest instance used to generate the data that is being validated. This determines which
@@ -131,6 +142,8 @@ def execute_validation(
     If |validation_name_filter| is supplied, only performs validations on those
     that have a regex match.
     If |sandbox_dataset_prefix| is supplied, performs validation using sandbox dataset
+    If |batch_validation_queries| is True, all checks that read the same validation view are computed in a single
+    query (see validation_planner.py). Jobs in a batch whose query fails are then run individually.
 
     Returns a tuple with the validation run_id and the number of validation jobs run.
     """
@@ -157,43 +170,55 @@ def execute_validation(
     failed_soft_validations: List[DataValidationJobResult] = []
     failed_hard_validations: List[DataValidationJobResult] = []
     results_to_store: List[ValidationResultForStorage] = []
+
+    def _record_result(
+        job: DataValidationJob, runtime_seconds: float, result: DataValidationJobResult
+    ) -> None:
+        results_to_store.append(
+            ValidationResultForStorage.from_validation_result(
+                run_id=run_id,
+                run_datetime=run_datetime,
+                result=result,
+                runtime_seconds=runtime_seconds,
+            )
+        )
+        if result.validation_result_status == ValidationResultStatus.FAIL_HARD:
+            failed_hard_validations.append(result)
+        if result.validation_result_status == ValidationResultStatus.FAIL_SOFT:
+            failed_soft_validations.append(result)
+        logging.info(
+            "Finished job [%s] for region [%s] in %.2f seconds",
+            job.validation.validation_name,
+            job.region_code,
+            runtime_seconds,
+        )
+
     with futures.ThreadPoolExecutor(
         # Conservatively allow only half as many workers as allowed connections.
         # Lower this number if we see "urllib3.connectionpool:Connection pool is
         # full, discarding connection" errors.
         max_workers=int(BQ_CLIENT_MAX_POOL_SIZE / 2)
     ) as executor:
+        jobs_to_run_individually = validation_jobs
+        if batch_validation_queries:
+            jobs_to_run_individually = _run_validation_query_batches(
+                executor, validation_jobs, _record_result
+            )
+
         future_to_jobs: Dict[
             futures.Future[Tuple[float, DataValidationJobResult]], DataValidationJob
         ] = {
             executor.submit(
                 trace.time_and_trace(structured_logging.with_context(_run_job)), job
             ): job
-            for job in validation_jobs
+            for job in jobs_to_run_individually
         }
 
         for future in futures.as_completed(future_to_jobs):
             job = future_to_jobs[future]
             try:
                 runtime_seconds, result = future.result()
-                results_to_store.append(
-                    ValidationResultForStorage.from_validation_result(
-                        run_id=run_id,
-                        run_datetime=run_datetime,
-                        result=result,
-                        runtime_seconds=runtime_seconds,
-                    )
-                )
-                if result.validation_result_status == ValidationResultStatus.FAIL_HARD:
-                    failed_hard_validations.append(result)
-                if result.validation_result_status == ValidationResultStatus.FAIL_SOFT:
-                    failed_soft_validations.append(result)
-                logging.info(
-                    "Finished job [%s] for region [%s] in %.2f seconds",
-                    job.validation.validation_name,
-                    job.region_code,
-                    runtime_seconds,
-                )
+                _record_result(job, runtime_seconds, result)
             except Exception as e:
                 logging.error(
                     "Failed to execute asynchronous query for validation job [%s] due to error: %r",
@@ -304,6 +329,61 @@ def _run_job(job: DataValidationJob) -> DataValidationJobResult:
     return job.validation.get_checker().run_check(job)
 
 
+def _run_validation_query_batches(
+    executor: futures.ThreadPoolExecutor,
+    validation_jobs: List[DataValidationJob],
+    record_result_fn: Callable[
+        [DataValidationJob, float, DataValidationJobResult], None
+    ],
+) -> List[DataValidationJob]:
+    """Runs the given validation jobs in batches that share a single query per
+    validation view, passing each job's result to |record_result_fn| along with the
+    runtime of its batch. All batches share one BigQuery client.
+
+    Returns the jobs from batches whose query failed, which should be run individually.
+    """
+    bq_client = BigQueryClientImpl()
+    batches = plan_validation_query_batches(validation_jobs)
+    logging.info(
+        "Running [%d] validation jobs in [%d] batched queries...",
+        len(validation_jobs),
+        len(batches),
+    )
+    future_to_batch = {
+        executor.submit(
+            trace.time_and_trace(
+                structured_logging.with_context(run_validation_query_batch)
+            ),
+            batch,
+            bq_client,
+        ): batch
+        for batch in batches
+    }
+
+    stats = ValidationBatchQueryStats()
+    failed_batch_jobs: List[DataValidationJob] = []
+    for future in futures.as_completed(future_to_batch):
+        batch = future_to_batch[future]
+        try:
+            runtime_seconds, (results, batch_stats) = future.result()
+        except Exception as e:
+            logging.warning(
+                "Failed to run batched query for [%d] validation jobs, running them "
+                "individually instead. Error: %r",
+                len(batch.jobs),
+                e,
+            )
+            failed_batch_jobs.extend(batch.jobs)
+            continue
+
+        stats += batch_stats
+        for job, result in zip(batch.jobs, results):
+            record_result_fn(job, runtime_seconds, result)
+
+    stats.log_summary()
+    return failed_batch_jobs
+
+
 def _fetch_validation_jobs_to_perform(
     region_code: str,
     ingest_instance: DirectIngestInstance,
@@ -18,7 +18,7 @@
 """Models representing data validation."""
 import abc
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Dict, Generic, List, Optional, TypeVar
 
 import attr
 
@@ -239,10 +239,18 @@ class DataValidationJobResult:
         )
 
 
+# The name of the temporary table that holds the rows of the validation view in a query
+# that runs several validation checks at once. See validation_planner.py.
+BATCHED_VALIDATION_ROWS_TABLE_NAME = "validation_rows"
+
+
 # pylint: disable=unused-argument
 class ValidationChecker(Generic[DataValidationType]):
     """Defines the interface for performing a particular kind of check."""
 
+    # The number of queries run_check() runs for a single validation job
+    num_queries_per_check: int = 1
+
     @classmethod
     @abc.abstractmethod
     def run_check(
@@ -253,3 +261,25 @@ class ValidationChecker(Generic[DataValidationType]):
     @classmethod
     def get_validation_query_str(cls, validation_check: DataValidationType) -> str:
         return ""
+
+    @classmethod
+    @abc.abstractmethod
+    def get_batched_select_expressions(
+        cls, validation_job: DataValidationJob[DataValidationType]
+    ) -> Dict[str, str]:
+        """Returns SELECT expressions, keyed by name, which together compute the result
+        of this check as a single row within a query over the rows of the validation
+        view. Those rows are materialized once in the BATCHED_VALIDATION_ROWS_TABLE_NAME
+        temporary table, which is shared by all checks against the same view, so
+        expressions should read from that table rather than from any view.
+        """
+
+    @classmethod
+    @abc.abstractmethod
+    def result_from_batched_values(
+        cls,
+        validation_job: DataValidationJob[DataValidationType],
+        values: Dict[str, Any],
+    ) -> DataValidationJobResult:
+        """Builds the result of this check from the values of the expressions returned
+        by get_batched_select_expressions(), keyed by the same names."""
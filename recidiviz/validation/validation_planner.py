@@ -0,0 +1,196 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""Plans and runs validation jobs in batches, where all of the checks that read the
+same validation view (for the same region and dataset overrides) are computed by a
+single BigQuery query.
+
+The combined query is a script that first materializes the validation view rows into
+a temporary table, so the view is only read once no matter how many checks read its
+rows. Each checker then computes its result as a handful of SELECT expressions over
+that table (see ValidationChecker.get_batched_select_expressions), so the script returns
+a single row with counts and aggregates rather than every row of the validation view.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import attr
+from google.cloud import bigquery
+from more_itertools import one
+
+from recidiviz.big_query.big_query_client import BigQueryClient
+from recidiviz.utils.string import StrictStringFormatter
+from recidiviz.validation.validation_models import (
+    BATCHED_VALIDATION_ROWS_TABLE_NAME,
+    DataValidationJob,
+    DataValidationJobResult,
+)
+
+# The maximum number of validation jobs to compute in a single query. This bounds the
+# size of the combined query and of the single row it returns.
+MAX_VALIDATION_JOBS_PER_BATCH = 25
+
+BATCHED_VALIDATION_QUERY_TEMPLATE = """
+CREATE TEMP TABLE {rows_table_name} AS (
+    {original_query}
+);
+SELECT
+    {select_expressions};
+"""
+
+
+@attr.s(frozen=True, kw_only=True)
+class ValidationBatchQueryStats:
+    """Resource usage of the queries run for a set of validation job batches."""
+
+    # The number of validation jobs that were run
+    num_validation_jobs: int = attr.ib(default=0)
+
+    # The number of queries that were run for those jobs
+    num_queries: int = attr.ib(default=0)
+
+    # The number of queries that running each job on its own would have required
+    num_unbatched_queries: int = attr.ib(default=0)
+
+    total_bytes_processed: int = attr.ib(default=0)
+    total_bytes_billed: int = attr.ib(default=0)
+    total_slot_millis: int = attr.ib(default=0)
+
+    def __add__(
+        self, other: "ValidationBatchQueryStats"
+    ) -> "ValidationBatchQueryStats":
+        return ValidationBatchQueryStats(
+            num_validation_jobs=self.num_validation_jobs + other.num_validation_jobs,
+            num_queries=self.num_queries + other.num_queries,
+            num_unbatched_queries=self.num_unbatched_queries
+            + other.num_unbatched_queries,
+            total_bytes_processed=self.total_bytes_processed
+            + other.total_bytes_processed,
+            total_bytes_billed=self.total_bytes_billed + other.total_bytes_billed,
+            total_slot_millis=self.total_slot_millis + other.total_slot_millis,
+        )
+
+    @classmethod
+    def for_query_job(
+        cls, batch: "ValidationQueryBatch", query_job: bigquery.QueryJob
+    ) -> "ValidationBatchQueryStats":
+        return ValidationBatchQueryStats(
+            num_validation_jobs=len(batch.jobs),
+            num_queries=1,
+            num_unbatched_queries=batch.num_unbatched_queries,
+            total_bytes_processed=query_job.total_bytes_processed or 0,
+            total_bytes_billed=query_job.total_bytes_billed or 0,
+            total_slot_millis=query_job.slot_millis or 0,
+        )
+
+    def log_summary(self) -> None:
+        logging.info(
+            "Ran [%d] validation jobs in [%d] batched queries instead of [%d] "
+            "queries. The batched queries processed [%d] bytes, billed [%d] bytes and "
+            "used [%d] slot-ms.",
+            self.num_validation_jobs,
+            self.num_queries,
+            self.num_unbatched_queries,
+            self.total_bytes_processed,
+            self.total_bytes_billed,
+            self.total_slot_millis,
+        )
+
+
+@attr.s(frozen=True, kw_only=True)
+class ValidationQueryBatch:
+    """A set of validation jobs that all read the same validation view rows and can
+    be computed in a single query."""
+
+    # The query for the validation view rows that all jobs in this batch read
+    original_query: str = attr.ib()
+
+    jobs: List[DataValidationJob] = attr.ib()
+
+    @property
+    def num_unbatched_queries(self) -> int:
+        return sum(
+            job.validation.get_checker().num_queries_per_check for job in self.jobs
+        )
+
+    @staticmethod
+    def _column_name(job_index: int, expression_name: str) -> str:
+        return f"job_{job_index}__{expression_name}"
+
+    def query_str(self) -> str:
+        select_expressions = []
+        for i, job in enumerate(self.jobs):
+            checker = job.validation.get_checker()
+            for name, expression in checker.get_batched_select_expressions(job).items():
+                select_expressions.append(
+                    f"{expression} AS {self._column_name(i, name)}"
+                )
+
+        return StrictStringFormatter().format(
+            BATCHED_VALIDATION_QUERY_TEMPLATE,
+            rows_table_name=BATCHED_VALIDATION_ROWS_TABLE_NAME,
+            original_query=self.original_query,
+            select_expressions=",\n    ".join(select_expressions),
+        )
+
+    def results_from_row(
+        self, row: bigquery.table.Row
+    ) -> List[DataValidationJobResult]:
+        """Returns the result of each job in this batch, in order, from the single row
+        returned by query_str()."""
+        results = []
+        for i, job in enumerate(self.jobs):
+            checker = job.validation.get_checker()
+            values = {
+                name: row.get(self._column_name(i, name))
+                for name in checker.get_batched_select_expressions(job)
+            }
+            results.append(checker.result_from_batched_values(job, values))
+        return results
+
+
+def plan_validation_query_batches(
+    validation_jobs: List[DataValidationJob],
+    max_jobs_per_batch: int = MAX_VALIDATION_JOBS_PER_BATCH,
+) -> List[ValidationQueryBatch]:
+    """Groups the given validation jobs into batches of jobs that read the same
+    validation view rows. Jobs keep their relative order within each batch."""
+    jobs_by_original_query: Dict[str, List[DataValidationJob]] = defaultdict(list)
+    for job in validation_jobs:
+        jobs_by_original_query[job.original_builder_query_str()].append(job)
+
+    return [
+        ValidationQueryBatch(
+            original_query=original_query,
+            jobs=jobs[start : start + max_jobs_per_batch],
+        )
+        for original_query, jobs in jobs_by_original_query.items()
+        for start in range(0, len(jobs), max_jobs_per_batch)
+    ]
+
+
+def run_validation_query_batch(
+    batch: ValidationQueryBatch, bq_client: BigQueryClient
+) -> Tuple[List[DataValidationJobResult], ValidationBatchQueryStats]:
+    """Runs the combined query for the given batch and returns the result of each of
+    its jobs, in order, along with the resource usage of the query."""
+    query_job = bq_client.run_query_async(
+        query_str=batch.query_str(), use_query_cache=True, query_parameters=[]
+    )
+    # The rows of a script's query job are those of its last statement
+    results = batch.results_from_row(one(query_job))
+    return results, ValidationBatchQueryStats.for_query_job(batch, query_job)
@@ -0,0 +1,273 @@
+# Recidiviz - a data platform for criminal justice reform
+# Copyright (C) 2023 Recidiviz, Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# =============================================================================
+"""An on-disk cache of the graph of all deployed views.
+
+Building the deployed view graph requires importing every module that defines a view
+builder and building every view, which takes several seconds. For tools that only need
+the structure of the graph (view addresses, queries, materialized addresses and parent
+tables), the graph can instead be loaded from a cache file that stores that
+information for every view.
+
+The cache is keyed by a hash of the contents of every source file that was loaded while
+building the graph, all non-Python data files (e.g. raw data YAML configs) in the
+recidiviz package, and the list of all Python files in the package (so that adding a
+new view module invalidates the cache). When the key of a cache file no longer matches,
+the graph is rebuilt from the view builders and the cache file is rewritten.
+
+Views loaded from the cache are CachedBigQueryView objects, not instances of the
+BigQueryView subclasses returned by the view builders, and do not have a
+should_deploy_predicate. Use build_all_deployed_views_dag_walker() directly if you need
+either of those.
+
+The local tools that only inspect the graph (display_bq_dag_for_view,
+find_unused_bq_views and benchmark_view_dag_sub_dags) load it through this cache. The
+view update, validation and other entrypoints still build the graph from the view
+builders, as they need the real view objects and run in fresh containers where the
+cache would be cold. Tests also build the graph from the view builders, since they are
+meant to exercise the view builders themselves.
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import recidiviz
+from recidiviz.big_query.big_query_address import BigQueryAddress
+from recidiviz.big_query.big_query_view import BigQueryView
+from recidiviz.big_query.big_query_view_dag_walker import BigQueryViewDagWalker
+from recidiviz.utils import environment, metadata
+
+# Bump this whenever the format of the cache file changes.
+DEPLOYED_VIEWS_CACHE_VERSION = 1
+
+_RECIDIVIZ_ROOT = os.path.dirname(recidiviz.__file__)
+
+# Extensions of non-Python files that may be read while building views.
+_DATA_FILE_EXTENSIONS = (".yaml", ".yml", ".json", ".csv", ".sql", ".txt")
+
+# Directories that never contain files that views are built from.
+_IGNORED_DIRECTORIES = {"tests", "__pycache__", "node_modules"}
+
+
+def _default_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "deployed_views_cache")
+
+
+class CachedBigQueryView(BigQueryView):
+    """A BigQueryView loaded from the deployed views cache, whose parent tables are
+    known up front rather than parsed from the view query."""
+
+    def __init__(
+        self,
+        *,
+        project_id: str,
+        dataset_id: str,
+        view_id: str,
+        bq_description: str,
+        description: str,
+        view_query: str,
+        materialized_address: Optional[BigQueryAddress],
+        clustering_fields: Optional[List[str]],
+        parent_tables: Set[BigQueryAddress],
+    ) -> None:
+        super().__init__(
+            project_id=project_id,
+            dataset_id=dataset_id,
+            view_id=view_id,
+            bq_description=bq_description,
+            description=description,
+            # The query is already fully formatted, so escape any braces to have it
+            # pass through query formatting unchanged.
+            view_query_template=view_query.replace("{", "{{").replace("}", "}}"),
+            materialized_address=materialized_address,
+            clustering_fields=clustering_fields,
+        )
+        self._parent_tables = parent_tables
+
+
+def _all_source_file_paths() -> List[str]:
+    """Returns the paths, relative to the recidiviz package, of all Python and data
+    files in the package, excluding tests."""
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(_RECIDIVIZ_ROOT):
+        dir_names[:] = sorted(d for d in dir_names if d not in _IGNORED_DIRECTORIES)
+        for file_name in file_names:
+            if file_name.endswith((".py", *_DATA_FILE_EXTENSIONS)):
+                paths.append(
+                    os.path.relpath(os.path.join(dir_path, file_name), _RECIDIVIZ_ROOT)
+                )
+    return sorted(paths)
+
+
+def _loaded_module_file_paths() -> List[str]:
+    """Returns the paths, relative to the recidiviz package, of all recidiviz modules
+    that are currently imported."""
+    paths = set()
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file or not module_file.startswith(_RECIDIVIZ_ROOT):
+            continue
+        path = os.path.relpath(module_file, _RECIDIVIZ_ROOT)
+        if _IGNORED_DIRECTORIES.isdisjoint(path.split(os.sep)):
+            paths.add(path)
+    return sorted(paths)
+
+
+def _source_hash(project_id: str, module_paths: Iterable[str]) -> str:
+    """Returns a hash of the contents of the given modules and of all data files in
+    the recidiviz package, as well as of the list of all source files in the package.
+    """
+    hasher = hashlib.sha256(f"{DEPLOYED_VIEWS_CACHE_VERSION}:{project_id}".encode())
+
+    all_source_paths = _all_source_file_paths()
+    hasher.update("\n".join(all_source_paths).encode())
+
+    paths_to_hash = set(module_paths) | {
+        path for path in all_source_paths if path.endswith(_DATA_FILE_EXTENSIONS)
+    }
+    for path in sorted(paths_to_hash):
+        hasher.update(path.encode())
+        try:
+            with open(os.path.join(_RECIDIVIZ_ROOT, path), "rb") as f:
+                hasher.update(hashlib.sha256(f.read()).digest())
+        except FileNotFoundError:
+            hasher.update(b"<missing>")
+    return hasher.hexdigest()
+
+
+def _address_to_json(address: Optional[BigQueryAddress]) -> Optional[List[str]]:
+    if address is None:
+        return None
+    return [address.dataset_id, address.table_id]
+
+
+def _address_from_json(address_json: Optional[List[str]]) -> Optional[BigQueryAddress]:
+    if address_json is None:
+        return None
+    dataset_id, table_id = address_json
+    return BigQueryAddress(dataset_id=dataset_id, table_id=table_id)
+
+
+def _view_to_json(view: BigQueryView) -> Dict[str, Any]:
+    return {
+        "project_id": view.project,
+        "dataset_id": view.dataset_id,
+        "view_id": view.view_id,
+        "bq_description": view.bq_description,
+        "description": view.description,
+        "view_query": view.view_query,
+        "materialized_address": _address_to_json(view.materialized_address),
+        "clustering_fields": view.clustering_fields,
+        "parent_tables": sorted(
+            [_address_to_json(a) for a in view.parent_tables],
+        ),
+    }
+
+
+def _view_from_json(view_json: Dict[str, Any]) -> CachedBigQueryView:
+    return CachedBigQueryView(
+        project_id=view_json["project_id"],
+        dataset_id=view_json["dataset_id"],
+        view_id=view_json["view_id"],
+        bq_description=view_json["bq_description"],
+        description=view_json["description"],
+        view_query=view_json["view_query"],
+        materialized_address=_address_from_json(view_json["materialized_address"]),
+        clustering_fields=view_json["clustering_fields"],
+        parent_tables={
+            BigQueryAddress(dataset_id=dataset_id, table_id=table_id)
+            for dataset_id, table_id in view_json["parent_tables"]
+        },
+    )
+
+
+def _load_cached_views(
+    cache_path: str, project_id: str
+) -> Optional[List[BigQueryView]]:
+    """Returns the views stored in the cache file at |cache_path|, or None if there is
+    no valid cache file for the current source files."""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache_json = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache_json.get("version") != DEPLOYED_VIEWS_CACHE_VERSION:
+        return None
+
+    if cache_json["source_hash"] != _source_hash(
+        project_id, cache_json["module_paths"]
+    ):
+        return None
+
+    return [_view_from_json(view_json) for view_json in cache_json["views"]]
+
+
+def _write_cache(cache_path: str, project_id: str, views: List[BigQueryView]) -> None:
+    module_paths = _loaded_module_file_paths()
+    cache_json = {
+        "version": DEPLOYED_VIEWS_CACHE_VERSION,
+        "module_paths": module_paths,
+        "source_hash": _source_hash(project_id, module_paths),
+        "views": [_view_to_json(view) for view in views],
+    }
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Write to a temporary file first so that concurrent readers never see a partially
+    # written cache file.
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        encoding="utf-8",
+        dir=os.path.dirname(cache_path),
+        suffix=".tmp",
+        delete=False,
+    ) as f:
+        json.dump(cache_json, f)
+    os.replace(f.name, cache_path)
+
+
+@environment.local_only
+def build_all_deployed_views_dag_walker_with_cache(
+    cache_dir: Optional[str] = None,
+) -> BigQueryViewDagWalker:
+    """Returns a BigQueryViewDagWalker representing the DAG of all deployed views in
+    the main view graph, loading the graph from the on-disk cache in |cache_dir| if the
+    cache is valid for the current source files. Otherwise, builds the graph from the
+    deployed view builders and writes it to the cache.
+    """
+    project_id = metadata.project_id()
+    cache_path = os.path.join(cache_dir or _default_cache_dir(), f"{project_id}.json")
+
+    views = _load_cached_views(cache_path, project_id)
+    if views is not None:
+        logging.info("Loaded [%s] deployed views from [%s]", len(views), cache_path)
+        return BigQueryViewDagWalker(views)
+
+    logging.info("No valid deployed views cache found, building all views...")
+    # Only import the view registry if the cache cannot be used, since importing all
+    # view builder modules is the most expensive part of building the graph.
+    # pylint: disable=import-outside-toplevel
+    from recidiviz.view_registry.deployed_views import (
+        build_all_deployed_views_dag_walker,
+    )
+
+    dag_walker = build_all_deployed_views_dag_walker()
+    _write_cache(cache_path, project_id, dag_walker.views)
+    return dag_walker
@@ -126,10 +126,13 @@ def get_workflows_etl_blueprint() -> Blueprint:
     @workflows_etl_blueprint.route("/_run_firestore_etl", methods=["POST"])
     @requires_gae_auth
     def _run_firestore_etl() -> Tuple[str, HTTPStatus]:
-        """This endpoint is triggered by a CloudTask created by _handle_workflows_firestore_etl"""
+        """This endpoint is triggered by a CloudTask created by _handle_workflows_firestore_etl.
+        If the request body sets "incremental" to true, only writes the documents that have
+        changed since the last incremental export."""
         body = get_cloud_task_json_body()
         filename = body.get("filename")
         state_code = body.get("state_code")
+        incremental = body.get("incremental", False) is True
 
         if not filename or not state_code:
             return (
@@ -140,7 +143,7 @@ def get_workflows_etl_blueprint() -> Blueprint:
         for delegate in get_workflows_delegates(StateCode(state_code)):
             try:
                 if delegate.supports_file(filename):
-                    delegate.run_etl(filename)
+                    delegate.run_etl(filename, incremental=incremental)
             except ValueError as e:
                 logging.error(str(e))
                 logging.info(
@@ -17,19 +17,23 @@
 """Abstract classes defining delegate interfaces for ETLing data into the
 workflows' frontend database(s)."""
 import abc
+import hashlib
+import json
 import logging
 import os
 import re
+from concurrent import futures
 from datetime import datetime, timezone
-from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 from google.api_core.exceptions import AlreadyExists
 from google.cloud.firestore_admin_v1 import CreateIndexRequest, Index
+from google.cloud.firestore_v1.document import DocumentReference
 
 from recidiviz.cloud_storage.gcsfs_factory import GcsfsFactory
 from recidiviz.cloud_storage.gcsfs_path import GcsfsFilePath
 from recidiviz.common.constants.states import StateCode
-from recidiviz.firestore.firestore_client import FirestoreClientImpl
+from recidiviz.firestore.firestore_client import FirestoreClient, FirestoreClientImpl
 from recidiviz.metrics.export.export_config import WORKFLOWS_VIEWS_OUTPUT_DIRECTORY_URI
 from recidiviz.utils import metadata
 from recidiviz.utils.string import StrictStringFormatter
@@ -37,6 +41,73 @@ from recidiviz.utils.string import StrictStringFormatter
 # Firestore client caps us at 500 records per batch
 MAX_FIRESTORE_RECORDS_PER_BATCH = 499
 
+# The maximum number of write batches that an incremental ETL commits at once
+MAX_CONCURRENT_FIRESTORE_BATCHES = 8
+
+# Name of the key incremental ETLs insert into each document to record a hash of its contents
+CONTENT_HASH_KEY = "__contentHash"
+
+
+def content_hash(document_fields: dict) -> str:
+    """Returns a stable hash of the given document contents."""
+    return hashlib.sha256(
+        json.dumps(document_fields, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class _ConcurrentBatchWriter:
+    """Accumulates writes into Firestore write batches and commits up to
+    MAX_CONCURRENT_FIRESTORE_BATCHES of them at a time. Must be used as a context
+    manager so that every pending batch is committed before it exits."""
+
+    def __init__(self, firestore_client: FirestoreClient):
+        self.firestore_client = firestore_client
+        self.batch = firestore_client.batch()
+        self.num_records_in_batch = 0
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_FIRESTORE_BATCHES
+        )
+        self.in_flight: Set[futures.Future] = set()
+
+    def __enter__(self) -> "_ConcurrentBatchWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, _value: Any, _traceback: Any) -> None:
+        try:
+            if exc_type is None:
+                self._commit_batch()
+                for future in futures.as_completed(self.in_flight):
+                    future.result()
+        finally:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def set(self, document: DocumentReference, data: dict) -> None:
+        self.batch.set(document, data)
+        self._record_added()
+
+    def delete(self, document: DocumentReference) -> None:
+        self.batch.delete(document)
+        self._record_added()
+
+    def _record_added(self) -> None:
+        self.num_records_in_batch += 1
+        if self.num_records_in_batch >= MAX_FIRESTORE_RECORDS_PER_BATCH:
+            self._commit_batch()
+
+    def _commit_batch(self) -> None:
+        if not self.num_records_in_batch:
+            return
+        if len(self.in_flight) >= MAX_CONCURRENT_FIRESTORE_BATCHES:
+            done, self.in_flight = futures.wait(
+                self.in_flight, return_when=futures.FIRST_COMPLETED
+            )
+            for future in done:
+                # Surface any failed commits
+                future.result()
+        self.in_flight.add(self.executor.submit(self.batch.commit))
+        self.batch = self.firestore_client.batch()
+        self.num_records_in_batch = 0
+
 
 class WorkflowsETLDelegate(abc.ABC):
     """Abstract class containing the ETL logic for transforming and exporting Workflows records."""
@@ -49,8 +120,10 @@ class WorkflowsETLDelegate(abc.ABC):
         """Provides list of source files supported for the given state."""
 
     @abc.abstractmethod
-    def run_etl(self, filename: str) -> None:
-        """Runs the ETL logic for the provided filename and state_code."""
+    def run_etl(self, filename: str, incremental: bool = False) -> None:
+        """Runs the ETL logic for the provided filename and state_code. If |incremental|
+        is set, only writes the records that have changed since the last incremental
+        run, if the delegate supports it."""
 
     def supports_file(self, filename: str) -> bool:
         """Checks if the given filename is supported by this delegate."""
@@ -127,7 +200,31 @@ class WorkflowsFirestoreETLDelegate(WorkflowsETLDelegate):
         doc_id = re.sub(r"[^a-z0-9_-]", "", doc_id)
         return doc_id
 
-    def run_etl(self, filename: str) -> None:
+    def iter_documents(self, filename: str) -> Iterator[Tuple[str, dict]]:
+        """Yields the document ID and document contents for each row of the exported file
+        that is transformed successfully."""
+        for file_stream in self.get_file_stream(filename):
+            while line := file_stream.readline():
+                try:
+                    row_id, document_fields = self.transform_row(line)
+                except Exception as e:
+                    logging.error(
+                        "Transform row failed on [%s] due to: %s", line, str(e)
+                    )
+                    continue
+
+                if row_id is None or document_fields is None:
+                    continue
+                yield self.doc_id_for_row_id(row_id), document_fields
+
+    def run_etl(self, filename: str, incremental: bool = False) -> None:
+        """Exports the given file to its Firestore collection. If |incremental| is set,
+        only writes the documents that have changed since the last incremental export
+        (see run_incremental_etl); otherwise rewrites every document."""
+        if incremental:
+            self.run_incremental_etl(filename, FirestoreClientImpl())
+            return
+
         collection_name = self.COLLECTION_BY_FILENAME[filename]
 
         logging.info(
@@ -144,31 +241,19 @@ class WorkflowsFirestoreETLDelegate(WorkflowsETLDelegate):
         etl_timestamp = datetime.now(timezone.utc)
 
         # step 1: Load new documents
-        for file_stream in self.get_file_stream(filename):
-            while line := file_stream.readline():
-                try:
-                    row_id, document_fields = self.transform_row(line)
-                except Exception as e:
-                    logging.error(
-                        "Transform row failed on [%s] due to: %s", line, str(e)
-                    )
-                    continue
-
-                if row_id is None or document_fields is None:
-                    continue
-                document_id = self.doc_id_for_row_id(row_id)
-                new_document = {
-                    **document_fields,
-                    self.timestamp_key: etl_timestamp,
-                }
-                batch.set(firestore_collection.document(document_id), new_document)
-                num_records_to_write += 1
-                total_records_written += 1
-
-                if num_records_to_write >= MAX_FIRESTORE_RECORDS_PER_BATCH:
-                    batch.commit()
-                    batch = firestore_client.batch()
-                    num_records_to_write = 0
+        for document_id, document_fields in self.iter_documents(filename):
+            new_document = {
+                **document_fields,
+                self.timestamp_key: etl_timestamp,
+            }
+            batch.set(firestore_collection.document(document_id), new_document)
+            num_records_to_write += 1
+            total_records_written += 1
+
+            if num_records_to_write >= MAX_FIRESTORE_RECORDS_PER_BATCH:
+                batch.commit()
+                batch = firestore_client.batch()
+                num_records_to_write = 0
 
         batch.commit()
         logging.info(
@@ -214,6 +299,71 @@ class WorkflowsFirestoreETLDelegate(WorkflowsETLDelegate):
             collection_name, self.state_code.value, self.timestamp_key, etl_timestamp
         )
 
+    def run_incremental_etl(
+        self, filename: str, firestore_client: FirestoreClient
+    ) -> None:
+        """Exports the given file to its Firestore collection, writing only the documents
+        whose contents have changed since they were last written and deleting only the
+        documents for this state that are no longer in the file.
+
+        Each document written stores a hash of its contents under CONTENT_HASH_KEY, which
+        is compared against the hashes read back from the collection on the next run.
+        Documents that were written without a hash (e.g. by a full export) are treated as
+        changed. Because unchanged documents are not rewritten, their timestamp_key
+        records when their contents last changed rather than when the file was last
+        exported.
+        """
+        collection_name = self.COLLECTION_BY_FILENAME[filename]
+
+        logging.info(
+            'Starting incremental export of %s to the Firestore collection "%s".',
+            self.filepath_url(filename),
+            collection_name,
+        )
+        firestore_collection = firestore_client.get_collection(collection_name)
+        existing_hashes = firestore_client.get_field_by_document_id(
+            collection_name, self.state_code.value, CONTENT_HASH_KEY
+        )
+        etl_timestamp = datetime.now(timezone.utc)
+        # Batches are committed concurrently, so writes to the same document in
+        # different batches may land in any order. Dedupe by document ID first so that,
+        # as in a full export, the last row for a document wins.
+        documents: Dict[str, dict] = dict(self.iter_documents(filename))
+        num_unchanged = 0
+        num_written = 0
+
+        with _ConcurrentBatchWriter(firestore_client) as writer:
+            # step 1: Write new and changed documents
+            for document_id, document_fields in documents.items():
+                document_hash = content_hash(document_fields)
+                if existing_hashes.get(document_id) == document_hash:
+                    num_unchanged += 1
+                    continue
+                writer.set(
+                    firestore_collection.document(document_id),
+                    {
+                        **document_fields,
+                        self.timestamp_key: etl_timestamp,
+                        CONTENT_HASH_KEY: document_hash,
+                    },
+                )
+                num_written += 1
+
+            # step 2: Delete documents that are no longer in the export
+            document_ids_to_delete = existing_hashes.keys() - documents.keys()
+            for document_id in sorted(document_ids_to_delete):
+                writer.delete(firestore_collection.document(document_id))
+
+        logging.info(
+            "[%s] Wrote %d changed records, skipped %d unchanged records and deleted %d "
+            'records in Firestore collection "%s".',
+            self.state_code.value,
+            num_written,
+            num_unchanged,
+            len(document_ids_to_delete),
+            collection_name,
+        )
+
 
 class WorkflowsSingleStateETLDelegate(WorkflowsFirestoreETLDelegate):
     """Abstract class containing the ETL logic for transforming and exporting Workflows records for a single state."""
@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # =============================================================================
-from typing import Any
+from typing import Any, Dict, List, Optional
 
 class DataType:
     pass
@@ -22,5 +22,30 @@ class DataType:
 class Scalar:
     def cast(self, data_type: DataType) -> Scalar: ...
 
+class Array:
+    pass
+
+class Field:
+    name: str
+    type: DataType
+
+class Schema:
+    pass
+
+class Table:
+    column_names: List[str]
+    @staticmethod
+    def from_arrays(arrays: List[Array], schema: Optional[Schema] = None) -> Table: ...
+    def to_pylist(self) -> List[Dict[str, Any]]: ...
+
 def null() -> DataType: ...
+def string() -> DataType: ...
+def int64() -> DataType: ...
+def bool_() -> DataType: ...
+def timestamp(unit: str, tz: Optional[str] = None) -> DataType: ...
 def scalar(value: Any) -> Scalar: ...
+def field(name: str, type: DataType, nullable: bool = True) -> Field: ...
+def schema(fields: List[Field]) -> Schema: ...
+def array(
+    obj: Any, type: Optional[DataType] = None, mask: Optional[Any] = None
+) -> Array: ...
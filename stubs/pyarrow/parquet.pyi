@@ -17,7 +17,7 @@
 from io import BytesIO
 from typing import Union
 
-from pyarrow import DataType
+from pyarrow import DataType, Table
 
 class Field:
     type: DataType
@@ -26,3 +26,5 @@ class Schema:
     def field(self, i: Union[int, str]) -> Field: ...
 
 def read_schema(file: BytesIO) -> Schema: ...
+def read_table(source: str) -> Table: ...
+def write_table(table: Table, where: str) -> None: ...
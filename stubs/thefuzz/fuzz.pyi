@@ -17,3 +17,7 @@
 
 def token_set_ratio(s1: str, s2: str) -> int: ...
 def partial_ratio(s1: str, s2: str) -> int: ...
+def ratio(s1: str, s2: str) -> int: ...
+def token_sort_ratio(s1: str, s2: str) -> int: ...
+def partial_token_sort_ratio(s1: str, s2: str) -> int: ...
+def partial_token_set_ratio(s1: str, s2: str) -> int: ...